@@ -53,7 +53,7 @@ def get_url() -> str | None:
         print(f"[ALEMBIC DEBUG] Original URL: {original_url}")
         print(f"[ALEMBIC DEBUG] Converted URL: {url}")
         print(f"[ALEMBIC DEBUG] Running with environment variable: {original_url}")
-        logger.info(f"Using database URL from environment: {url}")
+        logger.info("Using database URL from environment: %s", url)
         return url
 
     # Fall back to alembic.ini
@@ -61,7 +61,7 @@ def get_url() -> str | None:
     url = config.get_main_option("sqlalchemy.url")
     print(f"[ALEMBIC DEBUG] Fallback URL from alembic.ini: {url}")
     print("[ALEMBIC DEBUG] No environment variable found, using alembic.ini")
-    logger.info(f"Using database URL from alembic.ini: {url}")
+    logger.info("Using database URL from alembic.ini: %s", url)
     return url
 
 
@@ -84,14 +84,14 @@ def run_migrations_offline() -> None:
     config_file: str | None = config.config_file_name
     if config_file is not None:
         fileConfig(config_file)
-        logger.debug(f"Loaded logging config from {config_file}")
+        logger.debug("Loaded logging config from %s", config_file)
 
     url: str | None = get_url()
     if url is None:
         logger.error("No sqlalchemy.url provided for offline migration")
         raise ValueError("No sqlalchemy.url provided for offline migration")
 
-    logger.info(f"Configuring context for offline migration (url={url})")
+    logger.info("Configuring context for offline migration (url=%s)", url)
     context.configure(
         url=url,
         target_metadata=target_metadata,
@@ -123,7 +123,7 @@ def run_migrations_online(
     config_file: str | None = config.config_file_name
     if config_file is not None:
         fileConfig(config_file)
-        logger.debug(f"Loaded logging config from {config_file}")
+        logger.debug("Loaded logging config from %s", config_file)
 
     url: str | None = get_url()
     if url is None:
@@ -134,7 +134,7 @@ def run_migrations_online(
     config = get_config()
     config.set_main_option("sqlalchemy.url", url)
 
-    logger.info(f"Configuring engine and context for online migration (url={url})")
+    logger.info("Configuring engine and context for online migration (url=%s)", url)
     section_raw: object = config.get_section(config.config_ini_section)
     if not isinstance(section_raw, Mapping):
         raise TypeError("Expected config section to be a Mapping[str, object]")
@@ -0,0 +1,38 @@
+"""Add write-behind user activity columns
+
+Revision ID: b2c4d6e8f0a1
+Revises: 31eb30e5f037
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b2c4d6e8f0a1"
+down_revision: str | None = "31eb30e5f037"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column("users", sa.Column("last_active_at", sa.DateTime(), nullable=True))
+    op.add_column(
+        "users",
+        sa.Column("ws_message_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "users",
+        sa.Column("ws_error_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("users", "ws_error_count")
+    op.drop_column("users", "ws_message_count")
+    op.drop_column("users", "last_active_at")
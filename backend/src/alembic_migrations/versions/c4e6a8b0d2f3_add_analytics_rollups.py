@@ -0,0 +1,43 @@
+"""Add daily and monthly analytics rollup tables
+
+Revision ID: c4e6a8b0d2f3
+Revises: b2c4d6e8f0a1
+Create Date: 2026-10-18 12:00:00.000000
+
+Populate existing data with ``python -m src.repositories.analytics backfill``.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e6a8b0d2f3"
+down_revision: str | None = "b2c4d6e8f0a1"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "analytics_daily",
+        sa.Column("metric", sa.String(length=32), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("metric", "day"),
+    )
+    op.create_table(
+        "analytics_monthly",
+        sa.Column("metric", sa.String(length=32), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("value", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("metric", "month"),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("analytics_monthly")
+    op.drop_table("analytics_daily")
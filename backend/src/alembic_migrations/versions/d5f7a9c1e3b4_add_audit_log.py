@@ -0,0 +1,54 @@
+"""Add the audit_log table (monthly partitions on PostgreSQL)
+
+Revision ID: d5f7a9c1e3b4
+Revises: c4e6a8b0d2f3
+Create Date: 2026-10-18 16:00:00.000000
+
+On PostgreSQL the table is range-partitioned by ``occurred_at`` with a DEFAULT
+partition as a catch-all. Monthly partitions are created at startup, or with
+``python -m src.repositories.audit partitions``.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d5f7a9c1e3b4"
+down_revision: str | None = "c4e6a8b0d2f3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    is_postgresql = op.get_bind().dialect.name == "postgresql"
+    op.create_table(
+        "audit_log",
+        sa.Column("id", sa.String(length=32), nullable=False),
+        sa.Column("occurred_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("action", sa.String(length=64), nullable=False),
+        sa.Column("entity_type", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.String(length=255), nullable=True),
+        sa.Column("actor_id", sa.Integer(), nullable=True),
+        sa.Column("request_id", sa.String(length=64), nullable=True),
+        sa.Column("details", sa.JSON(), nullable=True),
+        sa.PrimaryKeyConstraint("id", "occurred_at"),
+        **({"postgresql_partition_by": "RANGE (occurred_at)"} if is_postgresql else {}),
+    )
+    op.create_index("ix_audit_log_occurred_at", "audit_log", ["occurred_at"])
+    op.create_index(
+        "ix_audit_log_entity", "audit_log", ["entity_type", "entity_id", "occurred_at"]
+    )
+    op.create_index("ix_audit_log_actor", "audit_log", ["actor_id", "occurred_at"])
+    if is_postgresql:
+        op.execute("CREATE TABLE audit_log_default PARTITION OF audit_log DEFAULT")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_audit_log_actor", table_name="audit_log")
+    op.drop_index("ix_audit_log_entity", table_name="audit_log")
+    op.drop_index("ix_audit_log_occurred_at", table_name="audit_log")
+    op.drop_table("audit_log")
@@ -0,0 +1,91 @@
+"""Index file lookups by name and per-user listings, and token expiry
+
+Revision ID: e6a8c0d2f4b5
+Revises: d5f7a9c1e3b4
+Create Date: 2026-10-19 09:00:00.000000
+
+``ix_files_user_id`` is replaced by ``ix_files_user_id_created_at_id``, which
+starts with the same column. On PostgreSQL the indexes are built
+``CONCURRENTLY`` so uploads keep working during the migration.
+
+File names must be unique. If existing rows share a name the upgrade stops
+and lists them. Rename or delete the extra rows, then run it again.
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e6a8c0d2f4b5"
+down_revision: str | None = "d5f7a9c1e3b4"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# (name, table, columns, unique)
+_INDEXES: list[tuple[str, str, list[str], bool]] = [
+    ("ix_files_filename", "files", ["filename"], True),
+    (
+        "ix_files_user_id_created_at_id",
+        "files",
+        ["user_id", "created_at", "id"],
+        False,
+    ),
+    ("ix_files_user_id_filename", "files", ["user_id", "filename"], False),
+    ("ix_blacklisted_tokens_expires_at", "blacklisted_tokens", ["expires_at"], False),
+]
+
+
+def _check_duplicate_filenames() -> None:
+    duplicates = (
+        op.get_bind()
+        .execute(
+            sa.text(
+                "SELECT filename, COUNT(*) FROM files "
+                "GROUP BY filename HAVING COUNT(*) > 1 ORDER BY filename"
+            )
+        )
+        .all()
+    )
+    if duplicates:
+        listed = ", ".join(
+            f"{name!r} ({count} rows)" for name, count in duplicates[:20]
+        )
+        raise RuntimeError(
+            f"{len(duplicates)} file names are used more than once: {listed}. "
+            "Rename or delete the duplicate rows, then upgrade again."
+        )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _check_duplicate_filenames()
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            for name, table, columns, unique in _INDEXES:
+                op.create_index(
+                    name,
+                    table,
+                    columns,
+                    unique=unique,
+                    postgresql_concurrently=True,
+                    if_not_exists=True,
+                )
+            op.drop_index(
+                "ix_files_user_id",
+                table_name="files",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        return
+    for name, table, columns, unique in _INDEXES:
+        op.create_index(name, table, columns, unique=unique)
+    op.drop_index("ix_files_user_id", table_name="files")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index("ix_files_user_id", "files", ["user_id"])
+    for name, table, _, _ in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
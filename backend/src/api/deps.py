@@ -1,13 +1,13 @@
 import contextvars
+import dataclasses
 import importlib
 import time
 import uuid
 from collections.abc import AsyncGenerator, Awaitable, Callable
-from functools import lru_cache, wraps
+from functools import lru_cache
 from typing import (
     Any,
     Final,
-    Literal,
     Protocol,
     TypeVar,
     cast,
@@ -22,10 +22,19 @@ from typing_extensions import TypedDict
 
 from src.core.config import get_settings
 from src.core.database import get_async_session
+from src.core.jwt_keys import is_asymmetric_algorithm
+from src.core.pool_metrics import pool_route_ctx_var
+from src.core.replicas import allow_replica_reads
 from src.core.security import verify_access_token
+from src.core.unit_of_work import UnitOfWork
 from src.models.user import User
 from src.repositories import user as user_repository
-from src.repositories.user import get_user_by_id
+from src.repositories.user import (
+    UserPrincipal,
+    get_user_by_id,
+    get_user_principal,
+    get_user_principal_by_email,
+)
 from src.services.user import UserService
 from src.utils.http_error import http_error
 
@@ -33,7 +42,7 @@ from src.utils.http_error import http_error
 Dependency injection utilities for FastAPI API endpoints.
 
 This module provides robust, reusable dependencies for:
-- Database session management (get_db)
+- Database session management (get_db, get_unit_of_work)
 - User authentication and active user checks (get_current_user, get_current_active_user, optional_get_current_user)
 - Pagination parameter validation (pagination_params)
 - Repository/service locator for testability (get_user_service, get_service)
@@ -213,12 +222,14 @@ def get_async_refresh_access_token() -> (
         settings = get_settings()
         jwt_secret_key: str | None = settings.jwt_secret_key
         jwt_algorithm: str | None = settings.jwt_algorithm
-        if jwt_secret_key is None or jwt_algorithm is None:
+        if jwt_algorithm is None or (
+            jwt_secret_key is None and not is_asymmetric_algorithm(jwt_algorithm)
+        ):
             raise RuntimeError("JWT secret key and algorithm must be set in settings.")
         return await async_refresh_access_token(
             session,
             token,
-            jwt_secret_key,
+            jwt_secret_key or "",
             jwt_algorithm,
         )
 
@@ -299,45 +310,6 @@ class HealthCheck:
 HealthCheck.register("database", lambda: True)  # Replace with real DB check
 
 
-# --- Dependency Metrics ---
-
-
-class DependencyMetric(TypedDict):
-    count: int
-    errors: int
-    total_time: float
-
-
-dependency_metrics: dict[str, DependencyMetric] = {}
-
-
-def measure_dependency(
-    func: Callable[..., Awaitable[object]],
-) -> Callable[..., Awaitable[object]]:
-    @wraps(func)
-    async def wrapper(*args: object, **kwargs: object) -> object:
-        start: float = time.time()
-        status: Literal["success", "error"] = "success"
-        result: object | None = None
-        try:
-            result = await func(*args, **kwargs)
-        except Exception:
-            status = "error"
-            raise
-        finally:
-            duration: float = time.time() - start
-            name: str = func.__name__
-            if name not in dependency_metrics:
-                dependency_metrics[name] = {"count": 0, "errors": 0, "total_time": 0.0}
-            dependency_metrics[name]["count"] += 1
-            dependency_metrics[name]["total_time"] += duration
-            if status == "error":
-                dependency_metrics[name]["errors"] += 1
-        return result
-
-    return wrapper
-
-
 # --- Dynamic Config Reloader ---
 
 
@@ -443,33 +415,60 @@ def pagination_params(
             logger.error,
         )
         raise RuntimeError("unreachable after http_error")
-    logger.info(f"Pagination params accepted: offset={offset}, limit={limit}")
+    logger.debug("Pagination params accepted: offset={}, limit={}", offset, limit)
     return PaginationParams(offset=offset, limit=limit)
 
 
-# --- Auth Dependencies ---
-async def _resolve_user_from_id(session: AsyncSession, user_id: Any) -> User | None:
-    """Helper to resolve a user from an int or str user_id."""
-    from sqlalchemy import select
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dependency that provides a SQLAlchemy AsyncSession for database operations.
 
-    from src.models.user import User
+    ``get_async_session`` is an async context manager, so it cannot be used
+    with ``Depends`` directly. Every dependency and endpoint that needs the
+    request's session asks for this one, so they all share the same session.
 
+    Yields:
+        AsyncSession: SQLAlchemy async session for DB operations.
+
+    Usage:
+        async def endpoint(db: AsyncSession = Depends(get_db)):
+            ...
+
+    """
+    http_error: HTTPException | None = None
+    async with get_async_session() as session:
+        try:
+            yield session
+        except HTTPException as exc:
+            # An error response, not a session failure: close the session normally.
+            http_error = exc
+    if http_error is not None:
+        raise http_error
+
+
+# --- Auth Dependencies ---
+async def _resolve_principal(
+    session: AsyncSession, user_id: Any
+) -> UserPrincipal | None:
+    """Helper to resolve a cached principal from an int or str user_id."""
     if isinstance(user_id, int):
-        return await get_user_by_id(session, user_id)
+        return await get_user_principal(session, user_id)
     if isinstance(user_id, str):
         if user_id.isdigit():
-            return await get_user_by_id(session, int(user_id))
-        result = await session.execute(select(User).where(User.email == user_id))
-        return result.scalar_one_or_none()
+            return await get_user_principal(session, int(user_id))
+        return await get_user_principal_by_email(session, user_id)
     logger.error(f"user_id has unexpected type: {type(user_id)}")
     return None
 
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_async_session),
-) -> User | None:
-    """Dependency to extract and validate a JWT token from the request and fetch the current user from the database.
+    session: AsyncSession = Depends(get_db),
+) -> UserPrincipal | None:
+    """Dependency to extract and validate a JWT token and resolve the current principal.
+
+    The principal is an immutable snapshot served from the principal cache, so a
+    cache hit costs no database round trip. Use get_current_user_entity when the
+    full ORM entity is required.
 
     Parameters
     ----------
@@ -478,7 +477,7 @@ async def get_current_user(
 
     Returns
     -------
-        User: The authenticated and active user instance.
+        UserPrincipal: The authenticated and active principal.
 
     Raises
     ------
@@ -490,7 +489,7 @@ async def get_current_user(
     settings = get_settings()
     if not settings.auth_enabled:
         logger.warning("Authentication is DISABLED! Returning development admin user.")
-        return _get_dev_admin_user()
+        return UserPrincipal.from_user(_get_dev_admin_user())
     user_id = None
     role = None
     try:
@@ -513,10 +512,10 @@ async def get_current_user(
             err,
         )
     # Support both int and str (email) user_id
-    user = None
+    principal = None
     if user_id is not None:
-        user = await _resolve_user_from_id(session, user_id)
-    if not user or not user.is_active or user.is_deleted:
+        principal = await _resolve_principal(session, user_id)
+    if not principal or not principal.is_active or principal.is_deleted:
         logger.error(f"User not found or inactive/deleted: user_id={user_id}")
         http_error(
             status.HTTP_401_UNAUTHORIZED,
@@ -526,17 +525,45 @@ async def get_current_user(
         # mypy: unreachable after http_error, but needed for type checkers
         return None
     # Attach role from JWT if present
-    if user is not None and role:
-        user.role = role
-    if user is not None:
-        logger.info(f"User authenticated: user_id={user_id}, role={role}")
+    if role:
+        principal = dataclasses.replace(principal, is_admin=role == "admin")
+    # Audit events recorded during this request are attributed to this user
+    current_user_id_ctx_var.set(principal.id)
+    logger.debug("User authenticated: user_id={}, role={}", user_id, role)
+    return principal
+
+
+async def get_current_user_entity(
+    principal: UserPrincipal | None = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+) -> User:
+    """Dependency that loads the full User entity for the authenticated principal.
+
+    Only routes that need profile fields should depend on this; authentication
+    itself is served by get_current_user without loading the entity.
+
+    Raises
+    ------
+        HTTPException(401): If the user disappeared since the principal was cached.
+
+    """
+    if not get_settings().auth_enabled:
+        return _get_dev_admin_user()
+    user = await get_user_by_id(session, principal.id) if principal else None
+    if user is None or not user.is_active or user.is_deleted:
+        http_error(
+            status.HTTP_401_UNAUTHORIZED,
+            "User not found or inactive",
+            logger.warning,
+        )
+        raise RuntimeError("unreachable after http_error")
     return user
 
 
 async def optional_get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_async_session),
-) -> User | None:
+    session: AsyncSession = Depends(get_db),
+) -> UserPrincipal | None:
     """Like get_current_user, but returns None instead of raising if token is invalid/missing.
 
     Parameters
@@ -546,14 +573,14 @@ async def optional_get_current_user(
 
     Returns
     -------
-        User | None: The authenticated user, or None if not authenticated.
+        UserPrincipal | None: The authenticated principal, or None if not authenticated.
     Usage:
         user = Depends(optional_get_current_user)
 
     """
     settings = get_settings()
     if not settings.auth_enabled:
-        return _get_dev_admin_user()
+        return UserPrincipal.from_user(_get_dev_admin_user())
     try:
         payload = verify_access_token(
             token,
@@ -562,60 +589,54 @@ async def optional_get_current_user(
         if user_id_raw is None:
             return None
         user_id = int(user_id_raw)
-        user = await get_user_by_id(session, user_id)
-        if not user or not user.is_active or user.is_deleted:
+        principal = await get_user_principal(session, user_id)
+        if not principal or not principal.is_active or principal.is_deleted:
             return None
-        return user
+        return principal
     except Exception:
         return None
 
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dependency that provides a SQLAlchemy AsyncSession for database operations.
+async def get_unit_of_work(
+    request: Request,
+    session: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[UnitOfWork, None]:
+    """Dependency that wraps the request's session in a unit of work.
 
-    Yields:
-        AsyncSession: SQLAlchemy async session for DB operations.
+    Installed on the API routers, so every endpoint shares one transaction:
+    it commits once after the endpoint returns, or rolls back if it raises.
+    Endpoints that need an explicit savepoint can ask for the unit of work.
+    GET and HEAD requests may serve their replica-safe reads from a replica.
+    Pool hold time is attributed to the request's route template.
 
-    Raises:
-        HTTPException(500): If database session cannot be established or used.
     Usage:
-        async def endpoint(db: AsyncSession = Depends(get_db)):
-            ...
+        async def endpoint(uow: UnitOfWork = Depends(get_unit_of_work)):
+            async with uow.savepoint():
+                ...
 
     """
-    from src.core.database import AsyncSessionLocal, ensure_engine_initialized
-
-    # Extra safety: ensure AsyncSessionLocal is initialized
-    if AsyncSessionLocal is None:
-        ensure_engine_initialized()
-    if AsyncSessionLocal is None:
-        # Defensive: if still None, raise error
-        raise RuntimeError("AsyncSessionLocal is not initialized.")
-    session = AsyncSessionLocal()
-    logger.info("Database session created.")
-    try:
-        yield session
-    except Exception as exc:
-        logger.error(f"Database session error: {exc}")
-        await session.rollback()
-        raise  # Let FastAPI handle the exception properly
-    finally:
-        await session.close()
-        logger.info("Database session closed.")
+    route = request.scope.get("route")
+    pool_route_ctx_var.set(
+        f"{request.method} {getattr(route, 'path', request.url.path)}"
+    )
+    if request.method in ("GET", "HEAD"):
+        allow_replica_reads(session)
+    async with UnitOfWork(session) as uow:
+        yield uow
 
 
 async def get_current_active_user(
-    user: User | None = Depends(get_current_user),
-) -> User | None:
+    user: UserPrincipal | None = Depends(get_current_user),
+) -> UserPrincipal | None:
     """Dependency to ensure the current user is active.
 
     Parameters
     ----------
-        user (User): The user instance from get_current_user.
+        user (UserPrincipal): The principal from get_current_user.
 
     Returns
     -------
-        User: The active user instance.
+        UserPrincipal: The active principal.
 
     Raises
     ------
@@ -634,7 +655,7 @@ async def get_current_active_user(
             logger.warning,
         )
         raise RuntimeError("unreachable after http_error")  # for type checkers
-    logger.info(f"Active user check passed: user_id={user.id if user else None}")
+    logger.debug("Active user check passed: user_id={}", user.id if user else None)
     return user
 
 
@@ -765,9 +786,9 @@ def require_api_key(api_key: str | None = Header(None, alias="X-API-Key")) -> No
 # Updated get_current_user that requires API key
 async def get_current_user_with_api_key(
     token: str = Depends(oauth2_scheme),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_db),
     _: None = Depends(require_api_key),
-) -> User:
+) -> UserPrincipal:
     """Like get_current_user, but also requires a valid API key.
     This function should be used for endpoints that require both
     JWT authentication and API key validation.
@@ -785,7 +806,9 @@ async def get_current_user_with_api_key(
     return user
 
 
-def require_admin(current_user: User = Depends(get_current_active_user)) -> User:
+def require_admin(
+    current_user: UserPrincipal = Depends(get_current_active_user),
+) -> UserPrincipal:
     """Dependency that ensures the current user is an admin.
     Raises 403 if not.
     """
@@ -857,8 +880,8 @@ def require_api_key_for_exports(
 
 async def get_current_user_with_export_api_key(
     request: Request,
-    session: AsyncSession = Depends(get_async_session),
-) -> User | None:
+    session: AsyncSession = Depends(get_db),
+) -> UserPrincipal | None:
     """Authentication dependency for export endpoints that respects global API key settings.
 
     When REVIEWPOINT_AUTH_ENABLED is false:
@@ -866,11 +889,11 @@ async def get_current_user_with_export_api_key(
 
     When REVIEWPOINT_AUTH_ENABLED is true and REVIEWPOINT_API_KEY_ENABLED is true:
         - Requires both valid JWT token and API key
-        - Returns the authenticated User
+        - Returns the authenticated UserPrincipal
 
     When REVIEWPOINT_AUTH_ENABLED is true and REVIEWPOINT_API_KEY_ENABLED is false:
         - Only requires JWT token (if provided)
-        - If JWT token is provided, validates it and returns User
+        - If JWT token is provided, validates it and returns UserPrincipal
         - If JWT token is invalid, raises 401 error
         - If no JWT token is provided, returns None (unauthenticated access allowed)
     """
@@ -879,7 +902,7 @@ async def get_current_user_with_export_api_key(
     # Check if authentication is disabled globally
     if not settings.auth_enabled:
         logger.warning("Authentication is DISABLED! Returning development admin user.")
-        return _get_dev_admin_user()
+        return UserPrincipal.from_user(_get_dev_admin_user())
 
     # Check JWT token first (regardless of API key setting)
     authorization = request.headers.get("Authorization")
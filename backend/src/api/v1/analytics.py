@@ -0,0 +1,151 @@
+"""
+Analytics endpoints backed by the daily/monthly rollup tables.
+
+Every endpoint reads only ``analytics_daily`` / ``analytics_monthly``; none of
+them scan ``users`` or ``files``.
+"""
+
+from datetime import UTC, date, datetime, timedelta
+from typing import Final, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import TypedDict
+
+from src.api.deps import get_db, require_admin, require_api_key, require_feature
+from src.repositories.analytics import daily_rollups, monthly_rollups
+from src.repositories.user import UserPrincipal
+
+router: Final[APIRouter] = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+Metric = Literal["signups", "logins", "uploads", "bytes_stored"]
+
+DEFAULT_DAILY_WINDOW_DAYS: Final[int] = 30
+MAX_DAILY_WINDOW_DAYS: Final[int] = 366
+
+
+class DailyPoint(TypedDict):
+    day: str
+    value: int
+
+
+class DailySeriesResponse(TypedDict):
+    metric: Metric
+    start: str
+    end: str
+    total: int
+    points: list[DailyPoint]
+
+
+class MonthlyPoint(TypedDict):
+    month: int
+    value: int
+
+
+class MonthlySeriesResponse(TypedDict):
+    metric: Metric
+    year: int
+    total: int
+    points: list[MonthlyPoint]
+
+
+@router.get(
+    "/daily",
+    summary="Daily analytics series",
+    description="""
+    Per-day values of one metric from the daily rollup table.
+
+    **Requirements:**
+    - Valid API key
+    - Feature flag 'analytics:read' must be enabled
+    - Admin privileges required
+
+    **Query Parameters:**
+    - `metric`: `signups`, `logins`, `uploads` or `bytes_stored`
+    - `start` / `end`: inclusive UTC dates (default: the last 30 days, at most 366)
+
+    Days without activity are returned with value 0. `uploads` and
+    `bytes_stored` are counted on the day a file was uploaded and go down
+    when it is deleted. Values lag behind writes by up to the write-behind
+    flush interval.
+    """,
+    responses={
+        400: {"description": "Invalid date range"},
+        401: {"description": "Invalid API key"},
+        403: {"description": "Admin access required"},
+    },
+    dependencies=[
+        Depends(require_feature("analytics:read")),
+        Depends(require_api_key),
+    ],
+)
+async def get_daily_series(
+    metric: Metric = Query(..., description="Metric to read"),
+    start: date | None = Query(None, description="First day (inclusive)"),
+    end: date | None = Query(None, description="Last day (inclusive)"),
+    session: AsyncSession = Depends(get_db),
+    _: UserPrincipal = Depends(require_admin),
+) -> DailySeriesResponse:
+    """
+    Return one point per day between start and end.
+    """
+    last: date = end or datetime.now(UTC).date()
+    first: date = start or last - timedelta(days=DEFAULT_DAILY_WINDOW_DAYS - 1)
+    if first > last:
+        raise HTTPException(status_code=400, detail="start must not be after end.")
+    if (last - first).days >= MAX_DAILY_WINDOW_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range is limited to {MAX_DAILY_WINDOW_DAYS} days.",
+        )
+    values: dict[date, int] = await daily_rollups(session, metric, first, last)
+    return {
+        "metric": metric,
+        "start": first.isoformat(),
+        "end": last.isoformat(),
+        "total": sum(values.values()),
+        "points": [{"day": d.isoformat(), "value": v} for d, v in values.items()],
+    }
+
+
+@router.get(
+    "/monthly",
+    summary="Monthly analytics series",
+    description="""
+    Per-month values of one metric for a calendar year, from the monthly rollup table.
+
+    **Requirements:**
+    - Valid API key
+    - Feature flag 'analytics:read' must be enabled
+    - Admin privileges required
+
+    **Query Parameters:**
+    - `metric`: `signups`, `logins`, `uploads` or `bytes_stored`
+    - `year`: calendar year (default: the current UTC year)
+    """,
+    responses={
+        401: {"description": "Invalid API key"},
+        403: {"description": "Admin access required"},
+    },
+    dependencies=[
+        Depends(require_feature("analytics:read")),
+        Depends(require_api_key),
+    ],
+)
+async def get_monthly_series(
+    metric: Metric = Query(..., description="Metric to read"),
+    year: int | None = Query(None, ge=1970, le=9999, description="Calendar year"),
+    session: AsyncSession = Depends(get_db),
+    _: UserPrincipal = Depends(require_admin),
+) -> MonthlySeriesResponse:
+    """
+    Return twelve monthly points for the year.
+    """
+    target: int = year or datetime.now(UTC).year
+    values: dict[int, int] = await monthly_rollups(session, metric, target)
+    return {
+        "metric": metric,
+        "year": target,
+        "total": sum(values.values()),
+        "points": [{"month": m, "value": v} for m, v in values.items()],
+    }
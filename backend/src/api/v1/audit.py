@@ -0,0 +1,244 @@
+"""
+Audit trail endpoints: paged queries, streaming export and writer stats.
+
+Every query is newest-first and keyset-paginated on ``(occurred_at, id)``.
+``start``/``end`` bounds let PostgreSQL prune the monthly ``audit_log``
+partitions.
+"""
+
+import csv
+import json
+from collections.abc import AsyncIterator
+from datetime import datetime
+from io import StringIO
+from typing import Final, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import TypedDict
+
+from src.api.deps import get_db, require_admin, require_api_key, require_feature
+from src.core.database import get_async_session
+from src.core.replicas import allow_replica_reads
+from src.repositories.audit import (
+    AuditRecord,
+    audit_stats,
+    iter_audit_events,
+    query_audit_events,
+)
+from src.repositories.user import UserPrincipal
+from src.utils.batch_queue import BatchQueueStats
+
+router: Final[APIRouter] = APIRouter(prefix="/audit", tags=["Audit"])
+
+DEFAULT_PAGE_SIZE: Final[int] = 100
+MAX_PAGE_SIZE: Final[int] = 1000
+EXPORT_COLUMNS: Final[tuple[str, ...]] = (
+    "id",
+    "occurred_at",
+    "action",
+    "entity_type",
+    "entity_id",
+    "actor_id",
+    "request_id",
+    "details",
+)
+
+
+class AuditPage(TypedDict):
+    events: list[AuditRecord]
+    next_cursor: str | None
+
+
+class AuditFilters:
+    """Query parameters shared by the list and export endpoints."""
+
+    def __init__(
+        self,
+        start: datetime | None = Query(
+            None, description="Earliest event time (inclusive, ISO 8601)"
+        ),
+        end: datetime | None = Query(
+            None, description="Latest event time (exclusive, ISO 8601)"
+        ),
+        actor_id: int | None = Query(None, description="User who performed the action"),
+        entity_type: str | None = Query(None, description="e.g. user, file"),
+        entity_id: str | None = Query(None, description="Id or filename of the entity"),
+        action: str | None = Query(None, description="e.g. user.update, auth.login"),
+    ) -> None:
+        self.start = start
+        self.end = end
+        self.actor_id = actor_id
+        self.entity_type = entity_type
+        self.entity_id = entity_id
+        self.action = action
+
+
+def _encode_cursor(record: AuditRecord) -> str:
+    return f"{record['occurred_at']}|{record['id']}"
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        at, event_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(at), event_id
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor.") from e
+
+
+@router.get(
+    "/events",
+    summary="Query the audit trail",
+    description="""
+    Audit events matching the filters, newest first.
+
+    **Requirements:**
+    - Valid API key
+    - Feature flag 'audit:read' must be enabled
+    - Admin privileges required
+
+    **Query Parameters:**
+    - `start` / `end`: time window (`end` exclusive)
+    - `actor_id`, `entity_type`, `entity_id`, `action`: exact-match filters
+    - `limit`: page size (default 100, max 1000)
+    - `cursor`: `next_cursor` from the previous page
+
+    Events become visible once the background writer has flushed them
+    (by default within 250 ms).
+    """,
+    responses={
+        400: {"description": "Invalid cursor"},
+        401: {"description": "Invalid API key"},
+        403: {"description": "Admin access required"},
+    },
+    dependencies=[
+        Depends(require_feature("audit:read")),
+        Depends(require_api_key),
+    ],
+)
+async def list_audit_events(
+    filters: AuditFilters = Depends(),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Opaque cursor for the next page"),
+    session: AsyncSession = Depends(get_db),
+    _: UserPrincipal = Depends(require_admin),
+) -> AuditPage:
+    """
+    Return one page of audit events and the cursor for the next one.
+    """
+    events: list[AuditRecord] = await query_audit_events(
+        session,
+        start=filters.start,
+        end=filters.end,
+        actor_id=filters.actor_id,
+        entity_type=filters.entity_type,
+        entity_id=filters.entity_id,
+        action=filters.action,
+        before=_decode_cursor(cursor) if cursor else None,
+        limit=limit,
+    )
+    return {
+        "events": events,
+        "next_cursor": _encode_cursor(events[-1]) if len(events) == limit else None,
+    }
+
+
+async def _export_lines(
+    filters: AuditFilters, fmt: Literal["ndjson", "csv"]
+) -> AsyncIterator[str]:
+    # The export outlives the request-scoped session, so it opens its own.
+    async with get_async_session() as session:
+        allow_replica_reads(session)
+        if fmt == "csv":
+            buffer = StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_COLUMNS)
+        async for record in iter_audit_events(
+            session,
+            start=filters.start,
+            end=filters.end,
+            actor_id=filters.actor_id,
+            entity_type=filters.entity_type,
+            entity_id=filters.entity_id,
+            action=filters.action,
+        ):
+            if fmt == "ndjson":
+                yield json.dumps(record) + "\n"
+                continue
+            writer.writerow(
+                [
+                    json.dumps(record["details"]) if c == "details" else record[c]  # type: ignore[literal-required]
+                    for c in EXPORT_COLUMNS
+                ]
+            )
+            if buffer.tell() >= 64 * 1024:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        if fmt == "csv":
+            yield buffer.getvalue()
+
+
+@router.get(
+    "/export",
+    summary="Export the audit trail",
+    description="""
+    Stream every matching audit event as NDJSON (default) or CSV, newest first.
+    Takes the same filters as `GET /audit/events`.
+
+    **Requirements:**
+    - Valid API key
+    - Feature flag 'audit:read' must be enabled
+    - Admin privileges required
+    """,
+    responses={
+        401: {"description": "Invalid API key"},
+        403: {"description": "Admin access required"},
+    },
+    dependencies=[
+        Depends(require_feature("audit:read")),
+        Depends(require_api_key),
+    ],
+)
+async def export_audit_events(
+    filters: AuditFilters = Depends(),
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="Output format"),
+    _: UserPrincipal = Depends(require_admin),
+) -> StreamingResponse:
+    """
+    Stream the audit events page by page.
+    """
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_lines(filters, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename=audit_log.{format}"},
+    )
+
+
+@router.get(
+    "/stats",
+    summary="Audit writer statistics",
+    description="""
+    Queue depth and counters of the background audit writer. A growing
+    `dropped` count means events arrive faster than they can be written, or
+    the database is rejecting them (`failed_batches`).
+
+    **Requirements:**
+    - Valid API key
+    - Feature flag 'audit:read' must be enabled
+    - Admin privileges required
+    """,
+    dependencies=[
+        Depends(require_feature("audit:read")),
+        Depends(require_api_key),
+    ],
+)
+async def get_audit_stats(
+    _: UserPrincipal = Depends(require_admin),
+) -> BatchQueueStats:
+    """
+    Return the audit queue counters for this process.
+    """
+    return audit_stats()
@@ -3,7 +3,6 @@ from datetime import UTC, datetime
 from typing import Final, cast
 
 from fastapi import APIRouter, Body, Depends, Request, status
-from jose import jwt
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import TypedDict
@@ -12,6 +11,7 @@ from src.api.deps import (
     get_async_refresh_access_token,
     get_blacklist_token,
     get_current_user,
+    get_current_user_entity,
     get_db,
     get_password_validation_error,
     get_request_id,
@@ -21,8 +21,9 @@ from src.api.deps import (
     require_api_key,
     require_feature,
 )
-from src.core.config import get_settings
+from src.core.security import decode_token_signature
 from src.models.user import User
+from src.repositories.user import UserPrincipal
 from src.schemas.auth import (
     AuthResponse,
     MessageResponse,
@@ -363,9 +364,11 @@ async def register(
         action="registration",
     )
     logger.info(
-        f"User registration attempt: {data.email}, name: {getattr(data, 'name', None)}",
+        "User registration attempt: {}, name: {}",
+        data.email,
+        getattr(data, "name", None),
     )
-    logger.debug(f"Registration payload: {data}")
+    logger.debug("Registration payload: {}", data)
     try:
         user: User = await user_service.register_user(session, data.model_dump())
         access_token: str
@@ -375,7 +378,7 @@ async def register(
             data.email,
             data.password,
         )
-        logger.info(f"User registered successfully: {user.email}")
+        logger.info("User registered successfully: {}", user.email)
         return AuthResponse(access_token=access_token, refresh_token=refresh_token)
     except UserAlreadyExistsError as e:
         http_error(
@@ -448,7 +451,7 @@ async def login(
         {"email": data.email},
         action="login",
     )
-    logger.info(f"User login attempt: {data.email}")
+    logger.info("User login attempt: {}", data.email)
     try:
         access_token: str
         refresh_token: str
@@ -457,7 +460,7 @@ async def login(
             data.email,
             data.password,
         )
-        logger.info(f"User authenticated successfully: {data.email}")
+        logger.info("User authenticated successfully: {}", data.email)
         return AuthResponse(access_token=access_token, refresh_token=refresh_token)
     except UserNotFoundError as e:
         logger.warning(f"Login failed: {data.email}")
@@ -507,7 +510,7 @@ async def login(
 )
 async def logout(
     request: Request,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
     session: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
     blacklist_token: Callable[[AsyncSession, str, datetime], Awaitable[None]] = Depends(
@@ -525,14 +528,7 @@ async def logout(
     if auth_header is not None and auth_header.lower().startswith("bearer "):
         token: str = auth_header.split(" ", 1)[1]
         try:
-            settings = get_settings()
-            if not settings.jwt_secret_key:
-                raise ValueError("JWT secret key is not configured.")
-            payload: Mapping[str, object] = jwt.decode(
-                token,
-                str(settings.jwt_secret_key),
-                algorithms=[settings.jwt_algorithm],
-            )
+            payload: Mapping[str, object] = decode_token_signature(token)
             jti: str = cast("str", payload.get("jti") or token)
             exp: int | None = cast("int | None", payload.get("exp"))
             if exp is not None:
@@ -678,7 +674,7 @@ async def request_password_reset(
         {"email": data.email},
         action="pwreset",
     )
-    logger.info(f"Password reset requested: {data.email}")
+    logger.info("Password reset requested: {}", data.email)
     try:
         user_service.get_password_reset_token(data.email)
         logger.info("pwreset_link_generated", extra={"email": data.email})
@@ -725,10 +721,10 @@ async def reset_password(
             logger.warning,
             cast("ExtraLogInfo", {"token_prefix": data.token[:8]}),
         )
-    logger.info(f"Password reset confirm attempt: {data.token[:8]}")
+    logger.info("Password reset confirm attempt: {}", data.token[:8])
     try:
         await user_service.reset_password(session, data.token, data.new_password)
-        logger.info(f"Password reset successful: {data.token[:8]}")
+        logger.info("Password reset successful: {}", data.token[:8])
         return MessageResponse(message="Password has been reset.")
     except ValidationError as e:
         http_error(
@@ -766,7 +762,7 @@ async def reset_password(
     ],
 )
 async def get_me(
-    current_user: User = Depends(get_current_user),
+    current_user: User = Depends(get_current_user_entity),
 ) -> UserProfile:
     """Returns the profile information of the currently authenticated user."""
     logger.info("Get current user info", extra={"user_id": current_user.id})
@@ -8,8 +8,11 @@ from fastapi import APIRouter, Depends, Response, status
 from typing_extensions import TypedDict
 
 from src.api.deps import get_request_id, require_api_key, require_feature
-from src.core.database import engine
+from src.core.database import get_session_stats
 from src.core.events import db_healthcheck
+from src.core.metrics import metrics as metrics_registry
+from src.core.pool_metrics import pool_telemetry
+from src.core.replicas import replica_set
 
 
 class PoolStatsDict(TypedDict, total=False):
@@ -59,10 +62,10 @@ def get_pool_stats() -> PoolStatsDict:
     """
     stats: PoolStatsDict = {}
     try:
-        from src.core.database import ensure_engine_initialized
+        from src.core import database
 
-        ensure_engine_initialized()
-        pool: object | None = getattr(engine, "pool", None)
+        database.ensure_engine_initialized()
+        pool: object | None = getattr(database.engine, "pool", None)
         if pool is not None:
             for attr in ("size", "checkedin", "checkedout", "overflow", "awaiting"):
                 val: Callable[[], int] | int | None = getattr(pool, attr, None)
@@ -291,6 +294,22 @@ async def health_check(
     - `db_pool_checkedout`: Active connections
     - `db_pool_overflow`: Overflow connections
     - `db_pool_awaiting`: Awaiting connections
+    - `db_sessions_total`: Sessions opened by `get_async_session`
+    - `db_sessions_without_connection_total`: Sessions that never checked out a connection
+    - `db_round_trips_saved_total`: Round trips avoided by lazy connection checkout
+    - `db_replica_primary_fallbacks_total`: Replica-safe reads sent to the primary
+    - `db_replica_healthy`, `db_replica_lag_seconds`, `db_replica_reads_total`: Per replica
+    - `db_pool_checkout_wait_seconds`: Histogram of checkout waits
+    - `db_pool_connection_hold_seconds_*`, `db_pool_connections_held`: Per route
+    - `db_pool_overflow_*`, `db_pool_connects_total`, `db_pool_invalidations_total`
+    - `http_requests_total`, `http_request_duration_seconds`: Per method, route template and status
+    - `http_request_bytes_total`, `http_response_bytes_total`, `http_requests_active`
+    - `websocket_connections_total`, `websocket_connections_active`, `websocket_messages_total`
+    - `http_phase_duration_seconds`: Per dependency, handler and serialization phase
+    - `upload_bytes_total`, `upload_files_total`: Accepted uploads
+
+    With `REVIEWPOINT_METRICS_MULTIPROCESS_DIR` set, the `http_*`, `websocket_*`
+    and `upload_*` metrics are summed over all workers.
 
     **Use case:**
     - Monitoring with Prometheus or similar tools
@@ -400,11 +419,13 @@ async def health_check(
 )
 def metrics() -> Response:
     """
-    Returns Prometheus-style metrics for uptime and database connection pool.
+    Returns Prometheus-style metrics for uptime, database connection pool,
+    requests, WebSockets and uploads.
     Returns:
         Response: FastAPI Response with Prometheus metrics as plain text.
     """
     pool_stats: PoolStatsDict = get_pool_stats()
+    session_stats = get_session_stats()
     uptime: float = time.time() - APP_START_TIME
     lines: list[str] = [
         f"app_uptime_seconds {uptime}",
@@ -413,5 +434,20 @@ def metrics() -> Response:
         f"db_pool_checkedout {pool_stats.get('checkedout', 0)}",
         f"db_pool_overflow {pool_stats.get('overflow', 0)}",
         f"db_pool_awaiting {pool_stats.get('awaiting', 0)}",
+        f"db_sessions_total {session_stats['sessions']}",
+        "db_sessions_without_connection_total "
+        f"{session_stats['sessions_without_connection']}",
+        f"db_round_trips_saved_total {session_stats['round_trips_saved']}",
+        f"db_replica_primary_fallbacks_total {replica_set.primary_fallbacks}",
+        *pool_telemetry.prometheus_lines(),
     ]
-    return Response("\n".join(lines), media_type="text/plain")
+    for replica in replica_set.stats():
+        label = f'{{replica="{replica["name"]}"}}'
+        lag = replica["lag_seconds"]
+        lines += [
+            f"db_replica_healthy{label} {int(replica['healthy'])}",
+            f"db_replica_lag_seconds{label} {lag if lag is not None else 'NaN'}",
+            f"db_replica_reads_total{label} {replica['reads']}",
+        ]
+    lines += metrics_registry.prometheus_lines()
+    return Response("\n".join(lines) + "\n", media_type="text/plain")
@@ -0,0 +1,165 @@
+"""
+Admin-only sampling profiles of the running worker.
+
+``GET /profiling/worker`` samples every thread of the worker that serves it
+for a few seconds and returns the profile as a download.
+``POST /profiling/tokens`` signs an ``X-Profile`` header value. Sending that
+header with one request makes ``ProfilingMiddleware`` return that request's
+profile instead of its response. See ``src/core/profiling.py``.
+"""
+
+import asyncio
+import time
+from datetime import UTC, datetime
+from typing import Final
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import TypedDict
+
+from src.api.deps import get_db, require_admin, require_api_key, require_feature
+from src.core.config import get_settings
+from src.core.profiling import (
+    ProfileFormat,
+    profile_worker,
+    profiling_lock,
+    sign_profile_token,
+)
+from src.repositories.user import UserPrincipal
+
+router: Final[APIRouter] = APIRouter(prefix="/profiling", tags=["Profiling"])
+
+MAX_TOKEN_TTL_SECONDS: Final[int] = 3600
+
+
+class ProfileTokenResponse(TypedDict):
+    header: str
+    value: str
+    method: str
+    path: str
+    expires_at: str
+
+
+@router.get(
+    "/worker",
+    summary="Sampling profile of this worker",
+    description="""
+    Samples the Python stack of every thread of the worker that serves the
+    request, for `seconds`, and returns the profile as a download.
+
+    **Requirements:**
+    - Valid API key
+    - Feature flag 'profiling:run' must be enabled
+    - Admin privileges required
+
+    **Query Parameters:**
+    - `seconds`: how long to sample, at most `REVIEWPOINT_PROFILING_MAX_SECONDS`
+    - `format`: `speedscope` (JSON for speedscope.app) or `collapsed` (for flamegraph.pl)
+    - `interval_ms`: time between samples
+    - `idle`: include threads that are waiting on a lock, a queue or the event loop
+
+    With several workers, only the worker that serves this request is profiled.
+    Only one profile runs at a time per worker.
+    """,
+    responses={
+        200: {"description": "The profile, as an attachment"},
+        400: {"description": "Profile too long"},
+        401: {"description": "Invalid API key"},
+        403: {"description": "Admin access required"},
+        409: {"description": "Another profile is running"},
+    },
+    dependencies=[
+        Depends(require_feature("profiling:run")),
+        Depends(require_api_key),
+    ],
+)
+async def profile_this_worker(
+    seconds: float = Query(10.0, gt=0, description="Sampling time in seconds"),
+    report_format: ProfileFormat = Query(
+        "speedscope", alias="format", description="Report format"
+    ),
+    interval_ms: int = Query(10, ge=1, le=1000, description="Sampling interval"),
+    idle: bool = Query(False, description="Include waiting threads"),
+    session: AsyncSession = Depends(get_db),
+    _: UserPrincipal = Depends(require_admin),
+) -> Response:
+    """
+    Sample this worker and return the profile.
+    """
+    max_seconds: int = getattr(get_settings(), "profiling_max_seconds", 60)
+    if seconds > max_seconds:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Profiles are limited to {max_seconds} seconds.",
+        )
+    if not profiling_lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="Another profile is running.")
+    try:
+        # Give back the connection the admin check used while we sample.
+        await session.close()
+        profile = await asyncio.to_thread(
+            profile_worker, seconds, interval_ms / 1000, idle
+        )
+    finally:
+        profiling_lock.release()
+    body, media_type, extension = profile.render(report_format)
+    return Response(
+        content=body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="worker-{int(time.time())}.{extension}"'
+            )
+        },
+    )
+
+
+@router.post(
+    "/tokens",
+    summary="Sign a per-request profiling header",
+    description="""
+    Returns an `X-Profile` header value for one method and path. A request
+    that sends it gets its sampling profile as a download instead of its
+    response, with the handler's status in `X-Profiled-Status`. Send
+    `X-Profile-Format: collapsed` for collapsed stacks.
+
+    **Requirements:**
+    - Valid API key
+    - Feature flag 'profiling:run' must be enabled
+    - Admin privileges required
+    - `REVIEWPOINT_PROFILING_SECRET` configured (the same on every worker)
+    """,
+    responses={
+        401: {"description": "Invalid API key"},
+        403: {"description": "Admin access required"},
+        503: {"description": "Per-request profiling is not configured"},
+    },
+    dependencies=[
+        Depends(require_feature("profiling:run")),
+        Depends(require_api_key),
+    ],
+)
+async def create_profile_token(
+    path: str = Query(..., description="Request path, e.g. /api/v1/uploads"),
+    method: str = Query("GET", description="HTTP method"),
+    ttl_seconds: int = Query(
+        300, ge=1, le=MAX_TOKEN_TTL_SECONDS, description="Validity in seconds"
+    ),
+    _: UserPrincipal = Depends(require_admin),
+) -> ProfileTokenResponse:
+    """
+    Sign an X-Profile token for the method and path.
+    """
+    secret: str | None = getattr(get_settings(), "profiling_secret", None)
+    if not secret:
+        raise HTTPException(
+            status_code=503, detail="Per-request profiling is not configured."
+        )
+    expires: int = int(time.time()) + ttl_seconds
+    return {
+        "header": "X-Profile",
+        "value": sign_profile_token(secret, method, path, expires),
+        "method": method.upper(),
+        "path": path,
+        "expires_at": datetime.fromtimestamp(expires, UTC).isoformat(),
+    }
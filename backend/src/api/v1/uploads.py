@@ -1,4 +1,3 @@
-import asyncio
 import csv
 import logging
 from collections.abc import Iterator, Mapping, Sequence
@@ -23,9 +22,10 @@ from fastapi import (
 from fastapi import (
     File as FastAPIFile,  # Renamed to avoid conflict
 )
-from fastapi.responses import StreamingResponse
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from loguru import logger
 from pydantic import BaseModel, ConfigDict
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import TypedDict
 
@@ -33,25 +33,32 @@ from src.api.deps import (
     get_current_user_with_api_key as get_current_user,
 )
 from src.api.deps import (
+    get_db,
     get_request_id,
+    get_unit_of_work,
     pagination_params,
     require_api_key,
     require_feature,
 )
-from src.core.database import get_async_session
+from src.core.metrics import metrics
+from src.core.unit_of_work import UnitOfWork
 from src.models.file import File as DBFile  # Renamed to avoid conflict
-from src.models.user import User
 from src.repositories.file import (
     bulk_delete_files,
     create_file,
     delete_file,
     get_file_by_filename,
 )
-from src.repositories.file import (
-    list_files as repo_list_files,
+from src.repositories.read_models import (
+    FILE_FIELDS,
+    FileListItem,
+    get_file_item,
+    list_file_items,
 )
+from src.repositories.user import UserPrincipal
 from src.utils.datetime import parse_flexible_datetime
 from src.utils.file import is_safe_filename, sanitize_filename
+from src.utils.filters import parse_sparse_fieldset
 from src.utils.http_error import ExtraLogInfo, http_error
 
 # --- TypedDicts for strict typing ---
@@ -72,6 +79,8 @@ ROUTER_PREFIX: Final[Literal["/uploads"]] = "/uploads"
 ROUTER_TAGS: Final[Sequence[Literal["File"]]] = ("File",)
 FileInDB: type = DBFile
 router: APIRouter = APIRouter(prefix=ROUTER_PREFIX, tags=list(ROUTER_TAGS))
+upload_bytes = metrics.counter("upload_bytes_total", "Bytes of accepted uploads")
+upload_files = metrics.counter("upload_files_total", "Accepted uploads")
 
 # ----------------------------------------
 # DATA MODELS - MUST BE DEFINED BEFORE ROUTES
@@ -169,6 +178,17 @@ def ensure_nonempty_filename(file: UploadFile = FastAPIFile(...)) -> UploadFile:
     return file
 
 
+def _parse_file_fields(raw: str | None) -> tuple[str, ...] | None:
+    """Parse ``fields[files]``; unknown field names are a 400."""
+    try:
+        return parse_sparse_fieldset(raw, FILE_FIELDS, required=("filename",))
+    except ValueError as e:
+        http_error(
+            400, str(e), logger.warning, cast(ExtraLogInfo, {"fields": raw or ""}), e
+        )
+    return None
+
+
 _log_msg_router: Final[str] = "Creating uploads router with export routes first"
 logging.warning(_log_msg_router)
 
@@ -308,7 +328,7 @@ async def export_alive() -> Mapping[str, str]:
     },
 )
 async def export_test(
-    current_user: User | None = Depends(get_current_user),
+    current_user: UserPrincipal | None = Depends(get_current_user),
 ) -> Mapping[str, str]:
     logging.warning(
         f"UPLOADS EXPORT-TEST CALLED with user_id={current_user.id if current_user else 'None'}"
@@ -439,8 +459,8 @@ async def export_test(
     },
 )
 async def export_files_csv(
-    session: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     params: object = Depends(pagination_params),
     q: str | None = Query(None, description="Search by filename (partial match)"),
     sort: Literal["created_at", "filename"] = Query(
@@ -471,20 +491,17 @@ async def export_files_csv(
         HTTPException: If date parsing fails.
     """
     logging.info(
-        f"UPLOADS EXPORT CALLED with user_id={getattr(current_user, 'id', None)}"
+        "UPLOADS EXPORT CALLED with user_id=%s", getattr(current_user, "id", None)
     )
 
-    def _generate_csv(files: Sequence[DBFile], columns: Sequence[str]) -> Iterator[str]:
+    def _generate_csv(
+        files: Sequence[FileListItem], columns: Sequence[str]
+    ) -> Iterator[str]:
         output: StringIO = StringIO()
         writer = csv.writer(output)
         writer.writerow(columns)
         for f in files:
-            row: list[str] = []
-            if "filename" in columns:
-                row.append(f.filename)
-            if "url" in columns:
-                row.append(f"/uploads/{f.filename}")
-            writer.writerow(row)
+            writer.writerow([f.get(c) for c in columns])
         yield output.getvalue()
 
     created_after_dt: datetime | None
@@ -515,9 +532,17 @@ async def export_files_csv(
             cast(ExtraLogInfo, {"created_before": created_before or ""}),
             e,
         )
-    files: Sequence[DBFile]
+    columns: list[str] = ["filename", "url"]
+    if fields:
+        requested: list[str] = [
+            f.strip() for f in fields.split(",") if f.strip() in columns
+        ]
+        if requested:
+            columns = requested
+    # Only the columns backing the exported fields are read.
+    files: list[FileListItem]
     _total: int
-    files, _total = await repo_list_files(
+    files, _total = await list_file_items(
         session,
         current_user.id,
         offset=getattr(params, "offset", 0),
@@ -527,14 +552,8 @@ async def export_files_csv(
         order=order,
         created_after=created_after_dt,
         created_before=created_before_dt,
+        fields=columns,
     )
-    columns: list[str] = ["filename", "url"]
-    if fields:
-        requested: list[str] = [
-            f.strip() for f in fields.split(",") if f.strip() in columns
-        ]
-        if requested:
-            columns = requested
     return StreamingResponse(
         _generate_csv(files, columns),
         media_type="text/csv",
@@ -748,8 +767,9 @@ async def upload_file(
     file: UploadFile = FastAPIFile(
         ..., description="The file to upload. Must be a valid file type."
     ),
-    session: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+    uow: UnitOfWork = Depends(get_unit_of_work),
+    current_user: UserPrincipal = Depends(get_current_user),
     request_id: str = Depends(get_request_id),
     feature_flag_ok: bool = Depends(require_feature("uploads:upload")),
     api_key_ok: None = Depends(require_api_key),
@@ -799,92 +819,38 @@ async def upload_file(
             f"Filename sanitized from '{original_filename}' to '{safe_filename}'"
         )
 
-    max_retries: Final[int] = 3
-    last_exception: Exception | None = None
-
-    for attempt in range(max_retries):
-        try:
-            # Create a new session for each attempt to avoid SQLAlchemy IllegalStateChangeError
-            async with session.begin_nested():
-                db_file: DBFile = await create_file(
-                    session,
-                    file.filename,
-                    file.content_type or "application/octet-stream",
-                    user_id=current_user.id,
-                    size=file_size,
-                )
-
-            await session.commit()
-            return FileUploadResponse(
-                filename=db_file.filename, url=f"/uploads/{db_file.filename}"
-            )
-        except Exception as e:
-            last_exception = e
-            try:
-                await session.rollback()
-            except Exception as rollback_error:
-                logging.error(f"Error during session rollback: {rollback_error}")
-            error_str: str = str(e).lower()
-
-            if attempt < max_retries - 1 and (
-                "database is locked" in error_str
-                or "unique constraint failed" in error_str
-                or "illegal state change" in error_str
-            ):
-                wait_time: float = 0.1 * (2**attempt)
-                await asyncio.sleep(wait_time)
-                continue
-
-            if "unique constraint failed" in error_str:
-                http_error(
-                    409,
-                    "File with same name already exists or concurrent upload conflict",
-                    logger.warning,
-                    cast(
-                        ExtraLogInfo,
-                        {
-                            "filename": (
-                                file.filename if file.filename is not None else ""
-                            )
-                        },
-                    ),
-                    e,
-                )
-
-            logging.error(f"Failed to upload file on attempt {attempt+1}: {str(e)}")
-
-    if last_exception:
-        if "illegal state change" in str(last_exception).lower():
-            http_error(
-                500,
-                "Database concurrency conflict. Please try again.",
-                logger.error,
-                cast(
-                    ExtraLogInfo,
-                    {"filename": file.filename if file.filename is not None else ""},
-                ),
-                last_exception,
+    try:
+        # A failure only rolls back this savepoint; the request's unit of
+        # work commits the upload.
+        async with uow.savepoint():
+            db_file: DBFile = await create_file(
+                session,
+                file.filename,
+                file.content_type or "application/octet-stream",
+                user_id=current_user.id,
+                size=file_size,
             )
+        upload_files.inc()
+        upload_bytes.inc(amount=file_size)
+        return FileUploadResponse(
+            filename=db_file.filename, url=f"/uploads/{db_file.filename}"
+        )
+    except IntegrityError as e:
+        http_error(
+            409,
+            "File with same name already exists",
+            logger.warning,
+            cast(ExtraLogInfo, {"filename": file.filename}),
+            e,
+        )
+    except Exception as e:
         http_error(
             500,
-            f"Failed to upload file: {str(last_exception)}",
+            f"Failed to upload file: {str(e)}",
             logger.error,
-            cast(
-                ExtraLogInfo,
-                {"filename": file.filename if file.filename is not None else ""},
-            ),
-            last_exception,
+            cast(ExtraLogInfo, {"filename": file.filename}),
+            e,
         )
-    http_error(
-        500,
-        "Failed to upload file after multiple retries",
-        logger.error,
-        cast(
-            ExtraLogInfo,
-            {"filename": file.filename if file.filename is not None else ""},
-        ),
-    )
-
     # Defensive: static type checkers require a return, but this is unreachable
     raise RuntimeError(
         "Unreachable: all code paths in upload_file should raise or return"
@@ -925,8 +891,8 @@ async def upload_file(
 )
 async def bulk_delete_files_endpoint(
     request_data: BulkDeleteRequest,
-    session: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     request_id: str = Depends(get_request_id),
     feature_flag_ok: bool = Depends(require_feature("uploads:bulk_delete")),
     api_key_ok: None = Depends(require_api_key),
@@ -950,10 +916,12 @@ async def bulk_delete_files_endpoint(
         deleted, failed = await bulk_delete_files(
             session, request_data.filenames, current_user.id
         )
-        await session.commit()
+        await session.flush()
 
         logger.info(
-            f"Bulk delete completed: {len(deleted)} deleted, {len(failed)} failed",
+            "Bulk delete completed: {} deleted, {} failed",
+            len(deleted),
+            len(failed),
             extra={"user_id": current_user.id, "deleted": deleted, "failed": failed},
         )
 
@@ -1039,27 +1007,33 @@ async def bulk_delete_files_endpoint(
 )
 async def get_file(
     filename: str = Path(..., description="The name of the file to retrieve."),
-    session: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(get_current_user),
-) -> FileUploadResponse:
+    fields_files: str | None = Query(
+        None,
+        alias="fields[files]",
+        description="Sparse fieldset (JSON:API); filename is always included",
+    ),
+    session: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
+) -> Response:
     """
     Retrieves metadata for an uploaded file by filename.
     Raises:
         HTTPException: If file is not found.
     """
     logging.warning(f"GET FILE BY FILENAME CALLED: {filename}")
-    db_file: DBFile | None = await get_file_by_filename(session, filename)
-    if db_file is None:
+    selected: tuple[str, ...] = _parse_file_fields(fields_files) or (
+        "filename",
+        "url",
+    )
+    item: FileListItem | None = await get_file_item(session, filename, selected)
+    if item is None:
         http_error(
             404,
             "File not found.",
             logger.warning,
             cast(ExtraLogInfo, {"filename": filename}),
         )
-    return FileUploadResponse(
-        filename=getattr(db_file, "filename", filename),
-        url=f"/uploads/{getattr(db_file, 'filename', filename)}",
-    )
+    return ORJSONResponse(item)
 
 
 @router.delete(
@@ -1117,8 +1091,8 @@ async def get_file(
 )
 async def delete_file_by_filename(
     filename: str = Path(..., description="The name of the file to delete."),
-    session: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     request_id: str = Depends(get_request_id),
     feature_flag_ok: bool = Depends(require_feature("uploads:delete")),
     api_key_ok: None = Depends(require_api_key),
@@ -1136,7 +1110,6 @@ async def delete_file_by_filename(
             logger.warning,
             cast(ExtraLogInfo, {"filename": filename}),
         )
-    await session.commit()  # Explicitly commit the transaction
     return Response(status_code=204)
 
 
@@ -1174,8 +1147,8 @@ async def delete_file_by_filename(
 )
 async def download_file(
     filename: str = Path(..., description="The name of the file to download."),
-    session: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     request_id: str = Depends(get_request_id),
     feature_flag_ok: bool = Depends(require_feature("uploads:download")),
     api_key_ok: None = Depends(require_api_key),
@@ -1271,7 +1244,10 @@ async def catch_all_uploads(path: str, request: Request) -> Response:
     **Notes:**
     - Supports filtering by filename and creation date.
     - Supports sorting by creation date or filename.
-    - Supports field selection to limit the returned data.
+    - Supports field selection to limit the returned data: `fields[files]=size`
+      (JSON:API sparse fieldset, `filename` always included, unknown names are
+      a 400) or the older `fields=filename,size`. Only the selected columns
+      are read from the database.
     """,
     response_model=FileListResponse,
     responses={
@@ -1305,8 +1281,8 @@ async def catch_all_uploads(path: str, request: Request) -> Response:
 )
 async def list_files(
     params: object = Depends(pagination_params),
-    session: AsyncSession = Depends(get_async_session),
-    current_user: User = Depends(get_current_user),
+    session: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(get_current_user),
     request_id: str = Depends(get_request_id),
     feature_flag_ok: bool = Depends(require_feature("uploads:list")),
     api_key_ok: None = Depends(require_api_key),
@@ -1314,6 +1290,11 @@ async def list_files(
     fields: str | None = Query(
         None, description="Comma-separated list of fields to include"
     ),
+    fields_files: str | None = Query(
+        None,
+        alias="fields[files]",
+        description="Sparse fieldset (JSON:API); filename is always included",
+    ),
     sort: Literal["created_at", "filename"] = Query(
         "created_at", description="Field to sort by"
     ),
@@ -1326,7 +1307,7 @@ async def list_files(
     created_before: str | None = Query(
         None, description="Filter by creation date (ISO format)"
     ),
-) -> FileListResponse:
+) -> Response:
     """
     List all uploaded files with pagination and filtering options.
     Raises:
@@ -1338,9 +1319,16 @@ async def list_files(
         created_after_dt = parse_flexible_datetime(created_after)
     if created_before:
         created_before_dt = parse_flexible_datetime(created_before)
-    files: Sequence[DBFile]
+    # Read-model fast path: only the requested columns are selected and rows
+    # come back as plain dicts, skipping ORM and pydantic per row.
+    selected: tuple[str, ...] | None = _parse_file_fields(fields_files)
+    if selected is None and fields:
+        # Legacy ``fields``: exactly the named fields, unknown names ignored.
+        named: set[str] = {n.strip() for n in fields.split(",")}
+        selected = tuple(f for f in FILE_FIELDS if f in named) or None
+    items: list[FileListItem]
     total: int
-    files, total = await repo_list_files(
+    items, total = await list_file_items(
         session,
         current_user.id,
         offset=getattr(params, "offset", 0),
@@ -1350,36 +1338,6 @@ async def list_files(
         order=order,
         created_after=created_after_dt,
         created_before=created_before_dt,
+        fields=selected,
     )
-
-    selected_fields: Sequence[str] | None = None
-    if fields:
-        selected_fields = [f.strip() for f in fields.split(",")]
-
-    file_responses: list[FileDict] = []
-    for file in files:
-        file_data: FileDict = {
-            "filename": file.filename,
-            "url": f"/uploads/{file.filename}",
-        }
-
-        # Add additional fields if requested or no field selection
-        if not selected_fields or "content_type" in selected_fields:
-            file_data["content_type"] = file.content_type
-        if not selected_fields or "size" in selected_fields:
-            file_data["size"] = file.size
-        if not selected_fields or "created_at" in selected_fields:
-            file_data["created_at"] = (
-                file.created_at.isoformat() if file.created_at else None
-            )
-
-        if selected_fields:
-            # Use cast to FileDict for type safety
-            # Always include filename as it's the primary identifier
-            file_data = cast(
-                FileDict,
-                {k: v for k, v in file_data.items() if k in selected_fields},
-            )
-        file_responses.append(file_data)
-
-    return FileListResponse(files=file_responses, total=total)
+    return ORJSONResponse({"files": items, "total": total})
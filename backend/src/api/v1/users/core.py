@@ -15,18 +15,21 @@ from fastapi import (
     Response,
     status,
 )
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.deps import (
     PaginationParams,
+    get_db,
     get_user_service,
     pagination_params,
     require_admin,
     require_api_key,
     require_feature,
 )
-from src.core.database import get_async_session
+from src.repositories.read_models import USER_FIELDS, UserListItem
+from src.repositories.user import UserPrincipal
 from src.schemas.user import UserCreateRequest, UserListResponse
 from src.schemas.user import UserProfile as UserResponse
 from src.services.user import (
@@ -36,11 +39,20 @@ from src.services.user import (
     UserService,
 )
 from src.utils.errors import ValidationError as CustomValidationError
+from src.utils.filters import parse_sparse_fieldset
 from src.utils.http_error import ExtraLogInfo, http_error
 
 router: Final[APIRouter] = APIRouter()
 
 
+def _parse_user_fields(raw: str | None) -> tuple[str, ...] | None:
+    """Parse ``fields[users]``; unknown field names are a 400."""
+    try:
+        return parse_sparse_fieldset(raw, USER_FIELDS, required=("id",))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+
 @router.post(
     "",
     summary="Create a new user",
@@ -125,7 +137,7 @@ async def create_user(
             "name": "John Doe",
         },
     ),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
 ) -> UserResponse:
     """
@@ -189,6 +201,8 @@ async def create_user(
     - `email`: Filter by email address (partial match)
     - `name`: Filter by user name (partial match)
     - `created_after`: Filter users created after date (ISO format)
+    - `fields[users]`: Comma-separated fields to return, e.g. `email,name`
+      (`id` is always included; only these columns are read from the database)
 
     **Response:**
     - `users`: Array of user objects
@@ -241,6 +255,7 @@ async def create_user(
                 }
             },
         },
+        400: {"description": "Unknown field in fields[users]"},
         401: {"description": "Invalid API key"},
         403: {"description": "Admin access required"},
         500: {"description": "Internal server error"},
@@ -260,10 +275,15 @@ async def list_users(
     created_after: str | None = Query(
         None, description="Filter users created after this date (ISO format)"
     ),
-    session: AsyncSession = Depends(get_async_session),
+    fields_users: str | None = Query(
+        None,
+        alias="fields[users]",
+        description="Comma-separated fields to return (sparse fieldset; id is always included)",
+    ),
+    session: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
-    current_user: UserResponse = Depends(require_admin),
-) -> UserListResponse:
+    _: UserPrincipal = Depends(require_admin),
+) -> Response:
     """
     List users with comprehensive filtering and pagination support.
     """
@@ -275,14 +295,18 @@ async def list_users(
         from src.utils.datetime import parse_flexible_datetime
 
         created_after_dt = parse_flexible_datetime(created_after)
+    fields: tuple[str, ...] | None = _parse_user_fields(fields_users)
 
-    users = await user_service.list_users(
+    # Read-model fast path: only the requested columns are selected and the
+    # rows are returned as plain dicts, skipping ORM and pydantic per row.
+    users: list[UserListItem] = await user_service.list_user_items(
         session,
         offset=params.offset,
         limit=params.limit,
         email=email,
         name=name,
         created_after=created_after_dt,
+        fields=fields,
     )
     logger.info(
         "users_listed",
@@ -293,21 +317,7 @@ async def list_users(
             "name": name,
         },
     )
-    return UserListResponse(
-        users=[
-            UserResponse(
-                id=u.id,
-                email=u.email,
-                name=u.name,
-                bio=u.bio,
-                avatar_url=u.avatar_url,
-                created_at=u.created_at.isoformat() if u.created_at else None,
-                updated_at=u.updated_at.isoformat() if u.updated_at else None,
-            )
-            for u in users
-        ],
-        total=len(users),
-    )
+    return ORJSONResponse({"users": users, "total": len(users)})
 
 
 @router.get(
@@ -324,8 +334,12 @@ async def list_users(
     **Path Parameters:**
     - `user_id`: Unique identifier of the user (integer)
 
+    **Query Parameters:**
+    - `fields[users]`: Comma-separated fields to return (`id` is always included)
+
     **Response:**
-    Returns complete user profile including metadata.
+    Returns complete user profile including metadata, or only the requested
+    fields when `fields[users]` is given.
 
     **Example Request:**
     ```
@@ -364,6 +378,7 @@ async def list_users(
                 }
             },
         },
+        400: {"description": "Unknown field in fields[users]"},
         401: {"description": "Invalid API key"},
         403: {"description": "Admin access required"},
         404: {"description": "User not found"},
@@ -377,34 +392,29 @@ async def list_users(
 )
 async def get_user_by_id(
     user_id: int = Path(..., description="User ID", gt=0),
-    session: AsyncSession = Depends(get_async_session),
+    fields_users: str | None = Query(
+        None,
+        alias="fields[users]",
+        description="Comma-separated fields to return (sparse fieldset; id is always included)",
+    ),
+    session: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
-    current_user: UserResponse = Depends(require_admin),
-) -> UserResponse:
+    _: UserPrincipal = Depends(require_admin),
+) -> Response:
     """
     Get detailed user information by ID with comprehensive error handling.
     """
+    fields: tuple[str, ...] | None = _parse_user_fields(fields_users)
     try:
-        user: Any = await user_service.get_user_by_id(session, user_id)
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        # Explicitly map ORM user to UserResponse
-        return UserResponse(
-            id=user.id,
-            email=user.email,
-            name=user.name,
-            bio=user.bio,
-            avatar_url=user.avatar_url,
-            created_at=user.created_at,
-            updated_at=user.updated_at,
+        user: UserListItem | None = await user_service.get_user_item(
+            session, user_id, fields=fields
         )
-    except HTTPException as exc:
-        raise exc
     except Exception as e:
         logger.error(f"Unexpected error in get_user_by_id: {e}")
         raise HTTPException(status_code=500, detail="Unexpected error.") from e
-    # Defensive: function must always return UserResponse or raise
-    raise HTTPException(status_code=500, detail="Unreachable code in get_user_by_id")
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return ORJSONResponse(user)
 
 
 @router.put(
@@ -490,9 +500,9 @@ async def update_user(
             "name": "Updated Name",
         },
     ),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(get_user_service),
-    current_user: UserResponse = Depends(require_admin),
+    _: UserPrincipal = Depends(require_admin),
 ) -> UserResponse:
     """
     Update user information with validation and conflict checking.
@@ -585,9 +595,9 @@ async def update_user(
 )
 async def delete_user(
     user_id: int = Path(..., description="User ID to delete", gt=0),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_db),
     user_service: UserService = Depends(),
-    current_user: UserResponse = Depends(require_admin),
+    _: UserPrincipal = Depends(require_admin),
 ) -> Response:
     """
     Delete user account with proper cleanup and error handling.
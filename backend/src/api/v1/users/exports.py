@@ -11,10 +11,9 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import TypedDict
 
-from src.api.deps import get_current_user_with_export_api_key, require_feature
-from src.core.database import get_async_session
+from src.api.deps import get_current_user_with_export_api_key, get_db, require_feature
 from src.models.user import User
-from src.repositories.user import list_users
+from src.repositories.user import UserPrincipal, list_users
 
 router: Final[APIRouter] = APIRouter()
 
@@ -90,8 +89,8 @@ CSV_EXPORT_FILENAME: Final[Literal["users_export.csv"]] = "users_export.csv"
     ],
 )
 async def export_users_csv(
-    session: AsyncSession = Depends(get_async_session),
-    current_user: User | None = Depends(get_current_user_with_export_api_key),
+    session: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal | None = Depends(get_current_user_with_export_api_key),
     email: str | None = Query(None, description="Filter by specific email address"),
     format: str | None = Query("csv", description="Export format (only csv supported)"),
 ) -> Response:
@@ -264,8 +263,8 @@ CSV_FULL_EXPORT_FILENAME: Final[Literal["users_full_export.csv"]] = (
     ],
 )
 async def export_users_full_csv(
-    session: AsyncSession = Depends(get_async_session),
-    current_user: User | None = Depends(get_current_user_with_export_api_key),
+    session: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal | None = Depends(get_current_user_with_export_api_key),
 ) -> Response:
     """
     Export comprehensive user data as CSV with all available fields.
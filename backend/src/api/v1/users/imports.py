@@ -0,0 +1,144 @@
+"""
+User import endpoint: streaming CSV / NDJSON bulk import.
+"""
+
+from typing import Final
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.deps import get_db, require_admin, require_api_key, require_feature
+from src.api.v1.websocket import broadcast_system_notification
+from src.repositories.user import UserPrincipal
+from src.services.user_import import (
+    IMPORT_FORMATS,
+    ImportFormat,
+    ImportReport,
+    ImportReportDict,
+    import_users,
+)
+
+router: Final[APIRouter] = APIRouter()
+
+# Content types accepted when no ``format`` query parameter is given.
+IMPORT_CONTENT_TYPES: Final[dict[str, ImportFormat]] = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+}
+
+
+def _import_format(request: Request, fmt: str | None) -> ImportFormat:
+    if fmt is not None:
+        if fmt in IMPORT_FORMATS:
+            return fmt  # type: ignore[return-value]
+        raise HTTPException(
+            status_code=400, detail="Unsupported format. Use 'csv' or 'ndjson'."
+        )
+    content_type: str = request.headers.get("content-type", "").split(";")[0]
+    detected: ImportFormat | None = IMPORT_CONTENT_TYPES.get(
+        content_type.strip().lower()
+    )
+    if detected is None:
+        raise HTTPException(
+            status_code=415,
+            detail="Send text/csv or application/x-ndjson, or pass ?format=.",
+        )
+    return detected
+
+
+@router.post(
+    "/import",
+    summary="Bulk import users from CSV or NDJSON",
+    description="""
+    Stream a CSV or NDJSON file of users into the database.
+
+    **Requirements:**
+    - Valid API key
+    - Feature flag 'users:import' must be enabled
+    - Admin privileges required
+
+    **Request Body:**
+    The raw file (not multipart). Columns / keys:
+    - `email` (required)
+    - `password` (required, initial password, hashed on import)
+    - `name` (optional)
+    - `is_active` (optional, default true)
+
+    **Query Parameters:**
+    - `format`: `csv` or `ndjson`; defaults to the request Content-Type
+
+    **Behavior:**
+    - Rows are processed in batches; each batch is committed separately
+    - Existing emails are skipped, not updated
+    - Invalid rows are reported and do not stop the import
+    - After every batch the caller receives a `system.notification` progress
+      message on their WebSocket connections
+
+    **Response:** totals plus a per-row error report (first 1000 errors).
+    """,
+    responses={
+        200: {
+            "description": "Import finished",
+            "content": {
+                "application/json": {
+                    "example": {
+                        "total": 3,
+                        "created": 1,
+                        "skipped": 1,
+                        "failed": 1,
+                        "errors": [
+                            {
+                                "row": 2,
+                                "email": "taken@example.com",
+                                "error": "Email already exists.",
+                            },
+                            {
+                                "row": 3,
+                                "email": "not-an-email",
+                                "error": "Invalid email format.",
+                            },
+                        ],
+                        "errors_truncated": False,
+                    }
+                }
+            },
+        },
+        400: {"description": "Unsupported format"},
+        401: {"description": "Invalid API key"},
+        403: {"description": "Admin access required"},
+        415: {"description": "Unsupported content type"},
+    },
+    tags=["User Management"],
+    dependencies=[
+        Depends(require_feature("users:import")),
+        Depends(require_api_key),
+    ],
+)
+async def import_users_endpoint(
+    request: Request,
+    format: str | None = Query(None, description="Import format: csv or ndjson"),
+    session: AsyncSession = Depends(get_db),
+    current_user: UserPrincipal = Depends(require_admin),
+) -> ImportReportDict:
+    """
+    Import users from the streamed request body and return the row report.
+    """
+    fmt: ImportFormat = _import_format(request, format)
+    target: list[str] = [str(current_user.id)]
+
+    async def notify(report: ImportReport, done: bool) -> None:
+        await broadcast_system_notification(
+            f"User import {'finished' if done else 'in progress'}: "
+            f"{report.total} rows, {report.created} created, "
+            f"{report.skipped} skipped, {report.failed} failed",
+            level="warning" if done and report.failed else "info",
+            target_users=target,
+        )
+
+    report: ImportReport = await import_users(
+        session, request.stream(), fmt, progress=notify
+    )
+    return report.as_dict()
@@ -11,8 +11,9 @@ from sqlalchemy.engine import Result
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import TypedDict
 
-from src.core.database import get_async_session
+from src.api.deps import get_db
 from src.models.user import User
+from src.repositories.user import invalidate_user_principal
 from src.utils.environment import is_test_mode
 
 # Router instance is a constant and should not be mutated
@@ -90,7 +91,7 @@ class PromoteAdminResponse(TypedDict):
 )
 async def promote_user_to_admin_async(
     email: str = Body(..., embed=True, description="Email address of user to promote"),
-    session: AsyncSession = Depends(get_async_session),
+    session: AsyncSession = Depends(get_db),
 ) -> PromoteAdminResponse:
     """
     Promote a user to admin status - TEST ENVIRONMENT ONLY.
@@ -112,5 +113,6 @@ async def promote_user_to_admin_async(
         )
     user_obj.is_admin = True
     await session.commit()
+    await invalidate_user_principal(user_obj.id)
     response: PromoteAdminResponse = {"detail": f"User {email} promoted to admin."}
     return response
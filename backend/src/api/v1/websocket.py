@@ -10,7 +10,7 @@ import asyncio
 import contextlib
 import json
 import time
-from collections import defaultdict, deque
+from collections import defaultdict
 from datetime import UTC, datetime
 from typing import (
     Any,
@@ -34,6 +34,8 @@ from loguru import logger
 from src.api.deps import get_current_user
 from src.core.security import decode_access_token
 from src.models.user import User
+from src.repositories.user import UserPrincipal, record_ws_activity
+from src.utils.rate_limit import RateLimiterEngine, RateLimitRule
 
 router: APIRouter = APIRouter(tags=["websocket"])
 
@@ -46,6 +48,9 @@ RATE_LIMIT_WINDOW: Final[int] = 60  # seconds
 RATE_LIMIT_MAX_MESSAGES: Final[int] = 100  # per window
 MAX_TOTAL_CONNECTIONS: Final[int] = 1000
 MESSAGE_QUEUE_SIZE: Final[int] = 100
+MESSAGE_RATE_LIMIT: Final[RateLimitRule] = RateLimitRule(
+    RATE_LIMIT_MAX_MESSAGES, RATE_LIMIT_WINDOW
+)
 
 # Message validation schema
 VALID_CLIENT_MESSAGE_TYPES: Final[set[str]] = {
@@ -72,40 +77,6 @@ VALID_SUBSCRIPTION_EVENTS: Final[set[str]] = {
 }
 
 
-class RateLimiter:
-    """Rate limiting for WebSocket connections."""
-
-    def __init__(self, max_messages: int, window_seconds: int) -> None:
-        """Initialize RateLimiter with max messages and window size."""
-        self.max_messages: Final[int] = max_messages
-        self.window_seconds: Final[int] = window_seconds
-        self.user_windows: dict[str, deque[float]] = defaultdict(deque)
-
-    def is_allowed(self, user_id: str) -> bool:
-        """Check if user is within rate limits."""
-        now: float = time.time()
-        window: deque[float] = self.user_windows[user_id]
-
-        # Remove old entries outside the window
-        while window and window[0] <= now - self.window_seconds:
-            window.popleft()
-
-        # Check if user is at limit
-        if len(window) >= self.max_messages:
-            return False
-
-        # Add current request
-        window.append(now)
-        return True
-
-    def get_reset_time(self, user_id: str) -> float | None:
-        """Get when the rate limit resets for a user."""
-        window: deque[float] = self.user_windows[user_id]
-        if not window:
-            return None
-        return window[0] + self.window_seconds
-
-
 class ConnectionInfo:
     """Information about a WebSocket connection."""
 
@@ -131,6 +102,21 @@ class ConnectionInfo:
         """Update last activity timestamp."""
         self.last_activity = datetime.now(UTC)
 
+    def count_message(self) -> None:
+        """Count a received message and queue it for persistence."""
+        self.message_count += 1
+        self._persist(messages=1)
+
+    def count_error(self) -> None:
+        """Count a message handling error and queue it for persistence."""
+        self.error_count += 1
+        self._persist(errors=1)
+
+    def _persist(self, messages: int = 0, errors: int = 0) -> None:
+        user_id: object = getattr(self.user, "id", None)
+        if isinstance(user_id, int):
+            record_ws_activity(user_id, messages=messages, errors=errors)
+
     def update_heartbeat(self) -> None:
         """Update last heartbeat timestamp."""
         self.last_heartbeat = datetime.now(UTC)
@@ -157,7 +143,7 @@ class WebSocketConnectionManager:
         """Initialize the WebSocketConnectionManager."""
         self.connections: dict[str, ConnectionInfo] = {}
         self.user_connections: dict[str, set[str]] = defaultdict(set)
-        self.rate_limiter = RateLimiter(RATE_LIMIT_MAX_MESSAGES, RATE_LIMIT_WINDOW)
+        self.rate_limiter: RateLimiterEngine = RateLimiterEngine()
         self._cleanup_task: asyncio.Task[None] | None = None
         self._cleanup_started: bool = False
 
@@ -316,7 +302,7 @@ class WebSocketConnectionManager:
 
         """
         if connection_id not in self.connections:
-            logger.debug(f"[WS] Connection not found: {connection_id}")
+            logger.debug("[WS] Connection not found: {}", connection_id)
             return False
 
         conn_info = self.connections[connection_id]
@@ -378,7 +364,7 @@ class WebSocketConnectionManager:
 
         """
         if user_id not in self.user_connections:
-            logger.debug(f"[WS] No active connections for user {user_id}")
+            logger.debug("[WS] No active connections for user {}", user_id)
             return 0
 
         connection_ids = list(self.user_connections[user_id])
@@ -564,8 +550,9 @@ class WebSocketConnectionManager:
         user_id = str(conn_info.user.id)
 
         # Check rate limiting
-        if not self.rate_limiter.is_allowed(user_id):
-            reset_time = self.rate_limiter.get_reset_time(user_id)
+        decision = self.rate_limiter.hit(user_id, MESSAGE_RATE_LIMIT)
+        if not decision.allowed:
+            reset_time = time.time() + decision.retry_after
             logger.warning(f"[WS] Rate limit exceeded for user {user_id}")
 
             await self.send_to_connection(
@@ -585,7 +572,7 @@ class WebSocketConnectionManager:
 
         # Update connection activity
         conn_info.update_activity()
-        conn_info.message_count += 1
+        conn_info.count_message()
 
         # Validate message type
         message_type = message.get("type")
@@ -593,7 +580,7 @@ class WebSocketConnectionManager:
             logger.warning(
                 f"[WS] Invalid message type: {message_type} from {connection_id}",
             )
-            conn_info.error_count += 1
+            conn_info.count_error()
 
             await self.send_to_connection(
                 connection_id,
@@ -626,7 +613,7 @@ class WebSocketConnectionManager:
 
         except Exception as e:
             logger.error(f"[WS] Error handling message {message_type}: {e}")
-            conn_info.error_count += 1
+            conn_info.count_error()
 
     async def _handle_ping(self, connection_id: str, message: dict[str, Any]) -> None:
         """Handle ping message and respond with pong."""
@@ -714,7 +701,7 @@ class WebSocketConnectionManager:
         conn_info = self.connections[connection_id]
         conn_info.update_heartbeat()
 
-        logger.debug(f"[WS] Heartbeat received from {connection_id}")
+        logger.debug("[WS] Heartbeat received from {}", connection_id)
 
     async def _handle_upload_cancel(
         self, connection_id: str, message: dict[str, Any]
@@ -728,7 +715,9 @@ class WebSocketConnectionManager:
 
         # Here you would implement the actual upload cancellation logic
         # For now, just log it
-        logger.info(f"[WS] Upload cancel requested: {upload_id} from {connection_id}")
+        logger.info(
+            "[WS] Upload cancel requested: {} from {}", upload_id, connection_id
+        )
 
     async def cleanup(self) -> None:
         """Cleanup manager resources."""
@@ -1247,11 +1236,11 @@ async def websocket_endpoint(websocket: WebSocket, token: str) -> None:
 
             except TimeoutError:
                 # Connection timeout - close connection
-                logger.info(f"[WS] Connection timeout for {connection_id}")
+                logger.info("[WS] Connection timeout for {}", connection_id)
                 break
 
             except WebSocketDisconnect:
-                logger.info(f"[WS] Client {connection_id} disconnected normally")
+                logger.info("[WS] Client {} disconnected normally", connection_id)
                 break
 
             except Exception as e:
@@ -1307,7 +1296,7 @@ async def websocket_endpoint(websocket: WebSocket, token: str) -> None:
     """,
 )
 async def get_websocket_stats(
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ) -> Any:
     """
     Get comprehensive WebSocket connection statistics for monitoring and
@@ -1346,7 +1335,7 @@ async def get_websocket_stats(
 )
 async def get_connection_info(
     connection_id: str,
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ) -> Any:
     """Get detailed information about a specific connection."""
     if not current_user.is_admin:
@@ -1378,7 +1367,7 @@ async def get_connection_info(
 )
 async def broadcast_message(
     message: dict[str, Any],
-    current_user: User = Depends(get_current_user),
+    current_user: UserPrincipal = Depends(get_current_user),
 ) -> Any:
     """Broadcast a message to all active connections."""
     if not current_user.is_admin:
@@ -0,0 +1,43 @@
+"""Public discovery documents served at the application root (``/.well-known``)."""
+
+from typing import Final
+
+from fastapi import APIRouter, Request, Response
+
+from src.core.config import get_settings
+from src.core.jwt_keys import get_key_ring, is_asymmetric_algorithm
+
+router: Final[APIRouter] = APIRouter(tags=["Auth"])
+
+_EMPTY_JWKS: Final[bytes] = b'{"keys":[]}'
+
+
+@router.get(
+    "/.well-known/jwks.json",
+    summary="JSON Web Key Set",
+    description=(
+        "Public keys for verifying access tokens offline. Keys are identified by "
+        "the `kid` token header; the set contains every key that may have signed "
+        "a still-valid token. Empty when tokens are HMAC-signed."
+    ),
+    responses={200: {"content": {"application/jwk-set+json": {}}}},
+)
+async def jwks(request: Request) -> Response:
+    """Serve the cached JWKS document with ETag revalidation."""
+    settings = get_settings()
+    headers: dict[str, str] = {
+        "Cache-Control": f"public, max-age={settings.jwks_cache_seconds}",
+    }
+    body: bytes = _EMPTY_JWKS
+    if is_asymmetric_algorithm(settings.jwt_algorithm):
+        ring = get_key_ring()
+        body = ring.jwks_json()
+        headers["ETag"] = ring.etag
+        if request.headers.get("if-none-match") == ring.etag:
+            return Response(status_code=304, headers=headers)
+    return Response(
+        content=body, media_type="application/jwk-set+json", headers=headers
+    )
+
+
+__all__: Final[list[str]] = ["router"]
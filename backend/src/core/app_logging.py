@@ -9,12 +9,23 @@ Repeat-safe initialiser::
 Only handlers created by this module are purged between calls; pytest-caplog &
 other third-party handlers remain, but we re-apply our formatter so captured
 output matches expectations.
+
+Performance mode (``init_logging(performance=True)``) keeps the request path
+free of log I/O: each line is queued and a background thread writes batches.
+``sample_rates`` keeps a fraction of DEBUG/INFO lines per logger.
 """
 
 from __future__ import annotations
 
+import atexit
+import math
+import threading
+from collections import deque
 from collections.abc import Mapping
-from typing import Final, Literal
+from typing import IO, TYPE_CHECKING, Final, Literal
+
+if TYPE_CHECKING:
+    from loguru import Message, Record
 
 # ──────────────────────────── colour map ────────────────────────────
 RESET: Final[str] = "\x1b[0m"
@@ -32,6 +43,140 @@ COLOR_MAP: Final[
 # attribute used to mark handlers we own
 _FLAG: Final[str] = "_rvp_internal"
 
+# Lines at or above this level (WARNING) are never sampled away.
+_SAMPLED_BELOW: Final[int] = 30
+
+
+class BatchedSink:
+    """Loguru sink that queues lines and writes them in batches.
+
+    Logging only appends the formatted line to a deque. A daemon thread
+    writes everything queued every ``flush_interval`` seconds, or as soon as
+    ``batch_size`` lines are waiting, with one ``write`` and one ``flush``.
+    If ``max_queue`` lines are already waiting the line is dropped and
+    counted, so a slow stream never blocks a request.
+    """
+
+    def __init__(
+        self,
+        stream: IO[str],
+        *,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+        max_queue: int = 100_000,
+        close_stream: bool = False,
+    ) -> None:
+        self.stream = stream
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.close_stream = close_stream
+        self.dropped = 0
+        self._lines: deque[str] = deque()
+        self._wake = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __call__(self, message: Message) -> None:
+        if self._stopping:  # after shutdown: write directly
+            self._lines.append(message)
+            self._write()
+            return
+        if len(self._lines) >= self.max_queue:
+            self.dropped += 1
+            return
+        self._lines.append(message)
+        if len(self._lines) == self.batch_size:
+            self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stopping:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._write()
+        self._write()
+
+    def _write(self) -> None:
+        batch: list[str] = []
+        while self._lines:
+            batch.append(self._lines.popleft())
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            batch.append(f"WARNING: {dropped} log lines dropped (queue full)\n")
+        if not batch:
+            return
+        try:
+            self.stream.write("".join(batch))
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass  # stream closed; nothing useful left to do
+
+    def stop(self) -> None:
+        """Write every queued line and stop the writer thread."""
+        if self._stopping:
+            return
+        self._stopping = True
+        self._wake.set()
+        self._thread.join()
+        if self.close_stream:
+            self.stream.close()
+
+
+class SampleFilter:
+    """Loguru filter keeping a fraction of DEBUG/INFO lines per logger.
+
+    ``rates`` maps a logger (module) name to the fraction to keep; the most
+    specific dotted prefix applies, so ``{"src.api": 0.1}`` also covers
+    ``src.api.deps``. Sampling is counter-based: a rate of 0.01 keeps exactly
+    every 100th line. WARNING and above always pass.
+    """
+
+    def __init__(self, rates: Mapping[str, float]) -> None:
+        self.rates = dict(rates)
+        self._resolved: dict[str, float | None] = {}
+        self._counts: dict[str, int] = {}
+
+    def _rate(self, name: str) -> float | None:
+        if name in self._resolved:
+            return self._resolved[name]
+        rate: float | None = None
+        prefix = name
+        while prefix:
+            if prefix in self.rates:
+                rate = self.rates[prefix]
+                break
+            prefix = prefix.rpartition(".")[0]
+        self._resolved[name] = rate
+        return rate
+
+    def __call__(self, record: Record) -> bool:
+        if record["level"].no >= _SAMPLED_BELOW:
+            return True
+        name = record["name"] or ""
+        rate = self._rate(name)
+        if rate is None:
+            return True
+        seen = self._counts.get(name, 0)
+        self._counts[name] = seen + 1
+        # True once every 1/rate lines, starting with the first.
+        return math.ceil((seen + 1) * rate) > math.ceil(seen * rate)
+
+
+# Sinks started by the last init_logging() call in performance mode.
+_batched_sinks: list[BatchedSink] = []
+
+
+def stop_logging() -> None:
+    """Flush and stop the batched sinks; safe to call more than once."""
+    while _batched_sinks:
+        _batched_sinks.pop().stop()
+
+
+atexit.register(stop_logging)
+
 
 def _is_testing() -> bool:
     """Check if we're currently running in a test environment."""
@@ -55,6 +200,8 @@ def init_logging(
     json_format: bool = False,
     json: bool = False,
     logfile: str | None = None,
+    performance: bool = False,
+    sample_rates: Mapping[str, float] | None = None,
 ) -> None:
     """
     Configure loguru as the main logger for the backend.
@@ -69,6 +216,10 @@ def init_logging(
         Emit JSON lines instead of human format.
     logfile : Optional[str]
         Optional file to tee logs to.
+    performance : bool
+        Write through ``BatchedSink`` queues instead of directly; no colours.
+    sample_rates : Optional[Mapping[str, float]]
+        Fraction of DEBUG/INFO lines kept per logger name (``SampleFilter``).
 
     Raises
     ------
@@ -88,15 +239,31 @@ def init_logging(
     except (ValueError, OSError):
         # Ignore errors during cleanup - handlers might already be removed
         pass
+    stop_logging()
+
+    sample_filter: SampleFilter | None = (
+        SampleFilter(sample_rates) if sample_rates else None
+    )
 
     # Console sink
+    console: IO[str] | BatchedSink = sys.stdout
+    if performance:
+        console = BatchedSink(sys.stdout)
+        _batched_sinks.append(console)
     if json or json_format:
-        loguru_logger.add(sys.stdout, level=level, serialize=True, colorize=False)
+        loguru_logger.add(
+            console,
+            level=level,
+            serialize=True,
+            colorize=False,
+            filter=sample_filter,
+        )
     else:
         loguru_logger.add(
-            sys.stdout,
+            console,
             level=level,
-            colorize=color,
+            colorize=color and not performance,
+            filter=sample_filter,
             format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan> | <level>{message}</level>",
         )
 
@@ -104,9 +271,25 @@ def init_logging(
     if logfile is not None and not _is_testing():
         fp: Path = Path(logfile)
         fp.parent.mkdir(parents=True, exist_ok=True)
-        loguru_logger.add(
-            str(fp), level=level, serialize=(json or json_format), encoding="utf-8"
-        )
+        if performance:
+            file_sink = BatchedSink(
+                fp.open("a", encoding="utf-8", buffering=1 << 16), close_stream=True
+            )
+            _batched_sinks.append(file_sink)
+            loguru_logger.add(
+                file_sink,
+                level=level,
+                serialize=(json or json_format),
+                filter=sample_filter,
+            )
+        else:
+            loguru_logger.add(
+                str(fp),
+                level=level,
+                serialize=(json or json_format),
+                encoding="utf-8",
+                filter=sample_filter,
+            )
 
     class InterceptHandler(logging.Handler):
         def emit(self, record: logging.LogRecord) -> None:
@@ -87,12 +87,123 @@ class Settings(BaseSettings):
 
     # Logging configuration
     log_level: Literal["CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG"] = "INFO"
+    log_performance_mode: bool = Field(
+        False,
+        description="Queue log lines and write them in batches from a background thread (env: REVIEWPOINT_LOG_PERFORMANCE_MODE)",
+    )
+    log_sample_rates: dict[str, float] = Field(
+        default_factory=dict,
+        description='Fraction of DEBUG/INFO lines kept per logger, e.g. {"src.api.deps": 0.01} (env: REVIEWPOINT_LOG_SAMPLE_RATES)',
+    )
+
+    # Metrics
+    metrics_multiprocess_dir: Path | None = Field(
+        None,
+        description="Directory where each worker writes its metrics for /metrics to sum; unset for one process (env: REVIEWPOINT_METRICS_MULTIPROCESS_DIR)",
+    )
+    metrics_flush_interval_seconds: float = Field(
+        5.0,
+        gt=0,
+        description="Seconds between a worker's metrics snapshot writes (env: REVIEWPOINT_METRICS_FLUSH_INTERVAL_SECONDS)",
+    )
+    server_timing_enabled: bool = Field(
+        False,
+        description="Return per-dependency and handler phase timings in Server-Timing on every response; otherwise only for requests sending X-Server-Timing with a valid API key (env: REVIEWPOINT_SERVER_TIMING_ENABLED)",
+    )
+
+    # Profiling
+    profiling_secret: str | None = Field(
+        None,
+        repr=False,
+        description="Key that signs X-Profile tokens for per-request profiles; unset disables them (env: REVIEWPOINT_PROFILING_SECRET)",
+    )
+    profiling_max_seconds: int = Field(
+        60,
+        ge=1,
+        description="Longest whole-worker sampling profile an admin can request (env: REVIEWPOINT_PROFILING_MAX_SECONDS)",
+    )
 
     # Database settings
     db_url: str | None = Field(
         default=None,
         description="Async SQLAlchemy database URL",
     )
+    db_pool_pre_ping: bool = Field(
+        True,
+        description="Test pooled connections on checkout (env: REVIEWPOINT_DB_POOL_PRE_PING)",
+    )
+    db_pool_recycle_seconds: int = Field(
+        1800,
+        ge=-1,
+        description="Replace pooled connections older than this; -1 never (env: REVIEWPOINT_DB_POOL_RECYCLE_SECONDS)",
+    )
+    db_pool_slow_checkout_ms: int = Field(
+        500,
+        ge=0,
+        description="Log the routes holding connections when a checkout waits this long (env: REVIEWPOINT_DB_POOL_SLOW_CHECKOUT_MS)",
+    )
+    db_slow_query_ms: int = Field(
+        200,
+        ge=0,
+        description="Log statements slower than this, with normalized SQL (env: REVIEWPOINT_DB_SLOW_QUERY_MS)",
+    )
+    db_n_plus_one_threshold: int = Field(
+        10,
+        ge=2,
+        description="Flag a request that runs the same statement this many times (env: REVIEWPOINT_DB_N_PLUS_ONE_THRESHOLD)",
+    )
+    db_query_cache_size: int = Field(
+        1200,
+        ge=0,
+        description="Compiled SQL statements cached per engine (env: REVIEWPOINT_DB_QUERY_CACHE_SIZE)",
+    )
+    db_prepared_statement_cache_size: int = Field(
+        256,
+        ge=0,
+        description="asyncpg prepared statements cached per connection (env: REVIEWPOINT_DB_PREPARED_STATEMENT_CACHE_SIZE)",
+    )
+    db_pgbouncer_mode: bool = Field(
+        False,
+        description="Disable prepared-statement caching for PgBouncer transaction pooling (env: REVIEWPOINT_DB_PGBOUNCER_MODE)",
+    )
+    db_replica_urls: list[str] = Field(
+        default_factory=list,
+        description="Read-replica database URLs, JSON list or comma-separated (env: REVIEWPOINT_DB_REPLICA_URLS)",
+    )
+    db_replica_max_lag_seconds: float = Field(
+        5.0,
+        ge=0,
+        description="Stop reading from a replica further behind than this (env: REVIEWPOINT_DB_REPLICA_MAX_LAG_SECONDS)",
+    )
+    db_replica_check_interval_seconds: float = Field(
+        5.0,
+        gt=0,
+        description="Seconds between replica health and lag checks (env: REVIEWPOINT_DB_REPLICA_CHECK_INTERVAL_SECONDS)",
+    )
+    db_sqlite_production: bool = Field(
+        False,
+        description="Run on a SQLite file with WAL, a reader pool and a single writer; allows SQLite in prod (env: REVIEWPOINT_DB_SQLITE_PRODUCTION)",
+    )
+    db_sqlite_readers: int = Field(
+        4,
+        ge=1,
+        description="Read connections kept open in production SQLite mode (env: REVIEWPOINT_DB_SQLITE_READERS)",
+    )
+    db_sqlite_busy_timeout_ms: int = Field(
+        5000,
+        ge=0,
+        description="How long SQLite waits for another process's write lock (env: REVIEWPOINT_DB_SQLITE_BUSY_TIMEOUT_MS)",
+    )
+    db_sqlite_mmap_size_mb: int = Field(
+        256,
+        ge=0,
+        description="Memory-mapped I/O size per SQLite connection (env: REVIEWPOINT_DB_SQLITE_MMAP_SIZE_MB)",
+    )
+    db_sqlite_cache_size_mb: int = Field(
+        64,
+        ge=1,
+        description="Page cache size per SQLite connection (env: REVIEWPOINT_DB_SQLITE_CACHE_SIZE_MB)",
+    )
 
     # Authentication settings
 
@@ -113,6 +224,18 @@ class Settings(BaseSettings):
         30,
         description="JWT expiration in minutes (env: REVIEWPOINT_JWT_EXPIRE_MINUTES)",
     )
+    jwt_keys_dir: Path | None = Field(
+        None,
+        description="Directory of <kid>.pem private keys for RS256/ES256 signing (env: REVIEWPOINT_JWT_KEYS_DIR)",
+    )
+    jwt_key_activation_seconds: int = Field(
+        300,
+        description="Seconds a newly rotated key is published before it signs tokens (env: REVIEWPOINT_JWT_KEY_ACTIVATION_SECONDS)",
+    )
+    jwks_cache_seconds: int = Field(
+        300,
+        description="Cache lifetime advertised for /.well-known/jwks.json (env: REVIEWPOINT_JWKS_CACHE_SECONDS)",
+    )
     # Backward compatibility: allow jwt_secret as alias for jwt_secret_key
     jwt_secret: str | None = Field(
         None,
@@ -127,6 +250,64 @@ class Settings(BaseSettings):
     upload_dir: Path = Path("uploads")
     max_upload_mb: int = 50
 
+    # Rate limiting
+    rate_limit_backend: Literal["memory", "redis"] = Field(
+        "memory",
+        description="Where rate limit state is kept; use redis to share limits across workers (env: REVIEWPOINT_RATE_LIMIT_BACKEND)",
+    )
+    rate_limit_redis_url: str | None = Field(
+        None,
+        repr=False,
+        description="Redis URL for the redis rate limit backend (env: REVIEWPOINT_RATE_LIMIT_REDIS_URL)",
+    )
+
+    front_door_enabled: bool = Field(
+        True,
+        description="Reject rate-limited and credential-less requests before routing (env: REVIEWPOINT_FRONT_DOOR_ENABLED)",
+    )
+    front_door_ip_limit: int = Field(
+        600,
+        description="HTTP requests per minute per client address, 0 to disable (env: REVIEWPOINT_FRONT_DOOR_IP_LIMIT)",
+    )
+    front_door_auth_limit: int = Field(
+        30,
+        description="Login/registration/token requests per minute per client address, 0 to disable (env: REVIEWPOINT_FRONT_DOOR_AUTH_LIMIT)",
+    )
+
+    # Write-behind activity (last login, WebSocket counters)
+    write_behind_flush_seconds: float = Field(
+        5.0,
+        description="Seconds between bulk flushes of buffered user activity (env: REVIEWPOINT_WRITE_BEHIND_FLUSH_SECONDS)",
+    )
+
+    # Bulk user import
+    user_import_batch_size: int = Field(
+        500,
+        description="Rows validated, hashed and loaded together by the user import pipeline (env: REVIEWPOINT_USER_IMPORT_BATCH_SIZE)",
+    )
+    user_import_hash_workers: int = Field(
+        0,
+        description="Worker processes hashing imported passwords; 0 uses the CPU count (env: REVIEWPOINT_USER_IMPORT_HASH_WORKERS)",
+    )
+
+    # Audit log writer
+    audit_queue_max_events: int = Field(
+        10000,
+        description="Audit events held in memory before new ones are dropped (env: REVIEWPOINT_AUDIT_QUEUE_MAX_EVENTS)",
+    )
+    audit_flush_batch_size: int = Field(
+        500,
+        description="Audit events written per batch; a full batch is flushed at once (env: REVIEWPOINT_AUDIT_FLUSH_BATCH_SIZE)",
+    )
+    audit_flush_interval_ms: int = Field(
+        250,
+        description="Milliseconds between audit log flushes (env: REVIEWPOINT_AUDIT_FLUSH_INTERVAL_MS)",
+    )
+    audit_partition_months_ahead: int = Field(
+        2,
+        description="Monthly audit_log partitions created ahead at startup on PostgreSQL (env: REVIEWPOINT_AUDIT_PARTITION_MONTHS_AHEAD)",
+    )
+
     # CORS settings
     allowed_origins: list[str] = []
 
@@ -189,7 +370,8 @@ class Settings(BaseSettings):
 
         Accepted schemes:
         - postgresql+asyncpg:// (production, dev)
-        - sqlite+aiosqlite:// (dev, testing)
+        - sqlite+aiosqlite:// (dev, testing, or any environment with
+          REVIEWPOINT_DB_SQLITE_PRODUCTION and a database file)
 
         :param v: The database URL string or None.
         :raises RuntimeError: If DB URL is missing in production mode.
@@ -202,6 +384,9 @@ class Settings(BaseSettings):
             or os.environ.get("REVIEWPOINT_TEST_MODE") == "1"
         )
         is_dev_mode: bool = os.environ.get("REVIEWPOINT_ENVIRONMENT") == "dev"
+        is_sqlite_production: bool = os.environ.get(
+            "REVIEWPOINT_DB_SQLITE_PRODUCTION", ""
+        ).lower() in ("1", "true", "yes", "on")
 
         if not v:
             if not is_explicit_test_mode:
@@ -211,10 +396,17 @@ class Settings(BaseSettings):
         if v.startswith("postgresql+asyncpg://"):
             return v
         if v.startswith("sqlite+aiosqlite://"):
+            if is_sqlite_production:
+                if ":memory:" in v or v.rstrip("/") == "sqlite+aiosqlite:":
+                    raise ValueError(
+                        "Production SQLite mode needs a database file, not :memory:",
+                    )
+                return v
             if is_explicit_test_mode or is_dev_mode:
                 return v
             raise ValueError(
-                "SQLite database is only allowed in dev or test environments",
+                "SQLite database is only allowed in dev or test environments "
+                "(or with REVIEWPOINT_DB_SQLITE_PRODUCTION)",
             )
         accepted_schemes: str = "postgresql+asyncpg://"
         if is_explicit_test_mode or is_dev_mode:
@@ -225,7 +417,7 @@ class Settings(BaseSettings):
         """Post-initialization adjustments for specific environments.
         - If environment is 'test', override DB URL to use SQLite in memory
         - If jwt_secret_key is not set but jwt_secret is, use it (for backward compatibility)
-        - Raise error if neither is set (only in production mode)
+        - Raise error if neither is set and no asymmetric algorithm is configured
 
         :param __context: Context object (unused).
         :raises RuntimeError: If JWT secret is missing in production mode.
@@ -247,12 +439,41 @@ class Settings(BaseSettings):
             None,
         ):
             object.__setattr__(self, "jwt_secret_key", self.jwt_secret)
-        if not getattr(self, "jwt_secret_key", None) and not is_explicit_test_mode:
+        uses_key_ring: bool = self.jwt_algorithm.upper().startswith(("RS", "ES"))
+        if (
+            not getattr(self, "jwt_secret_key", None)
+            and not uses_key_ring
+            and not is_explicit_test_mode
+        ):
             raise RuntimeError(
                 "Missing JWT secret: set REVIEWPOINT_JWT_SECRET_KEY or legacy REVIEWPOINT_JWT_SECRET.",
             )
         logger.debug("Settings initialized for environment: {}", self.environment)
 
+    @field_validator("db_replica_urls", mode="after")
+    @classmethod
+    def check_replica_schemes(cls: type[Settings], v: list[str]) -> list[str]:
+        """Replicas must use the same async drivers as the primary."""
+        for url in v:
+            if not url.startswith(("postgresql+asyncpg://", "sqlite+aiosqlite://")):
+                raise ValueError(
+                    "db_replica_urls must use postgresql+asyncpg:// or sqlite+aiosqlite://"
+                )
+        return v
+
+    @field_validator("log_sample_rates", mode="after")
+    @classmethod
+    def check_sample_rates(
+        cls: type[Settings], v: dict[str, float]
+    ) -> dict[str, float]:
+        """Sample rates are fractions of the lines to keep."""
+        for name, rate in v.items():
+            if not 0.0 <= rate <= 1.0:
+                raise ValueError(
+                    f"log_sample_rates[{name!r}] must be between 0 and 1, got {rate}"
+                )
+        return v
+
     @field_validator("upload_dir", mode="after")
     @classmethod
     def ensure_upload_dir_exists(cls: type[Settings], v: Path) -> Path:
@@ -290,7 +511,7 @@ class Settings(BaseSettings):
                 raise ValueError("email_port must be an integer") from err
         raise TypeError("email_port must be an integer or string")
 
-    @field_validator("allowed_origins", mode="before")
+    @field_validator("allowed_origins", "db_replica_urls", mode="before")
     @classmethod
     def parse_allowed_origins(cls: type[Settings], v: object) -> list[str]:
         if v is None:
@@ -310,7 +531,7 @@ class Settings(BaseSettings):
             except json.JSONDecodeError:
                 # If JSON parsing fails, split by comma
                 return [item.strip() for item in v.split(",") if item.strip()]
-        raise TypeError("allowed_origins must be a list or string")
+        raise TypeError("list settings must be a list or string")
 
     def __init__(self: Settings, **values: Any) -> None:
         super().__init__(**values)
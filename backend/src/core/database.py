@@ -3,12 +3,13 @@ from __future__ import annotations
 import os
 import threading
 import time
+import uuid
 from collections.abc import AsyncGenerator
 from contextlib import asynccontextmanager
 from typing import Final
 
 from loguru import logger
-from sqlalchemy import text
+from sqlalchemy import Connection, event, text
 from sqlalchemy.engine.url import URL, make_url
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.ext.asyncio import (
@@ -17,15 +18,23 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from sqlalchemy.orm import Session, SessionTransaction
 from typing_extensions import TypedDict
 
+from src.core import query_metrics
 from src.core.config import get_settings
+from src.core.pool_metrics import TimedAsyncAdaptedQueuePool, pool_telemetry
+from src.core.replicas import RoutingSession, replica_set
+from src.core.sqlite import SQLiteSession, create_sqlite_engines, sqlite_pools
 
 # Global state tracking for debugging
 _engine_creation_count: int = 0
 _session_creation_count: int = 0
+_sessions_without_connection: int = 0
 _connection_failures: int = 0
 _creation_lock: Final[threading.Lock] = threading.Lock()
+# session.info key set once a session has begun a transaction on a connection.
+_CONNECTED_KEY: Final[str] = "db_connected"
 
 
 def _log_worker_info() -> tuple[str, int, int]:
@@ -38,7 +47,7 @@ def _log_worker_info() -> tuple[str, int, int]:
     process_id: int = os.getpid()
     thread_id: int = threading.get_ident()
     logger.debug(
-        f"[DB_DEBUG] Worker: {worker_id}, PID: {process_id}, Thread: {thread_id}"
+        "[DB_DEBUG] Worker: {}, PID: {}, Thread: {}", worker_id, process_id, thread_id
     )
     return worker_id, process_id, thread_id
 
@@ -55,7 +64,7 @@ def _log_engine_pool_state(engine: AsyncEngine, context: str) -> None:
     try:
         pool = engine.pool
         worker_id, process_id, _ = _log_worker_info()
-        logger.info(f"[DB_POOL_STATE] {context} - Worker: {worker_id}")
+        logger.info("[DB_POOL_STATE] {} - Worker: {}", context, worker_id)
 
         def safe_call(attr: str) -> object:
             method = getattr(pool, attr, None)
@@ -71,24 +80,60 @@ def _log_engine_pool_state(engine: AsyncEngine, context: str) -> None:
         checked_in = safe_call("checkedin")
         overflow = safe_call("overflow")
         invalidated = safe_call("invalidated")
-        logger.info(f"[DB_POOL_STATE] Pool size: {pool_size}")
-        logger.info(f"[DB_POOL_STATE] Checked out: {checked_out}")
-        logger.info(f"[DB_POOL_STATE] Checked in: {checked_in}")
-        logger.info(f"[DB_POOL_STATE] Overflow: {overflow}")
-        logger.info(f"[DB_POOL_STATE] Invalid: {invalidated}")
+        logger.info("[DB_POOL_STATE] Pool size: {}", pool_size)
+        logger.info("[DB_POOL_STATE] Checked out: {}", checked_out)
+        logger.info("[DB_POOL_STATE] Checked in: {}", checked_in)
+        logger.info("[DB_POOL_STATE] Overflow: {}", overflow)
+        logger.info("[DB_POOL_STATE] Invalid: {}", invalidated)
         # Log connection URL (sanitized)
         db_url: str = str(engine.url)
         sanitized_url: str = db_url.split("@")[1] if "@" in db_url else db_url
-        logger.info(f"[DB_POOL_STATE] DB URL: ...@{sanitized_url}")
+        logger.info("[DB_POOL_STATE] DB URL: ...@{}", sanitized_url)
     except Exception as exc:
         logger.warning(f"[DB_POOL_STATE] Failed to get pool state: {exc}")
 
 
+def _unique_statement_name() -> str:
+    return f"__asyncpg_{uuid.uuid4()}__"
+
+
+def _asyncpg_statement_cache_args(settings: object) -> dict[str, object]:
+    """
+    asyncpg connect args for prepared-statement caching.
+
+    Each pooled connection keeps up to ``db_prepared_statement_cache_size``
+    prepared statements, so a hot query is parsed and planned once per
+    connection. Behind PgBouncer in transaction mode a connection's server
+    backend changes between transactions, so the cache is turned off and
+    statement names are made unique to avoid collisions on the server.
+    Args:
+        settings: The application settings.
+    Returns:
+        dict[str, object]: Entries for ``connect_args``.
+    """
+    if getattr(settings, "db_pgbouncer_mode", False):
+        return {
+            "prepared_statement_cache_size": 0,
+            "statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+    return {
+        "prepared_statement_cache_size": int(
+            getattr(settings, "db_prepared_statement_cache_size", 256)
+        )
+    }
+
+
 def get_engine_and_sessionmaker() -> (
     tuple[AsyncEngine, async_sessionmaker[AsyncSession]]
 ):
     """
     Create and return a new AsyncEngine and async_sessionmaker.
+
+    The sessions route replica-safe reads to the engines built from
+    ``db_replica_urls`` (see :mod:`src.core.replicas`); the returned engine is
+    the primary. In production SQLite mode the returned engine is the single
+    writer and reads go to ``sqlite_pools.reader`` (see :mod:`src.core.sqlite`).
     Returns:
         tuple[AsyncEngine, async_sessionmaker[AsyncSession]]: The engine and sessionmaker.
     Raises:
@@ -99,30 +144,38 @@ def get_engine_and_sessionmaker() -> (
         _engine_creation_count += 1
         creation_count: int = _engine_creation_count
     worker_id, process_id, thread_id = _log_worker_info()
-    logger.info(f"[DB_ENGINE_CREATE] Starting engine creation #{creation_count}")
+    logger.info("[DB_ENGINE_CREATE] Starting engine creation #{}", creation_count)
     logger.info(
-        f"[DB_ENGINE_CREATE] Worker: {worker_id}, PID: {process_id}, Thread: {thread_id}"
+        "[DB_ENGINE_CREATE] Worker: {}, PID: {}, Thread: {}",
+        worker_id,
+        process_id,
+        thread_id,
     )
     start_time: float = time.time()
     try:
         settings = get_settings()
         url_obj: URL = make_url(settings.async_db_url)
-        logger.info(f"[DB_ENGINE_CREATE] Database: {url_obj.database}")
-        logger.info(f"[DB_ENGINE_CREATE] Host: {url_obj.host}:{url_obj.port}")
-        logger.info(f"[DB_ENGINE_CREATE] Driver: {url_obj.drivername}")
+        logger.info("[DB_ENGINE_CREATE] Database: {}", url_obj.database)
+        logger.info("[DB_ENGINE_CREATE] Host: {}:{}", url_obj.host, url_obj.port)
+        logger.info("[DB_ENGINE_CREATE] Driver: {}", url_obj.drivername)
         engine_kwargs: dict[str, object] = {
-            "pool_pre_ping": True,
+            "pool_pre_ping": bool(getattr(settings, "db_pool_pre_ping", True)),
+            "pool_recycle": int(getattr(settings, "db_pool_recycle_seconds", 1800)),
+            "query_cache_size": int(getattr(settings, "db_query_cache_size", 1200)),
             "future": True,
         }
         if url_obj.drivername.startswith("postgresql"):
+            engine_kwargs["poolclass"] = TimedAsyncAdaptedQueuePool
+            engine_kwargs["connect_args"] = _asyncpg_statement_cache_args(settings)
             if os.environ.get("PYTEST_XDIST_WORKER"):
                 engine_kwargs["pool_size"] = 1
                 engine_kwargs["max_overflow"] = 1
                 engine_kwargs["pool_reset_on_return"] = "commit"
                 engine_kwargs["connect_args"] = {
+                    **_asyncpg_statement_cache_args(settings),
                     "server_settings": {
                         "application_name": f"reviewpoint_test_{worker_id}_{process_id}",
-                    }
+                    },
                 }
                 logger.info(
                     "[DB_ENGINE_CREATE] Using parallel test pool settings: size=1, overflow=1, reset_on_return=commit"
@@ -135,7 +188,9 @@ def get_engine_and_sessionmaker() -> (
                     20 if settings.environment == "prod" else 10
                 )
                 logger.info(
-                    f"[DB_ENGINE_CREATE] Using standard pool settings: size={engine_kwargs['pool_size']}, overflow={engine_kwargs['max_overflow']}"
+                    "[DB_ENGINE_CREATE] Using standard pool settings: size={}, overflow={}",
+                    engine_kwargs["pool_size"],
+                    engine_kwargs["max_overflow"],
                 )
         elif url_obj.drivername.startswith("sqlite"):
             connect_args = engine_kwargs.get("connect_args", {})
@@ -148,22 +203,61 @@ def get_engine_and_sessionmaker() -> (
             )
         else:
             logger.info(
-                f"[DB_ENGINE_CREATE] Unknown database type: {url_obj.drivername}, using default settings"
+                "[DB_ENGINE_CREATE] Unknown database type: {}, using default settings",
+                url_obj.drivername,
+            )
+        logger.info("[DB_ENGINE_CREATE] Engine kwargs: {}", engine_kwargs)
+        session_class: type[Session] = RoutingSession
+        sqlite_pools.reader = None
+        engine: AsyncEngine
+        if url_obj.drivername.startswith("sqlite") and getattr(
+            settings, "db_sqlite_production", False
+        ):
+            engine, sqlite_pools.reader = create_sqlite_engines(
+                settings.async_db_url, settings, engine_kwargs
+            )
+            session_class = SQLiteSession
+            logger.info(
+                "[DB_ENGINE_CREATE] Production SQLite mode: WAL, 1 writer, {} readers",
+                getattr(settings, "db_sqlite_readers", 4),
             )
-        logger.info(f"[DB_ENGINE_CREATE] Engine kwargs: {engine_kwargs}")
-        engine: AsyncEngine = create_async_engine(
-            settings.async_db_url,
-            **engine_kwargs,
+        else:
+            engine = create_async_engine(
+                settings.async_db_url,
+                **engine_kwargs,
+            )
+        pool_telemetry.slow_checkout_seconds = (
+            int(getattr(settings, "db_pool_slow_checkout_ms", 500)) / 1000
+        )
+        pool_telemetry.instrument(engine.sync_engine.pool)
+        query_metrics.configure(
+            int(getattr(settings, "db_slow_query_ms", 200)),
+            int(getattr(settings, "db_n_plus_one_threshold", 10)),
+        )
+        replica_urls: list[str] = list(getattr(settings, "db_replica_urls", []))
+        replica_set.configure(
+            [create_async_engine(url, **engine_kwargs) for url in replica_urls]
         )
+        replica_set.max_lag_seconds = float(
+            getattr(settings, "db_replica_max_lag_seconds", 5.0)
+        )
+        replica_set.interval = float(
+            getattr(settings, "db_replica_check_interval_seconds", 5.0)
+        )
+        if replica_urls:
+            logger.info("[DB_ENGINE_CREATE] Read replicas: {}", len(replica_urls))
         AsyncSessionLocal: async_sessionmaker[AsyncSession] = async_sessionmaker(
             bind=engine,
+            sync_session_class=session_class,
             expire_on_commit=False,
             autoflush=False,
             autocommit=False,
         )
         creation_time: float = time.time() - start_time
         logger.info(
-            f"[DB_ENGINE_CREATE] Engine #{creation_count} created successfully in {creation_time:.3f}s"
+            "[DB_ENGINE_CREATE] Engine #{} created successfully in {:.3f}s",
+            creation_count,
+            creation_time,
         )
         _log_engine_pool_state(engine, f"After creation #{creation_count}")
         return engine, AsyncSessionLocal
@@ -192,25 +286,32 @@ def ensure_engine_initialized() -> None:
         engine, AsyncSessionLocal = get_engine_and_sessionmaker()
 
 
+@event.listens_for(Session, "after_begin")
+def _mark_connected(
+    session: Session, transaction: SessionTransaction, connection: Connection
+) -> None:
+    session.info[_CONNECTED_KEY] = True
+
+
 @asynccontextmanager
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
     """
-    Dependency for FastAPI routes/services.
+    Open a session: ``async with get_async_session() as session``.
+
+    This is a context manager, not a FastAPI dependency; routes use
+    ``src.api.deps.get_db``, which wraps it.
+
+    A connection is checked out of the pool only when the session first runs a
+    statement, so a request that never touches the database never acquires one.
+    Liveness is left to the pool (``pool_pre_ping`` / ``pool_recycle``); there
+    is no probe query per session.
     Yields:
         AsyncSession: The SQLAlchemy async session.
     Raises:
         SQLAlchemyError: If a SQLAlchemy error occurs.
         Exception: For any other error.
     """
-    global AsyncSessionLocal, _session_creation_count, _connection_failures
-    with _creation_lock:
-        _session_creation_count += 1
-        session_count: int = _session_creation_count
-    worker_id, process_id, thread_id = _log_worker_info()
-    logger.debug(
-        f"[DB_SESSION] Creating session #{session_count} - Worker: {worker_id}"
-    )
-    session_start_time: float = time.time()
+    global _session_creation_count, _sessions_without_connection, _connection_failures
     if AsyncSessionLocal is None:
         logger.info(
             "[DB_SESSION] SessionLocal not initialized, creating engine/sessionmaker"
@@ -218,85 +319,85 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         try:
             ensure_engine_initialized()
         except Exception as exc:
-            logger.error(f"[DB_SESSION] Failed to initialize SessionLocal: {exc}")
+            logger.error("[DB_SESSION] Failed to initialize SessionLocal: {}", exc)
             raise
-    session: AsyncSession | None = None
+    assert (
+        AsyncSessionLocal is not None
+    ), "AsyncSessionLocal must be initialized before use"
+    # Plain increments: sessions are created on the event loop thread.
+    _session_creation_count += 1
+    session_count: int = _session_creation_count
+    session: AsyncSession = AsyncSessionLocal()
     try:
-        session_creation_start: float = time.time()
-        assert (
-            AsyncSessionLocal is not None
-        ), "AsyncSessionLocal must be initialized before use"
-        session = AsyncSessionLocal()
-        session_creation_time = time.time() - session_creation_start
-        logger.debug(
-            f"[DB_SESSION] Session #{session_count} created in {session_creation_time:.3f}s"
-        )
-        # Test the connection immediately
-        connection_test_start: float = time.time()
-        try:
-            await session.execute(text("SELECT 1"))
-            connection_test_time = time.time() - connection_test_start
-            logger.debug(
-                f"[DB_SESSION] Session #{session_count} connection test passed in {connection_test_time:.3f}s"
-            )
-        except Exception as exc:
-            connection_test_time = time.time() - connection_test_start
-            logger.error(
-                f"[DB_SESSION] Session #{session_count} connection test failed in {connection_test_time:.3f}s: {exc}"
-            )
-            raise
         yield session
-        # Log successful session completion
-        total_session_time = time.time() - session_start_time
-        logger.debug(
-            f"[DB_SESSION] Session #{session_count} completed successfully in {total_session_time:.3f}s"
-        )
     except SQLAlchemyError as exc:
-        with _creation_lock:
-            _connection_failures += 1
-            failure_count = _connection_failures
-        total_session_time = time.time() - session_start_time
+        _connection_failures += 1
+        worker_id, process_id, _ = _log_worker_info()
         logger.error(
-            f"[DB_SESSION] Session #{session_count} SQLAlchemy error #{failure_count} after {total_session_time:.3f}s: {exc}"
+            "[DB_SESSION] Session #{} SQLAlchemy error #{}: {}",
+            session_count,
+            _connection_failures,
+            exc,
         )
-        logger.error(f"[DB_SESSION] Error type: {type(exc).__name__}")
-        logger.error(f"[DB_SESSION] Worker: {worker_id}, PID: {process_id}")
-        if session:
-            try:
-                await session.rollback()
-                logger.debug(
-                    f"[DB_SESSION] Session #{session_count} rollback completed"
-                )
-            except Exception as rollback_error:
-                logger.error(
-                    f"[DB_SESSION] Session #{session_count} rollback failed: {rollback_error}"
-                )
+        logger.error(
+            "[DB_SESSION] Error type: {} - Worker: {}, PID: {}",
+            type(exc).__name__,
+            worker_id,
+            process_id,
+        )
+        try:
+            await session.rollback()
+        except Exception as rollback_error:
+            logger.error(
+                "[DB_SESSION] Session #{} rollback failed: {}",
+                session_count,
+                rollback_error,
+            )
         raise
     except Exception as exc:
-        with _creation_lock:
-            _connection_failures += 1
-            failure_count = _connection_failures
-        total_session_time = time.time() - session_start_time
+        _connection_failures += 1
         logger.error(
-            f"[DB_SESSION] Session #{session_count} unexpected error #{failure_count} after {total_session_time:.3f}s: {exc}"
+            "[DB_SESSION] Session #{} unexpected error #{}: {} ({})",
+            session_count,
+            _connection_failures,
+            exc,
+            type(exc).__name__,
         )
-        logger.error(f"[DB_SESSION] Error type: {type(exc).__name__}")
-        logger.error(f"[DB_SESSION] Worker: {worker_id}, PID: {process_id}")
         raise
     finally:
-        if session:
-            try:
-                close_start_time: float = time.time()
-                await session.close()
-                close_time: float = time.time() - close_start_time
-                logger.debug(
-                    f"[DB_SESSION] Session #{session_count} closed in {close_time:.3f}s"
-                )
-            except Exception as close_error:
-                logger.error(
-                    f"[DB_SESSION] Session #{session_count} close failed: {close_error}"
-                )
-        # No post-session pool state logging (removed invalid AsyncSessionLocal.bind usage)
+        if not session.sync_session.info.pop(_CONNECTED_KEY, False):
+            _sessions_without_connection += 1
+        try:
+            await session.close()
+        except Exception as close_error:
+            logger.error(
+                "[DB_SESSION] Session #{} close failed: {}", session_count, close_error
+            )
+
+
+class SessionStats(TypedDict):
+    sessions: int
+    sessions_without_connection: int
+    round_trips_saved: int
+
+
+def get_session_stats() -> SessionStats:
+    """
+    Session counters for the metrics endpoint.
+
+    ``round_trips_saved`` counts the per-session ``SELECT 1`` that is no longer
+    sent, plus, for sessions that never needed a connection, the checkout
+    pre-ping and the rollback when the connection is returned.
+    Returns:
+        SessionStats: Counters since process start.
+    """
+    idle_cost: int = 2 if getattr(get_settings(), "db_pool_pre_ping", True) else 1
+    return SessionStats(
+        sessions=_session_creation_count,
+        sessions_without_connection=_sessions_without_connection,
+        round_trips_saved=_session_creation_count
+        + idle_cost * _sessions_without_connection,
+    )
 
 
 async def db_healthcheck() -> bool:
@@ -309,7 +410,7 @@ async def db_healthcheck() -> bool:
     """
     global engine
     worker_id, process_id, thread_id = _log_worker_info()
-    logger.info(f"[DB_HEALTHCHECK] Starting healthcheck - Worker: {worker_id}")
+    logger.info("[DB_HEALTHCHECK] Starting healthcheck - Worker: {}", worker_id)
     healthcheck_start_time: float = time.time()
     if engine is None:
         logger.info("[DB_HEALTHCHECK] Engine not initialized, creating new engine")
@@ -326,14 +427,16 @@ async def db_healthcheck() -> bool:
         async with engine.connect() as conn:
             connection_time = time.time() - connection_start_time
             logger.debug(
-                f"[DB_HEALTHCHECK] Connection established in {connection_time:.3f}s"
+                "[DB_HEALTHCHECK] Connection established in {:.3f}s", connection_time
             )
             query_start_time: float = time.time()
             await conn.execute(text("SELECT 1"))
             query_time = time.time() - query_start_time
             total_healthcheck_time = time.time() - healthcheck_start_time
             logger.info(
-                f"[DB_HEALTHCHECK] SUCCESS - Total: {total_healthcheck_time:.3f}s, Query: {query_time:.3f}s"
+                "[DB_HEALTHCHECK] SUCCESS - Total: {:.3f}s, Query: {:.3f}s",
+                total_healthcheck_time,
+                query_time,
             )
         _log_engine_pool_state(engine, "After successful healthcheck")
         return True
@@ -413,4 +516,5 @@ __all__: tuple[str, ...] = (
     "db_healthcheck",
     "get_async_session",
     "get_connection_debug_info",
+    "get_session_stats",
 )
@@ -1,3 +1,4 @@
+from pathlib import Path
 from typing import cast
 
 from loguru import logger
@@ -97,8 +98,8 @@ def log_startup_complete() -> None:
     except Exception:
         pool_size = "n/a"
 
-    logger.info(f"Startup complete. Environment: {environment}, DB: {db_type}")
-    logger.info(f"DB pool size: {pool_size}")
+    logger.info("Startup complete. Environment: {}, DB: {}", environment, db_type)
+    logger.info("DB pool size: {}", pool_size)
 
 
 async def on_startup() -> None:
@@ -116,6 +117,64 @@ async def on_startup() -> None:
         # Optional: Initialize cache
         # await cache.init()
         # logger.info("Cache initialized.")
+        from src.core.config import get_settings
+        from src.repositories.analytics import analytics_rollups
+        from src.repositories.user import user_activity
+
+        for buffer in (user_activity, analytics_rollups):
+            buffer.interval = float(
+                getattr(get_settings(), "write_behind_flush_seconds", buffer.interval)
+            )
+            buffer.start()
+        from src.core.database import get_async_session
+        from src.repositories.audit import audit_queue, ensure_audit_partitions
+
+        settings = get_settings()
+        audit_queue.max_size = int(
+            getattr(settings, "audit_queue_max_events", audit_queue.max_size)
+        )
+        audit_queue.batch_size = int(
+            getattr(settings, "audit_flush_batch_size", audit_queue.batch_size)
+        )
+        audit_queue.interval = (
+            float(
+                getattr(
+                    settings, "audit_flush_interval_ms", audit_queue.interval * 1000
+                )
+            )
+            / 1000
+        )
+        audit_queue.start()
+        from src.core.replicas import replica_set
+
+        await replica_set.start()
+        metrics_dir = getattr(settings, "metrics_multiprocess_dir", None)
+        if metrics_dir is not None:
+            from src.core.metrics import metrics
+
+            metrics.start(
+                Path(metrics_dir),
+                float(getattr(settings, "metrics_flush_interval_seconds", 5.0)),
+            )
+        try:
+            async with get_async_session() as session:
+                await ensure_audit_partitions(
+                    session, int(getattr(settings, "audit_partition_months_ahead", 2))
+                )
+        except Exception as exc:
+            logger.error(f"Failed to create audit log partitions: {exc}")
+        from src.repositories.blacklisted_token import (
+            delete_expired_blacklisted_tokens,
+        )
+
+        try:
+            async with get_async_session() as session:
+                purged = await delete_expired_blacklisted_tokens(session)
+                await session.commit()
+            if purged:
+                logger.info("Deleted {} expired blacklisted tokens.", purged)
+        except Exception as exc:
+            logger.error(f"Failed to delete expired blacklisted tokens: {exc}")
         log_startup_complete()
     except Exception as e:
         error_msg: str = str(e)
@@ -131,12 +190,30 @@ async def on_shutdown() -> None:
     """
     try:
         logger.info("Shutting down application...")
-        # Complete pending tasks if any (custom logic here)
+        # Flush write-behind activity before the engine goes away
+        from src.repositories.analytics import analytics_rollups
+        from src.repositories.audit import audit_queue
+        from src.repositories.user import user_activity
+
+        for buffer in (user_activity, analytics_rollups, audit_queue):
+            try:
+                await buffer.stop()
+            except Exception as exc:
+                logger.error(f"Failed to flush {buffer.name} on shutdown: {exc}")
+        from src.services.user_import import shutdown_hash_pool
+
+        shutdown_hash_pool()
         # Optional: Close cache
         # await close_cache()
         # logger.info("Cache closed.")
         from src.core.database import engine
+        from src.core.metrics import metrics
+        from src.core.replicas import replica_set
+        from src.core.sqlite import sqlite_pools
 
+        await metrics.stop()
+        await replica_set.stop()
+        await sqlite_pools.stop()
         if engine is not None:
             await engine.dispose()
             logger.info("Database connections closed.")
@@ -146,3 +223,6 @@ async def on_shutdown() -> None:
         raise RuntimeError(f"Shutdown failed: {error_msg}") from e
     finally:
         logger.info("Shutdown complete.")
+        from src.core.app_logging import stop_logging
+
+        stop_logging()
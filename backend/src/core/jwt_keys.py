@@ -0,0 +1,323 @@
+"""Asymmetric JWT signing keys, rotation and JWKS publication.
+
+When ``REVIEWPOINT_JWT_ALGORITHM`` is an asymmetric algorithm (RS256/ES256 family),
+tokens are signed with a private key from ``REVIEWPOINT_JWT_KEYS_DIR`` and carry the
+key id in the ``kid`` header. Every key in the directory is published in the JWKS
+document so other services can verify tokens offline (see ``src.utils.jwt_verify``).
+
+Rotation is file based: a new ``<kid>.pem`` is published immediately and becomes the
+signing key once it is older than ``REVIEWPOINT_JWT_KEY_ACTIVATION_SECONDS``, giving
+verifiers time to refresh their JWKS cache first. Retired keys are removed with
+``rotate_keys(..., retire_after=...)`` once every token they signed has expired.
+
+Usage::
+
+    python -m src.core.jwt_keys rotate --dir /etc/reviewpoint/jwt --algorithm ES256
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import threading
+import time
+import uuid
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Final
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec, rsa
+from jose import jwk
+from loguru import logger
+
+from src.core.config import get_settings
+
+__all__: Sequence[str] = (
+    "ASYMMETRIC_ALGORITHMS",
+    "KeyRing",
+    "SigningKey",
+    "generate_private_key_pem",
+    "get_key_ring",
+    "is_asymmetric_algorithm",
+    "reset_key_ring",
+    "rotate_keys",
+)
+
+ASYMMETRIC_ALGORITHMS: Final[frozenset[str]] = frozenset(
+    {"RS256", "RS384", "RS512", "ES256", "ES384", "ES512"}
+)
+_EC_CURVES: Final[Mapping[str, ec.EllipticCurve]] = {
+    "ES256": ec.SECP256R1(),
+    "ES384": ec.SECP384R1(),
+    "ES512": ec.SECP521R1(),
+}
+_RSA_KEY_SIZE: Final[int] = 2048
+# How often the keys directory is re-scanned for rotated keys.
+_RELOAD_INTERVAL_SECONDS: Final[float] = 30.0
+
+
+def is_asymmetric_algorithm(algorithm: str) -> bool:
+    """Return True if tokens signed with ``algorithm`` are verified with a public key."""
+    return algorithm.upper() in ASYMMETRIC_ALGORITHMS
+
+
+def generate_private_key_pem(algorithm: str) -> bytes:
+    """Generate a new PKCS#8 PEM private key suitable for ``algorithm``.
+
+    Raises:
+        ValueError: If the algorithm is not a supported asymmetric algorithm.
+    """
+    algorithm = algorithm.upper()
+    if algorithm not in ASYMMETRIC_ALGORITHMS:
+        raise ValueError(f"Unsupported asymmetric JWT algorithm: {algorithm}")
+    private_key: ec.EllipticCurvePrivateKey | rsa.RSAPrivateKey
+    if algorithm in _EC_CURVES:
+        private_key = ec.generate_private_key(_EC_CURVES[algorithm])
+    else:
+        private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=_RSA_KEY_SIZE
+        )
+    return private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class SigningKey:
+    """A private signing key and its public JWK."""
+
+    kid: str
+    algorithm: str
+    private_pem: str = field(repr=False)
+    public_jwk: Mapping[str, str]
+    not_before: float
+
+    @classmethod
+    def from_pem(
+        cls, kid: str, algorithm: str, pem: bytes | str, not_before: float = 0.0
+    ) -> SigningKey:
+        """Build a signing key from a PEM private key.
+
+        Raises:
+            ValueError: If the PEM cannot be used with ``algorithm``.
+        """
+        pem_text: str = pem.decode() if isinstance(pem, bytes) else pem
+        try:
+            public: dict[str, Any] = (
+                jwk.construct(pem_text, algorithm).public_key().to_dict()
+            )
+        except Exception as exc:
+            raise ValueError(f"Invalid {algorithm} key for kid {kid}: {exc}") from exc
+        public.update({"kid": kid, "use": "sig", "alg": algorithm})
+        return cls(
+            kid=kid,
+            algorithm=algorithm,
+            private_pem=pem_text,
+            public_jwk={k: str(v) for k, v in public.items()},
+            not_before=not_before,
+        )
+
+
+class KeyRing:
+    """The set of keys used to sign new tokens and verify existing ones."""
+
+    def __init__(self, keys: Sequence[SigningKey]) -> None:
+        if not keys:
+            raise ValueError("KeyRing requires at least one key.")
+        self._keys: tuple[SigningKey, ...] = tuple(
+            sorted(keys, key=lambda k: (k.not_before, k.kid))
+        )
+        self._by_kid: dict[str, SigningKey] = {k.kid: k for k in self._keys}
+        document: dict[str, list[Mapping[str, str]]] = {
+            "keys": [dict(k.public_jwk) for k in self._keys]
+        }
+        self._jwks_bytes: bytes = json.dumps(
+            document, separators=(",", ":"), sort_keys=True
+        ).encode()
+        self.etag: str = '"' + hashlib.sha256(self._jwks_bytes).hexdigest()[:32] + '"'
+
+    @classmethod
+    def from_directory(
+        cls, directory: Path, algorithm: str, activation_delay: float = 0.0
+    ) -> KeyRing:
+        """Load every ``<kid>.pem`` in ``directory``.
+
+        A key becomes eligible for signing ``activation_delay`` seconds after its
+        file was written; it is published for verification immediately.
+
+        Raises:
+            ValueError: If the directory holds no usable key.
+        """
+        keys: list[SigningKey] = []
+        for path in sorted(directory.glob("*.pem")):
+            keys.append(
+                SigningKey.from_pem(
+                    kid=path.stem,
+                    algorithm=algorithm,
+                    pem=path.read_bytes(),
+                    not_before=path.stat().st_mtime + activation_delay,
+                )
+            )
+        if not keys:
+            raise ValueError(f"No JWT signing keys (*.pem) found in {directory}")
+        return cls(keys)
+
+    @classmethod
+    def ephemeral(cls, algorithm: str) -> KeyRing:
+        """Create a single in-memory key (development and tests only)."""
+        kid: str = f"ephemeral-{uuid.uuid4().hex[:12]}"
+        return cls(
+            [SigningKey.from_pem(kid, algorithm, generate_private_key_pem(algorithm))]
+        )
+
+    @property
+    def keys(self) -> tuple[SigningKey, ...]:
+        return self._keys
+
+    def signing_key(self, now: float | None = None) -> SigningKey:
+        """Return the newest active key, or the oldest key if none is active yet."""
+        current: float = time.time() if now is None else now
+        active: list[SigningKey] = [k for k in self._keys if k.not_before <= current]
+        return active[-1] if active else self._keys[0]
+
+    def get(self, kid: str) -> SigningKey | None:
+        """Return the key with the given id, if published."""
+        return self._by_kid.get(kid)
+
+    def jwks(self) -> Mapping[str, list[Mapping[str, str]]]:
+        """Return the public JWKS document."""
+        return {"keys": [dict(k.public_jwk) for k in self._keys]}
+
+    def jwks_json(self) -> bytes:
+        """Return the pre-serialized JWKS document."""
+        return self._jwks_bytes
+
+
+def rotate_keys(
+    directory: Path, algorithm: str, retire_after: timedelta | None = None
+) -> str:
+    """Write a new signing key to ``directory`` and optionally prune old ones.
+
+    ``retire_after`` should exceed the longest token lifetime (refresh tokens) plus
+    the activation delay, otherwise still-valid tokens stop verifying.
+
+    Returns:
+        The kid of the new key.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    kid: str = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    path: Path = directory / f"{kid}.pem"
+    path.write_bytes(generate_private_key_pem(algorithm))
+    path.chmod(0o600)
+    if retire_after is not None:
+        cutoff: float = time.time() - retire_after.total_seconds()
+        for old in directory.glob("*.pem"):
+            if old != path and old.stat().st_mtime < cutoff:
+                old.unlink()
+                logger.info("Retired JWT signing key {}", old.stem)
+    logger.info("Created JWT signing key {} ({})", kid, algorithm)
+    return kid
+
+
+_key_ring: KeyRing | None = None
+# (directory, algorithm, stamp) the cached ring was loaded from.
+_key_ring_source: tuple[str, str, tuple[tuple[str, int], ...]] | None = None
+_key_ring_checked_at: float = 0.0
+_key_ring_lock: Final[threading.Lock] = threading.Lock()
+
+
+def _directory_stamp(directory: Path) -> tuple[tuple[str, int], ...]:
+    # Every key file with its mtime, so adding, replacing or deleting one
+    # (even an older one) changes the stamp.
+    return tuple(
+        (path.name, path.stat().st_mtime_ns) for path in sorted(directory.glob("*.pem"))
+    )
+
+
+def get_key_ring() -> KeyRing:
+    """Return the process-wide key ring, reloading it when keys are rotated.
+
+    Raises:
+        RuntimeError: If asymmetric signing is configured without keys in production.
+        ValueError: If the configured algorithm is not asymmetric.
+    """
+    global _key_ring, _key_ring_source, _key_ring_checked_at
+    settings = get_settings()
+    algorithm: str = settings.jwt_algorithm.upper()
+    if not is_asymmetric_algorithm(algorithm):
+        raise ValueError(f"JWT algorithm {algorithm} does not use a key ring.")
+    keys_dir: Path | None = settings.jwt_keys_dir
+    now: float = time.monotonic()
+    ring: KeyRing | None = _key_ring
+    if (
+        ring is not None
+        and _key_ring_source is not None
+        and _key_ring_source[:2] == (str(keys_dir), algorithm)
+        and (keys_dir is None or now - _key_ring_checked_at < _RELOAD_INTERVAL_SECONDS)
+    ):
+        return ring
+    with _key_ring_lock:
+        if keys_dir is None:
+            if _key_ring is None or _key_ring_source != ("None", algorithm, ()):
+                if settings.environment == "prod":
+                    raise RuntimeError(
+                        "REVIEWPOINT_JWT_KEYS_DIR is required for asymmetric JWT signing in production."
+                    )
+                logger.warning(
+                    "No JWT keys directory configured; using an ephemeral {} key.",
+                    algorithm,
+                )
+                _key_ring = KeyRing.ephemeral(algorithm)
+                _key_ring_source = ("None", algorithm, ())
+            return _key_ring
+        stamp = _directory_stamp(keys_dir)
+        if _key_ring is None or _key_ring_source != (str(keys_dir), algorithm, stamp):
+            _key_ring = KeyRing.from_directory(
+                keys_dir, algorithm, float(settings.jwt_key_activation_seconds)
+            )
+            _key_ring_source = (str(keys_dir), algorithm, stamp)
+            logger.info(
+                "Loaded {} JWT signing key(s) from {}", len(_key_ring.keys), keys_dir
+            )
+        _key_ring_checked_at = now
+        return _key_ring
+
+
+def reset_key_ring() -> None:
+    """Drop the cached key ring (tests and settings reloads)."""
+    global _key_ring, _key_ring_source, _key_ring_checked_at
+    with _key_ring_lock:
+        _key_ring = None
+        _key_ring_source = None
+        _key_ring_checked_at = 0.0
+
+
+def _main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage JWT signing keys.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rotate = sub.add_parser("rotate", help="Create a new signing key.")
+    rotate.add_argument("--dir", type=Path, required=True)
+    rotate.add_argument("--algorithm", default="ES256")
+    rotate.add_argument(
+        "--retire-after-days",
+        type=float,
+        default=None,
+        help="Delete keys older than this many days.",
+    )
+    args = parser.parse_args(argv)
+    retire: timedelta | None = (
+        timedelta(days=args.retire_after_days)
+        if args.retire_after_days is not None
+        else None
+    )
+    print(rotate_keys(args.dir, args.algorithm, retire))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,445 @@
+"""
+In-process metrics registry with Prometheus text output.
+
+Counters, gauges and fixed-bucket histograms are registered once by name and
+label names. Each labelled series is a dict entry, so recording a value is a
+dict lookup and an addition. Nothing is locked: record from the event loop
+thread.
+
+``/metrics`` renders the registry after the connection-pool lines. With
+``metrics_multiprocess_dir`` set, every worker also writes a JSON snapshot of
+its registry to ``<dir>/metrics_<pid>.json`` every
+``metrics_flush_interval_seconds``, and ``/metrics`` answers with the sum over
+all workers (its own live values replace its file). Gauges of workers that
+have exited are dropped; their counters and histograms are kept, so totals
+never go backwards. Clear the directory when the service starts.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import os
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from pathlib import Path
+from typing import Final, Literal, TypedDict
+
+from loguru import logger
+
+__all__: Final[Sequence[str]] = (
+    "LATENCY_BUCKETS",
+    "PHASE_BUCKETS",
+    "SIZE_BUCKETS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "HistogramFamily",
+    "MetricsRegistry",
+    "RegistrySnapshot",
+    "merge_snapshots",
+    "metrics",
+    "prometheus_lines",
+)
+
+MetricType = Literal["counter", "gauge", "histogram"]
+
+WAIT_BUCKETS: Final[tuple[float, ...]] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+PHASE_BUCKETS: Final[tuple[float, ...]] = (
+    0.0001,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+)
+LATENCY_BUCKETS: Final[tuple[float, ...]] = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+)
+SIZE_BUCKETS: Final[tuple[float, ...]] = (
+    1024.0,
+    16384.0,
+    131072.0,
+    1048576.0,
+    5242880.0,
+    26214400.0,
+)
+
+_FILE_PREFIX: Final[str] = "metrics_"
+
+
+class SeriesSnapshot(TypedDict):
+    """One labelled series: a counter or gauge value, or a histogram."""
+
+    labels: list[str]
+    value: float  # histogram: sum of observations
+    counts: list[int]  # histogram: per-bucket counts, +Inf last; else empty
+
+
+class FamilySnapshot(TypedDict):
+    name: str
+    type: MetricType
+    help: str
+    labelnames: list[str]
+    buckets: list[float]
+    series: list[SeriesSnapshot]
+
+
+class RegistrySnapshot(TypedDict):
+    pid: int
+    families: list[FamilySnapshot]
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus-style cumulative output."""
+
+    def __init__(self, buckets: Sequence[float] = WAIT_BUCKETS) -> None:
+        self.buckets: tuple[float, ...] = tuple(buckets)
+        self.counts: list[int] = [0] * (len(self.buckets) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def prometheus_lines(self, name: str, labels: str = "") -> list[str]:
+        """Bucket, sum and count lines; ``labels`` is ``key="value",...``."""
+        prefix = f"{labels}," if labels else ""
+        suffix = f"{{{labels}}}" if labels else ""
+        lines: list[str] = []
+        running = 0
+        for bound, count in zip(self.buckets, self.counts, strict=False):
+            running += count
+            lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {running}')
+        lines.append(f'{name}_bucket{{{prefix}le="+Inf"}} {self.count}')
+        lines.append(f"{name}_sum{suffix} {self.sum}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _label_string(labelnames: Sequence[str], values: Sequence[str]) -> str:
+    return ",".join(
+        f'{name}="{_escape(value)}"'
+        for name, value in zip(labelnames, values, strict=True)
+    )
+
+
+class _Family:
+    type: MetricType
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str]) -> None:
+        self.name = name
+        self.help = help
+        self.labelnames: tuple[str, ...] = tuple(labelnames)
+
+
+class Counter(_Family):
+    """Monotonic totals per label values."""
+
+    type: MetricType = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help, labelnames)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+
+class Gauge(Counter):
+    """Values that go up and down per label values."""
+
+    type: MetricType = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) - amount
+
+    def set(self, *labels: str, value: float) -> None:
+        self.values[labels] = value
+
+
+class HistogramFamily(_Family):
+    """One :class:`Histogram` per label values, sharing fixed buckets."""
+
+    type: MetricType = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labelnames)
+        self.buckets: tuple[float, ...] = tuple(buckets)
+        self.series: dict[tuple[str, ...], Histogram] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        histogram = self.series.get(labels)
+        if histogram is None:
+            histogram = self.series[labels] = Histogram(self.buckets)
+        histogram.observe(value)
+
+
+Family = Counter | Gauge | HistogramFamily
+
+
+def _snapshot(family: Family) -> FamilySnapshot:
+    series: list[SeriesSnapshot]
+    if isinstance(family, HistogramFamily):
+        series = [
+            {"labels": list(labels), "value": h.sum, "counts": list(h.counts)}
+            for labels, h in family.series.items()
+        ]
+        buckets = list(family.buckets)
+    else:
+        series = [
+            {"labels": list(labels), "value": value, "counts": []}
+            for labels, value in family.values.items()
+        ]
+        buckets = []
+    return {
+        "name": family.name,
+        "type": family.type,
+        "help": family.help,
+        "labelnames": list(family.labelnames),
+        "buckets": buckets,
+        "series": series,
+    }
+
+
+def merge_snapshots(
+    snapshots: Iterable[RegistrySnapshot], live_pids: Iterable[int] = ()
+) -> list[FamilySnapshot]:
+    """Sum series across workers; gauges only from ``live_pids``."""
+    live = set(live_pids)
+    merged: dict[str, FamilySnapshot] = {}
+    sums: dict[str, dict[tuple[str, ...], SeriesSnapshot]] = {}
+    for snapshot in snapshots:
+        for family in snapshot["families"]:
+            if family["type"] == "gauge" and snapshot["pid"] not in live:
+                continue
+            name = family["name"]
+            if name not in merged:
+                merged[name] = {**family, "series": []}
+                sums[name] = {}
+            elif merged[name]["buckets"] != family["buckets"]:
+                logger.warning("Metric {} has different buckets; skipped", name)
+                continue
+            for series in family["series"]:
+                key = tuple(series["labels"])
+                total = sums[name].get(key)
+                if total is None:
+                    sums[name][key] = {
+                        "labels": list(series["labels"]),
+                        "value": series["value"],
+                        "counts": list(series["counts"]),
+                    }
+                    continue
+                total["value"] += series["value"]
+                total["counts"] = [
+                    a + b
+                    for a, b in zip(total["counts"], series["counts"], strict=True)
+                ]
+    for name, family in merged.items():
+        family["series"] = list(sums[name].values())
+    return list(merged.values())
+
+
+def prometheus_lines(families: Iterable[FamilySnapshot]) -> list[str]:
+    """Prometheus text exposition lines, with ``# HELP`` and ``# TYPE``."""
+    lines: list[str] = []
+    for family in families:
+        name = family["name"]
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        for series in sorted(family["series"], key=lambda s: s["labels"]):
+            labels = _label_string(family["labelnames"], series["labels"])
+            if family["type"] == "histogram":
+                histogram = Histogram(family["buckets"])
+                histogram.counts = list(series["counts"])
+                histogram.sum = series["value"]
+                histogram.count = sum(series["counts"])
+                lines += histogram.prometheus_lines(name, labels)
+            else:
+                lines.append(
+                    f"{name}{{{labels}}} {series['value']}"
+                    if labels
+                    else f"{name} {series['value']}"
+                )
+    return lines
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class MetricsRegistry:
+    """Named metric families, and the multi-process snapshot files."""
+
+    def __init__(self) -> None:
+        self.families: dict[str, Family] = {}
+        self.directory: Path | None = None
+        self.interval: float = 5.0
+        self._task: asyncio.Task[None] | None = None
+        self._stopping: bool = False
+
+    def _register(self, family: Family) -> Family:
+        existing = self.families.get(family.name)
+        if existing is not None:
+            if type(existing) is not type(family) or (
+                existing.labelnames != family.labelnames
+            ):
+                raise ValueError(f"Metric {family.name} is already registered")
+            return existing
+        self.families[family.name] = family
+        return family
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        family = self._register(Counter(name, help, labelnames))
+        assert isinstance(family, Counter)
+        return family
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        family = self._register(Gauge(name, help, labelnames))
+        assert isinstance(family, Gauge)
+        return family
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> HistogramFamily:
+        family = self._register(HistogramFamily(name, help, labelnames, buckets))
+        assert isinstance(family, HistogramFamily)
+        return family
+
+    def reset(self) -> None:
+        """Clear every recorded value; the families stay registered."""
+        for family in self.families.values():
+            if isinstance(family, HistogramFamily):
+                family.series.clear()
+            else:
+                family.values.clear()
+
+    def snapshot(self) -> RegistrySnapshot:
+        return {
+            "pid": os.getpid(),
+            "families": [_snapshot(f) for f in self.families.values()],
+        }
+
+    # ── multi-process ──────────────────────────────────────────────
+
+    def _path(self, pid: int) -> Path:
+        assert self.directory is not None
+        return self.directory / f"{_FILE_PREFIX}{pid}.json"
+
+    def write_snapshot(self) -> None:
+        """Replace this worker's snapshot file (atomic rename)."""
+        if self.directory is None:
+            return
+        path = self._path(os.getpid())
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+        tmp.replace(path)
+
+    def _worker_snapshots(self) -> list[RegistrySnapshot]:
+        own = self.snapshot()
+        snapshots = [own]
+        if self.directory is None:
+            return snapshots
+        for path in self.directory.glob(f"{_FILE_PREFIX}*.json"):
+            try:
+                snapshot: RegistrySnapshot = json.loads(path.read_text("utf-8"))
+            except (OSError, ValueError) as exc:
+                logger.warning("Skipping metrics file {}: {}", path.name, exc)
+                continue
+            if snapshot["pid"] != own["pid"]:
+                snapshots.append(snapshot)
+        return snapshots
+
+    def prometheus_lines(self) -> list[str]:
+        """This worker's metrics, summed with the other workers' files."""
+        if self.directory is None:
+            return prometheus_lines(_snapshot(f) for f in self.families.values())
+        snapshots = self._worker_snapshots()
+        live = [s["pid"] for s in snapshots if _pid_alive(s["pid"])]
+        return prometheus_lines(merge_snapshots(snapshots, live))
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.interval)
+            try:
+                self.write_snapshot()
+            except OSError as exc:
+                logger.error("Failed to write metrics snapshot: {}", exc)
+
+    def start(self, directory: Path, interval: float = 5.0) -> None:
+        """Write this worker's snapshot to ``directory`` every ``interval``."""
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.interval = interval
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = False
+        self.write_snapshot()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic writes and write a final snapshot."""
+        task, self._task = self._task, None
+        if task is not None:
+            self._stopping = True
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        with contextlib.suppress(OSError):
+            self.write_snapshot()
+
+
+metrics: Final[MetricsRegistry] = MetricsRegistry()
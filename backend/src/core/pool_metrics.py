@@ -0,0 +1,202 @@
+"""
+Connection-pool telemetry.
+
+Pool events on the primary engine record:
+
+- how long each checkout waited for a connection (histogram),
+- how long each connection was held, per route (the route is taken from
+  ``pool_route_ctx_var``, which the unit of work sets per request),
+- overflow use, new connections, and invalidations by reason.
+
+``/metrics`` exports the counters. When a checkout waits longer than
+``db_pool_slow_checkout_ms``, or times out, the routes holding the most
+connection time are logged, so pool exhaustion points at the endpoints
+that caused it.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from collections.abc import Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Final
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool
+from sqlalchemy.pool.base import PoolProxiedConnection
+
+from src.core.metrics import Histogram
+from src.core.server_timing import DB_CHECKOUT, add_phase
+
+__all__: Final[Sequence[str]] = (
+    "PoolTelemetry",
+    "TimedAsyncAdaptedQueuePool",
+    "pool_route_ctx_var",
+    "pool_telemetry",
+)
+
+# Route the current request's connections are attributed to.
+pool_route_ctx_var: Final[ContextVar[str]] = ContextVar(
+    "pool_route", default="background"
+)
+
+# connection_record.info key: (route, checkout time) while checked out.
+_HELD_KEY: Final[str] = "pool_held"
+
+
+@dataclass
+class RouteHold:
+    """Connection hold time attributed to one route."""
+
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    held: int = 0
+
+
+class PoolTelemetry:
+    """Counters fed by the pool events of the instrumented engines."""
+
+    def __init__(self, slow_checkout_seconds: float = 0.5) -> None:
+        self.slow_checkout_seconds = slow_checkout_seconds
+        self.log_interval: float = 60.0
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkout_wait = Histogram()
+        self.routes: dict[str, RouteHold] = {}
+        self.connects: int = 0
+        self.checkout_timeouts: int = 0
+        self.overflow_checkouts: int = 0
+        self.max_overflow: int = 0
+        self.invalidations: Counter[str] = Counter()
+        self._last_logged: float = float("-inf")
+
+    def instrument(self, pool: Pool) -> None:
+        """Listen to ``pool``'s events."""
+
+        def on_connect(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+            self.connects += 1
+
+        def on_checkout(
+            dbapi_connection: Any,
+            record: ConnectionPoolEntry,
+            proxy: PoolProxiedConnection,
+        ) -> None:
+            route = pool_route_ctx_var.get()
+            record.info[_HELD_KEY] = (route, time.perf_counter())
+            self.routes.setdefault(route, RouteHold()).held += 1
+            overflow = getattr(pool, "overflow", None)
+            in_overflow: int = overflow() if callable(overflow) else 0
+            if in_overflow > 0:
+                self.overflow_checkouts += 1
+                self.max_overflow = max(self.max_overflow, in_overflow)
+
+        def on_checkin(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+            self._release(record)
+
+        def on_invalidate(
+            dbapi_connection: Any,
+            record: ConnectionPoolEntry,
+            exception: BaseException | None,
+        ) -> None:
+            # The record's info is cleared on invalidation; release it first.
+            self._release(record)
+            self.invalidations[
+                type(exception).__name__ if exception is not None else "explicit"
+            ] += 1
+
+        def on_soft_invalidate(
+            dbapi_connection: Any,
+            record: ConnectionPoolEntry,
+            exception: BaseException | None,
+        ) -> None:
+            self.invalidations["soft"] += 1
+
+        event.listen(pool, "connect", on_connect)
+        event.listen(pool, "checkout", on_checkout)
+        event.listen(pool, "checkin", on_checkin)
+        event.listen(pool, "invalidate", on_invalidate)
+        event.listen(pool, "soft_invalidate", on_soft_invalidate)
+
+    def _release(self, record: ConnectionPoolEntry) -> None:
+        held = record.info.pop(_HELD_KEY, None)
+        if held is None:
+            return
+        route, checked_out_at = held
+        seconds = time.perf_counter() - checked_out_at
+        stats = self.routes.setdefault(route, RouteHold())
+        stats.held -= 1
+        stats.count += 1
+        stats.total_seconds += seconds
+        stats.max_seconds = max(stats.max_seconds, seconds)
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        self.checkout_wait.observe(seconds)
+        if timed_out:
+            self.checkout_timeouts += 1
+        if timed_out or seconds >= self.slow_checkout_seconds:
+            now = time.monotonic()
+            if timed_out or now - self._last_logged >= self.log_interval:
+                self._last_logged = now
+                self.log_top_routes(
+                    f"checkout {'timed out' if timed_out else 'waited'} "
+                    f"{seconds * 1000:.0f}ms"
+                )
+
+    def top_routes(self, limit: int = 5) -> list[tuple[str, RouteHold]]:
+        """Routes by total connection hold time, largest first."""
+        return sorted(
+            self.routes.items(), key=lambda item: item[1].total_seconds, reverse=True
+        )[:limit]
+
+    def log_top_routes(self, reason: str, limit: int = 5) -> None:
+        summary = ", ".join(
+            f"{route}: {stats.total_seconds:.2f}s over {stats.count} "
+            f"(max {stats.max_seconds * 1000:.0f}ms, holding {stats.held})"
+            for route, stats in self.top_routes(limit)
+        )
+        logger.warning("DB pool {}; top routes by hold time: {}", reason, summary)
+
+    def prometheus_lines(self) -> list[str]:
+        lines = self.checkout_wait.prometheus_lines("db_pool_checkout_wait_seconds")
+        lines += [
+            f"db_pool_checkout_timeouts_total {self.checkout_timeouts}",
+            f"db_pool_connects_total {self.connects}",
+            f"db_pool_overflow_checkouts_total {self.overflow_checkouts}",
+            f"db_pool_overflow_max {self.max_overflow}",
+        ]
+        for reason, count in sorted(self.invalidations.items()):
+            lines.append(f'db_pool_invalidations_total{{reason="{reason}"}} {count}')
+        for route, stats in sorted(self.routes.items()):
+            label = f'{{route="{route}"}}'
+            lines += [
+                f"db_pool_connection_hold_seconds_sum{label} {stats.total_seconds}",
+                f"db_pool_connection_hold_seconds_count{label} {stats.count}",
+                f"db_pool_connection_hold_seconds_max{label} {stats.max_seconds}",
+                f"db_pool_connections_held{label} {stats.held}",
+            ]
+        return lines
+
+
+pool_telemetry: Final[PoolTelemetry] = PoolTelemetry()
+
+
+class TimedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            pool_telemetry.observe_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        waited = time.perf_counter() - start
+        pool_telemetry.observe_wait(waited)
+        add_phase(DB_CHECKOUT, waited)
+        return connection
@@ -0,0 +1,294 @@
+"""
+Statistical sampling profiler for the running worker.
+
+While a profile is being taken, a sampler thread reads the Python stack of
+every thread with ``sys._current_frames()`` every ``interval`` seconds. No
+tracing or profiling hook is installed, so the sampled code runs at full speed.
+When no profile is being taken, no thread runs and nothing is recorded.
+Threads waiting on a lock, a queue or the event loop's selector are skipped
+unless ``include_idle`` is set.
+
+Two ways to take a profile:
+
+- :func:`profile_worker` samples the whole worker for a fixed time (the
+  ``/api/v1/profiling/worker`` endpoint);
+- :class:`RequestSampler` samples one request (``ProfilingMiddleware`` with a
+  signed ``X-Profile`` header). On the event loop thread it keeps only samples
+  in which that request's task is running. While the task is suspended, it
+  records the task's ``await`` chain under a ``waiting`` root instead.
+
+Only one profile runs at a time (``profiling_lock``). A :class:`Profile` is
+exported as collapsed stacks (for ``flamegraph.pl``) or speedscope JSON, both
+weighted by the time between samples.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import hmac
+import json
+import queue
+import selectors
+import sys
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Sequence
+from functools import lru_cache
+from types import CodeType, FrameType
+from typing import Any, Final, Literal
+
+__all__: Final[Sequence[str]] = (
+    "Profile",
+    "ProfileFormat",
+    "RequestSampler",
+    "profile_worker",
+    "profiling_lock",
+    "sign_profile_token",
+    "verify_profile_token",
+)
+
+ProfileFormat = Literal["speedscope", "collapsed"]
+
+WAITING: Final[str] = "waiting"
+MAX_DEPTH: Final[int] = 256
+# A thread whose innermost Python frame is in one of these files is parked.
+_IDLE_FILES: Final[frozenset[str]] = frozenset(
+    {threading.__file__, queue.__file__, selectors.__file__}
+)
+
+profiling_lock: Final[threading.Lock] = threading.Lock()
+
+Stack = tuple[CodeType, ...]
+
+
+@lru_cache(maxsize=4096)
+def _short_path(filename: str) -> str:
+    best = ""
+    for entry in sys.path:
+        if entry and filename.startswith(entry) and len(entry) > len(best):
+            best = entry
+    return filename[len(best) :].lstrip("/\\") if best else filename
+
+
+def _label(code: CodeType) -> str:
+    name = f"{code.co_qualname} ({_short_path(code.co_filename)}:{code.co_firstlineno})"
+    return name.replace(";", ":")
+
+
+def _stack(frame: FrameType | None) -> Stack:
+    """The frame and its callers, outermost first."""
+    codes: list[CodeType] = []
+    while frame is not None and len(codes) < MAX_DEPTH:
+        codes.append(frame.f_code)
+        frame = frame.f_back
+    codes.reverse()
+    return tuple(codes)
+
+
+def _await_stack(coro: Any) -> Stack:
+    """Where a suspended coroutine waits, outermost first."""
+    codes: list[CodeType] = []
+    while coro is not None and len(codes) < MAX_DEPTH:
+        frame = getattr(coro, "cr_frame", None) or getattr(coro, "gi_frame", None)
+        if frame is None:
+            break
+        codes.append(frame.f_code)
+        coro = getattr(coro, "cr_await", None) or getattr(coro, "gi_yieldfrom", None)
+    return tuple(codes)
+
+
+class Profile:
+    """Sampled stacks per thread, with how often and how long each was seen."""
+
+    def __init__(self, name: str, interval: float) -> None:
+        self.name = name
+        self.interval = interval
+        self.counts: Counter[tuple[str, Stack]] = Counter()
+        self.seconds: dict[tuple[str, Stack], float] = {}
+        self.duration: float = 0.0
+
+    def add(self, thread: str, stack: Stack, seconds: float) -> None:
+        key = (thread, stack)
+        self.counts[key] += 1
+        self.seconds[key] = self.seconds.get(key, 0.0) + seconds
+
+    @property
+    def samples(self) -> int:
+        return sum(self.counts.values())
+
+    def collapsed(self) -> str:
+        """One ``thread;outer;...;inner microseconds`` line per distinct stack.
+
+        Weighted by time rather than sample count: a thread busy in Python
+        holds the GIL, so the sampler runs less often while it does.
+        """
+        lines = sorted(
+            ";".join([thread, *map(_label, stack)]) + f" {round(seconds * 1e6)}"
+            for (thread, stack), seconds in self.seconds.items()
+        )
+        return "\n".join(lines) + "\n" if lines else ""
+
+    def speedscope(self) -> dict[str, Any]:
+        """The profile in speedscope's file format, one profile per thread."""
+        frames: list[dict[str, Any]] = []
+        index: dict[CodeType, int] = {}
+        threads: dict[str, tuple[list[list[int]], list[float]]] = {}
+        for (thread, stack), seconds in self.seconds.items():
+            sample: list[int] = []
+            for code in stack:
+                if code not in index:
+                    index[code] = len(frames)
+                    frames.append(
+                        {
+                            "name": code.co_qualname,
+                            "file": _short_path(code.co_filename),
+                            "line": code.co_firstlineno,
+                        }
+                    )
+                sample.append(index[code])
+            samples, weights = threads.setdefault(thread, ([], []))
+            samples.append(sample)
+            weights.append(seconds)
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "name": self.name,
+            "exporter": "reviewpoint",
+            "activeProfileIndex": 0,
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": thread,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": sum(weights),
+                    "samples": samples,
+                    "weights": weights,
+                }
+                for thread, (samples, weights) in sorted(threads.items())
+            ],
+        }
+
+    def render(self, fmt: ProfileFormat) -> tuple[bytes, str, str]:
+        """Body, media type and file extension for the chosen format."""
+        if fmt == "collapsed":
+            return self.collapsed().encode(), "text/plain", "collapsed.txt"
+        return (
+            json.dumps(self.speedscope(), separators=(",", ":")).encode(),
+            "application/json",
+            "speedscope.json",
+        )
+
+
+def _sample(
+    profile: Profile,
+    stop: threading.Event,
+    deadline: float | None,
+    include_idle: bool,
+    pick: Callable[[int, FrameType], tuple[str, Stack] | None] | None = None,
+) -> None:
+    own: int = threading.get_ident()
+    names: dict[int, str] = {}
+    start = last = time.perf_counter()
+    while not stop.wait(profile.interval):
+        now = time.perf_counter()
+        elapsed, last = now - last, now
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            if pick is not None:
+                picked = pick(ident, frame)
+                if picked is None:
+                    continue
+                thread, stack = picked
+            else:
+                if ident not in names:
+                    names = {t.ident: t.name for t in threading.enumerate() if t.ident}
+                thread, stack = names.get(ident, str(ident)), _stack(frame)
+            if not stack or (
+                not include_idle
+                and thread != WAITING
+                and stack[-1].co_filename in _IDLE_FILES
+            ):
+                continue
+            profile.add(thread, stack, elapsed)
+        if deadline is not None and now >= deadline:
+            break
+    profile.duration = time.perf_counter() - start
+
+
+def profile_worker(
+    seconds: float, interval: float = 0.01, include_idle: bool = False
+) -> Profile:
+    """Sample every thread of this process for ``seconds``; blocks meanwhile.
+
+    Run it in a thread (``asyncio.to_thread``) so the event loop keeps serving
+    and shows up in the profile. The caller holds ``profiling_lock``.
+    """
+    profile = Profile(f"worker {threading.main_thread().name}", interval)
+    _sample(profile, threading.Event(), time.perf_counter() + seconds, include_idle)
+    return profile
+
+
+class RequestSampler:
+    """Sample the current request until :meth:`stop`.
+
+    Create it on the event loop thread, inside the request's task. Threads
+    other than the event loop thread are sampled whole (sync dependencies and
+    endpoints run in the thread pool), so concurrent requests can show up there.
+    """
+
+    def __init__(self, name: str, interval: float = 0.001) -> None:
+        self.profile = Profile(name, interval)
+        self._loop = asyncio.get_running_loop()
+        self._task = asyncio.current_task()
+        self._loop_thread = threading.get_ident()
+        self._names: dict[int, str] = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=_sample,
+            args=(self.profile, self._stop, None, False, self._pick),
+            name="request-profiler",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _pick(self, ident: int, frame: FrameType) -> tuple[str, Stack] | None:
+        if ident not in self._names:
+            self._names = {t.ident: t.name for t in threading.enumerate() if t.ident}
+        if ident != self._loop_thread:
+            return self._names.get(ident, str(ident)), _stack(frame)
+        if self._task is None:
+            return None
+        if asyncio.current_task(self._loop) is self._task:
+            return self._names.get(ident, str(ident)), _stack(frame)
+        return WAITING, _await_stack(self._task.get_coro())
+
+    def stop(self) -> Profile:
+        self._stop.set()
+        self._thread.join()
+        return self.profile
+
+
+def _signature(secret: str, method: str, path: str, expires: int) -> str:
+    message = f"{expires}:{method.upper()} {path}".encode()
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def sign_profile_token(secret: str, method: str, path: str, expires: int) -> str:
+    """An ``X-Profile`` value for one method and path, valid until ``expires``."""
+    return f"{expires}.{_signature(secret, method, path, expires)}"
+
+
+def verify_profile_token(
+    token: str, secret: str, method: str, path: str, now: float | None = None
+) -> bool:
+    expires_text, _, signature = token.partition(".")
+    if not expires_text.isdigit():
+        return False
+    expires = int(expires_text)
+    if expires < (time.time() if now is None else now):
+        return False
+    return hmac.compare_digest(signature, _signature(secret, method, path, expires))
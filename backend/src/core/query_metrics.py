@@ -0,0 +1,165 @@
+"""
+Per-request query accounting.
+
+Cursor events on every engine record each statement and its database time into
+the :class:`QueryStats` of the current context. The request logging middleware
+opens one per request with :func:`track_queries`, next to ``request_id_var``.
+From it the middleware logs the query count and time, and outside production
+returns them as ``X-DB-Queries`` and ``Server-Timing`` headers.
+
+Two things are logged as they happen:
+
+- a statement slower than ``db_slow_query_ms``, with its normalized SQL;
+- an N+1 pattern: the same statement shape run ``db_n_plus_one_threshold``
+  times in one request (logged once per shape).
+
+Collectors nest. A test can wrap a request in ``track_queries()`` and still see
+the statements counted by the middleware's collector (see the ``query_budget``
+fixture).
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Final
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine, ExecutionContext
+
+from src.core.pool_metrics import pool_route_ctx_var
+
+__all__: Final[Sequence[str]] = (
+    "QueryStats",
+    "configure",
+    "normalize_sql",
+    "query_stats_ctx_var",
+    "track_queries",
+)
+
+query_stats_ctx_var: Final[ContextVar[QueryStats | None]] = ContextVar(
+    "query_stats", default=None
+)
+
+# Thresholds, set from the settings when the engine is created.
+_slow_query_seconds: float = 0.2
+_n_plus_one_threshold: int = 10
+
+# connection.info key: start time of the statement running on it.
+_STARTED_KEY: Final[str] = "query_started"
+
+_STRING_LITERAL: Final[re.Pattern[str]] = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL: Final[re.Pattern[str]] = re.compile(r"(?<![\w.$])\d+(?:\.\d+)?\b")
+_PLACEHOLDER: Final[re.Pattern[str]] = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+")
+_VALUE_LIST: Final[re.Pattern[str]] = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE: Final[re.Pattern[str]] = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """SQL with literals and placeholders as ``?`` and ``IN`` lists as ``(?)``."""
+    sql = _STRING_LITERAL.sub("?", statement)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _NUMBER_LITERAL.sub("?", sql)
+    sql = _VALUE_LIST.sub("(?)", sql)
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def configure(slow_query_ms: int, n_plus_one_threshold: int) -> None:
+    global _slow_query_seconds, _n_plus_one_threshold
+    _slow_query_seconds = slow_query_ms / 1000
+    _n_plus_one_threshold = n_plus_one_threshold
+
+
+class QueryStats:
+    """Statements and database time seen while this collector was active."""
+
+    def __init__(
+        self, parent: QueryStats | None = None, request_id: str | None = None
+    ) -> None:
+        self.parent = parent
+        self.request_id = request_id
+        self.count: int = 0
+        self.seconds: float = 0.0
+        self.shapes: Counter[str] = Counter()
+        self.repeated: list[str] = []
+
+    def record(self, statement: str, seconds: float) -> None:
+        stats: QueryStats | None = self
+        while stats is not None:
+            stats.count += 1
+            stats.seconds += seconds
+            stats.shapes[statement] += 1
+            stats = stats.parent
+        # Only the innermost collector reports, so a pattern is logged once.
+        if self.shapes[statement] == _n_plus_one_threshold:
+            sql = normalize_sql(statement)
+            self.repeated.append(sql)
+            logger.warning(
+                "Possible N+1: {} ran the same statement {} times (request {}): {}",
+                pool_route_ctx_var.get(),
+                _n_plus_one_threshold,
+                self.request_id,
+                sql,
+            )
+
+    def summary(self) -> str:
+        """The statements run, most repeated first, for assertion messages."""
+        return "\n".join(
+            f"{count:>4} x {normalize_sql(statement)}"
+            for statement, count in self.shapes.most_common()
+        )
+
+
+@contextmanager
+def track_queries(request_id: str | None = None) -> Iterator[QueryStats]:
+    """Count the statements run in this context until the block exits."""
+    stats = QueryStats(parent=query_stats_ctx_var.get(), request_id=request_id)
+    token = query_stats_ctx_var.set(stats)
+    try:
+        yield stats
+    finally:
+        query_stats_ctx_var.reset(token)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    # Overwritten by the next statement, so a failed one leaves nothing behind.
+    conn.info[_STARTED_KEY] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Connection,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    started: float | None = conn.info.pop(_STARTED_KEY, None)
+    if started is None:
+        return
+    seconds = time.perf_counter() - started
+    stats = query_stats_ctx_var.get()
+    if stats is not None:
+        stats.record(statement, seconds)
+    if seconds >= _slow_query_seconds:
+        logger.bind(component="slow_query").warning(
+            "Slow query {:.0f}ms on {} (request {}): {}",
+            seconds * 1000,
+            pool_route_ctx_var.get(),
+            stats.request_id if stats is not None else None,
+            normalize_sql(statement),
+        )
@@ -0,0 +1,276 @@
+"""
+Read-replica routing.
+
+Every write goes to the primary engine. Replica engines, configured with
+``db_replica_urls``, serve the repository reads marked with
+:func:`replica_read`, but only in sessions that opted in with
+:func:`allow_replica_reads`. The unit of work does that for GET and HEAD
+requests, and exports that open their own session do it themselves.
+
+A session that has written anything is pinned to the primary for the rest of
+its life, so a request always reads its own writes. A replica is used only if
+its last health check passed and its replication lag was within
+``db_replica_max_lag_seconds``. When no replica qualifies, reads fall back to
+the primary.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import functools
+import inspect
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Final, TypeVar, cast
+
+from loguru import logger
+from sqlalchemy import Delete, Insert, Update, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+from typing_extensions import TypedDict
+
+__all__: Final[Sequence[str]] = (
+    "ReplicaSet",
+    "ReplicaStats",
+    "RoutingSession",
+    "allow_replica_reads",
+    "is_pinned",
+    "replica_read",
+    "replica_set",
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# session.info keys: the session may read from replicas / how many
+# replica_read calls are running / the session has written (primary only) /
+# the replica the session reads from.
+_ALLOW_KEY: Final[str] = "replica_allowed"
+_READS_KEY: Final[str] = "replica_reads"
+_PINNED_KEY: Final[str] = "replica_pinned"
+_REPLICA_KEY: Final[str] = "replica"
+
+# Seconds the replica is behind the primary; 0 when it has replayed
+# everything it received (an idle primary sends nothing to replay).
+_POSTGRES_LAG: Final[str] = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() "
+    "OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class ReplicaStats(TypedDict):
+    name: str
+    healthy: bool
+    lag_seconds: float | None
+    reads: int
+
+
+@dataclass
+class Replica:
+    """One replica engine and the result of its last health check."""
+
+    name: str
+    engine: AsyncEngine
+    healthy: bool = False
+    lag_seconds: float | None = None
+    reads: int = 0
+
+
+@dataclass
+class ReplicaSet:
+    """Replica engines, their health, and the round-robin choice between them."""
+
+    max_lag_seconds: float = 5.0
+    interval: float = 5.0
+    timeout: float = 2.0
+    replicas: list[Replica] = field(default_factory=list)
+    primary_fallbacks: int = 0
+    _next: int = 0
+    _task: asyncio.Task[None] | None = None
+
+    def configure(self, engines: Sequence[AsyncEngine]) -> None:
+        """Replace the replica engines; none is used until it passes a check."""
+        self.replicas = [
+            Replica(name=f"replica{i}", engine=engine)
+            for i, engine in enumerate(engines)
+        ]
+        self._next = 0
+
+    def usable(self, replica: Replica) -> bool:
+        return (
+            replica.healthy
+            and replica.lag_seconds is not None
+            and replica.lag_seconds <= self.max_lag_seconds
+        )
+
+    def pick(self) -> Replica | None:
+        """Next usable replica in turn, or ``None`` to read from the primary."""
+        count = len(self.replicas)
+        for step in range(count):
+            replica = self.replicas[(self._next + step) % count]
+            if self.usable(replica):
+                self._next = (self._next + step + 1) % count
+                return replica
+        return None
+
+    async def _measure(self, replica: Replica) -> float:
+        async with replica.engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                lag = (await conn.execute(text(_POSTGRES_LAG))).scalar_one()
+            else:
+                # No streaming replication to measure (e.g. a local SQLite copy).
+                await conn.execute(text("SELECT 1"))
+                lag = 0
+        return float(lag)
+
+    async def check(self) -> None:
+        """Probe every replica once and record its health and lag."""
+        for replica in self.replicas:
+            was_usable = self.usable(replica)
+            try:
+                async with asyncio.timeout(self.timeout):
+                    replica.lag_seconds = await self._measure(replica)
+                replica.healthy = True
+            except Exception as exc:
+                replica.healthy = False
+                replica.lag_seconds = None
+                if was_usable:
+                    logger.warning("Replica {} failed its check: {}", replica.name, exc)
+            if was_usable and not self.usable(replica) and replica.healthy:
+                logger.warning(
+                    "Replica {} is {:.1f}s behind; reading from others",
+                    replica.name,
+                    replica.lag_seconds,
+                )
+            elif not was_usable and self.usable(replica):
+                logger.info("Replica {} is serving reads", replica.name)
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.check()
+
+    async def start(self) -> None:
+        """Check the replicas now, then keep checking them in the background."""
+        if not self.replicas:
+            return
+        await self.check()
+        task = self._task
+        if task is None or task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the checks and close the replica connection pools."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def stats(self) -> list[ReplicaStats]:
+        return [
+            ReplicaStats(
+                name=r.name,
+                healthy=r.healthy,
+                lag_seconds=r.lag_seconds,
+                reads=r.reads,
+            )
+            for r in self.replicas
+        ]
+
+
+replica_set: Final[ReplicaSet] = ReplicaSet()
+
+
+class RoutingSession(Session):
+    """Session that sends eligible reads to a replica and everything else to its bind."""
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        *,
+        clause: Any = None,
+        **kw: Any,
+    ) -> Any:
+        info = self.info
+        if (
+            info.get(_READS_KEY)
+            and info.get(_ALLOW_KEY)
+            and not is_pinned(self)
+            and not self._flushing
+            and not isinstance(clause, Insert | Update | Delete)
+            and replica_set.replicas
+        ):
+            # One replica per session, so all its reads see the same snapshot.
+            replica: Replica | None = info.get(_REPLICA_KEY)
+            if replica is None:
+                replica = info[_REPLICA_KEY] = replica_set.pick()
+            if replica is not None:
+                replica.reads += 1
+                return cast(Engine, replica.engine.sync_engine)
+            replica_set.primary_fallbacks += 1
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(Session, "after_flush")
+def _pin_after_flush(session: Session, flush_context: UOWTransaction) -> None:
+    session.info[_PINNED_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _pin_after_write(state: ORMExecuteState) -> None:
+    if not state.is_select:
+        state.session.info[_PINNED_KEY] = True
+
+
+def is_pinned(session: Session) -> bool:
+    """Whether ``session`` has written and so must stay on the primary."""
+    return bool(session.info.get(_PINNED_KEY))
+
+
+def allow_replica_reads(session: AsyncSession) -> None:
+    """Let :func:`replica_read` calls on this session use a replica.
+
+    Only for sessions that can tolerate reading slightly stale data before
+    their first write (after it they stay on the primary anyway).
+    """
+    session.sync_session.info[_ALLOW_KEY] = True
+
+
+@contextlib.contextmanager
+def _reading(args: tuple[Any, ...], kwargs: dict[str, Any]) -> Iterator[None]:
+    session: AsyncSession = args[0] if args else kwargs["session"]
+    info = session.sync_session.info
+    info[_READS_KEY] = info.get(_READS_KEY, 0) + 1
+    try:
+        yield
+    finally:
+        info[_READS_KEY] -= 1
+
+
+def replica_read(fn: F) -> F:
+    """Mark a read-only repository function (``session`` first) as replica-safe.
+
+    Works on coroutine functions and async generators.
+    """
+    if inspect.isasyncgenfunction(fn):
+
+        @functools.wraps(fn)
+        async def stream(*args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+            with _reading(args, kwargs):
+                async for item in fn(*args, **kwargs):
+                    yield item
+
+        return cast(F, stream)
+
+    @functools.wraps(fn)
+    async def call(*args: Any, **kwargs: Any) -> Any:
+        with _reading(args, kwargs):
+            return await fn(*args, **kwargs)
+
+    return cast(F, call)
@@ -12,6 +12,7 @@ from jose import JWTError, jwt
 from loguru import logger
 
 from src.core.config import get_settings
+from src.core.jwt_keys import get_key_ring, is_asymmetric_algorithm
 
 # Add current dir to path for stubs
 # NOTE: Removed sys.path modification as it is not essential for production.
@@ -21,6 +22,7 @@ __all__: Sequence[str] = (
     "create_access_token",
     "create_refresh_token",
     "decode_access_token",
+    "decode_token_signature",
     "verify_access_token",
 )
 
@@ -35,6 +37,63 @@ class JWTPayload(TypedDict, total=False):
     # Add other claims as needed
 
 
+def _encode_token(claims: Mapping[str, object], kind: str) -> str:
+    """Sign claims with the key ring (asymmetric) or the shared HMAC secret.
+
+    Raises:
+        ValueError: If the JWT secret key is not configured for HMAC signing.
+    """
+    settings = get_settings()
+    if is_asymmetric_algorithm(settings.jwt_algorithm):
+        key = get_key_ring().signing_key()
+        return str(
+            jwt.encode(
+                dict(claims),
+                key.private_pem,
+                algorithm=key.algorithm,
+                headers={"kid": key.kid},
+            )
+        )
+    if not settings.jwt_secret_key:
+        logger.error(f"JWT secret key is not configured. Cannot create {kind} token.")
+        raise ValueError("JWT secret key is not configured.")
+    return str(
+        jwt.encode(
+            dict(claims),
+            settings.jwt_secret_key,
+            algorithm=settings.jwt_algorithm,
+        )
+    )
+
+
+def decode_token_signature(
+    token: str,
+    secret: str | None = None,
+    algorithm: str | None = None,
+) -> dict[str, object]:
+    """Verify a token signature and expiry and return its claims.
+
+    Asymmetric tokens are verified with the public key named by their ``kid``
+    header; HMAC tokens with ``secret`` (defaults to the configured secret).
+
+    Raises:
+        JWTError: If the token is invalid, expired or signed by an unknown key.
+        ValueError: If the JWT secret key is not configured for HMAC tokens.
+    """
+    settings = get_settings()
+    alg: str = algorithm or settings.jwt_algorithm
+    if is_asymmetric_algorithm(alg):
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = get_key_ring().get(str(kid)) if kid else None
+        if key is None:
+            raise JWTError("Unknown signing key")
+        return dict(jwt.decode(token, dict(key.public_jwk), algorithms=[key.algorithm]))
+    key_material: str | None = secret or settings.jwt_secret_key
+    if not key_material:
+        raise ValueError("JWT secret key is not configured.")
+    return dict(jwt.decode(token, key_material, algorithms=[alg]))
+
+
 def create_access_token(data: Mapping[str, str | int | bool]) -> str:
     """Create a JWT access token with the given data payload.
     Uses config-driven secret, expiry, and algorithm.
@@ -55,19 +114,12 @@ def create_access_token(data: Mapping[str, str | int | bool]) -> str:
     to_encode["exp"] = expire
     to_encode["iat"] = int(datetime.now(UTC).timestamp())
     to_encode["jti"] = str(uuid.uuid4())
-    if not settings.jwt_secret_key:
-        logger.error("JWT secret key is not configured. Cannot create access token.")
-        raise ValueError("JWT secret key is not configured.")
-
     try:
-        token: str = jwt.encode(
-            to_encode,
-            settings.jwt_secret_key,
-            algorithm=settings.jwt_algorithm,
-        )
-        logger.debug(
+        token: str = _encode_token(to_encode, "access")
+        # lazy: the claims dict is only built when DEBUG is enabled
+        logger.opt(lazy=True).debug(
             "JWT access token created (claims: {})",
-            {k: v for k, v in to_encode.items() if k != "exp"},
+            lambda: {k: v for k, v in to_encode.items() if k != "exp"},
         )
         return str(token)
     except ValueError as e:
@@ -109,20 +161,18 @@ def verify_access_token(token: str) -> JWTPayload:
         logger.warning("JWT access token validation failed: Malformed token format")
         raise JWTError("Invalid token format")
 
-    if not settings.jwt_secret_key:
+    if not settings.jwt_secret_key and not is_asymmetric_algorithm(
+        settings.jwt_algorithm
+    ):
         logger.error("JWT secret key is not configured. Cannot verify access token.")
         raise ValueError("JWT secret key is not configured.")
     try:
-        payload: dict[str, object] = jwt.decode(
-            token,
-            settings.jwt_secret_key,
-            algorithms=[settings.jwt_algorithm],
-        )
+        payload: dict[str, object] = decode_token_signature(token)
         if not isinstance(payload, dict):
             raise TypeError("Decoded JWT payload is not a dictionary")
-        logger.debug(
+        logger.opt(lazy=True).debug(
             "JWT access token successfully verified (claims: {})",
-            {k: v for k, v in payload.items() if k != "exp"},
+            lambda: {k: v for k, v in payload.items() if k != "exp"},
         )
         # Cast to JWTPayload for type safety
         return cast("JWTPayload", payload)
@@ -167,24 +217,16 @@ def create_refresh_token(data: Mapping[str, str | int | bool]) -> str:
         RuntimeError: If token creation fails for unknown reasons.
 
     """
-    settings = get_settings()
     to_encode: MutableMapping[str, str | int | bool | datetime] = dict(data)
     expire: datetime = datetime.now(UTC) + timedelta(days=7)
     to_encode["exp"] = expire
     to_encode["iat"] = int(datetime.now(UTC).timestamp())
     to_encode["jti"] = str(uuid.uuid4())
-    if not settings.jwt_secret_key:
-        logger.error("JWT secret key is not configured. Cannot create refresh token.")
-        raise ValueError("JWT secret key is not configured.")
     try:
-        token: str = jwt.encode(
-            to_encode,
-            settings.jwt_secret_key,
-            algorithm=settings.jwt_algorithm,
-        )
-        logger.debug(
+        token: str = _encode_token(to_encode, "refresh")
+        logger.opt(lazy=True).debug(
             "JWT refresh token created (claims: {})",
-            {k: v for k, v in to_encode.items() if k != "exp"},
+            lambda: {k: v for k, v in to_encode.items() if k != "exp"},
         )
         return str(token)
     except ValueError as e:
@@ -207,15 +249,13 @@ def verify_refresh_token(token: str) -> JWTPayload:
 
     """
     settings = get_settings()
-    if not settings.jwt_secret_key:
+    if not settings.jwt_secret_key and not is_asymmetric_algorithm(
+        settings.jwt_algorithm
+    ):
         logger.error("JWT secret key is not configured. Cannot verify refresh token.")
         raise ValueError("JWT secret key is not configured.")
     try:
-        payload: dict[str, object] = jwt.decode(
-            token,
-            settings.jwt_secret_key,
-            algorithms=[settings.jwt_algorithm],
-        )
+        payload: dict[str, object] = decode_token_signature(token)
         if not isinstance(payload, dict):
             raise TypeError("Decoded JWT payload is not a dictionary")
         # Ensure required claims are present
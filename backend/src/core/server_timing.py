@@ -0,0 +1,298 @@
+"""
+Per-request timing of dependencies, the handler and serialization.
+
+:func:`instrument_routes` wraps the call of every dependency of every
+``APIRoute``, nested ones included, and the endpoint itself. Each request gets
+a :class:`RequestTimings` in ``request_timings_ctx_var``, which collects:
+
+- one phase per dependency, named after it (``get_current_user``,
+  ``get_async_session``, ``require_feature.dependency``). A phase covers only
+  the dependency's own code, not the dependencies it depends on. For
+  dependencies with ``yield``, only the code before the ``yield`` is timed;
+- ``handler``, the endpoint body;
+- ``serialize``, from the endpoint's return to the response start, which is
+  response validation, encoding and rendering;
+- ``db-checkout``, time spent waiting for a pooled connection. This happens
+  inside another phase and is also counted there.
+
+Every phase is recorded in the ``http_phase_duration_seconds`` histogram by
+method, route and phase. The phases are also returned in ``Server-Timing`` when
+``server_timing_enabled`` is set, or when the request sends ``X-Server-Timing``
+with a valid ``X-API-Key``. The request logging middleware adds its ``db``
+entry to the same header.
+
+The dependency wrappers compare and hash equal to the wrapped callable, so
+``app.dependency_overrides`` keyed by the original still apply. Overridden
+dependencies are not timed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hmac
+import re
+import time
+from collections.abc import AsyncIterator, Callable, Iterator, Sequence
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Final
+
+from fastapi import FastAPI
+from fastapi.dependencies.models import Dependant
+from fastapi.dependencies.utils import (
+    is_async_gen_callable,
+    is_coroutine_callable,
+    is_gen_callable,
+)
+from fastapi.routing import APIRoute
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import get_settings
+from src.core.metrics import PHASE_BUCKETS, metrics
+
+__all__: Final[Sequence[str]] = (
+    "DB_CHECKOUT",
+    "HANDLER",
+    "SERIALIZE",
+    "RequestTimings",
+    "add_phase",
+    "instrument_routes",
+    "request_timings_ctx_var",
+)
+
+HANDLER: Final[str] = "handler"
+SERIALIZE: Final[str] = "serialize"
+DB_CHECKOUT: Final[str] = "db-checkout"
+
+_REQUEST_HEADER: Final[bytes] = b"x-server-timing"
+_API_KEY_HEADER: Final[bytes] = b"x-api-key"
+# Characters not allowed in a Server-Timing metric name (an HTTP token).
+_NOT_TOKEN: Final[re.Pattern[str]] = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+phase_duration = metrics.histogram(
+    "http_phase_duration_seconds",
+    "Time per dependency, handler and serialization phase",
+    ("method", "route", "phase"),
+    PHASE_BUCKETS,
+)
+
+
+class RequestTimings:
+    """Seconds spent in each phase of one request, in the order first seen."""
+
+    def __init__(self) -> None:
+        self.phases: dict[str, float] = {}
+        self.handler_end: float | None = None
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self) -> str:
+        """The phases as a ``Server-Timing`` header value, in milliseconds."""
+        return ", ".join(
+            f"{phase};dur={seconds * 1000:.1f}"
+            for phase, seconds in self.phases.items()
+        )
+
+
+request_timings_ctx_var: Final[ContextVar[RequestTimings | None]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def add_phase(phase: str, seconds: float) -> None:
+    """Charge time to a phase of the current request, if it is being timed."""
+    timings = request_timings_ctx_var.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+def _phase_name(call: Callable[..., Any]) -> str:
+    name: str = getattr(call, "__qualname__", None) or type(call).__qualname__
+    return _NOT_TOKEN.sub("_", name.replace("<locals>.", ""))
+
+
+class _TimedCall:
+    """A dependency that charges its run time to ``phase``.
+
+    Compares and hashes equal to the wrapped callable, so dependency overrides
+    and ``inspect.signature`` see the original.
+    """
+
+    def __init__(self, call: Callable[..., Any], phase: str) -> None:
+        self.__wrapped__ = call
+        # FastAPI resolves string annotations against the call's globals.
+        self.__globals__ = getattr(call, "__globals__", {})
+        self.phase = phase
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, _TimedCall):
+            other = other.__wrapped__
+        return bool(self.__wrapped__ == other)
+
+    def __hash__(self) -> int:
+        return hash(self.__wrapped__)
+
+    def __repr__(self) -> str:
+        return f"<timed {self.__wrapped__!r}>"
+
+    def _done(self, start: float) -> None:
+        add_phase(self.phase, time.perf_counter() - start)
+
+
+class _TimedSync(_TimedCall):
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return self.__wrapped__(*args, **kwargs)
+        finally:
+            self._done(start)
+
+
+class _TimedAsync(_TimedCall):
+    async def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await self.__wrapped__(*args, **kwargs)
+        finally:
+            self._done(start)
+
+
+class _TimedGen(_TimedCall):
+    def __call__(self, *args: Any, **kwargs: Any) -> Iterator[Any]:
+        start = time.perf_counter()
+        with contextmanager(self.__wrapped__)(*args, **kwargs) as value:
+            self._done(start)
+            yield value
+
+
+class _TimedAsyncGen(_TimedCall):
+    async def __call__(self, *args: Any, **kwargs: Any) -> AsyncIterator[Any]:
+        start = time.perf_counter()
+        async with asynccontextmanager(self.__wrapped__)(*args, **kwargs) as value:
+            self._done(start)
+            yield value
+
+
+def _timed(call: Callable[..., Any]) -> _TimedCall:
+    # Same order as FastAPI's solve_dependencies, so the wrapper runs the same way.
+    phase = _phase_name(call)
+    if is_gen_callable(call):
+        return _TimedGen(call, phase)
+    if is_async_gen_callable(call):
+        return _TimedAsyncGen(call, phase)
+    if is_coroutine_callable(call):
+        return _TimedAsync(call, phase)
+    return _TimedSync(call, phase)
+
+
+def _timed_endpoint(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    # A plain function, so asyncio.iscoroutinefunction still sees the endpoint's kind.
+    def done(start: float) -> None:
+        end = time.perf_counter()
+        timings = request_timings_ctx_var.get()
+        if timings is not None:
+            timings.add(HANDLER, end - start)
+            timings.handler_end = end
+
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @wraps(endpoint)
+        async def timed_async(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                done(start)
+
+        return timed_async
+
+    @wraps(endpoint)
+    def timed_sync(*args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            done(start)
+
+    return timed_sync
+
+
+def _instrument_dependencies(dependant: Dependant) -> None:
+    for sub_dependant in dependant.dependencies:
+        _instrument_dependencies(sub_dependant)
+        if sub_dependant.call is not None and not isinstance(
+            sub_dependant.call, _TimedCall
+        ):
+            sub_dependant.call = _timed(sub_dependant.call)
+
+
+def _exposed(scope: Scope) -> bool:
+    settings = get_settings()
+    if getattr(settings, "server_timing_enabled", False):
+        return True
+    requested: bool = False
+    api_key: bytes | None = None
+    for name, value in scope["headers"]:
+        if name == _REQUEST_HEADER:
+            requested = True
+        elif name == _API_KEY_HEADER:
+            api_key = value
+    configured: str | None = getattr(settings, "api_key", None)
+    return (
+        requested
+        and api_key is not None
+        and bool(configured)
+        and hmac.compare_digest(api_key, str(configured).encode("latin-1"))
+    )
+
+
+class _RouteTimer:
+    """Collect one route's phases per request and report them."""
+
+    def __init__(self, app: ASGIApp, route: str) -> None:
+        self.app = app
+        self.route = route
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        timings = RequestTimings()
+        exposed = _exposed(scope)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                if timings.handler_end is not None:
+                    timings.add(SERIALIZE, time.perf_counter() - timings.handler_end)
+                if exposed and timings.phases:
+                    message.setdefault("headers", [])
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", timings.server_timing()
+                    )
+            await send(message)
+
+        token = request_timings_ctx_var.set(timings)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_timings_ctx_var.reset(token)
+            method: str = scope["method"]
+            for phase, seconds in timings.phases.items():
+                phase_duration.observe(seconds, method, self.route, phase)
+
+
+def instrument_routes(app: FastAPI) -> None:
+    """Time the dependencies, handler and serialization of every API route.
+
+    Call once all routers are included. Routes added later are not timed.
+    """
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or isinstance(route.app, _RouteTimer):
+            continue
+        _instrument_dependencies(route.dependant)
+        if route.dependant.call is not None:
+            route.dependant.call = _timed_endpoint(route.dependant.call)
+        route.app = _RouteTimer(route.app, route.path)
@@ -0,0 +1,150 @@
+"""
+Production SQLite mode.
+
+With ``db_sqlite_production`` the application runs on a single SQLite file,
+using two connection pools on it:
+
+- **readers**: ``db_sqlite_readers`` query-only connections. WAL lets them
+  read while a write is in progress.
+- **writer**: one connection. Every write in the process queues for it, in
+  arrival order, on the pool's async queue (``pool_telemetry`` records the
+  wait). Its transactions start with ``BEGIN IMMEDIATE``, so the write lock is
+  taken up front. ``busy_timeout`` then covers contention from other
+  processes, and a read lock never has to be upgraded mid-transaction (the
+  case SQLite reports as "database is locked" without waiting).
+
+:class:`SQLiteSession` sends a session's reads to the reader pool until the
+session writes. From then on everything goes to the writer, so the session
+reads its own writes.
+
+Every connection gets the pragmas in :func:`connection_pragmas`.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any, Final, cast
+
+from sqlalchemy import Delete, Insert, Update, event
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.pool import ConnectionPoolEntry
+
+from src.core.pool_metrics import TimedAsyncAdaptedQueuePool
+from src.core.replicas import RoutingSession, is_pinned
+
+__all__: Final[Sequence[str]] = (
+    "SQLitePools",
+    "SQLiteSession",
+    "connection_pragmas",
+    "create_sqlite_engines",
+    "sqlite_pools",
+)
+
+
+def connection_pragmas(settings: object) -> list[str]:
+    """The pragmas run on every connection in production SQLite mode."""
+    busy_timeout_ms = int(getattr(settings, "db_sqlite_busy_timeout_ms", 5000))
+    mmap_size_mb = int(getattr(settings, "db_sqlite_mmap_size_mb", 256))
+    cache_size_mb = int(getattr(settings, "db_sqlite_cache_size_mb", 64))
+    return [
+        "PRAGMA journal_mode=WAL",
+        # In WAL mode NORMAL only syncs at checkpoints; a power loss may undo
+        # the last commits but never corrupts the database.
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={busy_timeout_ms}",
+        f"PRAGMA mmap_size={mmap_size_mb * 1024 * 1024}",
+        # Negative: size in KiB rather than pages.
+        f"PRAGMA cache_size=-{cache_size_mb * 1024}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+
+
+def _on_connect(pragmas: Sequence[str], writer: bool) -> Any:
+    def apply(dbapi_connection: Any, record: ConnectionPoolEntry) -> None:
+        if writer:
+            # Let the "begin" listener issue BEGIN IMMEDIATE instead of the
+            # driver's deferred BEGIN.
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            if not writer:
+                # A write routed here by mistake fails instead of taking the lock.
+                cursor.execute("PRAGMA query_only=ON")
+        finally:
+            cursor.close()
+
+    return apply
+
+
+def _begin_immediate(conn: Connection) -> None:
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+def create_sqlite_engines(
+    url: str, settings: object, engine_kwargs: dict[str, object]
+) -> tuple[AsyncEngine, AsyncEngine]:
+    """
+    Build the writer and reader engines for one SQLite file.
+    Args:
+        url: The ``sqlite+aiosqlite`` URL of the database file.
+        settings: The application settings.
+        engine_kwargs: Common engine arguments.
+    Returns:
+        tuple[AsyncEngine, AsyncEngine]: The writer and the reader engine.
+    """
+    pragmas = connection_pragmas(settings)
+    readers = int(getattr(settings, "db_sqlite_readers", 4))
+    writer = create_async_engine(
+        url,
+        **engine_kwargs,
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+    )
+    reader = create_async_engine(
+        url, **engine_kwargs, pool_size=readers, max_overflow=2 * readers
+    )
+    event.listen(writer.sync_engine, "connect", _on_connect(pragmas, writer=True))
+    event.listen(writer.sync_engine, "begin", _begin_immediate)
+    event.listen(reader.sync_engine, "connect", _on_connect(pragmas, writer=False))
+    return writer, reader
+
+
+@dataclass
+class SQLitePools:
+    """The reader engine of production SQLite mode, if it is on."""
+
+    reader: AsyncEngine | None = None
+
+    async def stop(self) -> None:
+        reader, self.reader = self.reader, None
+        if reader is not None:
+            await reader.dispose()
+
+
+sqlite_pools: Final[SQLitePools] = SQLitePools()
+
+
+class SQLiteSession(RoutingSession):
+    """Session that reads from the reader pool until it writes."""
+
+    def get_bind(
+        self,
+        mapper: Any = None,
+        *,
+        clause: Any = None,
+        **kw: Any,
+    ) -> Any:
+        reader = sqlite_pools.reader
+        if (
+            reader is not None
+            and not is_pinned(self)
+            and not self._flushing
+            and not isinstance(clause, Insert | Update | Delete)
+        ):
+            return cast(Engine, reader.sync_engine)
+        return super().get_bind(mapper, clause=clause, **kw)
@@ -0,0 +1,125 @@
+"""
+Request-scoped unit of work.
+
+Repositories and services only flush. The unit of work wrapping a request
+commits once, when the request succeeds, and rolls back otherwise. A step
+that may fail on its own without failing the request runs inside
+``savepoint()``.
+"""
+
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from types import TracebackType
+from typing import Final
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session, UOWTransaction
+
+# Set in session.info once the open transaction has written something.
+_WRITES_KEY: Final[str] = "uow_writes"
+
+# session.info lists of work deferred until the transaction commits.
+AUDIT_PENDING_KEY: Final[str] = "audit_pending"
+ANALYTICS_PENDING_KEY: Final[str] = "analytics_rollup_pending"
+PRINCIPAL_INVALIDATIONS_KEY: Final[str] = "principal_invalidations"
+ON_COMMIT_KEYS: Final[tuple[str, ...]] = (
+    AUDIT_PENDING_KEY,
+    ANALYTICS_PENDING_KEY,
+    PRINCIPAL_INVALIDATIONS_KEY,
+)
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush(session: Session, flush_context: UOWTransaction) -> None:
+    session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement(state: ORMExecuteState) -> None:
+    # Anything that is not a SELECT (including textual SQL) counts as a write.
+    if not state.is_select:
+        state.session.info[_WRITES_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _clear_writes(session: Session) -> None:
+    # after_rollback also fires for a SAVEPOINT; the outer writes still count.
+    if not session.in_nested_transaction():
+        session.info.pop(_WRITES_KEY, None)
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Whether the open transaction has flushed or executed any write."""
+    sync_session: Session = session.sync_session
+    return bool(
+        sync_session.info.get(_WRITES_KEY)
+        or sync_session.new
+        or sync_session.dirty
+        or sync_session.deleted
+    )
+
+
+class UnitOfWork:
+    """One transaction per request on a single ``AsyncSession``.
+
+    Use as ``async with UnitOfWork(session) as uow``. On a clean exit the
+    session is committed only if it wrote anything; a read-only transaction
+    is released when the session closes, without a COMMIT round trip. On an
+    exception everything is rolled back.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self.session = session
+
+    async def __aenter__(self) -> "UnitOfWork":
+        # Statements run before the unit of work began (e.g. a connection
+        # check) are not writes of this request.
+        self.session.sync_session.info.pop(_WRITES_KEY, None)
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        if exc_type is not None:
+            await self.rollback()
+        elif has_pending_writes(self.session):
+            await self.commit()
+
+    async def commit(self) -> None:
+        """Commit now; rolls back and re-raises if the commit fails."""
+        try:
+            await self.session.commit()
+        except Exception as exc:
+            logger.error(f"Unit of work commit failed: {exc}")
+            await self.session.rollback()
+            raise
+
+    async def rollback(self) -> None:
+        """Discard everything written since the last commit."""
+        if self.session.in_transaction():
+            await self.session.rollback()
+
+    @asynccontextmanager
+    async def savepoint(self) -> AsyncIterator[AsyncSession]:
+        """Run a block in a SAVEPOINT.
+
+        If the block raises, only its own writes are rolled back, along with
+        the on-commit events (``ON_COMMIT_KEYS``) it queued on the session; the
+        exception is re-raised.
+        """
+        info = self.session.sync_session.info
+        queued: dict[str, int] = {key: len(info.get(key, ())) for key in ON_COMMIT_KEYS}
+        try:
+            async with self.session.begin_nested():
+                yield self.session
+        except BaseException:
+            for key, length in queued.items():
+                if key in info:
+                    del info[key][length:]
+            raise
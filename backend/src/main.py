@@ -3,23 +3,32 @@ import sys
 import time
 from typing import Any, Final
 
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
-from fastapi.responses import JSONResponse, Response
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
 from loguru import logger
 
+from src.api.deps import get_unit_of_work
+from src.api.v1.analytics import router as analytics_router
+from src.api.v1.audit import router as audit_router
 from src.api.v1.auth import router as auth_router
 from src.api.v1.health import router as health_router
+from src.api.v1.profiling import router as profiling_router
 from src.api.v1.uploads import router as uploads_router
 from src.api.v1.users import all_routers
 from src.api.v1.websocket import router as websocket_router
+from src.api.well_known import router as well_known_router
 from src.core.app_logging import init_logging
 from src.core.config import get_settings
 from src.core.documentation import get_enhanced_openapi_schema
 from src.core.events import on_shutdown, on_startup
+from src.core.server_timing import instrument_routes
+from src.middlewares.front_door import FrontDoorMiddleware
 from src.middlewares.logging import RequestLoggingMiddleware
+from src.middlewares.metrics import MetricsMiddleware
+from src.middlewares.profiling import ProfilingMiddleware
 
 PYTEST_ENV_VAR: Final = "PYTEST_CURRENT_TEST"
 if PYTEST_ENV_VAR not in os.environ:
@@ -61,6 +70,8 @@ def create_app() -> FastAPI:
         docs_url="/docs",
         redoc_url="/redoc",
         openapi_url="/openapi.json",
+        # orjson serializes response bodies several times faster than json.dumps
+        default_response_class=ORJSONResponse,
         swagger_ui_parameters=swagger_ui_parameters,
         # Enhanced Swagger UI configuration
         swagger_ui_oauth2_redirect_url="/docs/oauth2-redirect",
@@ -73,7 +84,19 @@ def create_app() -> FastAPI:
     )
     # Initialize logging system
     settings = get_settings()
-    init_logging(level=settings.log_level)
+    init_logging(
+        level=settings.log_level,
+        performance=getattr(settings, "log_performance_mode", False),
+        sample_rates=getattr(settings, "log_sample_rates", None),
+    )
+
+    # Profile requests that send a signed X-Profile header (innermost, so the
+    # profile covers routing and the handler only)
+    app.add_middleware(ProfilingMiddleware)
+
+    # Reject rate-limited and credential-less requests before routing. Added
+    # before CORS so rejections still carry CORS headers.
+    app.add_middleware(FrontDoorMiddleware)
 
     # Add CORS middleware
     app.add_middleware(
@@ -84,22 +107,11 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
-    # DEBUG: Add comprehensive request tracing middleware
-    @app.middleware("http")
-    async def trace_all_requests(request: Request, call_next: Any) -> Any:
-        logger.critical(
-            f"🔍 TRACE: {request.method} {request.url.path} | "
-            f"query: {request.url.query}",
-        )
-        response = await call_next(request)
-        logger.critical(
-            f"🔍 RESPONSE: {response.status_code} for "
-            f"{request.method} {request.url.path}",
-        )
-        return response
-
     # Add request logging middleware
     app.add_middleware(RequestLoggingMiddleware)
+    # Per-route latency, status and byte metrics (outermost, so rejected and
+    # failed requests are recorded too)
+    app.add_middleware(MetricsMiddleware)
 
     # DEBUG: Add a simple test endpoint to verify the server is working
     @app.get("/debug/test")
@@ -112,10 +124,14 @@ def create_app() -> FastAPI:
         logger.info("DEBUG: Test POST endpoint hit successfully")
         return {"message": "POST is working", "timestamp": time.time()}
 
+    # Database-backed routers run each request in one transaction (unit of work)
+    unit_of_work: list[Any] = [Depends(get_unit_of_work)]
     # Register authentication router
-    app.include_router(auth_router, prefix="/api/v1/auth")
+    app.include_router(auth_router, prefix="/api/v1/auth", dependencies=unit_of_work)
     # Register health check endpoint
     app.include_router(health_router, prefix="/api/v1")
+    # Register admin profiling endpoints
+    app.include_router(profiling_router, prefix="/api/v1")
     # Mount static files directory
     static_dir: str = os.path.join(os.path.dirname(__file__), "static")
     app.mount(
@@ -126,11 +142,17 @@ def create_app() -> FastAPI:
 
     # Register user routers (modularized)
     for router in all_routers:
-        app.include_router(router, prefix="/api/v1/users")
+        app.include_router(router, prefix="/api/v1/users", dependencies=unit_of_work)
     # Register uploads router
-    app.include_router(uploads_router, prefix="/api/v1")
+    app.include_router(uploads_router, prefix="/api/v1", dependencies=unit_of_work)
+    # Register analytics (rollup) router
+    app.include_router(analytics_router, prefix="/api/v1", dependencies=unit_of_work)
+    # Register audit trail router
+    app.include_router(audit_router, prefix="/api/v1", dependencies=unit_of_work)
     # Register WebSocket router
     app.include_router(websocket_router, prefix="/api/v1")
+    # Register public key discovery (JWKS) at the application root
+    app.include_router(well_known_router)
 
     # DEBUG: Catch-all route to log unmatched paths (MUST BE LAST!)
     @app.api_route(
@@ -260,6 +282,8 @@ def create_app() -> FastAPI:
             content={"detail": str(exc)},
         )
 
+    # Time every route's dependencies, handler and serialization
+    instrument_routes(app)
     return app
 
 
@@ -358,7 +382,7 @@ def print_routes(app: FastAPI) -> None:
         route_path: str | None = getattr(route, "path", None)
         if route_path is None:
             continue
-        logging.info(f"{route_path} -> {getattr(route, 'endpoint', None)}")
+        logging.info("%s -> %s", route_path, getattr(route, "endpoint", None))
 
 
 # Conditionally print routes and router info only in development environment
@@ -384,7 +408,7 @@ def print_all_routes(app: FastAPI) -> None:
         route_path: str | None = getattr(route, "path", None)
         if route_path is None:
             continue
-        logging.info(f"{route_path} -> {getattr(route, 'endpoint', None)}")
+        logging.info("%s -> %s", route_path, getattr(route, "endpoint", None))
 
 
 # Conditionally print all routes only in development environment
@@ -0,0 +1,232 @@
+"""Pure ASGI front door that rejects abusive and unauthenticated traffic early.
+
+The middleware runs before routing, so a rejected request never resolves
+dependencies, parses a body or checks out a database connection. It only looks
+at the request line, headers and client address:
+
+* Per-client-address rate limits: a global limit for every HTTP request and a
+  stricter one for the credential endpoints (login, registration, token refresh
+  and password reset). Rejections are ``429`` with ``Retry-After``.
+* Credential presence: routes whose dependencies include an ``OAuth2`` bearer
+  scheme answer ``401 Not authenticated`` when no bearer token is sent, exactly as
+  the scheme itself would after routing. Token validation still happens in the
+  route dependencies.
+
+The client address is ``scope["client"]``; run uvicorn with ``--proxy-headers``
+and ``--forwarded-allow-ips`` behind a proxy so it is the real client.
+
+Example Usage:
+    ```python
+    app = FastAPI()
+    app.add_middleware(FrontDoorMiddleware)
+    ```
+"""
+
+import math
+from collections.abc import Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from re import Pattern
+from typing import Any, Final
+
+from fastapi.dependencies.models import Dependant
+from fastapi.routing import APIRoute
+from fastapi.security.oauth2 import OAuth2
+from loguru import logger
+from starlette.routing import BaseRoute, Mount, WebSocketRoute
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.core.config import get_settings
+from src.utils.rate_limit import AsyncRateLimiter, RateLimitDecision
+
+__all__: Final[Sequence[str]] = ("AUTH_ENDPOINTS", "FrontDoorMiddleware")
+
+# Credential endpoints that share the stricter per-address limit.
+AUTH_ENDPOINTS: Final[frozenset[tuple[str, str]]] = frozenset(
+    {
+        ("POST", "/api/v1/auth/login"),
+        ("POST", "/api/v1/auth/register"),
+        ("POST", "/api/v1/auth/refresh-token"),
+        ("POST", "/api/v1/auth/request-password-reset"),
+        ("POST", "/api/v1/auth/reset-password"),
+    }
+)
+_LIMIT_PERIOD_SECONDS: Final[float] = 60.0
+
+_TOO_MANY_REQUESTS: Final[bytes] = (
+    b'{"detail":"Too many requests. Please try again later."}'
+)
+_NOT_AUTHENTICATED: Final[bytes] = b'{"detail":"Not authenticated"}'
+
+
+@dataclass(frozen=True, slots=True)
+class _RouteEntry:
+    path_regex: Pattern[str]
+    methods: frozenset[str] | None
+    requires_bearer: bool
+
+
+def _requires_bearer(
+    dependant: Dependant, overrides: Mapping[Any, Any], seen: set[int]
+) -> bool:
+    """Return True if resolving ``dependant`` always runs an auto-error OAuth2 scheme."""
+    for dep in dependant.dependencies:
+        call = dep.call
+        if call in overrides or id(dep) in seen:
+            continue
+        seen.add(id(dep))
+        if isinstance(call, OAuth2) and call.auto_error:
+            return True
+        if _requires_bearer(dep, overrides, seen):
+            return True
+    return False
+
+
+def _route_entries(
+    routes: Sequence[BaseRoute], overrides: Mapping[Any, Any]
+) -> Iterator[_RouteEntry]:
+    for route in routes:
+        if isinstance(route, WebSocketRoute):
+            continue
+        path_regex: Pattern[str] | None = getattr(route, "path_regex", None)
+        if path_regex is None:
+            continue
+        if isinstance(route, APIRoute):
+            yield _RouteEntry(
+                path_regex,
+                frozenset(route.methods),
+                _requires_bearer(route.dependant, overrides, set()),
+            )
+        elif isinstance(route, Mount):
+            yield _RouteEntry(path_regex, None, False)
+        else:
+            methods: set[str] | None = getattr(route, "methods", None)
+            yield _RouteEntry(
+                path_regex, frozenset(methods) if methods else None, False
+            )
+
+
+def _has_bearer_token(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == b"authorization":
+            scheme, _, token = value.partition(b" ")
+            return scheme.lower() == b"bearer" and bool(token)
+    return False
+
+
+class FrontDoorMiddleware:
+    """Reject rate-limited and credential-less requests before routing.
+
+    Limits are read from settings on every request (``front_door_enabled``,
+    ``front_door_ip_limit``, ``front_door_auth_limit``, requests per minute per
+    client address; ``0`` disables a limit). Limiter state uses the shared rate
+    limit store when one is configured.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the middleware.
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The ASGI application.
+        """
+        self.app: ASGIApp = app
+        self._limiters: dict[tuple[str, int], AsyncRateLimiter[str]] = {}
+        self._routes: tuple[_RouteEntry, ...] = ()
+        self._routes_key: tuple[int, int, tuple[int, ...]] | None = None
+
+    def _limiter(self, name: str, limit: int) -> AsyncRateLimiter[str]:
+        limiter = self._limiters.get((name, limit))
+        if limiter is None:
+            limiter = AsyncRateLimiter(
+                limit, _LIMIT_PERIOD_SECONDS, namespace=f"front_door:{name}"
+            )
+            self._limiters[(name, limit)] = limiter
+        return limiter
+
+    def _route_table(self, scope: Scope) -> tuple[_RouteEntry, ...]:
+        app: Any = scope.get("app")
+        router: Any = getattr(app, "router", None)
+        if router is None:
+            return ()
+        overrides: Mapping[Any, Any] = getattr(app, "dependency_overrides", {})
+        # Rebuilt when routes are added or dependency overrides change.
+        key = (id(router.routes), len(router.routes), tuple(map(id, overrides)))
+        if key != self._routes_key:
+            self._routes = tuple(_route_entries(router.routes, overrides))
+            self._routes_key = key
+        return self._routes
+
+    def _requires_bearer(self, scope: Scope) -> bool:
+        path: str = scope["path"]
+        method: str = scope["method"]
+        for entry in self._route_table(scope):
+            if entry.path_regex.match(path) is None:
+                continue
+            if entry.methods is None or method in entry.methods:
+                return entry.requires_bearer
+        return False
+
+    async def _check_limits(
+        self, scope: Scope, client: str
+    ) -> RateLimitDecision | None:
+        settings = get_settings()
+        checks: list[tuple[str, int]] = [("ip", settings.front_door_ip_limit)]
+        if (scope["method"], scope["path"]) in AUTH_ENDPOINTS:
+            checks.append(("auth", settings.front_door_auth_limit))
+        for name, limit in checks:
+            if limit <= 0:
+                continue
+            decision = await self._limiter(name, limit).check(client)
+            if not decision.allowed:
+                return decision
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process an ASGI connection."""
+        if scope["type"] != "http" or not get_settings().front_door_enabled:
+            await self.app(scope, receive, send)
+            return
+        client: str = scope["client"][0] if scope.get("client") else "unknown"
+        denied = await self._check_limits(scope, client)
+        if denied is not None:
+            logger.warning(
+                "Front door rate limit for {} on {} {}",
+                client,
+                scope["method"],
+                scope["path"],
+            )
+            await _reject(
+                send,
+                429,
+                _TOO_MANY_REQUESTS,
+                [(b"retry-after", str(math.ceil(denied.retry_after)).encode())],
+            )
+            return
+        if (
+            scope["method"] != "OPTIONS"
+            and not _has_bearer_token(scope)
+            and self._requires_bearer(scope)
+        ):
+            await _reject(
+                send, 401, _NOT_AUTHENTICATED, [(b"www-authenticate", b"Bearer")]
+            )
+            return
+        await self.app(scope, receive, send)
+
+
+async def _reject(
+    send: Send, status: int, body: bytes, headers: list[tuple[bytes, bytes]]
+) -> None:
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                *headers,
+            ],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
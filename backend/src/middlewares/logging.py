@@ -1,8 +1,13 @@
-"""FastAPI middleware for HTTP request/response logging.
+"""Pure ASGI middleware for HTTP request/response and WebSocket logging.
 
 This middleware adds a unique request ID to each request and logs details about
 requests and responses including timing information. It also attaches the
-request ID to logs and response headers for correlation.
+request ID to logs and response headers for correlation, and counts the
+database statements the request ran (see ``src.core.query_metrics``).
+
+It wraps ``send`` instead of the response: the status, headers and byte count
+are taken from the ASGI messages as they pass, so a ``StreamingResponse`` is
+forwarded chunk by chunk and never buffered.
 
 Example Usage:
     ```python
@@ -14,16 +19,20 @@ Example Usage:
     ```
 """
 
+from __future__ import annotations
+
 import time
 import uuid
-from collections.abc import Awaitable, Callable, Sequence
+from collections.abc import Sequence
 from contextvars import ContextVar, Token
-from typing import TYPE_CHECKING, Any, Final, cast
+from typing import TYPE_CHECKING, Final, cast
 
-from fastapi import Request, Response
 from loguru import logger
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.datastructures import MutableHeaders, QueryParams
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import get_settings
+from src.core.query_metrics import track_queries
 
 if TYPE_CHECKING:
     from loguru._logger import Logger
@@ -47,11 +56,16 @@ def get_request_id() -> str | None:
     return request_id_var.get()
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging HTTP requests with unique request IDs."""
+class RequestLoggingMiddleware:
+    """Middleware for logging HTTP requests with unique request IDs.
+
+    HTTP requests are logged when they arrive and again after the last body
+    chunk is sent, with the status, duration, bytes sent and database
+    statements. WebSocket connections are logged when they open and close.
+    """
 
     exclude_paths: Sequence[str]
-    logger: "Logger"
+    logger: Logger
     header_name: str
 
     def __init__(
@@ -59,8 +73,9 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         app: ASGIApp,
         *,
         exclude_paths: Sequence[str] | None = None,
-        logger_instance: "Logger | None" = None,
+        logger_instance: Logger | None = None,
         header_name: str = "X-Request-ID",
+        expose_query_headers: bool | None = None,
     ) -> None:
         """Initialize the middleware.
 
@@ -74,14 +89,12 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
             Custom logger to use, by default None (will use 'middleware.request')
         header_name : str, optional
             Name of the header to use for the request ID, by default "X-Request-ID"
-
-        Raises
-        ------
-        Exception
-            If logger_instance is not a Logger or None.
+        expose_query_headers : bool, optional
+            Add ``X-DB-Queries`` and ``Server-Timing`` to responses, by default
+            outside the prod environment
 
         """
-        super().__init__(app)
+        self.app: ASGIApp = app
         self.exclude_paths: Sequence[str] = (
             exclude_paths if exclude_paths is not None else ["/health", "/metrics"]
         )
@@ -90,99 +103,188 @@ class RequestLoggingMiddleware(BaseHTTPMiddleware):
         else:
             self.logger = cast("Logger", logger.bind(component="middleware.request"))
         self.header_name: str = header_name
+        self._header_key: bytes = header_name.lower().encode("latin-1")
+        if expose_query_headers is None:
+            expose_query_headers = (
+                getattr(get_settings(), "environment", "prod") != "prod"
+            )
+        self.expose_query_headers: bool = expose_query_headers
 
-    async def dispatch(
-        self,
-        request: Request,
-        call_next: Callable[[Request], Awaitable[Response]],
-    ) -> Response:
-        """Process a request and add logging and request ID tracking.
-
-        Parameters
-        ----------
-        request : Request
-            The incoming request
-        call_next : Callable[[Request], Awaitable[Response]]
-            The next middleware or route handler
-
-        Returns
-        -------
-        Response
-            The response with added X-Request-ID header
-
-        Raises
-        ------
-        Exception
-            Any exception raised during request processing is logged and re-raised.
+    def _request_id(self, scope: Scope) -> str:
+        for name, value in scope["headers"]:
+            if name == self._header_key:
+                return str(value.decode("latin-1"))
+        return str(uuid.uuid4())
 
-        """
-        # Skip excluded paths
-        if request.url.path in self.exclude_paths:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process an ASGI connection."""
+        if (
+            scope["type"] not in ("http", "websocket")
+            or scope["path"] in self.exclude_paths
+        ):
+            await self.app(scope, receive, send)
+            return
 
         # Generate or extract request ID
-        request_id: str = request.headers.get(self.header_name, str(uuid.uuid4()))
+        request_id: str = self._request_id(scope)
         # Set the request ID in the context variable for this request/response cycle
         token: Token[str | None] = request_id_var.set(request_id)
+        try:
+            if scope["type"] == "http":
+                await self._http(scope, receive, send, request_id)
+            else:
+                await self._websocket(scope, receive, send, request_id)
+        finally:
+            # Reset the context variable
+            request_id_var.reset(token)
 
-        # Prepare request details for logging
-        start_time: float = time.time()
+    def _filtered_query(self, scope: Scope) -> str:
+        query_string: bytes = scope.get("query_string", b"")
+        if not query_string:
+            return ""
         # Filter sensitive fields from query params
-        filtered_query: list[tuple[str, str]] = [
-            (k, "[FILTERED]") if k.lower() in SENSITIVE_FIELDS else (k, v)
-            for k, v in request.query_params.multi_items()
-        ]
-        filtered_query_str: str = "&".join(f"{k}={v}" for k, v in filtered_query)
-        log_extra: dict[str, Any] = {
-            "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "query": filtered_query_str,
-        }
-
-        cast("Logger", self.logger.bind(**log_extra)).info(  # type: ignore[no-untyped-call]
-            f"Request {request.method} {request.url.path} | query: {filtered_query_str}",
+        return "&".join(
+            f"{k}=[FILTERED]" if k.lower() in SENSITIVE_FIELDS else f"{k}={v}"
+            for k, v in QueryParams(query_string).multi_items()
         )
-        try:
-            # Process the request
-            response: Response = await call_next(request)
 
-            # Calculate request processing time
-            process_time: float = time.time() - start_time
-            process_time_ms: int = round(process_time * 1000)
+    async def _http(
+        self, scope: Scope, receive: Receive, send: Send, request_id: str
+    ) -> None:
+        method: str = scope["method"]
+        path: str = scope["path"]
+        filtered_query_str: str = self._filtered_query(scope)
+        log: Logger = cast(
+            "Logger",
+            self.logger.bind(  # type: ignore[no-untyped-call]
+                request_id=request_id,
+                method=method,
+                path=path,
+                query=filtered_query_str,
+            ),
+        )
+        log.info("Request {} {} | query: {}", method, path, filtered_query_str)
 
-            # Log the response
-            cast(
-                "Logger",
-                self.logger.bind(  # type: ignore[no-untyped-call]
-                    **log_extra,
-                    status_code=response.status_code,
-                    process_time_ms=process_time_ms,
-                ),
-            ).info(
-                f"Response {request.method} {request.url.path} completed with status {response.status_code} in {process_time_ms}ms | query: {filtered_query_str}",
-            )
+        start_time: float = time.perf_counter()
+        status_code: int | None = None
+        bytes_sent: int = 0
 
-            # Attach request ID to response headers
-            response.headers[self.header_name] = request_id
-            return response
+        # Process the request, counting its database statements
+        with track_queries(request_id) as queries:
 
-        except Exception as exc:
-            # Log exceptions with request context
-            error_process_time: float = time.time() - start_time
-            error_process_time_ms: int = round(error_process_time * 1000)
+            async def send_wrapper(message: Message) -> None:
+                nonlocal status_code, bytes_sent
+                if message["type"] == "http.response.start":
+                    status_code = message["status"]
+                    message.setdefault("headers", [])
+                    headers = MutableHeaders(scope=message)
+                    # Attach request ID to response headers
+                    headers.append(self.header_name, request_id)
+                    if self.expose_query_headers:
+                        db_ms: float = round(queries.seconds * 1000, 1)
+                        headers.append("X-DB-Queries", str(queries.count))
+                        # One header, with the route's phase timings if any
+                        timing: str = f'db;dur={db_ms};desc="{queries.count} queries"'
+                        phases: str | None = headers.get("Server-Timing")
+                        headers["Server-Timing"] = (
+                            f"{timing}, {phases}" if phases else timing
+                        )
+                elif message["type"] == "http.response.body":
+                    bytes_sent += len(message.get("body", b""))
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_wrapper)
+            except Exception as exc:
+                # Log exceptions with request context
+                cast(
+                    "Logger",
+                    log.bind(  # type: ignore[no-untyped-call]
+                        error=str(exc),
+                        status_code=status_code,
+                        process_time_ms=round(
+                            (time.perf_counter() - start_time) * 1000
+                        ),
+                    ),
+                ).exception("Error processing request {} {}: {}", method, path, exc)
+                raise
+
+        process_time_ms: int = round((time.perf_counter() - start_time) * 1000)
+        db_time_ms: float = round(queries.seconds * 1000, 1)
+        cast(
+            "Logger",
+            log.bind(  # type: ignore[no-untyped-call]
+                status_code=status_code,
+                process_time_ms=process_time_ms,
+                bytes_sent=bytes_sent,
+                db_queries=queries.count,
+                db_time_ms=db_time_ms,
+            ),
+        ).info(
+            "Response {} {} completed with status {} in {}ms "
+            "({} bytes, {} queries, {}ms DB) | query: {}",
+            method,
+            path,
+            status_code,
+            process_time_ms,
+            bytes_sent,
+            queries.count,
+            db_time_ms,
+            filtered_query_str,
+        )
+
+    async def _websocket(
+        self, scope: Scope, receive: Receive, send: Send, request_id: str
+    ) -> None:
+        path: str = scope["path"]
+        log: Logger = cast(
+            "Logger",
+            self.logger.bind(  # type: ignore[no-untyped-call]
+                request_id=request_id, method="WEBSOCKET", path=path
+            ),
+        )
+        log.info("WebSocket {} connecting", path)
+
+        start_time: float = time.perf_counter()
+        accepted: bool = False
+        close_code: int | None = None
+        bytes_sent: int = 0
 
+        async def send_wrapper(message: Message) -> None:
+            nonlocal accepted, close_code, bytes_sent
+            if message["type"] == "websocket.accept":
+                accepted = True
+                headers = list(message.get("headers") or [])
+                headers.append((self._header_key, request_id.encode("latin-1")))
+                message["headers"] = headers
+            elif message["type"] == "websocket.send":
+                if message.get("bytes") is not None:
+                    bytes_sent += len(message["bytes"])
+                elif message.get("text") is not None:
+                    bytes_sent += len(message["text"].encode())
+            elif message["type"] == "websocket.close":
+                close_code = message.get("code", 1000)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            log.exception("Error in WebSocket {}: {}", path, exc)
+            raise
+        finally:
+            duration_ms: int = round((time.perf_counter() - start_time) * 1000)
             cast(
                 "Logger",
-                self.logger.bind(  # type: ignore[no-untyped-call]
-                    **log_extra,
-                    error=str(exc),
-                    process_time_ms=error_process_time_ms,
+                log.bind(  # type: ignore[no-untyped-call]
+                    accepted=accepted,
+                    close_code=close_code,
+                    process_time_ms=duration_ms,
+                    bytes_sent=bytes_sent,
                 ),
-            ).exception(
-                f"Error processing request {request.method} {request.url.path}: {exc}",
+            ).info(
+                "WebSocket {} closed with code {} after {}ms ({} bytes sent)",
+                path,
+                close_code,
+                duration_ms,
+                bytes_sent,
             )
-            raise
-        finally:
-            # Reset the context variable
-            request_id_var.reset(token)
@@ -0,0 +1,177 @@
+"""Pure ASGI middleware recording request and WebSocket metrics.
+
+Series are keyed by the route template (``/api/v1/uploads/{filename}``), never
+by the raw path, so cardinality stays bounded. Requests that match no route
+are labelled ``<unmatched>``. Values go to the registry in
+``src.core.metrics`` and are exported on ``/metrics``:
+
+* ``http_requests_total`` and ``http_request_duration_seconds`` by method,
+  route and status;
+* ``http_request_bytes_total`` and ``http_response_bytes_total`` by method and
+  route (request ``Content-Length``, or the chunks received when there is
+  none; response bodies as sent);
+* ``http_requests_active``;
+* ``websocket_connections_total``, ``websocket_connections_active`` and
+  ``websocket_messages_total`` (by route and direction).
+
+Example Usage:
+    ```python
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+    ```
+"""
+
+import time
+from collections.abc import Sequence
+from typing import Final
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.metrics import metrics
+
+__all__: Final[Sequence[str]] = ("MetricsMiddleware",)
+
+UNMATCHED: Final[str] = "<unmatched>"
+
+http_requests = metrics.counter(
+    "http_requests_total", "HTTP requests completed", ("method", "route", "status")
+)
+http_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time from request start to the last response byte",
+    ("method", "route", "status"),
+)
+http_request_bytes = metrics.counter(
+    "http_request_bytes_total", "HTTP request body bytes", ("method", "route")
+)
+http_response_bytes = metrics.counter(
+    "http_response_bytes_total", "HTTP response body bytes", ("method", "route")
+)
+http_active = metrics.gauge("http_requests_active", "HTTP requests in progress")
+ws_connections = metrics.counter(
+    "websocket_connections_total", "WebSocket connections accepted", ("route",)
+)
+ws_active = metrics.gauge(
+    "websocket_connections_active", "Open WebSocket connections", ("route",)
+)
+ws_messages = metrics.counter(
+    "websocket_messages_total",
+    "WebSocket messages by direction (in, out)",
+    ("route", "direction"),
+)
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, once routing has run."""
+    route = scope.get("route")
+    path: str | None = getattr(route, "path", None)
+    return path if path is not None else UNMATCHED
+
+
+class MetricsMiddleware:
+    """Record per-route HTTP and WebSocket metrics.
+
+    Paths in ``exclude_paths`` (the scrape endpoint by default) are not
+    recorded.
+    """
+
+    def __init__(
+        self, app: ASGIApp, *, exclude_paths: Sequence[str] | None = None
+    ) -> None:
+        """Initialize the middleware.
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The ASGI application.
+        exclude_paths : Sequence[str], optional
+            Paths not recorded, by default ``/metrics`` and ``/api/v1/metrics``
+        """
+        self.app: ASGIApp = app
+        self.exclude_paths: frozenset[str] = frozenset(
+            exclude_paths
+            if exclude_paths is not None
+            else ("/metrics", "/api/v1/metrics")
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process an ASGI connection."""
+        if scope["type"] == "http" and scope["path"] not in self.exclude_paths:
+            await self._http(scope, receive, send)
+        elif scope["type"] == "websocket":
+            await self._websocket(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+    async def _http(self, scope: Scope, receive: Receive, send: Send) -> None:
+        start: float = time.perf_counter()
+        status: int = 500
+        received: int = 0
+        sent: int = 0
+        content_length: bytes | None = None
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                content_length = value
+                break
+
+        async def receive_wrapper() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+            return message
+
+        app_receive: Receive = receive_wrapper
+        if content_length is not None and content_length.isdigit():
+            # Known up front, and counted even if the handler never reads it.
+            received = int(content_length)
+            app_receive = receive
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, sent
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                sent += len(message.get("body", b""))
+            await send(message)
+
+        http_active.inc()
+        try:
+            await self.app(scope, app_receive, send_wrapper)
+        finally:
+            http_active.dec()
+            method: str = scope["method"]
+            route = route_template(scope)
+            http_requests.inc(method, route, str(status))
+            http_duration.observe(
+                time.perf_counter() - start, method, route, str(status)
+            )
+            if received:
+                http_request_bytes.inc(method, route, amount=received)
+            if sent:
+                http_response_bytes.inc(method, route, amount=sent)
+
+    async def _websocket(self, scope: Scope, receive: Receive, send: Send) -> None:
+        accepted_route: str | None = None
+
+        async def receive_wrapper() -> Message:
+            message = await receive()
+            if message["type"] == "websocket.receive":
+                ws_messages.inc(route_template(scope), "in")
+            return message
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal accepted_route
+            if message["type"] == "websocket.accept":
+                accepted_route = route_template(scope)
+                ws_connections.inc(accepted_route)
+                ws_active.inc(accepted_route)
+            elif message["type"] == "websocket.send":
+                ws_messages.inc(route_template(scope), "out")
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            if accepted_route is not None:
+                ws_active.dec(accepted_route)
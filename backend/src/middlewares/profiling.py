@@ -0,0 +1,139 @@
+"""Pure ASGI middleware that profiles single requests on demand.
+
+A request that sends ``X-Profile: <token>`` runs as usual while a
+:class:`~src.core.profiling.RequestSampler` samples it. The token is signed with
+``profiling_secret`` for the request's method and path, and expires. Admins
+get one from ``POST /api/v1/profiling/tokens``. The report replaces the response
+body and is sent as an attachment. ``X-Profile-Format: collapsed`` selects
+collapsed stacks instead of speedscope JSON. The handler's own status is in
+``X-Profiled-Status``.
+
+A missing, invalid or expired token, or another profile already running, leaves
+the request unprofiled. Without the header the only cost is one scan of the
+request headers.
+
+Example Usage:
+    ```python
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+    ```
+"""
+
+import time
+from collections.abc import Sequence
+from typing import Final
+
+from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.core.config import get_settings
+from src.core.profiling import (
+    ProfileFormat,
+    RequestSampler,
+    profiling_lock,
+    verify_profile_token,
+)
+
+__all__: Final[Sequence[str]] = ("ProfilingMiddleware",)
+
+_TOKEN_HEADER: Final[bytes] = b"x-profile"
+_FORMAT_HEADER: Final[bytes] = b"x-profile-format"
+
+
+class ProfilingMiddleware:
+    """Return a sampling profile instead of the response for signed requests."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Initialize the middleware.
+
+        Parameters
+        ----------
+        app : ASGIApp
+            The ASGI application.
+        """
+        self.app: ASGIApp = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Process an ASGI connection."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token: bytes | None = None
+        fmt: ProfileFormat = "speedscope"
+        for name, value in scope["headers"]:
+            if name == _TOKEN_HEADER:
+                token = value
+            elif name == _FORMAT_HEADER and value == b"collapsed":
+                fmt = "collapsed"
+        if token is None or not self._authorized(scope, token):
+            await self.app(scope, receive, send)
+            return
+        if not profiling_lock.acquire(blocking=False):
+            logger.warning(
+                "Not profiling {} {}: another profile is running",
+                scope["method"],
+                scope["path"],
+            )
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._profile(scope, receive, send, fmt)
+        finally:
+            profiling_lock.release()
+
+    def _authorized(self, scope: Scope, token: bytes) -> bool:
+        secret: str | None = getattr(get_settings(), "profiling_secret", None)
+        if secret and verify_profile_token(
+            token.decode("latin-1"), secret, scope["method"], scope["path"]
+        ):
+            return True
+        logger.warning(
+            "Ignoring X-Profile on {} {}: invalid or expired token",
+            scope["method"],
+            scope["path"],
+        )
+        return False
+
+    async def _profile(
+        self, scope: Scope, receive: Receive, send: Send, fmt: ProfileFormat
+    ) -> None:
+        method: str = scope["method"]
+        path: str = scope["path"]
+        status: int = 500
+
+        async def send_wrapper(message: Message) -> None:
+            # The handler's response is dropped; the report is sent instead.
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+        sampler = RequestSampler(f"{method} {path}")
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profile = sampler.stop()
+        logger.info(
+            "Profiled {} {}: {} samples in {:.0f}ms",
+            method,
+            path,
+            profile.samples,
+            profile.duration * 1000,
+        )
+        body, media_type, extension = profile.render(fmt)
+        filename = f"profile-{int(time.time())}.{extension}"
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", media_type.encode()),
+                    (b"content-length", str(len(body)).encode()),
+                    (
+                        b"content-disposition",
+                        f'attachment; filename="{filename}"'.encode(),
+                    ),
+                    (b"x-profiled-status", str(status).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -1,6 +1,17 @@
 from .base import Base
 
-__all__ = ["Base", "BlacklistedToken", "File", "UsedPasswordResetToken", "User"]
+__all__ = [
+    "AuditLog",
+    "Base",
+    "BlacklistedToken",
+    "DailyRollup",
+    "File",
+    "MonthlyRollup",
+    "UsedPasswordResetToken",
+    "User",
+]
+from .analytics import DailyRollup, MonthlyRollup
+from .audit_log import AuditLog
 from .blacklisted_token import BlacklistedToken
 from .file import File
 from .used_password_reset_token import UsedPasswordResetToken
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Final
+
+from sqlalchemy import BigInteger, Date, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+# Metrics kept in the rollup tables.
+METRIC_SIGNUPS: Final[str] = "signups"
+METRIC_LOGINS: Final[str] = "logins"
+METRIC_UPLOADS: Final[str] = "uploads"
+METRIC_BYTES_STORED: Final[str] = "bytes_stored"
+ROLLUP_METRICS: Final[tuple[str, ...]] = (
+    METRIC_SIGNUPS,
+    METRIC_LOGINS,
+    METRIC_UPLOADS,
+    METRIC_BYTES_STORED,
+)
+
+
+class DailyRollup(Base):
+    """Pre-aggregated value of one analytics metric for one UTC day."""
+
+    __tablename__ = "analytics_daily"
+
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    day: Mapped[date] = mapped_column(Date, primary_key=True)
+    value: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+
+    def __repr__(self: DailyRollup) -> str:
+        return f"<DailyRollup {self.metric} {self.day}={self.value}>"
+
+
+class MonthlyRollup(Base):
+    """Pre-aggregated value of one analytics metric for one UTC month.
+
+    ``month`` is the first day of the month.
+    """
+
+    __tablename__ = "analytics_monthly"
+
+    metric: Mapped[str] = mapped_column(String(32), primary_key=True)
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    value: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0, server_default="0"
+    )
+
+    def __repr__(self: MonthlyRollup) -> str:
+        return f"<MonthlyRollup {self.metric} {self.month}={self.value}>"
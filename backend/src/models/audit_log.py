@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import JSON, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from src.models.base import Base
+
+
+class AuditLog(Base):
+    """One audit event: who did what to which entity, and when.
+
+    On PostgreSQL the table is range-partitioned by month on ``occurred_at``,
+    so the primary key includes it. Event ids are generated by the writer
+    (UUID hex), so rows can be bulk-inserted or ``COPY``-ed without a
+    sequence. ``actor_id`` and ``entity_id`` carry no foreign keys: the trail
+    must outlive the rows it describes.
+    """
+
+    __tablename__ = "audit_log"
+    __table_args__ = (
+        Index("ix_audit_log_entity", "entity_type", "entity_id", "occurred_at"),
+        Index("ix_audit_log_actor", "actor_id", "occurred_at"),
+        {"postgresql_partition_by": "RANGE (occurred_at)"},
+    )
+
+    id: Mapped[str] = mapped_column(String(32), primary_key=True)
+    occurred_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, index=True
+    )
+    action: Mapped[str] = mapped_column(String(64), nullable=False)
+    entity_type: Mapped[str] = mapped_column(String(32), nullable=False)
+    entity_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    actor_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    request_id: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    details: Mapped[Mapping[str, Any] | None] = mapped_column(JSON, nullable=True)
+
+    def __repr__(self: AuditLog) -> str:
+        return (
+            f"<AuditLog {self.occurred_at} {self.action} "
+            f"{self.entity_type}:{self.entity_id}>"
+        )
@@ -10,5 +10,5 @@ class BlacklistedToken(BaseModel):
     __tablename__ = "blacklisted_tokens"
     jti: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
     expires_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False
+        DateTime(timezone=True), nullable=False, index=True
     )
@@ -14,7 +14,14 @@ class File(BaseModel):
     """SQLAlchemy model for a file uploaded by a user."""
 
     __tablename__ = "files"
-    __table_args__ = (Index("ix_files_user_id", "user_id"),)
+    __table_args__ = (
+        # Lookups by name back download, get and delete.
+        Index("ix_files_filename", "filename", unique=True),
+        # A user's files newest first (the default listing), and by name.
+        # The first also serves every lookup by user_id alone.
+        Index("ix_files_user_id_created_at_id", "user_id", "created_at", "id"),
+        Index("ix_files_user_id_filename", "user_id", "filename"),
+    )
 
     filename: Mapped[str] = mapped_column(String(255), nullable=False)
     content_type: Mapped[str] = mapped_column(String(128), nullable=False)
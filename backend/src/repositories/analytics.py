@@ -0,0 +1,317 @@
+"""Incrementally maintained daily and monthly analytics rollups.
+
+Dashboards read pre-aggregated rows from ``analytics_daily`` and
+``analytics_monthly`` instead of scanning ``users`` and ``files``.
+
+Write paths record changes with :func:`count_on_commit`, which holds the change
+on the session until it commits, or with :func:`count_event` when there is no
+transaction. Committed changes are coalesced per day in the write-behind buffer
+:data:`analytics_rollups`. The buffer flushes them as one upsert per table
+(``value = value + delta``).
+
+:func:`backfill_rollups` rebuilds the metrics that can be derived from existing
+rows (signups, uploads and bytes stored). Login counts exist only in the
+rollups.
+
+Command line usage:
+    ```bash
+    python -m src.repositories.analytics backfill
+    ```
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+from collections.abc import Mapping, Sequence
+from datetime import UTC, date, datetime
+from typing import Any, Final
+
+from loguru import logger
+from sqlalchemy import ColumnElement, delete, event, func, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute, Session
+
+from src.core.replicas import replica_read
+from src.core.unit_of_work import ANALYTICS_PENDING_KEY
+from src.models.analytics import (
+    METRIC_BYTES_STORED,
+    METRIC_SIGNUPS,
+    METRIC_UPLOADS,
+    DailyRollup,
+    MonthlyRollup,
+)
+from src.models.file import File
+from src.models.user import User
+from src.utils.write_behind import PendingWrite, WriteBehindBuffer
+
+__all__: Final[Sequence[str]] = (
+    "REBUILDABLE_METRICS",
+    "analytics_rollups",
+    "apply_rollup_deltas",
+    "backfill_rollups",
+    "count_event",
+    "count_on_commit",
+    "daily_rollups",
+    "monthly_rollups",
+)
+
+# Metrics that backfill_rollups can recompute from the source tables.
+REBUILDABLE_METRICS: Final[tuple[str, ...]] = (
+    METRIC_SIGNUPS,
+    METRIC_UPLOADS,
+    METRIC_BYTES_STORED,
+)
+_PENDING_KEY: Final[str] = ANALYTICS_PENDING_KEY
+_UPSERT_CHUNK_SIZE: Final[int] = 500
+
+
+def _today() -> date:
+    return datetime.now(UTC).date()
+
+
+def _as_date(value: object) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+async def _flush_rollups(updates: Mapping[date, PendingWrite]) -> None:
+    from src.core.database import get_async_session
+
+    async with get_async_session() as session:
+        await apply_rollup_deltas(session, updates)
+        await session.commit()
+
+
+# Per-day metric deltas, written behind the request.
+analytics_rollups: Final[WriteBehindBuffer[date]] = WriteBehindBuffer(
+    "analytics_rollups", _flush_rollups
+)
+
+
+def count_event(metric: str, amount: int = 1, day: date | None = None) -> None:
+    """Add ``amount`` to ``metric`` for ``day`` (default: today, UTC)."""
+    if amount:
+        analytics_rollups.increment(day or _today(), **{metric: amount})
+
+
+def count_on_commit(
+    session: AsyncSession, metric: str, amount: int = 1, day: date | None = None
+) -> None:
+    """Like :func:`count_event`, but only once ``session`` commits.
+
+    Nothing is counted if the transaction rolls back.
+    """
+    if amount:
+        pending: list[tuple[date, str, int]] = session.sync_session.info.setdefault(
+            _PENDING_KEY, []
+        )
+        pending.append((day or _today(), metric, amount))
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_on_commit(session: Session) -> None:
+    for day, metric, amount in session.info.pop(_PENDING_KEY, ()):
+        count_event(metric, amount, day)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    # A rolled-back SAVEPOINT leaves the outer transaction, and its events, alive.
+    if not session.in_nested_transaction():
+        session.info.pop(_PENDING_KEY, None)
+
+
+def _upsert(
+    session: AsyncSession,
+    model: type[DailyRollup] | type[MonthlyRollup],
+    key: str,
+    rows: Sequence[Mapping[str, object]],
+) -> Any:
+    insert_fn = (
+        pg_insert if session.get_bind().dialect.name == "postgresql" else sqlite_insert
+    )
+    stmt = insert_fn(model).values(list(rows))
+    return stmt.on_conflict_do_update(
+        index_elements=["metric", key],
+        set_={"value": model.__table__.c.value + stmt.excluded.value},
+    )
+
+
+def _monthly(daily: Mapping[tuple[str, date], int]) -> dict[tuple[str, date], int]:
+    monthly: defaultdict[tuple[str, date], int] = defaultdict(int)
+    for (metric, day), value in daily.items():
+        monthly[(metric, day.replace(day=1))] += value
+    return dict(monthly)
+
+
+async def _write(
+    session: AsyncSession,
+    daily: Mapping[tuple[str, date], int],
+    *,
+    additive: bool,
+) -> None:
+    for model, key, values in (
+        (DailyRollup, "day", daily),
+        (MonthlyRollup, "month", _monthly(daily)),
+    ):
+        rows: list[dict[str, object]] = [
+            {"metric": metric, key: when, "value": value}
+            for (metric, when), value in values.items()
+        ]
+        for start in range(0, len(rows), _UPSERT_CHUNK_SIZE):
+            chunk = rows[start : start + _UPSERT_CHUNK_SIZE]
+            await session.execute(
+                _upsert(session, model, key, chunk)
+                if additive
+                else insert(model).values(chunk)
+            )
+
+
+async def apply_rollup_deltas(
+    session: AsyncSession, updates: Mapping[date, PendingWrite]
+) -> None:
+    """Add per-day metric deltas to the daily and monthly rollups.
+
+    Does not commit.
+    """
+    daily: dict[tuple[str, date], int] = {
+        (metric, day): delta
+        for day, pending in updates.items()
+        for metric, delta in pending.increments.items()
+        if delta
+    }
+    if daily:
+        await _write(session, daily, additive=True)
+
+
+async def _daily_totals(
+    session: AsyncSession,
+    metric: str,
+    created_at: InstrumentedAttribute[datetime],
+    value: ColumnElement[Any],
+) -> dict[tuple[str, date], int]:
+    day = func.date(created_at)
+    result = await session.execute(select(day, value).group_by(day))
+    return {(metric, _as_date(d)): int(v or 0) for d, v in result.all() if d}
+
+
+async def backfill_rollups(session: AsyncSession) -> dict[str, int]:
+    """Rebuild the rebuildable metrics from ``users`` and ``files`` and commit.
+
+    Deltas buffered for those metrics are dropped, since the rebuild already
+    includes them. Other buffered deltas are written in the same transaction.
+    Returns the number of days written per metric.
+    Raises:
+        Exception: On DB failure (buffered deltas are restored).
+    """
+    pending: dict[date, PendingWrite] = analytics_rollups.drain()
+    kept: dict[date, PendingWrite] = {
+        day: PendingWrite(
+            increments={
+                m: v
+                for m, v in write.increments.items()
+                if m not in REBUILDABLE_METRICS
+            }
+        )
+        for day, write in pending.items()
+    }
+    try:
+        await apply_rollup_deltas(session, kept)
+        daily: dict[tuple[str, date], int] = {}
+        daily.update(
+            await _daily_totals(
+                session, METRIC_SIGNUPS, User.created_at, func.count(User.id)
+            )
+        )
+        daily.update(
+            await _daily_totals(
+                session, METRIC_UPLOADS, File.created_at, func.count(File.id)
+            )
+        )
+        daily.update(
+            await _daily_totals(
+                session,
+                METRIC_BYTES_STORED,
+                File.created_at,
+                func.coalesce(func.sum(File.size), 0),
+            )
+        )
+        for model in (DailyRollup, MonthlyRollup):
+            await session.execute(
+                delete(model).where(model.metric.in_(REBUILDABLE_METRICS))
+            )
+        await _write(session, daily, additive=False)
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        for day, write in pending.items():
+            analytics_rollups.increment(day, **write.increments)
+        raise
+    counts: dict[str, int] = dict.fromkeys(REBUILDABLE_METRICS, 0)
+    for metric, _day in daily:
+        counts[metric] += 1
+    logger.info("Analytics rollups rebuilt: {}", counts)
+    return counts
+
+
+@replica_read
+async def daily_rollups(
+    session: AsyncSession, metric: str, start: date, end: date
+) -> dict[date, int]:
+    """Return ``{day: value}`` for ``start``..``end`` inclusive, zero-filled."""
+    result = await session.execute(
+        select(DailyRollup.day, DailyRollup.value).where(
+            DailyRollup.metric == metric,
+            DailyRollup.day >= start,
+            DailyRollup.day <= end,
+        )
+    )
+    values: dict[date, int] = {d: int(v) for d, v in result.all()}
+    return {
+        date.fromordinal(n): values.get(date.fromordinal(n), 0)
+        for n in range(start.toordinal(), end.toordinal() + 1)
+    }
+
+
+@replica_read
+async def monthly_rollups(
+    session: AsyncSession, metric: str, year: int
+) -> dict[int, int]:
+    """Return ``{month: value}`` (1-12, zero-filled) for ``year``."""
+    result = await session.execute(
+        select(MonthlyRollup.month, MonthlyRollup.value).where(
+            MonthlyRollup.metric == metric,
+            MonthlyRollup.month >= date(year, 1, 1),
+            MonthlyRollup.month <= date(year, 12, 1),
+        )
+    )
+    stats: dict[int, int] = dict.fromkeys(range(1, 13), 0)
+    for month, value in result.all():
+        stats[month.month] = int(value)
+    return stats
+
+
+async def _run_backfill() -> dict[str, int]:
+    from src.core.database import get_async_session
+
+    async with get_async_session() as session:
+        return await backfill_rollups(session)
+
+
+def _main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage analytics rollups.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser(
+        "backfill", help="Rebuild signups, uploads and bytes stored from source rows."
+    )
+    parser.parse_args(argv)
+    print(asyncio.run(_run_backfill()))
+
+
+if __name__ == "__main__":
+    _main()
@@ -0,0 +1,381 @@
+"""Persistent audit trail written off the request path.
+
+Mutations record :class:`AuditEvent` objects. :func:`audit_on_commit` holds an
+event on the session until the transaction commits. :func:`record_audit` is for
+actions that are already durable or that have no transaction (logins, failed
+logins). Recorded events go to the bounded in-process :data:`audit_queue`. Its
+background writer stores them in ``audit_log`` in batches, with ``COPY`` on
+PostgreSQL and multi-row ``INSERT`` elsewhere, so a request never waits for an
+audit ``INSERT``. When the queue is full, events are dropped and counted in
+``audit_queue.dropped`` rather than blocking requests; :func:`audit_stats`
+exposes the counters.
+
+On PostgreSQL ``audit_log`` is partitioned by month on ``occurred_at``.
+:func:`ensure_audit_partitions` creates the upcoming partitions. It runs at
+startup, and can also be run by hand:
+
+    ```bash
+    python -m src.repositories.audit partitions --months-ahead 3
+    ```
+"""
+
+import argparse
+import asyncio
+import json
+import uuid
+from collections.abc import AsyncIterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from typing import Any, Final
+
+from loguru import logger
+from sqlalchemy import ColumnElement, and_, event, insert, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing_extensions import TypedDict
+
+from src.core.replicas import replica_read
+from src.core.unit_of_work import AUDIT_PENDING_KEY
+from src.models.audit_log import AuditLog
+from src.utils.batch_queue import BatchQueue, BatchQueueStats
+
+__all__: Final[Sequence[str]] = (
+    "AuditEvent",
+    "AuditRecord",
+    "audit_on_commit",
+    "audit_queue",
+    "audit_stats",
+    "ensure_audit_partitions",
+    "iter_audit_events",
+    "query_audit_events",
+    "record_audit",
+    "write_audit_events",
+)
+
+_PENDING_KEY: Final[str] = AUDIT_PENDING_KEY
+_COLUMNS: Final[tuple[str, ...]] = (
+    "id",
+    "occurred_at",
+    "action",
+    "entity_type",
+    "entity_id",
+    "actor_id",
+    "request_id",
+    "details",
+)
+_INSERT_CHUNK_SIZE: Final[int] = 500
+
+
+def _context() -> tuple[int | None, str | None]:
+    """The authenticated user and request id of the current request, if any."""
+    from src.api.deps import current_user_id_ctx_var, get_current_request_id
+    from src.middlewares.logging import get_request_id
+
+    return current_user_id_ctx_var.get(), get_request_id() or get_current_request_id()
+
+
+@dataclass(frozen=True, slots=True)
+class AuditEvent:
+    """One audited action; ``actor_id``/``request_id`` default to the current request."""
+
+    action: str
+    entity_type: str
+    entity_id: str | None = None
+    actor_id: int | None = None
+    request_id: str | None = None
+    details: Mapping[str, Any] | None = None
+    occurred_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+
+    @classmethod
+    def create(
+        cls,
+        action: str,
+        entity_type: str,
+        entity_id: object = None,
+        *,
+        actor_id: int | None = None,
+        details: Mapping[str, Any] | None = None,
+    ) -> "AuditEvent":
+        ctx_actor, ctx_request = _context()
+        return cls(
+            action=action,
+            entity_type=entity_type,
+            entity_id=str(entity_id) if entity_id is not None else None,
+            actor_id=actor_id if actor_id is not None else ctx_actor,
+            request_id=ctx_request,
+            details=details,
+        )
+
+    def row(self) -> dict[str, Any]:
+        return {c: getattr(self, c) for c in _COLUMNS}
+
+
+class AuditRecord(TypedDict):
+    id: str
+    occurred_at: str
+    action: str
+    entity_type: str
+    entity_id: str | None
+    actor_id: int | None
+    request_id: str | None
+    details: Mapping[str, Any] | None
+
+
+async def write_audit_events(
+    session: AsyncSession, events: Sequence[AuditEvent]
+) -> None:
+    """Insert ``events`` in bulk (``COPY`` on PostgreSQL). Does not commit."""
+    if not events:
+        return
+    if session.get_bind().dialect.name == "postgresql":
+        conn = await session.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            AuditLog.__tablename__,
+            records=[
+                (
+                    *(getattr(e, c) for c in _COLUMNS[:-1]),
+                    json.dumps(e.details) if e.details is not None else None,
+                )
+                for e in events
+            ],
+            columns=list(_COLUMNS),
+        )
+        return
+    rows: list[dict[str, Any]] = [e.row() for e in events]
+    for start in range(0, len(rows), _INSERT_CHUNK_SIZE):
+        await session.execute(
+            insert(AuditLog), rows[start : start + _INSERT_CHUNK_SIZE]
+        )
+
+
+async def _flush_audit(events: Sequence[AuditEvent]) -> None:
+    from src.core.database import get_async_session
+
+    async with get_async_session() as session:
+        await write_audit_events(session, events)
+        await session.commit()
+
+
+# Audit events waiting to be written; sized from settings at startup.
+audit_queue: Final[BatchQueue[AuditEvent]] = BatchQueue("audit_log", _flush_audit)
+
+
+def record_audit(
+    action: str,
+    entity_type: str,
+    entity_id: object = None,
+    *,
+    actor_id: int | None = None,
+    details: Mapping[str, Any] | None = None,
+) -> bool:
+    """Queue an audit event now. Returns False if the queue was full."""
+    return audit_queue.put_nowait(
+        AuditEvent.create(
+            action, entity_type, entity_id, actor_id=actor_id, details=details
+        )
+    )
+
+
+def audit_on_commit(
+    session: AsyncSession,
+    action: str,
+    entity_type: str,
+    entity_id: object = None,
+    *,
+    actor_id: int | None = None,
+    details: Mapping[str, Any] | None = None,
+) -> None:
+    """Like :func:`record_audit`, but only once ``session`` commits.
+
+    The event keeps the time and request context of this call.
+    """
+    pending: list[AuditEvent] = session.sync_session.info.setdefault(_PENDING_KEY, [])
+    pending.append(
+        AuditEvent.create(
+            action, entity_type, entity_id, actor_id=actor_id, details=details
+        )
+    )
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_on_commit(session: Session) -> None:
+    for audit_event in session.info.pop(_PENDING_KEY, ()):
+        audit_queue.put_nowait(audit_event)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    # A rolled-back SAVEPOINT leaves the outer transaction, and its events, alive.
+    if not session.in_nested_transaction():
+        session.info.pop(_PENDING_KEY, None)
+
+
+def audit_stats() -> BatchQueueStats:
+    """Queue depth and written/dropped counters of the audit writer."""
+    return audit_queue.stats()
+
+
+def _filters(
+    start: datetime | None,
+    end: datetime | None,
+    actor_id: int | None,
+    entity_type: str | None,
+    entity_id: str | None,
+    action: str | None,
+) -> list[ColumnElement[bool]]:
+    # Bounds on occurred_at let PostgreSQL prune partitions.
+    clauses: list[ColumnElement[bool]] = []
+    if start is not None:
+        clauses.append(AuditLog.occurred_at >= start)
+    if end is not None:
+        clauses.append(AuditLog.occurred_at < end)
+    if actor_id is not None:
+        clauses.append(AuditLog.actor_id == actor_id)
+    if entity_type is not None:
+        clauses.append(AuditLog.entity_type == entity_type)
+    if entity_id is not None:
+        clauses.append(AuditLog.entity_id == entity_id)
+    if action is not None:
+        clauses.append(AuditLog.action == action)
+    return clauses
+
+
+def _record(row: AuditLog) -> AuditRecord:
+    return {
+        "id": row.id,
+        "occurred_at": row.occurred_at.isoformat(),
+        "action": row.action,
+        "entity_type": row.entity_type,
+        "entity_id": row.entity_id,
+        "actor_id": row.actor_id,
+        "request_id": row.request_id,
+        "details": row.details,
+    }
+
+
+@replica_read
+async def query_audit_events(
+    session: AsyncSession,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    actor_id: int | None = None,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    action: str | None = None,
+    before: tuple[datetime, str] | None = None,
+    limit: int = 100,
+) -> list[AuditRecord]:
+    """Return matching events, newest first.
+
+    ``start`` is inclusive and ``end`` exclusive. ``before`` is the
+    ``(occurred_at, id)`` of the last event of the previous page (keyset
+    pagination).
+    """
+    clauses = _filters(start, end, actor_id, entity_type, entity_id, action)
+    if before is not None:
+        at, event_id = before
+        clauses.append(
+            or_(
+                AuditLog.occurred_at < at,
+                and_(AuditLog.occurred_at == at, AuditLog.id < event_id),
+            )
+        )
+    result = await session.execute(
+        select(AuditLog)
+        .where(*clauses)
+        .order_by(AuditLog.occurred_at.desc(), AuditLog.id.desc())
+        .limit(limit)
+    )
+    return [_record(row) for row in result.scalars()]
+
+
+@replica_read
+async def iter_audit_events(
+    session: AsyncSession,
+    *,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    actor_id: int | None = None,
+    entity_type: str | None = None,
+    entity_id: str | None = None,
+    action: str | None = None,
+    chunk_size: int = 1000,
+) -> AsyncIterator[AuditRecord]:
+    """Yield every matching event, newest first, one page at a time."""
+    before: tuple[datetime, str] | None = None
+    while True:
+        page = await query_audit_events(
+            session,
+            start=start,
+            end=end,
+            actor_id=actor_id,
+            entity_type=entity_type,
+            entity_id=entity_id,
+            action=action,
+            before=before,
+            limit=chunk_size,
+        )
+        for record in page:
+            yield record
+        if len(page) < chunk_size:
+            return
+        last = page[-1]
+        before = (datetime.fromisoformat(last["occurred_at"]), last["id"])
+
+
+def _add_months(day: date, months: int) -> date:
+    index = day.year * 12 + day.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def ensure_audit_partitions(
+    session: AsyncSession, months_ahead: int = 2
+) -> list[str]:
+    """Create monthly ``audit_log`` partitions up to ``months_ahead`` months out.
+
+    PostgreSQL only; elsewhere this does nothing. Commits, and returns the
+    partition names it checked.
+    """
+    if session.get_bind().dialect.name != "postgresql":
+        return []
+    first = datetime.now(UTC).date().replace(day=1)
+    names: list[str] = []
+    for offset in range(months_ahead + 1):
+        lower = _add_months(first, offset)
+        upper = _add_months(lower, 1)
+        name = f"audit_log_y{lower.year:04d}m{lower.month:02d}"
+        await session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF audit_log "
+                f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+            )
+        )
+        names.append(name)
+    await session.commit()
+    logger.info("Audit partitions ensured: {}", ", ".join(names))
+    return names
+
+
+async def _run_partitions(months_ahead: int) -> list[str]:
+    from src.core.database import get_async_session
+
+    async with get_async_session() as session:
+        return await ensure_audit_partitions(session, months_ahead)
+
+
+def _main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Manage the audit log.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    partitions = sub.add_parser(
+        "partitions", help="Create upcoming monthly partitions (PostgreSQL)."
+    )
+    partitions.add_argument("--months-ahead", type=int, default=2)
+    args = parser.parse_args(argv)
+    print(asyncio.run(_run_partitions(args.months_ahead)))
+
+
+if __name__ == "__main__":
+    _main()
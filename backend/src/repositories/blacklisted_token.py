@@ -1,10 +1,11 @@
 from datetime import UTC, datetime
 from typing import Final
 
+from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
 from src.models.blacklisted_token import BlacklistedToken
+from src.repositories import hot_queries
 
 
 async def blacklist_token(
@@ -34,9 +35,7 @@ async def is_token_blacklisted(session: AsyncSession, jti: str) -> bool:
     Returns:
         bool: True if the token is blacklisted and not expired, False otherwise.
     """
-    result: Final = await session.execute(
-        select(BlacklistedToken).where(BlacklistedToken.jti == jti)
-    )
+    result: Final = await session.execute(hot_queries.blacklisted_token(jti))
     token: BlacklistedToken | None = result.scalar_one_or_none()
     now: Final[datetime] = datetime.now(UTC)
     if token is not None:
@@ -47,3 +46,24 @@ async def is_token_blacklisted(session: AsyncSession, jti: str) -> bool:
         if expires_at > now:
             return True
     return False
+
+
+async def delete_expired_blacklisted_tokens(
+    session: AsyncSession, now: datetime | None = None
+) -> int:
+    """
+    Delete blacklist entries whose tokens have expired (they can no longer be used).
+
+    Args:
+        session (AsyncSession): The SQLAlchemy async session.
+        now (datetime | None): The cutoff; defaults to the current time.
+
+    Returns:
+        int: The number of entries deleted.
+    """
+    result = await session.execute(
+        delete(BlacklistedToken).where(
+            BlacklistedToken.expires_at <= (now or datetime.now(UTC))
+        )
+    )
+    return int(getattr(result, "rowcount", 0) or 0)
@@ -2,18 +2,21 @@ from datetime import datetime
 from typing import Any, Literal
 
 import sqlalchemy
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.replicas import replica_read
+from src.models.analytics import METRIC_BYTES_STORED, METRIC_UPLOADS
 from src.models.file import File
+from src.repositories import hot_queries
+from src.repositories.analytics import count_on_commit
+from src.repositories.audit import audit_on_commit
 from src.utils.errors import ValidationError
 
 
 async def get_file_by_filename(session: AsyncSession, filename: str) -> File | None:
-    from typing import Any
-
     result: sqlalchemy.engine.Result[Any] = await session.execute(
-        select(File).where(File.filename == filename)
+        hot_queries.file_by_filename(filename)
     )
     return result.scalar_one_or_none()
 
@@ -34,16 +37,36 @@ async def create_file(
         filename=filename, content_type=content_type, user_id=user_id, size=size
     )
 
-    try:
-        session.add(file)
-        await session.flush()
-    except Exception as exc:
-        await session.rollback()
-        raise exc
-
+    session.add(file)
+    await session.flush()
+
+    count_on_commit(session, METRIC_UPLOADS)
+    count_on_commit(session, METRIC_BYTES_STORED, size or 0)
+    audit_on_commit(
+        session,
+        "file.upload",
+        "file",
+        filename,
+        actor_id=user_id,
+        details={"size": size, "content_type": content_type},
+    )
     return file
 
 
+def _uncount_file(session: AsyncSession, file: File) -> None:
+    """Take a deleted file out of the rollups for the day it was uploaded, and audit it."""
+    day = file.created_at.date() if file.created_at else None
+    count_on_commit(session, METRIC_UPLOADS, -1, day)
+    count_on_commit(session, METRIC_BYTES_STORED, -(file.size or 0), day)
+    audit_on_commit(
+        session,
+        "file.delete",
+        "file",
+        file.filename,
+        details={"owner_id": file.user_id},
+    )
+
+
 async def delete_file(session: AsyncSession, filename: str) -> bool:
     """
     Delete a file by filename.
@@ -56,7 +79,8 @@ async def delete_file(session: AsyncSession, filename: str) -> bool:
     if not file:
         return False
     await session.delete(file)
-    # Note: Don't flush here - let the endpoint handle the commit
+    _uncount_file(session, file)
+    # Not flushed here; the request's unit of work flushes and commits
     return True
 
 
@@ -70,47 +94,39 @@ async def bulk_delete_files(
     Raises:
         Exception: If the database operation fails.
     """
+    # One SELECT for the whole batch; the DELETEs go out in one flush.
+    result = await session.execute(
+        select(File).where(File.filename.in_(set(filenames)), File.user_id == user_id)
+    )
+    owned: dict[str, File] = {file.filename: file for file in result.scalars()}
     deleted: list[str] = []
     failed: list[str] = []
-
     for filename in filenames:
+        file: File | None = owned.pop(filename, None)
+        if file is None:
+            failed.append(filename)
+            continue
         try:
-            # Check if file exists and belongs to the user
-            result = await session.execute(
-                select(File).where(File.filename == filename, File.user_id == user_id)
-            )
-            file: File | None = result.scalar_one_or_none()
-
-            if file:
-                await session.delete(file)
-                deleted.append(filename)
-            else:
-                failed.append(filename)
+            await session.delete(file)
+            _uncount_file(session, file)
+            deleted.append(filename)
         except Exception:
             failed.append(filename)
 
     return deleted, failed
 
 
-async def list_files(
-    session: AsyncSession,
+def apply_file_list_filters(
+    stmt: sqlalchemy.sql.Select[Any],
     user_id: int,
-    offset: int = 0,
-    limit: int = 20,
     q: str | None = None,
     sort: Literal["created_at", "filename"] = "created_at",
     order: Literal["desc", "asc"] = "desc",
     created_after: datetime | None = None,
     created_before: datetime | None = None,
-) -> tuple[list[File], int]:
-    """
-    List files for a user with optional filters and pagination.
-    Returns:
-        tuple[list[File], int]: (files, total count)
-    Raises:
-        Exception: If the database operation fails.
-    """
-    stmt: sqlalchemy.sql.Select[Any] = select(File).where(File.user_id == user_id)
+) -> sqlalchemy.sql.Select[Any]:
+    """Add the file list filters and ordering to ``stmt`` (any projection)."""
+    stmt = stmt.where(File.user_id == user_id)
     if q is not None:
         stmt = stmt.where(File.filename.ilike(f"%{q}%"))
     if created_after is not None:
@@ -124,11 +140,37 @@ async def list_files(
         else:
             col = col.asc()
         stmt = stmt.order_by(col)
-    count_stmt: sqlalchemy.sql.Select[Any] = select(func.count()).select_from(
-        stmt.subquery()
+    return stmt
+
+
+@replica_read
+async def list_files(
+    session: AsyncSession,
+    user_id: int,
+    offset: int = 0,
+    limit: int = 20,
+    q: str | None = None,
+    sort: Literal["created_at", "filename"] = "created_at",
+    order: Literal["desc", "asc"] = "desc",
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> tuple[list[File], int]:
+    """
+    List files for a user with optional filters and pagination.
+    Returns:
+        tuple[list[File], int]: (files, total count)
+    Raises:
+        Exception: If the database operation fails.
+    """
+    total: int = (
+        await session.execute(
+            hot_queries.file_count(user_id, q, created_after, created_before)
+        )
+    ).scalar_one()
+    result = await session.execute(
+        hot_queries.file_page(
+            user_id, offset, limit, q, sort, order, created_after, created_before
+        )
     )
-    total: int = (await session.execute(count_stmt)).scalar_one()
-    stmt = stmt.offset(offset).limit(limit)
-    result = await session.execute(stmt)
     files: list[File] = list(result.scalars().all())
     return files, total
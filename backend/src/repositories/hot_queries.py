@@ -0,0 +1,134 @@
+"""Cached statements for the hottest repository queries.
+
+Building a ``select()`` and computing its cache key costs tens of microseconds
+of Python on every call, even when SQLAlchemy already has the compiled SQL
+cached. Each builder here returns a ``lambda_stmt``. SQLAlchemy analyses the
+lambda once, keys the cache on its code location, and turns the closure
+variables into bound parameters. A repeat call only collects the new parameter
+values.
+
+Rules for the lambdas (violations silently reuse a stale statement):
+
+- Closure variables may be plain values (bound as parameters) or SQL
+  expressions (part of the cache key). Never use a closure value to *choose*
+  structure inside the lambda (e.g. ``getattr(File, sort)``); resolve it
+  outside, as :func:`file_page` does for the ORDER BY column.
+- Optional clauses are added with ``stmt += lambda s: ...`` in plain ``if``
+  branches; each branch's lambda becomes part of the cache key.
+
+:data:`HOT_QUERIES` names every builder for the benchmark in
+``tests/performance``.
+"""
+
+from collections.abc import Callable, Mapping, Sequence
+from datetime import datetime
+from typing import Any, Final, Literal
+
+from sqlalchemy import ColumnElement, StatementLambdaElement, func, lambda_stmt, select
+
+from src.models.blacklisted_token import BlacklistedToken
+from src.models.file import File
+from src.models.user import User
+
+__all__: Final[Sequence[str]] = (
+    "HOT_QUERIES",
+    "blacklisted_token",
+    "file_by_filename",
+    "file_count",
+    "file_page",
+    "user_by_id",
+    "user_id_by_email",
+    "user_principal_row",
+)
+
+
+def user_by_id(user_id: int) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User).where(User.id == user_id))
+
+
+def user_principal_row(user_id: int) -> StatementLambdaElement:
+    """The columns of a :class:`~src.repositories.user.UserPrincipal`."""
+    return lambda_stmt(
+        lambda: select(
+            User.id,
+            User.email,
+            User.is_active,
+            User.is_deleted,
+            User.is_admin,
+            User.updated_at,
+        ).where(User.id == user_id)
+    )
+
+
+def user_id_by_email(email: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(User.id).where(User.email == email))
+
+
+def file_by_filename(filename: str) -> StatementLambdaElement:
+    return lambda_stmt(lambda: select(File).where(File.filename == filename))
+
+
+def blacklisted_token(jti: str) -> StatementLambdaElement:
+    return lambda_stmt(
+        lambda: select(BlacklistedToken).where(BlacklistedToken.jti == jti)
+    )
+
+
+def _file_filters(
+    stmt: StatementLambdaElement,
+    q: str | None,
+    created_after: datetime | None,
+    created_before: datetime | None,
+) -> StatementLambdaElement:
+    # Same filters as apply_file_list_filters; keep the two in step.
+    if q is not None:
+        pattern = f"%{q}%"
+        stmt += lambda s: s.where(File.filename.ilike(pattern))
+    if created_after is not None:
+        stmt += lambda s: s.where(File.created_at >= created_after)
+    if created_before is not None:
+        stmt += lambda s: s.where(File.created_at <= created_before)
+    return stmt
+
+
+def file_page(
+    user_id: int,
+    offset: int = 0,
+    limit: int = 20,
+    q: str | None = None,
+    sort: Literal["created_at", "filename"] = "created_at",
+    order: Literal["desc", "asc"] = "desc",
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> StatementLambdaElement:
+    """One page of a user's files, as :func:`~src.repositories.file.list_files` returns."""
+    column = File.filename if sort == "filename" else File.created_at
+    ordering: ColumnElement[Any] = column.desc() if order == "desc" else column.asc()
+    stmt = lambda_stmt(lambda: select(File).where(File.user_id == user_id))
+    stmt = _file_filters(stmt, q, created_after, created_before)
+    stmt += lambda s: s.order_by(ordering).offset(offset).limit(limit)
+    return stmt
+
+
+def file_count(
+    user_id: int,
+    q: str | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> StatementLambdaElement:
+    """Number of a user's files matching the :func:`file_page` filters."""
+    stmt = lambda_stmt(
+        lambda: select(func.count()).select_from(File).where(File.user_id == user_id)
+    )
+    return _file_filters(stmt, q, created_after, created_before)
+
+
+HOT_QUERIES: Final[Mapping[str, Callable[..., StatementLambdaElement]]] = {
+    "user_by_id": user_by_id,
+    "user_principal_row": user_principal_row,
+    "user_id_by_email": user_id_by_email,
+    "file_by_filename": file_by_filename,
+    "blacklisted_token": blacklisted_token,
+    "file_page": file_page,
+    "file_count": file_count,
+}
@@ -0,0 +1,219 @@
+"""Column-projected read models for list endpoints.
+
+The list endpoints only need a few scalar columns per row. These queries select
+exactly those columns with a Core ``select()`` and turn each result tuple into a
+plain ``TypedDict``. There is no ORM entity, identity map, attribute
+instrumentation or pydantic validation, and wide columns such as
+``users.preferences`` are never read. Filters and ordering are shared with the
+ORM list functions (:func:`apply_user_list_filters`,
+:func:`apply_file_list_filters`), so both paths return the same rows.
+
+Every function takes an optional sparse fieldset (``fields``). Only the columns
+backing those fields are put in the ``SELECT``, so a table view asking for
+``id,email,name`` never reads ``bio`` or ``avatar_url`` at all.
+"""
+
+from collections.abc import Mapping, Sequence
+from datetime import datetime
+from typing import Any, Final, Literal, cast
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
+from typing_extensions import TypedDict
+
+from src.core.replicas import replica_read
+from src.models.file import File
+from src.models.user import User
+from src.repositories.file import apply_file_list_filters
+from src.repositories.user import UserListSort, apply_user_list_filters
+
+__all__: Final[Sequence[str]] = (
+    "FILE_FIELDS",
+    "USER_FIELDS",
+    "FileListItem",
+    "UserListItem",
+    "get_file_item",
+    "get_user_item",
+    "list_file_items",
+    "list_user_items",
+)
+
+
+class UserListItem(TypedDict, total=False):
+    id: int
+    email: str
+    name: str | None
+    bio: str | None
+    avatar_url: str | None
+    created_at: str | None
+    updated_at: str | None
+
+
+class FileListItem(TypedDict, total=False):
+    filename: str
+    url: str
+    content_type: str
+    size: int
+    created_at: str | None
+
+
+# Public field name -> column it is read from. ``url`` is derived from
+# ``filename``, so it costs no extra column.
+_USER_COLUMNS: Final[Mapping[str, InstrumentedAttribute[Any]]] = {
+    "id": User.id,
+    "email": User.email,
+    "name": User.name,
+    "bio": User.bio,
+    "avatar_url": User.avatar_url,
+    "created_at": User.created_at,
+    "updated_at": User.updated_at,
+}
+_FILE_COLUMNS: Final[Mapping[str, InstrumentedAttribute[Any]]] = {
+    "filename": File.filename,
+    "url": File.filename,
+    "content_type": File.content_type,
+    "size": File.size,
+    "created_at": File.created_at,
+}
+USER_FIELDS: Final[tuple[str, ...]] = tuple(_USER_COLUMNS)
+FILE_FIELDS: Final[tuple[str, ...]] = tuple(_FILE_COLUMNS)
+_DATETIME_FIELDS: Final[frozenset[str]] = frozenset({"created_at", "updated_at"})
+
+
+def _iso(value: datetime | None) -> str | None:
+    return value.isoformat() if value is not None else None
+
+
+class _Projection:
+    """The columns to select for a fieldset, and how to turn a row into a dict."""
+
+    __slots__ = ("columns", "fields", "_positions")
+
+    def __init__(
+        self,
+        registry: Mapping[str, InstrumentedAttribute[Any]],
+        fields: Sequence[str] | None,
+    ) -> None:
+        wanted = set(fields) if fields is not None else set(registry)
+        # Keep the registry order so responses have a stable key order.
+        self.fields: tuple[str, ...] = tuple(f for f in registry if f in wanted)
+        self.columns: list[InstrumentedAttribute[Any]] = []
+        self._positions: list[int] = []
+        by_key: dict[str, int] = {}
+        for name in self.fields:
+            column = registry[name]
+            if column.key not in by_key:
+                by_key[column.key] = len(self.columns)
+                self.columns.append(column)
+            self._positions.append(by_key[column.key])
+
+    def item(self, row: Sequence[Any]) -> dict[str, Any]:
+        item: dict[str, Any] = {}
+        for name, position in zip(self.fields, self._positions, strict=True):
+            value = row[position]
+            if name == "url":
+                value = f"/uploads/{value}"
+            elif name in _DATETIME_FIELDS:
+                value = _iso(value)
+            item[name] = value
+        return item
+
+
+@replica_read
+async def list_user_items(
+    session: AsyncSession,
+    offset: int = 0,
+    limit: int = 20,
+    email: str | None = None,
+    name: str | None = None,
+    q: str | None = None,
+    sort: UserListSort = "created_at",
+    order: Literal["desc", "asc"] = "desc",
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    fields: Sequence[str] | None = None,
+) -> list[UserListItem]:
+    """Return one page of users as response-ready dicts (no count query).
+
+    ``fields`` limits both the selected columns and the returned keys; ``None``
+    means every field in :data:`USER_FIELDS`.
+    """
+    projection = _Projection(_USER_COLUMNS, fields)
+    stmt = apply_user_list_filters(
+        select(*projection.columns),
+        email=email,
+        name=name,
+        q=q,
+        sort=sort,
+        order=order,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    result = await session.execute(stmt.offset(offset).limit(limit))
+    return [cast(UserListItem, projection.item(row)) for row in result.tuples()]
+
+
+@replica_read
+async def get_user_item(
+    session: AsyncSession, user_id: int, fields: Sequence[str] | None = None
+) -> UserListItem | None:
+    """Return one user as a response-ready dict, or ``None`` if it does not exist."""
+    projection = _Projection(_USER_COLUMNS, fields)
+    row = (
+        await session.execute(select(*projection.columns).where(User.id == user_id))
+    ).first()
+    return cast(UserListItem, projection.item(row)) if row is not None else None
+
+
+@replica_read
+async def list_file_items(
+    session: AsyncSession,
+    user_id: int,
+    offset: int = 0,
+    limit: int = 20,
+    q: str | None = None,
+    sort: Literal["created_at", "filename"] = "created_at",
+    order: Literal["desc", "asc"] = "desc",
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    fields: Sequence[str] | None = None,
+) -> tuple[list[FileListItem], int]:
+    """Return one page of a user's files as response-ready dicts, and the total.
+
+    ``fields`` works as in :func:`list_user_items`, over :data:`FILE_FIELDS`.
+    """
+    projection = _Projection(_FILE_COLUMNS, fields)
+    stmt = apply_file_list_filters(
+        select(*projection.columns),
+        user_id,
+        q=q,
+        sort=sort,
+        order=order,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    total: int = (
+        await session.execute(
+            select(func.count()).select_from(stmt.order_by(None).subquery())
+        )
+    ).scalar_one()
+    result = await session.execute(stmt.offset(offset).limit(limit))
+    items: list[FileListItem] = [
+        cast(FileListItem, projection.item(row)) for row in result.tuples()
+    ]
+    return items, total
+
+
+@replica_read
+async def get_file_item(
+    session: AsyncSession, filename: str, fields: Sequence[str] | None = None
+) -> FileListItem | None:
+    """Return one file as a response-ready dict, or ``None`` if it does not exist."""
+    projection = _Projection(_FILE_COLUMNS, fields)
+    row = (
+        await session.execute(
+            select(*projection.columns).where(File.filename == filename)
+        )
+    ).first()
+    return cast(FileListItem, projection.item(row)) if row is not None else None
@@ -1,9 +1,11 @@
+import asyncio
 import csv
 import io
 import json
 import logging
 from collections.abc import AsyncIterator, Mapping, Sequence
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
 from datetime import UTC, datetime
 
 # Example: rate limiter for user actions (5 per minute per user)
@@ -14,16 +16,33 @@ from typing import (
 )
 
 from sqlalchemy import (
-    extract,
+    DateTime,
+    Integer,
+    bindparam,
+    delete,
+    event,
     func,
+    insert,
     or_,
     select,
+    text,
+    update,
 )
-from sqlalchemy.engine import Row
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import ReturningInsert
 from typing_extensions import TypedDict
 
+from src.core.replicas import replica_read
+from src.core.unit_of_work import PRINCIPAL_INVALIDATIONS_KEY
+from src.models.analytics import METRIC_LOGINS, METRIC_SIGNUPS
 from src.models.user import User
+from src.repositories import hot_queries
+from src.repositories.analytics import count_event, count_on_commit, monthly_rollups
+from src.repositories.audit import audit_on_commit
 from src.utils.cache import user_cache
 from src.utils.errors import (
     RateLimitExceededError,
@@ -36,34 +55,181 @@ from src.utils.validation import (
     get_password_validation_error,
     validate_email,
 )
+from src.utils.write_behind import PendingWrite, WriteBehindBuffer
 
 user_action_limiter: Final[AsyncRateLimiter[Any]] = AsyncRateLimiter(
-    max_calls=5, period=60.0
+    max_calls=5, period=60.0, namespace="user_action"
 )
 
 
+# Principals are cached per process: an invalidation only reaches this
+# worker's ``user_cache``, so other workers keep serving a deactivated,
+# deleted or demoted user until their entry expires.
+PRINCIPAL_CACHE_TTL: Final[float] = 60.0
+
+
+@dataclass(frozen=True, slots=True)
+class UserPrincipal:
+    """Immutable snapshot of the user fields needed to authenticate a request.
+
+    ``version`` is derived from ``updated_at`` and changes whenever the row is written.
+    """
+
+    id: int
+    email: str
+    is_active: bool
+    is_deleted: bool
+    is_admin: bool
+    version: float
+
+    @property
+    def role(self) -> Literal["admin", "user"]:
+        """Return the role of the principal."""
+        return "admin" if self.is_admin else "user"
+
+    @classmethod
+    def from_user(cls, user: User) -> "UserPrincipal":
+        """Build a principal snapshot from a loaded User entity."""
+        updated_at: datetime | None = user.updated_at
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=bool(user.is_active),
+            is_deleted=bool(user.is_deleted),
+            is_admin=bool(user.is_admin),
+            version=updated_at.timestamp() if updated_at is not None else 0.0,
+        )
+
+
+# session.info key for principals to invalidate once the transaction commits.
+_INVALIDATE_KEY: Final[str] = PRINCIPAL_INVALIDATIONS_KEY
+
+
+class _PrincipalRead:
+    """A principal lookup in flight; set ``stale`` if the user is invalidated."""
+
+    __slots__ = ("stale",)
+
+    def __init__(self) -> None:
+        self.stale: bool = False
+
+
+# Lookups in flight per user, so a lookup that read the row before a change
+# committed does not cache it afterwards. Entries only live while a lookup
+# runs, so the map is bounded by concurrent lookups, not by users.
+_principal_reads: dict[int, set[_PrincipalRead]] = {}
+
+
+def _principal_cache_key(user_id: int) -> str:
+    return f"user_principal:{user_id}"
+
+
+def _discard_principal(user_id: int) -> None:
+    for read in _principal_reads.get(user_id, ()):
+        read.stale = True
+    user_cache.discard(_principal_cache_key(user_id))
+
+
+async def _load_principal(session: AsyncSession, user_id: int) -> UserPrincipal | None:
+    result = await session.execute(hot_queries.user_principal_row(user_id))
+    row = result.one_or_none()
+    if row is None:
+        return None
+    return UserPrincipal(
+        id=row.id,
+        email=row.email,
+        is_active=bool(row.is_active),
+        is_deleted=bool(row.is_deleted),
+        is_admin=bool(row.is_admin),
+        version=row.updated_at.timestamp() if row.updated_at is not None else 0.0,
+    )
+
+
+async def get_user_principal(
+    session: AsyncSession, user_id: int, use_cache: bool = True
+) -> UserPrincipal | None:
+    """Fetch the auth snapshot for a user, served from the principal cache when possible.
+    Only the principal columns are selected on a miss; the ORM entity is never loaded.
+    Raises:
+        None
+    """
+    if not use_cache:
+        return await _load_principal(session, user_id)
+    cache_key: Final[str] = _principal_cache_key(user_id)
+    cached = await user_cache.get(cache_key)
+    if isinstance(cached, UserPrincipal):
+        return cached
+    read = _PrincipalRead()
+    reads = _principal_reads.setdefault(user_id, set())
+    reads.add(read)
+    try:
+        principal = await _load_principal(session, user_id)
+        if principal is not None and not read.stale:
+            await user_cache.set(cache_key, principal, ttl=PRINCIPAL_CACHE_TTL)
+            if read.stale:
+                # Invalidated while waiting for the cache lock.
+                user_cache.discard(cache_key)
+    finally:
+        reads.discard(read)
+        if not reads and _principal_reads.get(user_id) is reads:
+            del _principal_reads[user_id]
+    return principal
+
+
+async def get_user_principal_by_email(
+    session: AsyncSession, email: str
+) -> UserPrincipal | None:
+    """Resolve a principal by email (legacy tokens carry the email as ``sub``)."""
+    result = await session.execute(hot_queries.user_id_by_email(email))
+    user_id: int | None = result.scalar_one_or_none()
+    if user_id is None:
+        return None
+    return await get_user_principal(session, user_id)
+
+
+async def invalidate_user_principal(*user_ids: int) -> None:
+    """Drop cached principals so the next auth lookup reads the committed row."""
+    for user_id in user_ids:
+        _discard_principal(user_id)
+
+
+def invalidate_principal_on_commit(session: AsyncSession, *user_ids: int) -> None:
+    """Drop the cached principals of ``user_ids`` once ``session`` commits.
+
+    Dropping them earlier would let a concurrent request cache the old row
+    again before the change is visible.
+    """
+    if user_ids:
+        pending: list[int] = session.sync_session.info.setdefault(_INVALIDATE_KEY, [])
+        pending.extend(user_ids)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session: Session) -> None:
+    for user_id in session.info.pop(_INVALIDATE_KEY, ()):
+        _discard_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session) -> None:
+    if not session.in_nested_transaction():
+        session.info.pop(_INVALIDATE_KEY, None)
+
+
+@replica_read
 async def get_user_by_id(
     session: AsyncSession, user_id: int, use_cache: bool = True
 ) -> User | None:
-    """Fetch a user by their ID, optionally using async cache (cache only user id, not ORM instance).
+    """Fetch the full User entity by ID.
+    With use_cache the session identity map is consulted first, so a user already
+    loaded in this session is returned without another SELECT.
     Raises:
         None
     """
-    cache_key: Final[str] = f"user_id:{user_id}"
     if use_cache:
-        cached_id_obj = await user_cache.get(cache_key)
-        cached_id: int | None = (
-            cached_id_obj if isinstance(cached_id_obj, int) else None
-        )
-        if cached_id is not None:
-            result = await session.execute(select(User).where(User.id == cached_id))
-            return result.scalar_one_or_none()
-    result = await session.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if user is not None and use_cache:
-        # user.id is always int, but mypy may not know user is User here
-        await user_cache.set(cache_key, user.id, ttl=60)
-    return user
+        return await session.get(User, user_id)
+    result = await session.execute(hot_queries.user_by_id(user_id))
+    return result.scalar_one_or_none()
 
 
 async def create_user_with_validation(
@@ -73,11 +239,13 @@ async def create_user_with_validation(
     Raises:
         ValidationError: If email or password is invalid.
         UserAlreadyExistsError: If email already exists.
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     import traceback
 
-    logging.debug(f"create_user_with_validation called with email={email}, name={name}")
+    logging.debug(
+        "create_user_with_validation called with email=%s, name=%s", email, name
+    )
     if not validate_email(email):
         logging.warning(f"Invalid email format: {email}")
         raise ValidationError("Invalid email format.")
@@ -85,31 +253,66 @@ async def create_user_with_validation(
     if err is not None:
         logging.warning(f"Password validation failed for {email}")
         raise ValidationError(err)
-    is_unique: bool = await is_email_unique(session, email)
+    from src.utils.hashing import hash_password_async
+
+    # Hash off the event loop while the uniqueness pre-check runs; the pre-check
+    # only fails fast, the INSERT below is what enforces uniqueness.
+    hash_task: asyncio.Task[str] = asyncio.create_task(hash_password_async(password))
+    try:
+        is_unique: bool = await is_email_unique(session, email)
+    except BaseException:
+        hash_task.cancel()
+        raise
     if not is_unique:
+        hash_task.cancel()
         logging.warning(f"Email already exists: {email}")
         raise UserAlreadyExistsError("Email already exists.")
-    from src.utils.hashing import hash_password
-
-    hashed: str = hash_password(password)
-    user = User(email=email, hashed_password=hashed, is_active=True)
-    if name is not None:
-        user.name = name
-    session.add(user)
+    hashed: str = await hash_task
+    values: dict[str, object] = {
+        "email": email,
+        "hashed_password": hashed,
+        "is_active": True,
+        "name": name,
+    }
     try:
-        await session.commit()
-        await session.refresh(user)
-        logging.info(f"User created successfully: {user.email}, id={user.id}")
+        user: User | None = (
+            await session.scalars(_insert_user_if_absent(session, values))
+        ).one_or_none()
+        if user is None:
+            logging.warning(f"Email already exists: {email}")
+            raise UserAlreadyExistsError("Email already exists.")
+        count_on_commit(session, METRIC_SIGNUPS)
+        audit_on_commit(session, "user.create", "user", user.id)
+        logging.info("User created successfully: %s, id=%s", user.email, user.id)
+    except UserAlreadyExistsError:
+        raise
     except Exception as e:
         tb: str = traceback.format_exc()
         logging.error(
             f"Exception during user creation for {email}: {e}\nTraceback: {tb}"
         )
-        await session.rollback()
         raise
     return user
 
 
+def _insert_user_if_absent(
+    session: AsyncSession, values: Mapping[str, object]
+) -> ReturningInsert[tuple[User]]:
+    """``INSERT ... ON CONFLICT (email) DO NOTHING RETURNING users.*``.
+
+    Returns no row when the email is taken, so the existence check and the insert
+    are a single statement and the generated columns need no refresh.
+    """
+    dialect: str = session.get_bind().dialect.name
+    insert_fn = pg_insert if dialect == "postgresql" else sqlite_insert
+    return (
+        insert_fn(User)
+        .values(**values)
+        .on_conflict_do_nothing(index_elements=[User.email])
+        .returning(User)
+    )
+
+
 async def sensitive_user_action(
     session: AsyncSession, user_id: int, action: str
 ) -> None:
@@ -141,6 +344,7 @@ async def safe_get_user_by_id(session: AsyncSession, user_id: int) -> User:
     return user
 
 
+@replica_read
 async def get_users_by_ids(
     session: AsyncSession, user_ids: Sequence[int]
 ) -> Sequence[User]:
@@ -152,6 +356,7 @@ async def get_users_by_ids(
     return users
 
 
+@replica_read
 async def list_users_paginated(
     session: AsyncSession, offset: int = 0, limit: int = 20
 ) -> Sequence[User]:
@@ -163,23 +368,20 @@ async def list_users_paginated(
     return users
 
 
-async def list_users(
-    session: AsyncSession,
-    offset: int = 0,
-    limit: int = 20,
+UserListSort = Literal["created_at", "name", "email"]
+
+
+def apply_user_list_filters(
+    stmt: Select[Any],
     email: str | None = None,
     name: str | None = None,
     q: str | None = None,
-    sort: Literal["created_at", "name", "email"] = "created_at",
+    sort: UserListSort = "created_at",
     order: Literal["desc", "asc"] = "desc",
     created_after: datetime | None = None,
     created_before: datetime | None = None,
-) -> tuple[list[User], int]:
-    """List users with filtering and pagination.
-    Returns:
-        (users, total_count)
-    """
-    stmt = select(User)
+) -> Select[Any]:
+    """Add the user list filters and ordering to ``stmt`` (any projection)."""
     if email:
         stmt = stmt.where(User.email.ilike(f"%{email}%"))
     if name:
@@ -198,6 +400,36 @@ async def list_users(
         else:
             col = col.asc()
         stmt = stmt.order_by(col)
+    return stmt
+
+
+@replica_read
+async def list_users(
+    session: AsyncSession,
+    offset: int = 0,
+    limit: int = 20,
+    email: str | None = None,
+    name: str | None = None,
+    q: str | None = None,
+    sort: UserListSort = "created_at",
+    order: Literal["desc", "asc"] = "desc",
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+) -> tuple[list[User], int]:
+    """List users with filtering and pagination.
+    Returns:
+        (users, total_count)
+    """
+    stmt = apply_user_list_filters(
+        select(User),
+        email=email,
+        name=name,
+        q=q,
+        sort=sort,
+        order=order,
+        created_after=created_after,
+        created_before=created_before,
+    )
     count_stmt = select(func.count()).select_from(stmt.subquery())
     total = (await session.execute(count_stmt)).scalar_one()
     stmt = stmt.offset(offset).limit(limit)
@@ -206,6 +438,7 @@ async def list_users(
     return users, total
 
 
+@replica_read
 async def search_users_by_name_or_email(
     session: AsyncSession, query: str, offset: int = 0, limit: int = 20
 ) -> Sequence[User]:
@@ -218,6 +451,7 @@ async def search_users_by_name_or_email(
     return users
 
 
+@replica_read
 async def filter_users_by_status(
     session: AsyncSession, is_active: bool
 ) -> Sequence[User]:
@@ -227,12 +461,14 @@ async def filter_users_by_status(
     return users
 
 
+@replica_read
 async def filter_users_by_role(session: AsyncSession, role: str) -> Sequence[User]:
     """Stub: Fetch users filtered by role. Not implemented (no role field)."""
     # Role field not present in User model
     return []
 
 
+@replica_read
 async def get_users_created_within(
     session: AsyncSession, start: datetime, end: datetime
 ) -> Sequence[User]:
@@ -244,6 +480,7 @@ async def get_users_created_within(
     return users
 
 
+@replica_read
 async def count_users(session: AsyncSession, is_active: bool | None = None) -> int:
     """Count users, optionally filtered by active status."""
     stmt = select(func.count()).select_from(User)
@@ -254,16 +491,19 @@ async def count_users(session: AsyncSession, is_active: bool | None = None) -> i
     return count
 
 
+@replica_read
 async def get_active_users(session: AsyncSession) -> Sequence[User]:
     """Fetch all active users."""
     return await filter_users_by_status(session, True)
 
 
+@replica_read
 async def get_inactive_users(session: AsyncSession) -> Sequence[User]:
     """Fetch all inactive users."""
     return await filter_users_by_status(session, False)
 
 
+@replica_read
 async def get_users_by_custom_field(
     session: AsyncSession, field: str, value: object
 ) -> Sequence[User]:
@@ -272,22 +512,66 @@ async def get_users_by_custom_field(
     return []
 
 
+# Rows per statement for bulk helpers; keeps IN lists and bound parameters
+# well under SQLite's limit and bounds per-statement memory.
+_BULK_CHUNK_SIZE: Final[int] = 1000
+_USER_COLUMNS: Final[frozenset[str]] = frozenset(c.key for c in User.__table__.columns)
+
+
+def _user_row(user: User | Mapping[str, object]) -> dict[str, object]:
+    if isinstance(user, User):
+        state: Mapping[str, object] = vars(user)
+        return {k: state[k] for k in _USER_COLUMNS if k in state}
+    unknown: set[str] = set(user) - _USER_COLUMNS
+    if unknown:
+        raise ValidationError(f"Unknown user fields: {', '.join(sorted(unknown))}")
+    return dict(user)
+
+
+def _chunks(ids: Sequence[int]) -> list[Sequence[int]]:
+    unique: list[int] = list(dict.fromkeys(ids))
+    return [
+        unique[i : i + _BULK_CHUNK_SIZE]
+        for i in range(0, len(unique), _BULK_CHUNK_SIZE)
+    ]
+
+
 async def bulk_create_users(
-    session: AsyncSession, users: Sequence[User]
-) -> Sequence[User]:
-    """Bulk create users and return them with IDs.
+    session: AsyncSession, users: Sequence[User | Mapping[str, object]]
+) -> list[int]:
+    """Insert users with multi-row ``INSERT ... RETURNING id`` statements.
+
+    Accepts ``User`` instances (which are not added to the session) or column
+    mappings. Returns the new ids in input order.
     Raises:
-        Exception: On DB commit failure.
+        ValidationError: If a mapping names an unknown column.
+        Exception: On DB flush failure.
     """
-    session.add_all(users)
-    try:
-        await session.commit()
-        for user in users:
-            await session.refresh(user)
-    except Exception as exc:
-        await session.rollback()
-        raise exc
-    return users
+    rows: list[dict[str, object]] = [_user_row(user) for user in users]
+    ids: list[int] = []
+    # Rows with the same columns share one executemany (insertmanyvalues)
+    # batch; a change of column set starts a new batch so order is kept.
+    start: int = 0
+    while start < len(rows):
+        keys: frozenset[str] = frozenset(rows[start])
+        end: int = start + 1
+        while (
+            end < len(rows)
+            and end - start < _BULK_CHUNK_SIZE
+            and frozenset(rows[end]) == keys
+        ):
+            end += 1
+        result = await session.execute(
+            insert(User).returning(User.id, sort_by_parameter_order=True),
+            rows[start:end],
+        )
+        ids.extend(result.scalars().all())
+        start = end
+    count_on_commit(session, METRIC_SIGNUPS, len(ids))
+    for user_id in ids:
+        audit_on_commit(session, "user.create", "user", user_id)
+    invalidate_principal_on_commit(session, *ids)
+    return ids
 
 
 class UserUpdateData(TypedDict, total=False):
@@ -303,78 +587,82 @@ class UserUpdateData(TypedDict, total=False):
 
 async def bulk_update_users(
     session: AsyncSession, user_ids: Sequence[int], update_data: Mapping[str, object]
-) -> int:
-    """Bulk update users by IDs with the given update_data dict. Returns number of updated rows.
+) -> list[int]:
+    """Apply ``update_data`` to the given users with one ``UPDATE ... WHERE id IN``
+    per chunk. Rows are not loaded. Returns the ids that were updated.
     Raises:
-        Exception: On DB commit failure.
+        ValidationError: If ``update_data`` names an unknown column.
+        Exception: On DB flush failure.
     """
     if not user_ids or not update_data:
-        return 0
-    result = await session.execute(select(User).where(User.id.in_(user_ids)))
-    users: Sequence[User] = result.scalars().all()
-    for user in users:
-        for key, value in update_data.items():
-            setattr(user, key, value)
-    try:
-        await session.commit()
-    except Exception as exc:
-        await session.rollback()
-        raise exc
-    return len(users)
+        return []
+    values: dict[str, object] = _user_row(update_data)
+    updated: list[int] = []
+    for chunk in _chunks(user_ids):
+        result = await session.execute(
+            update(User).where(User.id.in_(chunk)).values(**values).returning(User.id)
+        )
+        updated.extend(result.scalars().all())
+    for user_id in updated:
+        audit_on_commit(
+            session,
+            "user.update",
+            "user",
+            user_id,
+            details={"fields": sorted(values)},
+        )
+    invalidate_principal_on_commit(session, *updated)
+    return updated
 
 
-async def bulk_delete_users(session: AsyncSession, user_ids: Sequence[int]) -> int:
-    """Bulk delete users by IDs. Returns number of deleted rows.
+async def bulk_delete_users(
+    session: AsyncSession, user_ids: Sequence[int]
+) -> list[int]:
+    """Delete users with one ``DELETE ... WHERE id IN`` per chunk.
+    Rows are not loaded. Returns the ids that were deleted.
     Raises:
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     if not user_ids:
-        return 0
-    result = await session.execute(select(User).where(User.id.in_(user_ids)))
-    users: Sequence[User] = result.scalars().all()
-    for user in users:
-        await session.delete(user)
-    try:
-        await session.commit()
-    except Exception as exc:
-        await session.rollback()
-        raise exc
-    return len(users)
+        return []
+    deleted: list[int] = []
+    for chunk in _chunks(user_ids):
+        result = await session.execute(
+            delete(User).where(User.id.in_(chunk)).returning(User.id)
+        )
+        deleted.extend(result.scalars().all())
+    for user_id in deleted:
+        audit_on_commit(session, "user.delete", "user", user_id)
+    invalidate_principal_on_commit(session, *deleted)
+    return deleted
 
 
 async def soft_delete_user(session: AsyncSession, user_id: int) -> bool:
     """Mark a user as deleted (soft delete).
     Raises:
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     user: User | None = await get_user_by_id(session, user_id)
     if user is None or getattr(user, "is_deleted", False):
         return False
     user.is_deleted = True
-    try:
-        await session.commit()
-    except Exception as exc:
-        logging.error(f"Failed to commit soft delete for user {user_id}: {exc}")
-        await session.rollback()
-        raise exc
+    await session.flush()
+    invalidate_principal_on_commit(session, user_id)
     return True
 
 
 async def restore_user(session: AsyncSession, user_id: int) -> bool:
     """Restore a soft-deleted user.
     Raises:
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     user: User | None = await get_user_by_id(session, user_id)
     if user is None or not getattr(user, "is_deleted", False):
         return False
     user.is_deleted = False
-    try:
-        await session.commit()
-    except Exception as exc:
-        logging.error(f"Failed to commit restore for user {user_id}: {exc}")
-        await session.rollback()
-        raise exc
+    audit_on_commit(session, "user.restore", "user", user_id)
+    await session.flush()
+    invalidate_principal_on_commit(session, user_id)
     return True
 
 
@@ -384,7 +672,7 @@ async def upsert_user(
     """Insert or update a user by email. Returns the user.
     Raises:
         ValidationError: If email is invalid.
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     if not email or not validate_email(email):
         raise ValidationError("Invalid email format.")
@@ -397,13 +685,16 @@ async def upsert_user(
     else:
         user = User(email=email, **defaults)
         session.add(user)
-    try:
-        await session.commit()
-        await session.refresh(user)
-    except Exception as exc:
-        logging.error(f"Failed to commit upsert for user {email}: {exc}")
-        await session.rollback()
-        raise exc
+    await session.flush()
+    await session.refresh(user)
+    audit_on_commit(
+        session,
+        "user.upsert",
+        "user",
+        user.id,
+        details={"fields": sorted(defaults)},
+    )
+    invalidate_principal_on_commit(session, user.id)
     return user
 
 
@@ -412,21 +703,22 @@ async def partial_update_user(
 ) -> User | None:
     """Update only provided fields for a user.
     Raises:
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     user: User | None = await get_user_by_id(session, user_id)
     if user is None:
         return None
+    changed: list[str] = []
     for key, value in update_data.items():
         if hasattr(user, key):
             setattr(user, key, value)
-    try:
-        await session.commit()
-        await session.refresh(user)
-    except Exception as exc:
-        logging.error(f"Failed to commit partial update for user {user_id}: {exc}")
-        await session.rollback()
-        raise exc
+            changed.append(key)
+    audit_on_commit(
+        session, "user.update", "user", user_id, details={"fields": changed}
+    )
+    await session.flush()
+    await session.refresh(user)
+    invalidate_principal_on_commit(session, user_id)
     return user
 
 
@@ -441,7 +733,7 @@ async def is_email_unique(
     session: AsyncSession, email: str, exclude_user_id: int | None = None
 ) -> bool:
     """Check if an email is unique (optionally excluding a user by ID)."""
-    stmt = select(User).where(User.email == email)
+    stmt = select(User.id).where(User.email == email)
     if exclude_user_id is not None:
         stmt = stmt.where(User.id != exclude_user_id)
     result = await session.execute(stmt)
@@ -454,18 +746,15 @@ async def change_user_password(
 ) -> bool:
     """Change a user's password (hashed).
     Raises:
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     user: User | None = await get_user_by_id(session, user_id)
     if user is None:
         return False
     user.hashed_password = new_hashed_password
-    try:
-        await session.commit()
-    except Exception as exc:
-        logging.error(f"Failed to commit password change for user {user_id}: {exc}")
-        await session.rollback()
-        raise exc
+    audit_on_commit(session, "user.password_change", "user", user_id)
+    await session.flush()
+    invalidate_principal_on_commit(session, user_id)
     return True
 
 
@@ -475,12 +764,18 @@ logger: Final[logging.Logger] = logging.getLogger("user_audit")
 async def audit_log_user_change(
     session: AsyncSession, user_id: int, action: str, details: str = ""
 ) -> None:
-    """Log an audit event for a user change. In production, consider integrating with Azure Monitor or Application Insights.
+    """Record an audit event for a user change once ``session`` commits.
     Raises:
         None
     """
-    logger.info(f"User {user_id}: {action}. {details}")
-    # Optionally, persist audit logs to DB or send to Azure Monitor here
+    logger.info("User %s: %s. %s", user_id, action, details)
+    audit_on_commit(
+        session,
+        f"user.{action}",
+        "user",
+        user_id,
+        details={"message": details} if details else None,
+    )
 
 
 async def assign_role_to_user(session: AsyncSession, user_id: int, role: str) -> bool:
@@ -524,6 +819,7 @@ async def db_transaction(session: AsyncSession) -> AsyncIterator[AsyncSession]:
         yield session
 
 
+@replica_read
 async def get_user_with_files(session: AsyncSession, user_id: int) -> User | None:
     """Fetch a user and their files separately (WriteOnlyMapped doesn't support eager loading)."""
     from src.models.file import File
@@ -556,6 +852,7 @@ class UserCSVRow(TypedDict):
     last_login_at: object
 
 
+@replica_read
 async def export_users_to_csv(session: AsyncSession) -> str:
     """Export all users to CSV string."""
     result = await session.execute(select(User))
@@ -598,6 +895,7 @@ class UserJSONRow(TypedDict):
     last_login_at: str | None
 
 
+@replica_read
 async def export_users_to_json(session: AsyncSession) -> str:
     """Export all users to JSON string."""
     result = await session.execute(select(User))
@@ -623,54 +921,126 @@ async def import_users_from_dicts(
     session: AsyncSession, user_dicts: Sequence[Mapping[str, object]]
 ) -> Sequence[User]:
     """Bulk import users from a list of dicts.
+
+    Rows are written with batched ``INSERT ... RETURNING users.*`` statements, so
+    the returned users need no refresh. For large or untrusted input use the
+    streaming pipeline in ``src.services.user_import``.
     Raises:
-        Exception: On DB commit failure.
+        ValidationError: If a dict names an unknown column.
+        Exception: On DB flush failure.
     """
-    users: list[User] = [User(**d) for d in user_dicts]
-    session.add_all(users)
-    try:
-        await session.commit()
-        for user in users:
-            await session.refresh(user)
-    except Exception as exc:
-        await session.rollback()
-        raise exc
+    rows: list[dict[str, object]] = [_user_row(d) for d in user_dicts]
+    if not rows:
+        return []
+    users: Sequence[User] = (
+        await session.scalars(
+            insert(User).returning(User, sort_by_parameter_order=True), rows
+        )
+    ).all()
+    count_on_commit(session, METRIC_SIGNUPS, len(users))
+    for user in users:
+        audit_on_commit(
+            session, "user.create", "user", user.id, details={"import": True}
+        )
     return users
 
 
+# Staging table for COPY-based imports on PostgreSQL; rows vanish at commit.
+_IMPORT_STAGE_DDL: Final[str] = (
+    "CREATE TEMP TABLE IF NOT EXISTS user_import_stage ("
+    "email varchar(255), hashed_password varchar(255), name varchar(128), "
+    "is_active boolean) ON COMMIT DELETE ROWS"
+)
+_IMPORT_STAGE_COLUMNS: Final[tuple[str, ...]] = (
+    "email",
+    "hashed_password",
+    "name",
+    "is_active",
+)
+_IMPORT_FROM_STAGE: Final[str] = (
+    "INSERT INTO users (email, hashed_password, name, is_active, is_deleted, "
+    "is_admin, created_at, updated_at) "
+    "SELECT email, hashed_password, name, is_active, false, false, now(), now() "
+    "FROM user_import_stage ON CONFLICT (email) DO NOTHING RETURNING id, email"
+)
+
+
+async def insert_users_skip_existing(
+    session: AsyncSession, rows: Sequence[Mapping[str, object]]
+) -> dict[str, int]:
+    """Insert import rows, skipping emails that already exist.
+
+    Each row has ``email``, ``hashed_password``, ``name`` and ``is_active``. On
+    PostgreSQL the rows are ``COPY``-ed into a temporary staging table and moved
+    with one ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``; other databases
+    get multi-row ``INSERT ... ON CONFLICT DO NOTHING`` statements. Returns
+    ``{email: id}`` for the rows that were inserted; a missing email was a
+    conflict.
+    Raises:
+        Exception: On DB flush failure.
+    """
+    if not rows:
+        return {}
+    created: dict[str, int] = {}
+    if session.get_bind().dialect.name == "postgresql":
+        await session.execute(text(_IMPORT_STAGE_DDL))
+        conn = await session.connection()
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_records_to_table(
+            "user_import_stage",
+            records=[tuple(row[c] for c in _IMPORT_STAGE_COLUMNS) for row in rows],
+            columns=list(_IMPORT_STAGE_COLUMNS),
+        )
+        result = await session.execute(text(_IMPORT_FROM_STAGE))
+        created.update((email, user_id) for user_id, email in result.all())
+    else:
+        # Four columns per row keeps each statement far below SQLite's
+        # bound-parameter limit.
+        for start in range(0, len(rows), _BULK_CHUNK_SIZE):
+            chunk = [
+                {c: row[c] for c in _IMPORT_STAGE_COLUMNS}
+                for row in rows[start : start + _BULK_CHUNK_SIZE]
+            ]
+            result = await session.execute(
+                sqlite_insert(User)
+                .values(chunk)
+                .on_conflict_do_nothing(index_elements=[User.email])
+                .returning(User.id, User.email)
+            )
+            created.update((email, user_id) for user_id, email in result.all())
+    count_on_commit(session, METRIC_SIGNUPS, len(created))
+    for user_id in created.values():
+        audit_on_commit(
+            session, "user.create", "user", user_id, details={"import": True}
+        )
+    return created
+
+
 async def deactivate_user(session: AsyncSession, user_id: int) -> bool:
     """Deactivate a user (set is_active=False).
     Raises:
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     user: User | None = await get_user_by_id(session, user_id)
     if user is None or not getattr(user, "is_active", False):
         return False
     user.is_active = False
-    try:
-        await session.commit()
-    except Exception as exc:
-        logging.error(f"Failed to commit deactivate for user {user_id}: {exc}")
-        await session.rollback()
-        raise exc
+    await session.flush()
+    invalidate_principal_on_commit(session, user_id)
     return True
 
 
 async def reactivate_user(session: AsyncSession, user_id: int) -> bool:
     """Reactivate a user (set is_active=True).
     Raises:
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     user: User | None = await get_user_by_id(session, user_id)
     if user is None or getattr(user, "is_active", False):
         return False
     user.is_active = True
-    try:
-        await session.commit()
-    except Exception as exc:
-        logging.error(f"Failed to commit reactivate for user {user_id}: {exc}")
-        await session.rollback()
-        raise exc
+    await session.flush()
+    invalidate_principal_on_commit(session, user_id)
     return True
 
 
@@ -679,7 +1049,7 @@ async def update_last_login(
 ) -> bool:
     """Update the last_login_at timestamp for a user.
     Raises:
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     user: User | None = await get_user_by_id(session, user_id)
     if user is None:
@@ -688,19 +1058,100 @@ async def update_last_login(
     if dt.tzinfo is not None:
         dt = dt.replace(tzinfo=None)
     user.last_login_at = dt
-    try:
-        await session.commit()
-    except Exception as exc:
-        logging.error(f"Failed to commit last login update for user {user_id}: {exc}")
-        await session.rollback()
-        raise exc
+    await session.flush()
     return True
 
 
+# Rows per bulk activity UPDATE; keeps bound parameters well under SQLite's limit.
+_ACTIVITY_CHUNK_SIZE: Final[int] = 500
+
+
+async def apply_user_activity(
+    session: AsyncSession, updates: Mapping[int, PendingWrite]
+) -> int:
+    """Apply coalesced activity updates with one ``UPDATE ... FROM (VALUES ...)``
+    per chunk. Timestamps replace stored values when set; counters are added.
+
+    The caller commits. Returns the number of rows updated.
+    """
+    updated: int = 0
+    items: list[tuple[int, PendingWrite]] = list(updates.items())
+    for start in range(0, len(items), _ACTIVITY_CHUNK_SIZE):
+        chunk = items[start : start + _ACTIVITY_CHUNK_SIZE]
+        rows: list[str] = []
+        params: dict[str, object] = {}
+        binds = []
+        for i, (user_id, write) in enumerate(chunk):
+            rows.append(f"(:id{i}, :login{i}, :active{i}, :msgs{i}, :errs{i})")
+            params.update(
+                {
+                    f"id{i}": user_id,
+                    f"login{i}": write.touches.get("last_login_at"),
+                    f"active{i}": write.touches.get("last_active_at"),
+                    f"msgs{i}": write.increments.get("ws_message_count", 0),
+                    f"errs{i}": write.increments.get("ws_error_count", 0),
+                }
+            )
+            binds += [
+                bindparam(f"id{i}", type_=Integer()),
+                bindparam(f"login{i}", type_=DateTime()),
+                bindparam(f"active{i}", type_=DateTime()),
+                bindparam(f"msgs{i}", type_=Integer()),
+                bindparam(f"errs{i}", type_=Integer()),
+            ]
+        # VALUES columns are column1..column5 on both PostgreSQL and SQLite.
+        stmt = text(
+            "UPDATE users SET "
+            "last_login_at = COALESCE(v.last_login_at, users.last_login_at), "
+            "last_active_at = COALESCE(v.last_active_at, users.last_active_at), "
+            "ws_message_count = users.ws_message_count + v.ws_message_count, "
+            "ws_error_count = users.ws_error_count + v.ws_error_count "
+            "FROM (SELECT column1 AS id, column2 AS last_login_at, "
+            "column3 AS last_active_at, column4 AS ws_message_count, "
+            f"column5 AS ws_error_count FROM (VALUES {', '.join(rows)}) AS t) AS v "
+            "WHERE users.id = v.id"
+        ).bindparams(*binds)
+        result = await session.execute(stmt, params)
+        updated += int(getattr(result, "rowcount", 0) or 0)
+    return updated
+
+
+async def _flush_user_activity(updates: Mapping[int, PendingWrite]) -> None:
+    from src.core.database import get_async_session
+
+    async with get_async_session() as session:
+        await apply_user_activity(session, updates)
+        await session.commit()
+
+
+# Login and WebSocket activity, written behind the request (see record_login).
+user_activity: Final[WriteBehindBuffer[int]] = WriteBehindBuffer(
+    "user_activity", _flush_user_activity
+)
+
+
+def _naive_utc(when: datetime | None) -> datetime:
+    dt: datetime = when or datetime.now(UTC)
+    return dt.astimezone(UTC).replace(tzinfo=None) if dt.tzinfo else dt
+
+
+def record_login(user_id: int, login_time: datetime | None = None) -> None:
+    """Queue a last_login_at update and a login count without touching the database."""
+    when: datetime = _naive_utc(login_time)
+    user_activity.touch(user_id, last_login_at=when, last_active_at=when)
+    count_event(METRIC_LOGINS, day=when.date())
+
+
+def record_ws_activity(user_id: int, messages: int = 0, errors: int = 0) -> None:
+    """Queue WebSocket message/error counts and a last_active_at update."""
+    user_activity.touch(user_id, last_active_at=_naive_utc(None))
+    user_activity.increment(user_id, ws_message_count=messages, ws_error_count=errors)
+
+
 async def anonymize_user(session: AsyncSession, user_id: int) -> bool:
     """Anonymize user data for privacy/GDPR (irreversibly removes PII, disables account).
     Raises:
-        Exception: On DB commit failure.
+        Exception: On DB flush failure.
     """
     user: User | None = await get_user_by_id(session, user_id, use_cache=False)
     if user is None or getattr(user, "is_deleted", False):
@@ -710,39 +1161,35 @@ async def anonymize_user(session: AsyncSession, user_id: int) -> bool:
     user.is_active = False
     user.is_deleted = True
     user.last_login_at = None
-    try:
-        await session.commit()
-    except Exception as exc:
-        logging.error(f"Failed to commit anonymize for user {user_id}: {exc}")
-        await session.rollback()
-        raise exc
+    await session.flush()
+    invalidate_principal_on_commit(session, user_id)
     return True
 
 
+@replica_read
 async def user_signups_per_month(session: AsyncSession, year: int) -> dict[int, int]:
-    """Return a dict of {month: signup_count} for the given year (1-12)."""
-    stmt = (
-        select(extract("month", User.created_at).label("month"), func.count(User.id))
-        .where(extract("year", User.created_at) == year)
-        .group_by("month")
-        .order_by("month")
-    )
-    result = await session.execute(stmt)
-    # result.all() returns Sequence[Row[Any]], so extract values explicitly
-    rows: Sequence[Row[Any]] = result.all()
-    stats: dict[int, int] = dict.fromkeys(range(1, 13), 0)
-    for row in rows:
-        month: int = int(row[0])
-        count: int = int(row[1])
-        stats[month] = count
-    return stats
+    """Return a dict of {month: signup_count} for the given year (1-12).
+
+    Reads the monthly analytics rollup, so signups from the last write-behind
+    interval may not be counted yet.
+    """
+    return await monthly_rollups(session, METRIC_SIGNUPS, year)
 
 
 __all__: Final[list[str]] = [
+    "UserPrincipal",
+    "get_user_principal",
+    "get_user_principal_by_email",
+    "invalidate_user_principal",
+    "invalidate_principal_on_commit",
     "safe_get_user_by_id",
     "create_user_with_validation",
     "sensitive_user_action",
     "anonymize_user",
+    "apply_user_activity",
+    "record_login",
+    "record_ws_activity",
+    "user_activity",
     "user_signups_per_month",
     "UserNotFoundError",
     "select",
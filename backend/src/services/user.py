@@ -10,11 +10,11 @@ from collections.abc import (
     Sequence,
 )
 from datetime import UTC, datetime, timedelta
-from enum import Enum
+from enum import StrEnum
 from typing import Final, Literal, cast
 
 from fastapi import UploadFile
-from jose import JWTError, jwt
+from jose import JWTError
 from loguru import logger
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,13 +24,17 @@ from src.core.config import get_settings
 from src.core.security import (
     create_access_token,
     create_refresh_token,
+    decode_token_signature,
     verify_access_token,
     verify_refresh_token,
 )
 from src.models.used_password_reset_token import UsedPasswordResetToken
 from src.models.user import User
+from src.repositories import read_models
 from src.repositories import user as user_repo
+from src.repositories.audit import audit_on_commit, record_audit
 from src.repositories.blacklisted_token import is_token_blacklisted
+from src.repositories.read_models import UserListItem
 from src.repositories.user import (
     change_user_password,
     get_user_by_id,
@@ -60,7 +64,7 @@ UserAlreadyExistsError: type[Exception] = UserAlreadyExistsError
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../../")))
 
 
-class UserRole(str, Enum):
+class UserRole(StrEnum):
     ADMIN = "admin"
     USER = "user"
     MODERATOR = "moderator"
@@ -141,7 +145,10 @@ async def authenticate_user(
             },
         )
         logger.debug(
-            f"Refresh token payload at creation: {{'sub': 'dev-user', 'user_id': 'dev-user', 'email': '{email}', 'role': 'admin', 'is_authenticated': True, 'jti': '{dev_jti}', 'exp': {dev_exp}}}",
+            "Refresh token payload at creation: {{'sub': 'dev-user', 'user_id': 'dev-user', 'email': '{}', 'role': 'admin', 'is_authenticated': True, 'jti': '{}', 'exp': {}}}",
+            email,
+            dev_jti,
+            dev_exp,
         )
         return dev_access_token, dev_refresh_token
 
@@ -150,12 +157,25 @@ async def authenticate_user(
     user: User | None = result.scalar_one_or_none()
     if not user or not user.is_active or user.is_deleted:
         logger.warning("Login failed: user not found or inactive", email=email)
+        record_audit(
+            "auth.login_failed",
+            "user",
+            user.id if user else None,
+            details={"email": email, "reason": "not_found_or_inactive"},
+        )
         raise UserNotFoundError("User not found or inactive.")
     if not verify_password(password, user.hashed_password):
         logger.warning("Login failed: incorrect password", user_id=user.id, email=email)
+        record_audit(
+            "auth.login_failed",
+            "user",
+            user.id,
+            details={"email": email, "reason": "bad_password"},
+        )
         raise ValidationError("Incorrect password.")
     # Update last login
-    await user_repo.update_last_login(session, user.id)
+    user_repo.record_login(user.id)
+    record_audit("auth.login", "user", user.id, actor_id=user.id)
     logger.info("User authenticated successfully", user_id=user.id, email=user.email)
     # Create JWT tokens
     user_access_token: str = create_access_token(
@@ -187,7 +207,13 @@ async def authenticate_user(
         },
     )
     logger.debug(
-        f"Refresh token payload at creation: {{'sub': '{user.id}', 'user_id': '{user.id}', 'email': '{user.email}', 'role': '{user.role}', 'jti': '{user_jti}', 'exp': {user_exp}}}",
+        "Refresh token payload at creation: {{'sub': '{}', 'user_id': '{}', 'email': '{}', 'role': '{}', 'jti': '{}', 'exp': {}}}",
+        user.id,
+        user.id,
+        user.email,
+        user.role,
+        user_jti,
+        user_exp,
     )
     return user_access_token, user_refresh_token
 
@@ -198,6 +224,7 @@ async def logout_user(session: AsyncSession, user_id: int) -> None:
     """
     logger.info("User logout attempt", user_id=user_id)
     await user_repo.deactivate_user(session, user_id)
+    record_audit("auth.logout", "user", user_id, actor_id=user_id)
     logger.info("User logged out (deactivated)", user_id=user_id)
 
 
@@ -329,7 +356,10 @@ async def reset_password(session: AsyncSession, token: str, new_password: str) -
                 used_at=datetime.now().replace(tzinfo=None),
             ),
         )
-        await session.commit()
+        audit_on_commit(
+            session, "auth.password_reset", "user", user.id, actor_id=user.id
+        )
+        await session.flush()
         logger.info("Password reset successful", user_id=user.id, email=email)
     except UserNotFoundError:
         raise
@@ -452,7 +482,7 @@ async def set_user_preferences(
     if not user or user.is_deleted:
         raise UserNotFoundError("User not found.")
     user.preferences = dict(preferences)
-    await session.commit()
+    await session.flush()
     # Defensive: Only pass known fields to UserPreferences
     theme_val = preferences.get("theme")
     locale_val = preferences.get("locale")
@@ -479,7 +509,7 @@ async def upload_avatar(
     with open(file_path, "wb") as f:
         f.write(content)
     user.avatar_url = f"/uploads/avatars/{filename}"
-    await session.commit()
+    await session.flush()
     return UserAvatarResponse(avatar_url=user.avatar_url or "")
 
 
@@ -630,10 +660,10 @@ async def async_refresh_access_token(
     :raises RefreshTokenBlacklistedError: If token is blacklisted.
     """
     try:
-        payload: Mapping[str, object] = jwt.decode(
+        payload: Mapping[str, object] = decode_token_signature(
             token,
             jwt_secret,
-            algorithms=[jwt_algorithm],
+            jwt_algorithm,
         )
         user_id_val = payload.get("user_id")
         if not isinstance(user_id_val, int | str):
@@ -773,8 +803,18 @@ class UserService:
             if not isinstance(password_val, str):
                 raise ValidationError("Password must be a string.")
             user.hashed_password = hash_password(password_val)
-        await session.commit()
+        audit_on_commit(
+            session,
+            "user.update",
+            "user",
+            user_id,
+            details={
+                "fields": sorted(k for k in ("email", "name", "password") if k in data)
+            },
+        )
+        await session.flush()
         await session.refresh(user)
+        user_repo.invalidate_principal_on_commit(session, user_id)
         return user
 
     async def delete_user(self, session: AsyncSession, user_id: int) -> None:
@@ -782,7 +822,9 @@ class UserService:
         if not user:
             raise UserNotFoundError("User not found.")
         await session.delete(user)
-        await session.commit()
+        audit_on_commit(session, "user.delete", "user", user_id)
+        await session.flush()
+        user_repo.invalidate_principal_on_commit(session, user_id)
 
     async def list_users(
         self,
@@ -805,6 +847,36 @@ class UserService:
         )
         return users
 
+    async def list_user_items(
+        self,
+        session: AsyncSession,
+        offset: int = 0,
+        limit: int = 20,
+        email: str | None = None,
+        name: str | None = None,
+        created_after: datetime | None = None,
+        fields: Sequence[str] | None = None,
+    ) -> list[UserListItem]:
+        """Like ``list_users`` but column-projected, returning plain dicts."""
+        return await read_models.list_user_items(
+            session,
+            offset=offset,
+            limit=limit,
+            email=email,
+            name=name,
+            created_after=created_after,
+            fields=fields,
+        )
+
+    async def get_user_item(
+        self,
+        session: AsyncSession,
+        user_id: int,
+        fields: Sequence[str] | None = None,
+    ) -> UserListItem | None:
+        """Like ``get_user_by_id`` but column-projected, returning a plain dict."""
+        return await read_models.get_user_item(session, user_id, fields=fields)
+
     async def get_user_by_id(self, session: AsyncSession, user_id: int) -> User | None:
         from src.repositories.user import get_user_by_id
 
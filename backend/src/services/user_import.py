@@ -0,0 +1,429 @@
+"""Streaming bulk user import from CSV or NDJSON.
+
+The pipeline never holds the whole upload in memory. It works in batches of
+``user_import_batch_size`` rows, and each batch goes through four stages:
+
+1. **Parse**: rows are decoded incrementally from the byte stream.
+2. **Validate**: emails, passwords and names are checked, and emails repeated
+   within the batch are rejected.
+3. **Hash**: initial passwords are hashed in a process pool, because bcrypt is
+   CPU bound.
+4. **Load**: rows are inserted with ``COPY`` on PostgreSQL or multi-row inserts
+   elsewhere, and emails that already exist are skipped.
+
+Rows that fail at any stage are recorded in the :class:`ImportReport` with
+their row number. An optional progress callback runs after every batch; the API
+uses it to send ``system.notification`` messages over the WebSocket. The
+callback gets the report and whether the import has finished.
+
+Command line usage:
+    ```bash
+    python -m src.services.user_import users.csv
+    python -m src.services.user_import users.ndjson --format ndjson
+    ```
+
+Input columns are ``email``, ``password`` (required) and ``name``,
+``is_active`` (optional). Other columns are ignored.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import codecs
+import csv
+import json
+import multiprocessing
+import os
+import sys
+from collections.abc import AsyncIterable, AsyncIterator, Awaitable, Callable, Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Final, Literal
+
+from loguru import logger
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import TypedDict
+
+from src.core.config import get_settings
+from src.repositories.user import insert_users_skip_existing
+from src.utils.hashing import hash_password
+from src.utils.validation import get_password_validation_error, validate_email
+
+__all__: Final[Sequence[str]] = (
+    "IMPORT_FORMATS",
+    "ImportFormat",
+    "ImportReport",
+    "ImportReportDict",
+    "ImportRowError",
+    "import_users",
+    "shutdown_hash_pool",
+)
+
+ImportFormat = Literal["csv", "ndjson"]
+IMPORT_FORMATS: Final[tuple[ImportFormat, ...]] = ("csv", "ndjson")
+
+# Error details kept in the report; later failures are still counted.
+MAX_REPORTED_ERRORS: Final[int] = 1000
+_NAME_MAX_LENGTH: Final[int] = 128
+_TRUE_STRINGS: Final[frozenset[str]] = frozenset({"1", "true", "yes", "y", "on"})
+_FALSE_STRINGS: Final[frozenset[str]] = frozenset({"0", "false", "no", "n", "off"})
+
+ProgressCallback = Callable[["ImportReport", bool], Awaitable[None]]
+
+
+class ImportRowError(TypedDict):
+    row: int
+    email: str | None
+    error: str
+
+
+class ImportReportDict(TypedDict):
+    total: int
+    created: int
+    skipped: int
+    failed: int
+    errors: list[ImportRowError]
+    errors_truncated: bool
+
+
+@dataclass(slots=True)
+class ImportReport:
+    """Running totals and per-row errors of one import.
+
+    ``skipped`` counts rows whose email already existed; ``failed`` counts rows
+    rejected by parsing or validation.
+    """
+
+    total: int = 0
+    created: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: list[ImportRowError] = field(default_factory=list)
+    errors_truncated: bool = False
+
+    def add_error(
+        self, row: int, email: str | None, error: str, *, skipped: bool = False
+    ) -> None:
+        if skipped:
+            self.skipped += 1
+        else:
+            self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "email": email, "error": error})
+        else:
+            self.errors_truncated = True
+
+    def as_dict(self) -> ImportReportDict:
+        return {
+            "total": self.total,
+            "created": self.created,
+            "skipped": self.skipped,
+            "failed": self.failed,
+            "errors": list(self.errors),
+            "errors_truncated": self.errors_truncated,
+        }
+
+
+@dataclass(slots=True)
+class _ParsedRow:
+    row: int
+    data: dict[str, object] | None
+    error: str | None = None
+
+
+@dataclass(slots=True)
+class _Candidate:
+    row: int
+    email: str
+    password: str
+    name: str | None
+    is_active: bool
+
+
+async def _iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Decode a UTF-8 byte stream into lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending: str = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.removesuffix("\r")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending.removesuffix("\r")
+
+
+async def _iter_csv(lines: AsyncIterator[str]) -> AsyncIterator[_ParsedRow]:
+    header: list[str] | None = None
+    row: int = 0
+    record: str = ""
+    async for line in lines:
+        # A quoted field may contain newlines: keep reading until quotes balance.
+        record = f"{record}\n{line}" if record else line
+        if record.count('"') % 2:
+            continue
+        text, record = record, ""
+        if not text.strip():
+            continue
+        values: list[str] = next(csv.reader([text]))
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            continue
+        row += 1
+        if len(values) != len(header):
+            yield _ParsedRow(
+                row, None, f"Expected {len(header)} columns, got {len(values)}."
+            )
+            continue
+        yield _ParsedRow(row, dict(zip(header, values, strict=True)))
+    if record:
+        yield _ParsedRow(row + 1, None, "Unterminated quoted field.")
+
+
+async def _iter_ndjson(lines: AsyncIterator[str]) -> AsyncIterator[_ParsedRow]:
+    row: int = 0
+    async for line in lines:
+        if not line.strip():
+            continue
+        row += 1
+        try:
+            data: object = json.loads(line)
+        except ValueError:
+            yield _ParsedRow(row, None, "Invalid JSON.")
+            continue
+        if not isinstance(data, dict):
+            yield _ParsedRow(row, None, "Expected a JSON object.")
+            continue
+        yield _ParsedRow(row, {str(k).lower(): v for k, v in data.items()})
+
+
+def _parse_is_active(value: object) -> bool | None:
+    if value is None or value == "":
+        return True
+    if isinstance(value, bool):
+        return value
+    text: str = str(value).strip().lower()
+    if text in _TRUE_STRINGS:
+        return True
+    if text in _FALSE_STRINGS:
+        return False
+    return None
+
+
+def _validate(parsed: _ParsedRow, report: ImportReport) -> _Candidate | None:
+    data = parsed.data
+    if data is None:
+        report.add_error(parsed.row, None, parsed.error or "Unreadable row.")
+        return None
+    email_value: object = data.get("email")
+    email: str = email_value.strip() if isinstance(email_value, str) else ""
+    if not email or not validate_email(email):
+        report.add_error(parsed.row, email or None, "Invalid email format.")
+        return None
+    password: object = data.get("password")
+    if not isinstance(password, str) or not password:
+        report.add_error(parsed.row, email, "Password is required.")
+        return None
+    password_error: str | None = get_password_validation_error(password)
+    if password_error is not None:
+        report.add_error(parsed.row, email, password_error)
+        return None
+    name_value: object = data.get("name")
+    name: str | None = None
+    if name_value not in (None, ""):
+        name = str(name_value).strip() or None
+    if name is not None and len(name) > _NAME_MAX_LENGTH:
+        report.add_error(
+            parsed.row, email, f"Name longer than {_NAME_MAX_LENGTH} characters."
+        )
+        return None
+    is_active: bool | None = _parse_is_active(data.get("is_active"))
+    if is_active is None:
+        report.add_error(parsed.row, email, "Invalid is_active value.")
+        return None
+    return _Candidate(parsed.row, email, password, name, is_active)
+
+
+def _validate_batch(
+    batch: Sequence[_ParsedRow], report: ImportReport
+) -> list[_Candidate]:
+    candidates: list[_Candidate] = []
+    seen: set[str] = set()
+    for parsed in batch:
+        candidate = _validate(parsed, report)
+        if candidate is None:
+            continue
+        # Duplicates across batches are caught by the database conflict check.
+        if candidate.email in seen:
+            report.add_error(
+                candidate.row, candidate.email, "Duplicate email in import."
+            )
+            continue
+        seen.add(candidate.email)
+        candidates.append(candidate)
+    return candidates
+
+
+_hash_pool: ProcessPoolExecutor | None = None
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    if _hash_pool is None:
+        workers: int = get_settings().user_import_hash_workers or os.cpu_count() or 1
+        # spawn, not fork: the parent runs an event loop and database threads.
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the password hashing worker processes, if any were started."""
+    global _hash_pool
+    pool, _hash_pool = _hash_pool, None
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+async def _hash_passwords(
+    candidates: Sequence[_Candidate], executor: Executor
+) -> list[str]:
+    loop = asyncio.get_running_loop()
+    return list(
+        await asyncio.gather(
+            *(
+                loop.run_in_executor(executor, hash_password, c.password)
+                for c in candidates
+            )
+        )
+    )
+
+
+async def _load_batch(
+    session: AsyncSession,
+    batch: Sequence[_ParsedRow],
+    report: ImportReport,
+    executor: Executor,
+) -> None:
+    report.total += len(batch)
+    candidates: list[_Candidate] = _validate_batch(batch, report)
+    if not candidates:
+        return
+    hashes: list[str] = await _hash_passwords(candidates, executor)
+    created: dict[str, int] = await insert_users_skip_existing(
+        session,
+        [
+            {
+                "email": c.email,
+                "hashed_password": hashed,
+                "name": c.name,
+                "is_active": c.is_active,
+            }
+            for c, hashed in zip(candidates, hashes, strict=True)
+        ],
+    )
+    # Each batch is its own transaction; see import_users.
+    await session.commit()
+    report.created += len(created)
+    for c in candidates:
+        if c.email not in created:
+            report.add_error(c.row, c.email, "Email already exists.", skipped=True)
+
+
+async def import_users(
+    session: AsyncSession,
+    chunks: AsyncIterable[bytes],
+    fmt: ImportFormat,
+    *,
+    progress: ProgressCallback | None = None,
+    executor: Executor | None = None,
+    batch_size: int | None = None,
+) -> ImportReport:
+    """Import users from a CSV or NDJSON byte stream.
+
+    Each batch is committed on its own, so an interrupted import keeps the
+    batches loaded so far. ``executor`` defaults to the shared process pool.
+
+    Raises:
+        ValueError: If ``fmt`` is not a supported format.
+        Exception: On DB failure while loading a batch.
+    """
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {fmt}")
+    size: int = max(1, batch_size or get_settings().user_import_batch_size)
+    pool: Executor = executor if executor is not None else _get_hash_pool()
+    lines = _iter_lines(chunks)
+    rows = _iter_csv(lines) if fmt == "csv" else _iter_ndjson(lines)
+    report = ImportReport()
+    batch: list[_ParsedRow] = []
+    async for parsed in rows:
+        batch.append(parsed)
+        if len(batch) >= size:
+            await _load_batch(session, batch, report, pool)
+            batch = []
+            if progress is not None:
+                await progress(report, False)
+    if batch:
+        await _load_batch(session, batch, report, pool)
+    if progress is not None:
+        await progress(report, True)
+    logger.info(
+        "User import finished: {} rows, {} created, {} skipped, {} failed",
+        report.total,
+        report.created,
+        report.skipped,
+        report.failed,
+    )
+    return report
+
+
+async def _file_chunks(path: Path, size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    with path.open("rb") as handle:
+        while chunk := await asyncio.to_thread(handle.read, size):
+            yield chunk
+
+
+async def _run_cli(path: Path, fmt: ImportFormat) -> ImportReport:
+    from src.core.database import get_async_session
+
+    async def print_progress(report: ImportReport, done: bool) -> None:
+        print(
+            f"{'Done: ' if done else ''}{report.total} rows: {report.created} created, "
+            f"{report.skipped} skipped, {report.failed} failed",
+            file=sys.stderr,
+        )
+
+    try:
+        async with get_async_session() as session:
+            return await import_users(
+                session, _file_chunks(path), fmt, progress=print_progress
+            )
+    finally:
+        shutdown_hash_pool()
+
+
+def _main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bulk import users.")
+    parser.add_argument("path", type=Path, help="CSV or NDJSON file.")
+    parser.add_argument(
+        "--format",
+        choices=IMPORT_FORMATS,
+        default=None,
+        help="Input format (default: from the file extension).",
+    )
+    args = parser.parse_args(argv)
+    fmt: ImportFormat = args.format or (
+        "ndjson" if args.path.suffix.lower() in {".ndjson", ".jsonl"} else "csv"
+    )
+    report: ImportReport = asyncio.run(_run_cli(args.path, fmt))
+    print(json.dumps(report.as_dict(), indent=2))
+    if report.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    _main()
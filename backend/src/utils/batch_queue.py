@@ -0,0 +1,169 @@
+"""Bounded in-process queue drained by a background batch writer.
+
+Producers append items without awaiting any I/O. A writer task takes up to
+``batch_size`` items at a time and hands them to ``flush_fn``. It runs every
+``interval`` seconds, or as soon as a full batch is waiting. The queue holds at
+most ``max_size`` items. When it is full, :meth:`BatchQueue.put_nowait` drops the
+item and counts it in ``dropped``. :meth:`BatchQueue.put` instead waits up to a
+timeout for the writer to make room (backpressure).
+
+Unlike :class:`~src.utils.write_behind.WriteBehindBuffer` nothing is coalesced:
+every item is written. The queue is not thread-safe: use it from the event loop
+thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections import deque
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Final, Generic, TypeVar
+
+from loguru import logger
+from typing_extensions import TypedDict
+
+__all__: Final[Sequence[str]] = ("BatchQueue", "BatchQueueStats")
+
+T = TypeVar("T")
+
+
+class BatchQueueStats(TypedDict):
+    queued: int
+    max_size: int
+    written: int
+    dropped: int
+    failed_batches: int
+
+
+class BatchQueue(Generic[T]):
+    """Collect items in memory and write them in batches from a background task.
+
+    ``flush_fn`` receives one batch (at most ``batch_size`` items, oldest first).
+    If it raises, the batch goes back to the front of the queue and is retried
+    on the next flush. Items that no longer fit are dropped.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush_fn: Callable[[Sequence[T]], Awaitable[None]],
+        *,
+        max_size: int = 10_000,
+        batch_size: int = 500,
+        interval: float = 0.25,
+    ) -> None:
+        self.name: str = name
+        self.max_size: int = max_size
+        self.batch_size: int = batch_size
+        self.interval: float = interval
+        self.written: int = 0
+        self.dropped: int = 0
+        self.failed_batches: int = 0
+        self._flush_fn: Callable[[Sequence[T]], Awaitable[None]] = flush_fn
+        self._items: deque[T] = deque()
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._space: asyncio.Event | None = None
+        self._stopping: bool = False
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def put_nowait(self, item: T) -> bool:
+        """Queue ``item``; returns False (and counts a drop) if the queue is full."""
+        if len(self._items) >= self.max_size:
+            self.dropped += 1
+            if self.dropped == 1 or self.dropped % 1000 == 0:
+                logger.warning(
+                    "{} queue full; {} items dropped", self.name, self.dropped
+                )
+            self._wake()
+            return False
+        self._items.append(item)
+        if len(self._items) >= self.batch_size:
+            self._wake()
+        return True
+
+    async def put(self, item: T, timeout: float) -> bool:
+        """Queue ``item``, waiting up to ``timeout`` seconds for room if full."""
+        if len(self._items) >= self.max_size and self._space is not None:
+            self._wake()
+            self._space.clear()
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(timeout):
+                    while len(self._items) >= self.max_size:
+                        await self._space.wait()
+                        self._space.clear()
+        return self.put_nowait(item)
+
+    def drain(self) -> list[T]:
+        """Remove and return everything queued, for a caller that writes it itself."""
+        items = list(self._items)
+        self._items.clear()
+        return items
+
+    def stats(self) -> BatchQueueStats:
+        return {
+            "queued": len(self._items),
+            "max_size": self.max_size,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed_batches": self.failed_batches,
+        }
+
+    def _wake(self) -> None:
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """Write everything queued now, batch by batch; returns how many were written."""
+        flushed = 0
+        while self._items:
+            count = min(self.batch_size, len(self._items))
+            batch: list[T] = [self._items.popleft() for _ in range(count)]
+            try:
+                await self._flush_fn(batch)
+            except Exception as exc:
+                self.failed_batches += 1
+                logger.error("{} batch write failed: {}", self.name, exc)
+                room = max(self.max_size - len(self._items), 0)
+                self.dropped += max(len(batch) - room, 0)
+                self._items.extendleft(reversed(batch[:room]))
+                break
+            self.written += len(batch)
+            flushed += len(batch)
+            if self._space is not None:
+                self._space.set()
+        return flushed
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(self.interval):
+                    await self._wakeup.wait()
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the background writer on the running event loop."""
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._space = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background writer and write everything still queued."""
+        task, self._task = self._task, None
+        if task is not None and self._wakeup is not None:
+            self._stopping = True
+            self._wakeup.set()
+            await task
+        await self.flush()
+        self._wakeup = None
+        self._space = None
@@ -41,6 +41,20 @@ class AsyncInMemoryCache(Generic[_K, _V]):
             expires: float = asyncio.get_event_loop().time() + ttl
             self._cache[key] = (value, expires)
 
+    async def delete(self, key: _K) -> None:
+        """
+        Remove a key from the cache if present.
+        """
+        async with self._lock:
+            self._cache.pop(key, None)
+
+    def discard(self, key: _K) -> None:
+        """
+        Remove a key without taking the lock, for synchronous callbacks
+        running on the event loop thread.
+        """
+        self._cache.pop(key, None)
+
     async def clear(self) -> None:
         """
         Clear all items from the cache.
@@ -35,6 +35,36 @@ def filter_fields(
     return {k: v for k, v in obj.items() if k in fields_to_include}
 
 
+def parse_sparse_fieldset(
+    raw: str | None,
+    allowed: Sequence[str],
+    required: Sequence[str] = (),
+) -> tuple[str, ...] | None:
+    """
+    Parse a JSON:API sparse fieldset such as ``fields[users]=email,name``.
+    Args:
+        raw: The comma-separated parameter value, or None if it was not given.
+        allowed: The field names the resource exposes.
+        required: Fields that are always included (e.g. the identifier).
+    Returns:
+        The requested fields plus the required ones, in ``allowed`` order, or
+        None if no fieldset was given (meaning all fields).
+    Raises:
+        ValueError: If a requested field is not in ``allowed``.
+    """
+    if raw is None:
+        return None
+    requested: set[str] = {f.strip() for f in raw.split(",") if f.strip()}
+    unknown: set[str] = requested - set(allowed)
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(sorted(unknown))}. "
+            f"Allowed: {', '.join(allowed)}"
+        )
+    requested.update(required)
+    return tuple(f for f in allowed if f in requested)
+
+
 TDate = TypeVar("TDate")
 
 
@@ -1,5 +1,6 @@
 """Password hashing and verification utilities using passlib's bcrypt."""
 
+import asyncio
 from typing import Final, Literal, Protocol
 
 from loguru import logger
@@ -65,6 +66,18 @@ def hash_password(password: str) -> str:
     return hash_result
 
 
+async def hash_password_async(password: str) -> str:
+    """Hash a password in a worker thread so the event loop keeps serving requests.
+
+    bcrypt releases the GIL, so concurrent registrations hash in parallel.
+
+    Raises:
+        ValueError: If password is not hashable.
+
+    """
+    return await asyncio.to_thread(hash_password, password)
+
+
 def verify_password(plain: str, hashed: str) -> bool:
     """Verify a plain password against a given bcrypt hash.
 
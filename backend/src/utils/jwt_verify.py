@@ -0,0 +1,128 @@
+"""Offline verification of ReViewPoint access tokens for internal services.
+
+Services fetch the API's public keys from ``/.well-known/jwks.json`` once, cache
+them, and verify tokens locally instead of calling back into the API. The module
+only depends on ``python-jose`` and the standard library so it can be imported by
+workers that do not load the API settings or database.
+
+Usage::
+
+    verifier = JWKSVerifier("https://api.example.com/.well-known/jwks.json")
+    claims = verifier.verify(token)
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.request
+from collections.abc import Callable, Mapping, Sequence
+from typing import Any, Final
+
+from jose import JWTError, jwt
+
+__all__: Sequence[str] = ("JWKSVerifier", "fetch_jwks")
+
+DEFAULT_ALGORITHMS: Final[tuple[str, ...]] = (
+    "RS256",
+    "RS384",
+    "RS512",
+    "ES256",
+    "ES384",
+    "ES512",
+)
+
+
+def fetch_jwks(url: str, timeout: float = 5.0) -> Mapping[str, Any]:
+    """Download and parse a JWKS document.
+
+    Raises:
+        OSError: If the document cannot be fetched.
+        ValueError: If the response is not a JWKS document.
+    """
+    with urllib.request.urlopen(url, timeout=timeout) as response:  # noqa: S310
+        document: object = json.loads(response.read())
+    if not isinstance(document, dict) or not isinstance(document.get("keys"), list):
+        raise ValueError(f"Invalid JWKS document from {url}")
+    return document
+
+
+class JWKSVerifier:
+    """Verify JWTs against a cached JWKS document.
+
+    Keys are refreshed after ``cache_ttl`` seconds, or early when a token names an
+    unknown ``kid`` (a freshly rotated key), at most once per
+    ``min_refresh_interval`` seconds so bad tokens cannot hammer the API.
+    """
+
+    def __init__(
+        self,
+        jwks_url: str | None = None,
+        *,
+        jwks: Mapping[str, Any] | None = None,
+        cache_ttl: float = 300.0,
+        min_refresh_interval: float = 30.0,
+        algorithms: Sequence[str] = DEFAULT_ALGORITHMS,
+        fetcher: Callable[[str], Mapping[str, Any]] | None = None,
+    ) -> None:
+        if jwks_url is None and jwks is None:
+            raise ValueError("Either jwks_url or jwks must be provided.")
+        self._url: str | None = jwks_url
+        self._fetch: Callable[[str], Mapping[str, Any]] = fetcher or fetch_jwks
+        self._cache_ttl: float = cache_ttl
+        self._min_refresh_interval: float = min_refresh_interval
+        self._algorithms: frozenset[str] = frozenset(algorithms)
+        self._lock: threading.Lock = threading.Lock()
+        self._keys: dict[str, Mapping[str, Any]] = {}
+        self._fetched_at: float = float("-inf")
+        if jwks is not None:
+            self._load(jwks)
+
+    def _load(self, document: Mapping[str, Any]) -> None:
+        self._keys = {
+            str(key["kid"]): key
+            for key in document.get("keys", [])
+            if isinstance(key, Mapping) and "kid" in key
+        }
+        self._fetched_at = time.monotonic()
+
+    def refresh(self) -> None:
+        """Re-fetch the JWKS document (no-op for a static document)."""
+        if self._url is None:
+            return
+        document = self._fetch(self._url)
+        with self._lock:
+            self._load(document)
+
+    def _key_for(self, kid: str) -> Mapping[str, Any] | None:
+        age: float = time.monotonic() - self._fetched_at
+        key = self._keys.get(kid)
+        if self._url is not None and (
+            age > self._cache_ttl or (key is None and age > self._min_refresh_interval)
+        ):
+            self.refresh()
+            key = self._keys.get(kid)
+        return key
+
+    def verify(self, token: str, **options: Any) -> dict[str, Any]:
+        """Verify the signature and expiry of ``token`` and return its claims.
+
+        Extra keyword arguments (``audience``, ``issuer``, ``options``) are passed
+        to ``jose.jwt.decode``.
+
+        Raises:
+            JWTError: If the token is malformed, expired, uses a disallowed
+                algorithm or is signed by an unknown key.
+        """
+        header: Mapping[str, Any] = jwt.get_unverified_header(token)
+        algorithm: str = str(header.get("alg", ""))
+        if algorithm not in self._algorithms:
+            raise JWTError(f"Algorithm {algorithm!r} is not allowed")
+        kid: object = header.get("kid")
+        if not isinstance(kid, str):
+            raise JWTError("Token has no key id")
+        key = self._key_for(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key {kid!r}")
+        return dict(jwt.decode(token, dict(key), algorithms=[algorithm], **options))
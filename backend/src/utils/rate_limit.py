@@ -1,19 +1,52 @@
-import asyncio
+"""Rate limiting shared by the HTTP dependencies and the WebSocket manager.
+
+Limits use GCRA (the generic cell rate algorithm): each key stores a single float,
+its *theoretical arrival time* (TAT). A call is allowed when it would not push the
+TAT more than one period into the future, so a ``limit``/``period`` rule permits a
+burst of ``limit`` calls and then one call every ``period / limit`` seconds.
+
+State lives in ``RateLimiterEngine``, which spreads keys over independently locked
+shards so concurrent callers rarely contend, and drops keys whose TAT has passed
+(an idle key carries no information). Every operation is O(1) in the number of
+tracked keys.
+
+Multi-worker deployments can keep the state in a shared store instead
+(``REVIEWPOINT_RATE_LIMIT_BACKEND=redis``); ``RedisRateLimitStore`` runs the same
+algorithm atomically in a Lua script. Any object with the ``RateLimitStore``
+interface can be plugged in, e.g. ``LocalRateLimitStore`` in tests.
+"""
+
+from __future__ import annotations
+
+import functools
 import os
-from collections import defaultdict
-from collections.abc import Sequence
-from typing import (
-    Final,
-    Generic,
-    Literal,
-    TypedDict,
-    TypeVar,
-)
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from typing import Any, Final, Generic, Protocol, TypedDict, TypeVar
+
+from loguru import logger
 
-__all__: Final[Sequence[Literal["AsyncRateLimiter"]]] = ("AsyncRateLimiter",)
+from src.core.config import get_settings
+
+__all__: Final[Sequence[str]] = (
+    "AsyncRateLimiter",
+    "LocalRateLimitStore",
+    "RateLimitDecision",
+    "RateLimitRule",
+    "RateLimitStore",
+    "RateLimiterEngine",
+    "RedisRateLimitStore",
+    "create_rate_limit_store",
+    "get_rate_limit_store",
+)
 
 K = TypeVar("K", bound=str)
-V = TypeVar("V")
+
+DEFAULT_SHARDS: Final[int] = 16
+# Idle keys are swept one shard at a time; a full pass takes this many seconds.
+DEFAULT_EVICT_INTERVAL: Final[float] = 60.0
 
 
 class _RateLimitConfig(TypedDict):
@@ -21,23 +54,329 @@ class _RateLimitConfig(TypedDict):
     period: float
 
 
-class RateLimitState(TypedDict):
-    calls: int
-    last_reset: float
+@dataclass(frozen=True, slots=True)
+class RateLimitRule:
+    """Allow ``limit`` calls per ``period`` seconds, with bursts up to ``limit``."""
+
+    limit: int
+    period: float
+
+    def __post_init__(self) -> None:
+        if self.limit < 1 or self.period <= 0:
+            raise ValueError("Rate limit requires limit >= 1 and period > 0.")
+
+    @property
+    def emission_interval(self) -> float:
+        """Seconds one call adds to the key's theoretical arrival time."""
+        return self.period / self.limit
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimitDecision:
+    """Outcome of a rate limit check.
+
+    ``retry_after`` is 0 when allowed, otherwise the seconds until the next call
+    would be allowed. ``reset_after`` is the seconds until the key is fully idle.
+    """
+
+    allowed: bool
+    remaining: int
+    retry_after: float
+    reset_after: float
+
+
+def _decide(
+    tat: float, now: float, rule: RateLimitRule, cost: int
+) -> tuple[RateLimitDecision, float]:
+    """Apply GCRA to a stored TAT; return the decision and the TAT to store."""
+    interval: float = rule.emission_interval
+    # Work with offsets from ``now`` so an idle key yields exactly ``interval *
+    # cost`` (no ``now + period - period`` rounding at the limit boundary).
+    ahead: float = max(tat - now, 0.0) + interval * cost
+    if ahead > rule.period:
+        return (
+            RateLimitDecision(
+                allowed=False,
+                remaining=0,
+                retry_after=ahead - rule.period,
+                reset_after=max(tat - now, 0.0),
+            ),
+            tat,
+        )
+    return (
+        RateLimitDecision(
+            allowed=True,
+            remaining=int((rule.period - ahead) / interval + 1e-9),
+            retry_after=0.0,
+            reset_after=ahead,
+        ),
+        now + ahead,
+    )
+
+
+class _Shard:
+    __slots__ = ("lock", "tats")
+
+    def __init__(self) -> None:
+        self.lock: threading.Lock = threading.Lock()
+        self.tats: dict[str, float] = {}
+
+
+class RateLimiterEngine:
+    """In-process GCRA state, sharded by key hash.
+
+    Thread-safe and usable from sync code (WebSocket message handling) as well as
+    coroutines; shard locks are held only for a dictionary lookup and store.
+    """
+
+    def __init__(
+        self,
+        shards: int = DEFAULT_SHARDS,
+        evict_interval: float = DEFAULT_EVICT_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if shards < 1:
+            raise ValueError("shards must be >= 1")
+        self._shards: tuple[_Shard, ...] = tuple(_Shard() for _ in range(shards))
+        self._clock: Callable[[], float] = clock
+        self._sweep_every: float = evict_interval / shards
+        self._next_sweep: float = clock() + self._sweep_every
+        self._sweep_cursor: int = 0
+
+    def _shard(self, key: str) -> _Shard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def hit(
+        self,
+        key: str,
+        rule: RateLimitRule,
+        cost: int = 1,
+        now: float | None = None,
+    ) -> RateLimitDecision:
+        """Consume ``cost`` calls for ``key`` if the rule allows it."""
+        current: float = self._clock() if now is None else now
+        shard: _Shard = self._shard(key)
+        with shard.lock:
+            decision, tat = _decide(shard.tats.get(key, current), current, rule, cost)
+            if decision.allowed:
+                shard.tats[key] = tat
+        if current >= self._next_sweep:
+            self._sweep(current)
+        return decision
+
+    def peek(
+        self, key: str, rule: RateLimitRule, now: float | None = None
+    ) -> RateLimitDecision:
+        """Return the decision for one call without consuming it."""
+        current: float = self._clock() if now is None else now
+        shard: _Shard = self._shard(key)
+        with shard.lock:
+            return _decide(shard.tats.get(key, current), current, rule, 1)[0]
+
+    def reset(self, key: str | None = None) -> None:
+        """Forget ``key``, or every key when ``key`` is None."""
+        if key is not None:
+            shard: _Shard = self._shard(key)
+            with shard.lock:
+                shard.tats.pop(key, None)
+            return
+        for shard in self._shards:
+            with shard.lock:
+                shard.tats.clear()
+
+    def _sweep(self, now: float) -> None:
+        # Advance the schedule first so concurrent callers do not sweep twice.
+        self._next_sweep = now + self._sweep_every
+        index: int = self._sweep_cursor
+        self._sweep_cursor = (index + 1) % len(self._shards)
+        self._evict_shard(self._shards[index], now)
+
+    @staticmethod
+    def _evict_shard(shard: _Shard, now: float) -> int:
+        with shard.lock:
+            idle: list[str] = [k for k, tat in shard.tats.items() if tat <= now]
+            for key in idle:
+                del shard.tats[key]
+        return len(idle)
+
+    def evict_idle(self, now: float | None = None) -> int:
+        """Drop every idle key immediately; returns the number removed."""
+        current: float = self._clock() if now is None else now
+        return sum(self._evict_shard(shard, current) for shard in self._shards)
+
+    def __len__(self) -> int:
+        return sum(len(shard.tats) for shard in self._shards)
+
+
+class RateLimitStore(Protocol):
+    """Shared rate limit state used when several workers enforce one limit."""
+
+    async def hit(
+        self, key: str, rule: RateLimitRule, cost: int = 1
+    ) -> RateLimitDecision: ...
+
+    async def reset(self, key: str) -> None: ...
+
+
+class LocalRateLimitStore:
+    """``RateLimitStore`` backed by an in-process engine.
+
+    Behaves like a shared store for a single worker; used as the stand-in for
+    Redis in tests and single-process deployments.
+    """
+
+    def __init__(self, engine: RateLimiterEngine | None = None) -> None:
+        self.engine: RateLimiterEngine = engine or RateLimiterEngine()
+
+    async def hit(
+        self, key: str, rule: RateLimitRule, cost: int = 1
+    ) -> RateLimitDecision:
+        return self.engine.hit(key, rule, cost)
+
+    async def reset(self, key: str) -> None:
+        self.engine.reset(key)
+
+
+# KEYS[1] = key; ARGV = emission interval, period, cost (all in seconds / calls).
+# Uses the server clock so workers with skewed clocks agree, and expires the key
+# once it is idle so Redis evicts it without a sweep.
+_GCRA_LUA: Final[
+    str
+] = """
+local interval = tonumber(ARGV[1])
+local period = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+local behind = math.max(tat - now, 0)
+local ahead = behind + interval * cost
+if ahead > period then
+  return {0, tostring(ahead - period), tostring(behind)}
+end
+redis.call('SET', KEYS[1], tostring(now + ahead), 'PX', math.ceil(ahead * 1000))
+return {1, tostring(period - ahead), tostring(ahead)}
+"""
+
+
+class RedisRateLimitStore:
+    """``RateLimitStore`` on Redis, for limits shared across worker processes.
+
+    ``client`` is a ``redis.asyncio.Redis`` (or compatible) instance; only
+    ``eval`` and ``delete`` are used.
+    """
+
+    def __init__(self, client: Any, prefix: str = "reviewpoint:rl:") -> None:
+        self._client: Any = client
+        self._prefix: str = prefix
+
+    async def hit(
+        self, key: str, rule: RateLimitRule, cost: int = 1
+    ) -> RateLimitDecision:
+        allowed, first, reset_after = await self._client.eval(
+            _GCRA_LUA,
+            1,
+            self._prefix + key,
+            repr(rule.emission_interval),
+            repr(rule.period),
+            str(cost),
+        )
+        if int(allowed):
+            return RateLimitDecision(
+                allowed=True,
+                remaining=int(float(first) / rule.emission_interval + 1e-9),
+                retry_after=0.0,
+                reset_after=float(reset_after),
+            )
+        return RateLimitDecision(
+            allowed=False,
+            remaining=0,
+            retry_after=float(first),
+            reset_after=max(float(reset_after), 0.0),
+        )
+
+    async def reset(self, key: str) -> None:
+        await self._client.delete(self._prefix + key)
+
+
+def create_rate_limit_store(backend: str, url: str | None = None) -> RateLimitStore:
+    """Build the store named by ``REVIEWPOINT_RATE_LIMIT_BACKEND``.
+
+    Raises:
+        RuntimeError: If the redis backend is selected without a URL or without
+            the optional ``redis`` package installed.
+        ValueError: If the backend name is unknown.
+    """
+    if backend == "memory":
+        return LocalRateLimitStore()
+    if backend == "redis":
+        if not url:
+            raise RuntimeError(
+                "REVIEWPOINT_RATE_LIMIT_REDIS_URL is required for the redis backend."
+            )
+        try:
+            from redis.asyncio import Redis
+        except ImportError as exc:
+            raise RuntimeError(
+                "The redis rate limit backend requires the 'redis' extra."
+            ) from exc
+        return RedisRateLimitStore(Redis.from_url(url))
+    raise ValueError(f"Unknown rate limit backend: {backend}")
+
+
+@functools.cache
+def get_rate_limit_store() -> RateLimitStore | None:
+    """Return the configured shared store, or None for in-process limits."""
+    settings = get_settings()
+    if settings.rate_limit_backend == "memory":
+        return None
+    return create_rate_limit_store(
+        settings.rate_limit_backend, settings.rate_limit_redis_url
+    )
 
 
 class AsyncRateLimiter(Generic[K]):
+    """Per-key limiter of ``max_calls`` per ``period`` seconds.
+
+    State is kept in a private ``RateLimiterEngine`` unless a shared ``store`` is
+    given or configured (``get_rate_limit_store``). ``namespace`` prefixes the
+    keys in the store, so it must be stable across workers and restarts. Store
+    errors fail open to the local engine so an unavailable backend does not lock
+    every user out.
+    """
+
     config: _RateLimitConfig
     max_calls: int
     period: float
-    _lock: asyncio.Lock
 
-    def __init__(self, max_calls: int, period: float) -> None:
+    def __init__(
+        self,
+        max_calls: int,
+        period: float,
+        *,
+        namespace: str,
+        store: RateLimitStore | None = None,
+        engine: RateLimiterEngine | None = None,
+    ) -> None:
         self.config: _RateLimitConfig = {"max_calls": max_calls, "period": period}
         self.max_calls: int = self.config["max_calls"]
         self.period: float = self.config["period"]
-        self.calls: defaultdict[K, list[float]] = defaultdict(list)
-        self._lock: asyncio.Lock = asyncio.Lock()
+        self.rule: RateLimitRule = RateLimitRule(max_calls, period)
+        self.engine: RateLimiterEngine = engine or RateLimiterEngine()
+        self.store: RateLimitStore | None = store
+        self.namespace: str = namespace
+
+    async def check(self, key: K, cost: int = 1) -> RateLimitDecision:
+        """Consume ``cost`` calls for ``key`` and return the full decision."""
+        store: RateLimitStore | None = self.store or get_rate_limit_store()
+        if store is not None:
+            try:
+                return await store.hit(f"{self.namespace}:{key}", self.rule, cost)
+            except Exception as exc:
+                logger.warning(
+                    "Rate limit store unavailable, using local state: {}", exc
+                )
+        return self.engine.hit(key, self.rule, cost)
 
     async def is_allowed(self, key: K) -> bool:
         """
@@ -48,36 +387,19 @@ class AsyncRateLimiter(Generic[K]):
 
         Returns:
             bool: True if allowed, False otherwise.
-
-        Raises:
-            RuntimeError: If the event loop is not running.
         """
         # Bypass rate limiting in test mode
         if os.environ.get("TESTING") == "1":
             return True
-        now: float = asyncio.get_event_loop().time()
-        async with self._lock:
-            calls: list[float] = self.calls[key]
-            # Remove expired calls
-            self.calls[key] = [t for t in calls if t > now - self.period]
-            allowed: bool = len(self.calls[key]) < self.max_calls
-            if allowed:
-                self.calls[key].append(now)
-                return True
-            return False
+        return (await self.check(key)).allowed
 
     def reset(self, key: K | None = None) -> None:
         """
         Reset the rate limiter for a specific key or all keys if key is None.
 
+        Only local state is cleared; keys in a shared store expire on their own.
+
         Args:
             key (Optional[str]): The key to reset, or None to reset all.
         """
-        if key is not None:
-            self.calls.pop(key, None)
-        else:
-            self.calls.clear()
-
-
-# Example usage (not a constant, so not Final):
-# user_rate_limiter: AsyncRateLimiter[str] = AsyncRateLimiter(max_calls=5, period=60.0)
+        self.engine.reset(key)
@@ -0,0 +1,151 @@
+"""Write-behind buffering for high-frequency "touch" updates.
+
+Hot, loss-tolerant writes (last login, last activity, message counters) are
+recorded in memory, coalesced per entity and written in bulk by a periodic flush
+instead of one transaction per event. Timestamps are last-write-wins and counters
+are summed, so a flush writes at most one row per entity however many events
+arrived in between.
+
+The buffer is not thread-safe: record and flush from the event loop thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable, Hashable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Final, Generic, TypeVar
+
+from loguru import logger
+
+__all__: Final[Sequence[str]] = ("PendingWrite", "WriteBehindBuffer")
+
+K = TypeVar("K", bound=Hashable)
+
+
+@dataclass(slots=True)
+class PendingWrite:
+    """Coalesced updates for one entity."""
+
+    touches: dict[str, Any] = field(default_factory=dict)
+    increments: dict[str, int] = field(default_factory=dict)
+
+    def merge_older(self, older: PendingWrite) -> None:
+        """Fold in updates recorded before this one (used to requeue a failed flush)."""
+        for name, value in older.touches.items():
+            self.touches.setdefault(name, value)
+        for name, delta in older.increments.items():
+            self.increments[name] = self.increments.get(name, 0) + delta
+
+
+class WriteBehindBuffer(Generic[K]):
+    """Coalesce per-entity updates in memory and flush them in bulk.
+
+    ``flush_fn`` receives every pending entity and must write them in as few
+    statements as it can. If it raises, the batch is merged back and retried on
+    the next flush; once more than ``max_entities`` are pending, new entities are
+    dropped (and counted in ``dropped``) rather than growing without bound.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        flush_fn: Callable[[Mapping[K, PendingWrite]], Awaitable[None]],
+        *,
+        interval: float = 5.0,
+        max_entities: int = 50_000,
+    ) -> None:
+        self.name: str = name
+        self.interval: float = interval
+        self.max_entities: int = max_entities
+        self.dropped: int = 0
+        self._flush_fn: Callable[[Mapping[K, PendingWrite]], Awaitable[None]] = flush_fn
+        self._pending: dict[K, PendingWrite] = {}
+        self._task: asyncio.Task[None] | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._stopping: bool = False
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _entry(self, key: K) -> PendingWrite | None:
+        entry = self._pending.get(key)
+        if entry is None:
+            if len(self._pending) >= self.max_entities:
+                self.dropped += 1
+                if self._wakeup is not None:
+                    self._wakeup.set()
+                return None
+            entry = self._pending[key] = PendingWrite()
+        return entry
+
+    def touch(self, key: K, **values: Any) -> None:
+        """Record column values for ``key``; later values replace earlier ones."""
+        entry = self._entry(key)
+        if entry is not None:
+            entry.touches.update(values)
+
+    def increment(self, key: K, **deltas: int) -> None:
+        """Add to counters for ``key``."""
+        entry = self._entry(key)
+        if entry is not None:
+            for name, delta in deltas.items():
+                entry.increments[name] = entry.increments.get(name, 0) + delta
+
+    def drain(self) -> dict[K, PendingWrite]:
+        """Remove and return everything pending, for a caller that writes it itself."""
+        batch, self._pending = self._pending, {}
+        return batch
+
+    async def flush(self) -> int:
+        """Write every pending entity now; returns how many were flushed."""
+        if not self._pending:
+            return 0
+        batch: dict[K, PendingWrite] = self._pending
+        self._pending = {}
+        try:
+            await self._flush_fn(batch)
+        except Exception as exc:
+            logger.error("Write-behind flush of {} failed: {}", self.name, exc)
+            for key, older in batch.items():
+                newer = self._pending.get(key)
+                if newer is not None:
+                    newer.merge_older(older)
+                elif len(self._pending) < self.max_entities:
+                    self._pending[key] = older
+                else:
+                    self.dropped += 1
+            return 0
+        logger.debug("Write-behind flushed {} {} entities", len(batch), self.name)
+        return len(batch)
+
+    async def _run(self) -> None:
+        assert self._wakeup is not None
+        while not self._stopping:
+            with contextlib.suppress(TimeoutError):
+                async with asyncio.timeout(self.interval):
+                    await self._wakeup.wait()
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self) -> None:
+        """Start the periodic flush task on the running event loop."""
+        loop = asyncio.get_running_loop()
+        task = self._task
+        if task is not None and not task.done() and task.get_loop() is loop:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the periodic flush and write everything still pending."""
+        task, self._task = self._task, None
+        if task is not None and self._wakeup is not None:
+            # Let the loop finish its current flush rather than cancelling it.
+            self._stopping = True
+            self._wakeup.set()
+            await task
+        await self.flush()
+        self._wakeup = None
@@ -8,7 +8,7 @@ from unittest.mock import AsyncMock
 import pytest
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.models.user import User
+from src.repositories.user import UserPrincipal
 from src.services.user import UserService
 from src.utils.rate_limit import AsyncRateLimiter
 from tests.test_templates import AuthUnitTestTemplate
@@ -22,7 +22,7 @@ class TestGetCurrentUser(AuthUnitTestTemplate):
         """
         Test that get_current_user returns the dev user when auth is disabled.
         Verifies:
-            - User is instance of User
+            - Result is a UserPrincipal
             - Email is 'dev@example.com'
             - User is active
         """
@@ -34,8 +34,8 @@ class TestGetCurrentUser(AuthUnitTestTemplate):
         user_result = await deps.get_current_user(
             token="irrelevant", session=async_session
         )
-        assert isinstance(user_result, User)
-        user: Final[User] = user_result
+        assert isinstance(user_result, UserPrincipal)
+        user: Final[UserPrincipal] = user_result
         assert user.email == "dev@example.com"
         assert user.is_active
         self.patch_setting(settings, "auth_enabled", True)
@@ -84,13 +84,45 @@ class TestGetCurrentUser(AuthUnitTestTemplate):
             return {"sub": 123}
 
         self.patch_dep("src.api.deps.verify_access_token", fake_verify_access_token)
-        self.patch_dep("src.api.deps.get_user_by_id", AsyncMock(return_value=None))
+        self.patch_dep("src.api.deps.get_user_principal", AsyncMock(return_value=None))
 
         async def call() -> None:
             await deps.get_current_user(token="token", session=async_session)
 
         await self.assert_async_http_exception(call, 401, "User not found")
 
+    @pytest.mark.asyncio
+    async def test_get_current_user_uses_principal_cache(
+        self, async_session: AsyncSession
+    ) -> None:
+        """
+        Test that a cached principal authenticates without touching the session,
+        while get_current_user_entity loads the full entity lazily.
+        """
+        from src.api import deps
+        from src.core.config import get_settings
+        from src.models.user import User
+
+        settings = get_settings()
+        self.patch_setting(settings, "auth_enabled", True)
+        user = User(email="principal@example.com", hashed_password="x", name="P")
+        async_session.add(user)
+        await async_session.commit()
+
+        def fake_verify_access_token(token: str) -> dict[str, object]:
+            return {"sub": str(user.id), "role": "admin"}
+
+        self.patch_dep("src.api.deps.verify_access_token", fake_verify_access_token)
+        first = await deps.get_current_user(token="token", session=async_session)
+        assert isinstance(first, UserPrincipal)
+        assert first.is_admin is True
+        second = await deps.get_current_user(
+            token="token", session=AsyncMock(spec=AsyncSession)
+        )
+        assert second == first
+        entity = await deps.get_current_user_entity(first, async_session)
+        assert entity.name == "P"
+
     def test_get_user_service_returns_user_module(self) -> None:
         """
         Test that get_user_service returns a UserService instance with required methods.
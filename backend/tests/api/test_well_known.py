@@ -0,0 +1,48 @@
+from collections.abc import Iterator
+
+import pytest
+from fastapi.testclient import TestClient
+
+from src.core.config import get_settings
+from src.core.jwt_keys import get_key_ring, reset_key_ring
+from src.utils.jwt_verify import JWKSVerifier
+
+JWKS_ENDPOINT: str = "/.well-known/jwks.json"
+
+
+@pytest.fixture
+def es256_settings(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:
+    reset_key_ring()
+    monkeypatch.setattr(get_settings(), "jwt_algorithm", "ES256")
+    yield
+    reset_key_ring()
+
+
+def test_jwks_empty_for_hmac(client: TestClient) -> None:
+    resp = client.get(JWKS_ENDPOINT)
+    assert resp.status_code == 200
+    assert resp.json() == {"keys": []}
+
+
+def test_jwks_publishes_ring_and_revalidates(
+    client: TestClient, es256_settings: None
+) -> None:
+    resp = client.get(JWKS_ENDPOINT)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/jwk-set+json")
+    assert "max-age" in resp.headers["cache-control"]
+    kids = [key["kid"] for key in resp.json()["keys"]]
+    assert kids == [get_key_ring().signing_key().kid]
+    cached = client.get(JWKS_ENDPOINT, headers={"If-None-Match": resp.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_jwks_verifies_issued_token_offline(
+    client: TestClient, es256_settings: None
+) -> None:
+    from src.core.security import create_access_token
+
+    document = client.get(JWKS_ENDPOINT).json()
+    verifier = JWKSVerifier(jwks=document)
+    token = create_access_token({"sub": "5", "role": "admin"})
+    assert verifier.verify(token)["sub"] == "5"
@@ -0,0 +1,75 @@
+"""Tests for the rollup-backed analytics endpoints."""
+
+from collections.abc import AsyncGenerator
+from datetime import date
+from typing import Final
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.deps import require_admin
+from src.repositories.analytics import apply_rollup_deltas
+from src.schemas.user import UserProfile
+from src.utils.write_behind import PendingWrite
+
+ANALYTICS_ENDPOINT: Final[str] = "/api/v1/analytics"
+
+
+@pytest_asyncio.fixture
+async def admin_client(test_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    test_app.dependency_overrides[require_admin] = lambda: UserProfile(
+        id=1, email="admin@example.com"
+    )
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://test",
+            headers={"X-API-Key": "testkey"},
+        ) as ac:
+            yield ac
+    finally:
+        test_app.dependency_overrides.pop(require_admin, None)
+
+
+@pytest.mark.asyncio
+async def test_daily_and_monthly_series(
+    admin_client: AsyncClient, async_session: AsyncSession
+) -> None:
+    await apply_rollup_deltas(
+        async_session,
+        {
+            date(2003, 7, 1): PendingWrite(increments={"uploads": 3}),
+            date(2003, 7, 3): PendingWrite(increments={"uploads": 2}),
+        },
+    )
+    await async_session.commit()
+
+    resp = await admin_client.get(
+        f"{ANALYTICS_ENDPOINT}/daily",
+        params={"metric": "uploads", "start": "2003-07-01", "end": "2003-07-03"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["total"] == 5
+    assert [p["value"] for p in body["points"]] == [3, 0, 2]
+
+    resp = await admin_client.get(
+        f"{ANALYTICS_ENDPOINT}/monthly", params={"metric": "uploads", "year": 2003}
+    )
+    assert resp.json()["points"][6] == {"month": 7, "value": 5}
+
+
+@pytest.mark.asyncio
+async def test_daily_series_validates_range(admin_client: AsyncClient) -> None:
+    resp = await admin_client.get(
+        f"{ANALYTICS_ENDPOINT}/daily",
+        params={"metric": "signups", "start": "2020-01-01", "end": "2022-01-01"},
+    )
+    assert resp.status_code == 400
+    resp = await admin_client.get(
+        f"{ANALYTICS_ENDPOINT}/daily", params={"metric": "pageviews"}
+    )
+    assert resp.status_code == 422
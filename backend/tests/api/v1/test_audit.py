@@ -0,0 +1,113 @@
+"""Tests for the audit trail endpoints."""
+
+import json
+from collections.abc import AsyncGenerator, AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import UTC, datetime, timedelta
+from typing import Final
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.deps import require_admin
+from src.api.v1 import audit as audit_api
+from src.repositories.audit import AuditEvent, write_audit_events
+from src.schemas.user import UserProfile
+
+AUDIT_ENDPOINT: Final[str] = "/api/v1/audit"
+WINDOW: Final[dict[str, str]] = {
+    "start": "2005-03-01T00:00:00+00:00",
+    "end": "2005-03-02T00:00:00+00:00",
+}
+
+
+@pytest_asyncio.fixture
+async def admin_client(test_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    test_app.dependency_overrides[require_admin] = lambda: UserProfile(
+        id=1, email="admin@example.com"
+    )
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://test",
+            headers={"X-API-Key": "testkey"},
+        ) as ac:
+            yield ac
+    finally:
+        test_app.dependency_overrides.pop(require_admin, None)
+
+
+@pytest_asyncio.fixture
+async def audit_rows(async_session: AsyncSession) -> None:
+    base = datetime(2005, 3, 1, 9, tzinfo=UTC)
+    await write_audit_events(
+        async_session,
+        [
+            AuditEvent(
+                action="user.update",
+                entity_type="user",
+                entity_id=str(i),
+                actor_id=7,
+                details={"fields": ["name"]},
+                occurred_at=base + timedelta(seconds=i),
+            )
+            for i in range(3)
+        ],
+    )
+    await async_session.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("audit_rows")
+async def test_list_events_pages_with_cursor(admin_client: AsyncClient) -> None:
+    resp = await admin_client.get(
+        f"{AUDIT_ENDPOINT}/events", params={**WINDOW, "limit": 2}
+    )
+    assert resp.status_code == 200
+    page = resp.json()
+    assert [e["entity_id"] for e in page["events"]] == ["2", "1"]
+    assert page["next_cursor"]
+
+    resp = await admin_client.get(
+        f"{AUDIT_ENDPOINT}/events",
+        params={**WINDOW, "limit": 2, "cursor": page["next_cursor"]},
+    )
+    page = resp.json()
+    assert [e["entity_id"] for e in page["events"]] == ["0"]
+    assert page["next_cursor"] is None
+
+    resp = await admin_client.get(f"{AUDIT_ENDPOINT}/events", params={"cursor": "x"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("audit_rows")
+async def test_export_and_stats(
+    admin_client: AsyncClient,
+    async_session: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    # The export opens its own session; point it at the test database.
+    @asynccontextmanager
+    async def test_session() -> AsyncIterator[AsyncSession]:
+        yield async_session
+
+    monkeypatch.setattr(audit_api, "get_async_session", test_session)
+    resp = await admin_client.get(f"{AUDIT_ENDPOINT}/export", params=WINDOW)
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in resp.text.splitlines()]
+    assert [r["entity_id"] for r in lines] == ["2", "1", "0"]
+
+    resp = await admin_client.get(
+        f"{AUDIT_ENDPOINT}/export", params={**WINDOW, "format": "csv"}
+    )
+    rows = resp.text.splitlines()
+    assert rows[0].startswith("id,occurred_at,action")
+    assert len(rows) == 4
+
+    stats = (await admin_client.get(f"{AUDIT_ENDPOINT}/stats")).json()
+    assert set(stats) == {"queued", "max_size", "written", "dropped", "failed_batches"}
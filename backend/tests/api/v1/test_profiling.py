@@ -0,0 +1,80 @@
+"""Tests for the admin profiling endpoints."""
+
+from collections.abc import AsyncGenerator
+from typing import Final
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.api.deps import require_admin
+from src.core.config import get_settings
+from src.core.profiling import verify_profile_token
+from src.schemas.user import UserProfile
+
+PROFILING_ENDPOINT: Final[str] = "/api/v1/profiling"
+
+
+@pytest_asyncio.fixture
+async def admin_client(test_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    test_app.dependency_overrides[require_admin] = lambda: UserProfile(
+        id=1, email="admin@example.com"
+    )
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://test",
+            headers={"X-API-Key": "testkey"},
+        ) as ac:
+            yield ac
+    finally:
+        test_app.dependency_overrides.pop(require_admin, None)
+
+
+@pytest.mark.asyncio
+async def test_worker_profile_is_a_download(
+    admin_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    resp = await admin_client.get(
+        f"{PROFILING_ENDPOINT}/worker", params={"seconds": 0.1, "idle": True}
+    )
+    assert resp.status_code == 200
+    assert resp.headers["Content-Disposition"].endswith('.speedscope.json"')
+    assert resp.json()["profiles"]
+
+    monkeypatch.setattr(get_settings(), "profiling_max_seconds", 1)
+    resp = await admin_client.get(f"{PROFILING_ENDPOINT}/worker", params={"seconds": 2})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_tokens_need_a_configured_secret(
+    admin_client: AsyncClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "profiling_secret", None)
+    resp = await admin_client.post(
+        f"{PROFILING_ENDPOINT}/tokens", params={"path": "/api/v1/uploads"}
+    )
+    assert resp.status_code == 503
+
+    monkeypatch.setattr(get_settings(), "profiling_secret", "secret")
+    resp = await admin_client.post(
+        f"{PROFILING_ENDPOINT}/tokens",
+        params={"path": "/api/v1/uploads", "method": "post"},
+    )
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["header"] == "X-Profile"
+    assert verify_profile_token(body["value"], "secret", "POST", "/api/v1/uploads")
+
+
+@pytest.mark.asyncio
+async def test_profiling_requires_admin(test_app: FastAPI) -> None:
+    async with AsyncClient(
+        transport=ASGITransport(app=test_app),
+        base_url="http://test",
+        headers={"X-API-Key": "testkey"},
+    ) as client:
+        resp = await client.get(f"{PROFILING_ENDPOINT}/worker", params={"seconds": 0.1})
+    assert resp.status_code == 401
@@ -0,0 +1,84 @@
+"""Query budgets for endpoints that used to run a statement per item."""
+
+from collections.abc import AsyncGenerator, Callable
+from contextlib import AbstractContextManager
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.query_metrics import QueryStats
+from src.repositories.file import create_file
+from src.repositories.user import bulk_create_users
+from tests.test_data_generators import get_unique_email
+
+QueryBudget = Callable[[int], AbstractContextManager[QueryStats]]
+
+
+@pytest_asyncio.fixture
+async def user_client(
+    test_app: FastAPI,
+) -> AsyncGenerator[tuple[AsyncClient, int], None]:
+    """A client logged in as a freshly registered user, and that user's id."""
+    async with AsyncClient(
+        transport=ASGITransport(app=test_app),
+        base_url="http://test",
+        headers={"X-API-Key": "testkey"},
+    ) as ac:
+        resp = await ac.post(
+            "/api/v1/auth/register",
+            json={"email": get_unique_email(), "password": "TestPass123!"},
+        )
+        assert resp.status_code == 201, resp.text
+        ac.headers["Authorization"] = f"Bearer {resp.json()['access_token']}"
+        me = await ac.get("/api/v1/auth/me")
+        yield ac, me.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_me_budget(
+    user_client: tuple[AsyncClient, int], query_budget: QueryBudget
+) -> None:
+    ac, _ = user_client
+    # The entity load; the principal comes from the cache when it is warm.
+    with query_budget(2) as stats:
+        resp = await ac.get("/api/v1/auth/me")
+    assert resp.status_code == 200
+    assert resp.headers["X-DB-Queries"] == str(stats.count)
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_budget_does_not_grow_with_files(
+    user_client: tuple[AsyncClient, int],
+    async_session: AsyncSession,
+    query_budget: QueryBudget,
+) -> None:
+    ac, user_id = user_client
+    names = [f"budget-{user_id}-{i}.txt" for i in range(20)]
+    for name in names:
+        await create_file(async_session, name, "text/plain", user_id)
+    await async_session.commit()
+    # One SELECT ... IN and one executemany DELETE, plus auth.
+    with query_budget(3):
+        resp = await ac.post(
+            "/api/v1/uploads/bulk-delete", json={"filenames": [*names, "missing.txt"]}
+        )
+    assert resp.status_code == 200, resp.text
+    assert resp.json() == {"deleted": names, "failed": ["missing.txt"]}
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_users_budget(
+    async_session: AsyncSession, query_budget: QueryBudget
+) -> None:
+    # PostgreSQL batches the rows into one INSERT ... RETURNING; SQLite cannot
+    # return ids in input order from a multi-row INSERT, so it runs one per row.
+    budget = 50 if async_session.bind.dialect.name == "sqlite" else 1
+    with query_budget(budget):
+        ids = await bulk_create_users(
+            async_session,
+            [{"email": get_unique_email(), "hashed_password": "h"} for _ in range(50)],
+        )
+    assert len(ids) == 50
@@ -7,12 +7,18 @@ Merged from test_core_fixed.py and test_core_async.py.
 """
 
 import uuid
-from collections.abc import Sequence
+from collections.abc import AsyncGenerator, Sequence
 from typing import Final
 
 import pytest
+import pytest_asyncio
+from fastapi import FastAPI
 from httpx import ASGITransport, AsyncClient, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.api.deps import require_admin
+from src.models.user import User
+from src.schemas.user import UserProfile
 from tests.test_templates import UserCoreEndpointTestTemplate
 
 USER_ENDPOINT: Final[str] = "/api/v1/users"
@@ -859,3 +865,55 @@ class TestUserValidation(UserCoreEndpointTestTemplate):
                 resp = await ac.post(USER_ENDPOINT, json=data, headers=headers)
                 # Might reject very long names depending on validation rules
                 assert resp.status_code in [200, 201, 400, 422]
+
+
+@pytest_asyncio.fixture
+async def admin_client(test_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    test_app.dependency_overrides[require_admin] = lambda: UserProfile(
+        id=1, email="admin@example.com"
+    )
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://test",
+            headers={"X-API-Key": "testkey"},
+        ) as ac:
+            yield ac
+    finally:
+        test_app.dependency_overrides.pop(require_admin, None)
+
+
+@pytest.mark.asyncio
+async def test_sparse_fieldsets(
+    admin_client: AsyncClient, async_session: AsyncSession
+) -> None:
+    """fields[users] limits the returned keys; id is always included."""
+    user = User(
+        email=f"sparse_{uuid.uuid4().hex[:8]}@example.com",
+        hashed_password="h",
+        is_active=True,
+        name="Sparse",
+        bio="not requested",
+    )
+    async_session.add(user)
+    await async_session.commit()
+
+    resp = await admin_client.get(
+        USER_ENDPOINT, params={"email": user.email, "fields[users]": "email,name"}
+    )
+    assert resp.status_code == 200
+    assert resp.json()["users"] == [
+        {"id": user.id, "email": user.email, "name": "Sparse"}
+    ]
+
+    resp = await admin_client.get(
+        f"{USER_ENDPOINT}/{user.id}", params={"fields[users]": "bio"}
+    )
+    assert resp.json() == {"id": user.id, "bio": "not requested"}
+    full = (await admin_client.get(f"{USER_ENDPOINT}/{user.id}")).json()
+    assert full["email"] == user.email and "updated_at" in full
+
+    resp = await admin_client.get(
+        USER_ENDPOINT, params={"fields[users]": "hashed_password"}
+    )
+    assert resp.status_code == 400
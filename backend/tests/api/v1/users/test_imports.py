@@ -0,0 +1,84 @@
+"""Tests for users/imports.py (streaming bulk import endpoint)."""
+
+import uuid
+from collections.abc import AsyncGenerator
+from typing import Final
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from src.api.deps import require_admin
+from src.schemas.user import UserProfile
+
+IMPORT_ENDPOINT: Final[str] = "/api/v1/users/import"
+
+
+@pytest.fixture
+def notifications(monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, list[str]]]:
+    sent: list[tuple[str, list[str]]] = []
+
+    async def capture(
+        message_text: str, level: str = "info", target_users: list[str] | None = None
+    ) -> None:
+        sent.append((message_text, target_users or []))
+
+    monkeypatch.setattr(
+        "src.api.v1.users.imports.broadcast_system_notification", capture
+    )
+    return sent
+
+
+@pytest_asyncio.fixture
+async def admin_client(test_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    test_app.dependency_overrides[require_admin] = lambda: UserProfile(
+        id=42, email="admin@example.com", name="Admin"
+    )
+    try:
+        async with AsyncClient(
+            transport=ASGITransport(app=test_app),
+            base_url="http://test",
+            headers={"X-API-Key": "testkey"},
+        ) as ac:
+            yield ac
+    finally:
+        test_app.dependency_overrides.pop(require_admin, None)
+
+
+@pytest.mark.asyncio
+async def test_import_csv_reports_rows_and_progress(
+    admin_client: AsyncClient, notifications: list[tuple[str, list[str]]]
+) -> None:
+    email: str = f"import_{uuid.uuid4().hex[:8]}@example.com"
+    body: str = (
+        "email,password,name\n"
+        f"{email},Password123!,Imported\n"
+        "not-an-email,Password123!,Bad\n"
+        f"{email},Password123!,Again\n"
+    )
+    resp = await admin_client.post(
+        IMPORT_ENDPOINT, content=body, headers={"Content-Type": "text/csv"}
+    )
+    assert resp.status_code == 200
+    report = resp.json()
+    assert (report["total"], report["created"], report["failed"]) == (3, 1, 2)
+    assert [e["row"] for e in report["errors"]] == [2, 3]
+    assert notifications and notifications[-1][1] == ["42"]
+    assert "finished" in notifications[-1][0]
+
+    again = await admin_client.post(
+        f"{IMPORT_ENDPOINT}?format=ndjson",
+        content=f'{{"email": "{email}", "password": "Password123!"}}\n',
+    )
+    assert again.json()["skipped"] == 1
+
+
+@pytest.mark.asyncio
+async def test_import_requires_known_format(admin_client: AsyncClient) -> None:
+    resp = await admin_client.post(
+        IMPORT_ENDPOINT, content="x", headers={"Content-Type": "text/plain"}
+    )
+    assert resp.status_code == 415
+    resp = await admin_client.post(f"{IMPORT_ENDPOINT}?format=xml", content="x")
+    assert resp.status_code == 400
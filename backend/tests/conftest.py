@@ -23,6 +23,7 @@ from collections.abc import (
     Generator,
     Iterator,
 )
+from contextlib import AbstractContextManager, contextmanager
 from pathlib import Path
 from typing import cast
 
@@ -156,6 +157,9 @@ if is_pytest_run:
                 "USERS_EXPORT",
                 "USERS_EXPORT_ALIVE",
                 "USERS_EXPORT_SIMPLE",
+                "USERS_IMPORT",
+                "ANALYTICS_READ",
+                "AUDIT_READ",
                 "HEALTH",
                 "HEALTH_READ",
                 "UPLOADS",
@@ -445,6 +449,10 @@ def set_remaining_env_vars(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("REVIEWPOINT_FEATURE_USERS_EXPORT_FULL", "true")
     monkeypatch.setenv("REVIEWPOINT_FEATURE_USERS_EXPORT_ALIVE", "true")
     monkeypatch.setenv("REVIEWPOINT_FEATURE_USERS_EXPORT_SIMPLE", "true")
+    monkeypatch.setenv("REVIEWPOINT_FEATURE_USERS_IMPORT", "true")
+    monkeypatch.setenv("REVIEWPOINT_FEATURE_ANALYTICS_READ", "true")
+    monkeypatch.setenv("REVIEWPOINT_FEATURE_AUDIT_READ", "true")
+    monkeypatch.setenv("REVIEWPOINT_FEATURE_PROFILING_RUN", "true")
     monkeypatch.setenv("REVIEWPOINT_FEATURE_USERS_READ", "true")
     # Uploads/files endpoints (granular flags)
     monkeypatch.setenv("REVIEWPOINT_FEATURE_UPLOADS", "true")
@@ -543,6 +551,18 @@ async def truncate_tables(async_engine_isolated: AsyncEngine) -> None:
         logger.error(f"truncate_tables: Unexpected error: {e}")
 
 
+@pytest_asyncio.fixture(autouse=True, scope="function")
+async def clear_user_cache() -> AsyncGenerator[None, None]:
+    """Clear the shared user/principal cache so ids reused across per-test
+    databases never resolve to a principal cached by an earlier test.
+    """
+    from src.utils.cache import user_cache
+
+    await user_cache.clear()
+    yield
+    await user_cache.clear()
+
+
 @pytest_asyncio.fixture(scope="function")
 async def async_engine_isolated(
     use_fast_db: bool,
@@ -828,6 +848,31 @@ def loguru_list_sink() -> Iterator[list[str]]:
 
 
 # 7. Utility fixtures
+@pytest.fixture
+def query_budget() -> Callable[[int], AbstractContextManager[object]]:
+    """Fail the test if a block runs more than ``max_queries`` statements.
+
+    Usage::
+
+        with query_budget(3):
+            await client.get("/api/v1/auth/me")
+
+    Statements are counted through the current context, so drive the app with
+    an ``httpx.AsyncClient`` (``TestClient`` runs it in another thread).
+    """
+    from src.core.query_metrics import QueryStats, track_queries
+
+    @contextmanager
+    def budget(max_queries: int) -> Iterator[QueryStats]:
+        with track_queries() as stats:
+            yield stats
+        assert (
+            stats.count <= max_queries
+        ), f"{stats.count} queries, budget {max_queries}:\n{stats.summary()}"
+
+    return budget
+
+
 @pytest.fixture
 def override_env_vars(
     monkeypatch: pytest.MonkeyPatch,
@@ -10,7 +10,7 @@ from collections.abc import Awaitable, Callable
 from typing import Any, Final, cast
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import event, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -585,3 +585,50 @@ class TestDatabase(DatabaseTestTemplate):
             assert row.last_login_at.replace(microsecond=0) == now.replace(
                 microsecond=0
             )
+
+    @pytest.mark.asyncio
+    async def test_get_async_session_checks_out_lazily(self) -> None:
+        """Sessions connect on first use; unused sessions never touch the pool."""
+        from src.core import database
+
+        self.monkeypatch.setattr(database, "AsyncSessionLocal", self.AsyncSessionLocal)
+        checkouts: list[object] = []
+
+        def on_checkout(*_: object) -> None:
+            checkouts.append(True)
+
+        event.listen(self.engine.sync_engine.pool, "checkout", on_checkout)
+        try:
+            before = database.get_session_stats()
+            async with database.get_async_session():
+                pass
+            assert checkouts == []
+            async with database.get_async_session() as session:
+                await session.execute(select(self.User.id).limit(1))
+            assert len(checkouts) == 1
+        finally:
+            event.remove(self.engine.sync_engine.pool, "checkout", on_checkout)
+        after = database.get_session_stats()
+        assert after["sessions"] - before["sessions"] == 2
+        assert (
+            after["sessions_without_connection"] - before["sessions_without_connection"]
+            == 1
+        )
+        # One skipped SELECT 1 each, plus pre-ping and reset for the idle one.
+        assert after["round_trips_saved"] - before["round_trips_saved"] == 4
+
+    def test_asyncpg_statement_cache_args(self) -> None:
+        """PgBouncer mode turns off both statement caches and names uniquely."""
+        from types import SimpleNamespace
+
+        from src.core.database import _asyncpg_statement_cache_args
+
+        args = _asyncpg_statement_cache_args(
+            SimpleNamespace(db_prepared_statement_cache_size=64)
+        )
+        assert args == {"prepared_statement_cache_size": 64}
+        args = _asyncpg_statement_cache_args(SimpleNamespace(db_pgbouncer_mode=True))
+        assert args["prepared_statement_cache_size"] == 0
+        assert args["statement_cache_size"] == 0
+        name_func = cast(Callable[[], str], args["prepared_statement_name_func"])
+        assert name_func() != name_func()
@@ -0,0 +1,127 @@
+import os
+import time
+from collections.abc import Iterator
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+from jose import JWTError, jwt
+
+from src.core.config import get_settings
+from src.core.jwt_keys import (
+    KeyRing,
+    SigningKey,
+    generate_private_key_pem,
+    get_key_ring,
+    is_asymmetric_algorithm,
+    reset_key_ring,
+    rotate_keys,
+)
+from src.core.security import (
+    create_access_token,
+    create_refresh_token,
+    verify_access_token,
+    verify_refresh_token,
+)
+from tests.test_templates import SecurityUnitTestTemplate
+
+
+class TestJWTKeys(SecurityUnitTestTemplate):
+    @pytest.fixture(autouse=True)
+    def _reset_ring(self) -> Iterator[None]:
+        reset_key_ring()
+        yield
+        reset_key_ring()
+
+    def _use_algorithm(self, algorithm: str, keys_dir: Path | None = None) -> None:
+        settings = get_settings()
+        self.monkeypatch.setattr(settings, "jwt_algorithm", algorithm)
+        self.monkeypatch.setattr(settings, "jwt_keys_dir", keys_dir)
+
+    def test_is_asymmetric_algorithm(self) -> None:
+        assert is_asymmetric_algorithm("RS256")
+        assert is_asymmetric_algorithm("es256")
+        assert not is_asymmetric_algorithm("HS256")
+
+    def test_generate_rejects_hmac(self) -> None:
+        with pytest.raises(ValueError):
+            generate_private_key_pem("HS256")
+
+    @pytest.mark.parametrize("algorithm", ["RS256", "ES256"])
+    def test_access_token_roundtrip(self, algorithm: str) -> None:
+        """Tokens are signed with the ring key and carry its kid."""
+        self._use_algorithm(algorithm)
+        token: str = create_access_token({"sub": "7", "role": "user"})
+        header = jwt.get_unverified_header(token)
+        assert header["alg"] == algorithm
+        assert header["kid"] == get_key_ring().signing_key().kid
+        payload = verify_access_token(token)
+        assert payload["sub"] == "7"
+
+    def test_refresh_token_roundtrip(self) -> None:
+        self._use_algorithm("ES256")
+        token: str = create_refresh_token({"sub": "7", "user_id": 7})
+        assert verify_refresh_token(token)["sub"] == "7"
+
+    def test_unknown_kid_rejected(self) -> None:
+        self._use_algorithm("ES256")
+        foreign = KeyRing.ephemeral("ES256").signing_key()
+        token: str = jwt.encode(
+            {"sub": "1", "exp": int(time.time()) + 60},
+            foreign.private_pem,
+            algorithm="ES256",
+            headers={"kid": foreign.kid},
+        )
+        with pytest.raises(JWTError):
+            verify_access_token(token)
+
+    def test_signing_key_waits_for_activation(self) -> None:
+        """A newly published key only signs once its activation time has passed."""
+        old = SigningKey.from_pem("old", "ES256", generate_private_key_pem("ES256"), 0)
+        new = SigningKey.from_pem(
+            "new", "ES256", generate_private_key_pem("ES256"), 1000.0
+        )
+        ring = KeyRing([new, old])
+        assert ring.signing_key(now=500.0).kid == "old"
+        assert ring.signing_key(now=1500.0).kid == "new"
+        assert {k["kid"] for k in ring.jwks()["keys"]} == {"old", "new"}
+        assert "d" not in ring.jwks()["keys"][0]
+
+    def test_rotate_keys_writes_and_retires(self, tmp_path: Path) -> None:
+        first: str = rotate_keys(tmp_path, "ES256")
+        old_time: float = time.time() - 3 * 86400
+        os.utime(tmp_path / f"{first}.pem", (old_time, old_time))
+        second: str = rotate_keys(tmp_path, "ES256", retire_after=timedelta(days=1))
+        assert sorted(p.stem for p in tmp_path.glob("*.pem")) == [second]
+
+    def test_key_ring_reloads_rotated_directory(self, tmp_path: Path) -> None:
+        """Tokens signed before a rotation keep verifying after it."""
+        rotate_keys(tmp_path, "ES256")
+        self._use_algorithm("ES256", tmp_path)
+        self.monkeypatch.setattr(get_settings(), "jwt_key_activation_seconds", 0)
+        self.monkeypatch.setattr("src.core.jwt_keys._RELOAD_INTERVAL_SECONDS", 0.0)
+        token: str = create_access_token({"sub": "1"})
+        ring_before = get_key_ring()
+        rotate_keys(tmp_path, "ES256")
+        ring_after = get_key_ring()
+        assert len(ring_after.keys) == 2
+        assert ring_after.etag != ring_before.etag
+        assert verify_access_token(token)["sub"] == "1"
+
+    def test_key_ring_drops_deleted_keys(self, tmp_path: Path) -> None:
+        """Removing an older key file reloads the ring without it."""
+        first: str = rotate_keys(tmp_path, "ES256")
+        old_time: float = time.time() - 86400
+        os.utime(tmp_path / f"{first}.pem", (old_time, old_time))
+        second: str = rotate_keys(tmp_path, "ES256")
+        self._use_algorithm("ES256", tmp_path)
+        self.monkeypatch.setattr("src.core.jwt_keys._RELOAD_INTERVAL_SECONDS", 0.0)
+        assert len(get_key_ring().keys) == 2
+        (tmp_path / f"{first}.pem").unlink()
+        assert [key.kid for key in get_key_ring().keys] == [second]
+
+    def test_production_requires_keys_dir(self) -> None:
+        self._use_algorithm("ES256")
+        self.monkeypatch.setattr(get_settings(), "environment", "prod")
+        with pytest.raises(RuntimeError):
+            get_key_ring()
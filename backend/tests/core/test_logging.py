@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import ast
 import importlib
+import io
 import logging
 import sys
 from pathlib import Path
@@ -9,10 +11,12 @@ from typing import Final
 from unittest.mock import patch
 
 from _pytest.capture import CaptureFixture
+from loguru import logger
 
 from tests.test_templates import LogCaptureTestTemplate
 
 MODULE: Final[str] = "src.core.app_logging"
+SRC: Final[Path] = Path(__file__).resolve().parents[2] / "src"
 
 
 class TestLogging(LogCaptureTestTemplate):
@@ -89,3 +93,85 @@ class TestLogging(LogCaptureTestTemplate):
         import src.core.app_logging
 
         assert hasattr(src.core.app_logging, "init_logging")
+
+    def test_performance_mode_writes_in_batches(
+        self, capsys: CaptureFixture[str]
+    ) -> None:
+        """Performance mode queues lines and writes them from the writer thread."""
+        log_mod: ModuleType = self.reload_logging()
+        log_mod.init_logging(level="INFO", performance=True)
+        for i in range(5):
+            logger.info("queued {}", i)
+        log_mod.stop_logging()
+        out: str = capsys.readouterr().out
+        assert all(f"queued {i}" in out for i in range(5))
+        assert "\x1b[" not in out
+
+    def test_performance_mode_file_sink(self, tmp_path: Path) -> None:
+        """The batched file sink is flushed and closed by stop_logging()."""
+        log_mod: ModuleType = self.reload_logging()
+        logfile: Path = tmp_path / "app.log"
+        with patch.object(log_mod, "_is_testing", return_value=False):
+            log_mod.init_logging(level="INFO", logfile=str(logfile), performance=True)
+            logger.info("batched-to-file")
+        log_mod.stop_logging()
+        assert "batched-to-file" in logfile.read_text()
+
+    def test_batched_sink_drops_when_full(self) -> None:
+        """A full queue drops lines instead of blocking, and reports the count."""
+        log_mod: ModuleType = self.reload_logging()
+        stream = io.StringIO()
+        sink = log_mod.BatchedSink(stream, max_queue=2, flush_interval=60)
+        for line in ("one\n", "two\n", "three\n"):
+            sink(line)
+        assert sink.dropped == 1
+        sink.stop()
+        assert stream.getvalue() == (
+            "one\ntwo\nWARNING: 1 log lines dropped (queue full)\n"
+        )
+
+    def test_sample_filter_keeps_a_fraction_per_logger(
+        self, capsys: CaptureFixture[str]
+    ) -> None:
+        """Sampled loggers keep one line in 1/rate; warnings always pass."""
+        log_mod: ModuleType = self.reload_logging()
+        log_mod.init_logging(level="DEBUG", sample_rates={"tests.core": 0.1})
+        for i in range(50):
+            logger.debug("sampled {}", i)
+        logger.warning("always")
+        logging.getLogger("other").info("unsampled")
+        out: str = capsys.readouterr().out
+        assert out.count("sampled ") == 5
+        assert "sampled 0" in out and "sampled 10" in out
+        assert "always" in out and "unsampled" in out
+
+    def test_sample_filter_matches_most_specific_prefix(self) -> None:
+        """The longest dotted prefix of the logger name selects the rate."""
+        log_mod: ModuleType = self.reload_logging()
+        sampler = log_mod.SampleFilter({"src": 1.0, "src.api.deps": 0.0})
+        assert sampler._rate("src.api.deps") == 0.0
+        assert sampler._rate("src.api.v1.auth") == 1.0
+        assert sampler._rate("sqlalchemy.engine") is None
+
+
+def test_debug_and_info_messages_are_formatted_lazily() -> None:
+    """DEBUG/INFO/TRACE calls pass arguments instead of building f-strings.
+
+    An f-string is formatted even when the level is disabled; loguru ``{}``
+    and stdlib ``%s`` arguments are only formatted when the line is written.
+    """
+    offenders: list[str] = []
+    for path in sorted(SRC.rglob("*.py")):
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Call)
+                and isinstance(node.func, ast.Attribute)
+                and node.func.attr in ("trace", "debug", "info")
+                and isinstance(node.func.value, ast.Name)
+                and node.func.value.id in ("logger", "logging", "log")
+                and node.args
+                and isinstance(node.args[0], ast.JoinedStr)
+            ):
+                offenders.append(f"{path.relative_to(SRC)}:{node.lineno}")
+    assert offenders == [], f"f-string log messages: {offenders}"
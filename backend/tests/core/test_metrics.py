@@ -0,0 +1,77 @@
+"""Tests for the in-process metrics registry."""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from src.core.metrics import (
+    MetricsRegistry,
+    RegistrySnapshot,
+    merge_snapshots,
+    prometheus_lines,
+)
+
+
+def _registry() -> MetricsRegistry:
+    registry = MetricsRegistry()
+    requests = registry.counter("requests_total", "Requests", ("route", "status"))
+    active = registry.gauge("active", "In progress")
+    latency = registry.histogram("latency_seconds", "Latency", ("route",), (0.1, 1.0))
+    requests.inc("/a", "200")
+    requests.inc("/a", "200")
+    requests.inc('/b"', "500")
+    active.inc()
+    latency.observe(0.05, "/a")
+    latency.observe(0.5, "/a")
+    return registry
+
+
+def test_prometheus_text_format() -> None:
+    lines = _registry().prometheus_lines()
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/a",status="200"} 2.0' in lines
+    assert 'requests_total{route="/b\\"",status="500"} 1.0' in lines
+    assert "active 1.0" in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 2' in lines
+    assert 'latency_seconds_count{route="/a"} 2' in lines
+
+
+def test_families_are_registered_once() -> None:
+    registry = MetricsRegistry()
+    first = registry.counter("hits_total", "Hits", ("route",))
+    assert registry.counter("hits_total", "Hits", ("route",)) is first
+    with pytest.raises(ValueError, match="already registered"):
+        registry.gauge("hits_total", "Hits", ("route",))
+
+
+def test_merge_sums_workers_and_drops_dead_gauges() -> None:
+    live: RegistrySnapshot = _registry().snapshot()
+    dead: RegistrySnapshot = {**_registry().snapshot(), "pid": -1}
+    lines = prometheus_lines(merge_snapshots([live, dead], live_pids=[live["pid"]]))
+    assert 'requests_total{route="/a",status="200"} 4.0' in lines
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 2' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+    # The exited worker's requests are still counted; its gauge is not.
+    assert "active 1.0" in lines
+
+
+@pytest.mark.asyncio
+async def test_workers_share_a_directory(tmp_path: Path) -> None:
+    worker = _registry()
+    worker.start(tmp_path, interval=60)
+    await worker.stop()
+    assert (tmp_path / f"metrics_{os.getpid()}.json").exists()
+    # Another worker (as this process sees it) with the same series.
+    other = _registry()
+    other.directory = tmp_path
+    snapshot = other.snapshot()
+    snapshot["pid"] = os.getppid()
+    (tmp_path / f"metrics_{os.getppid()}.json").write_text(
+        json.dumps(snapshot), encoding="utf-8"
+    )
+    lines = worker.prometheus_lines()
+    assert 'requests_total{route="/a",status="200"} 4.0' in lines
+    assert "active 2.0" in lines
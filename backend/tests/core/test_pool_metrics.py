@@ -0,0 +1,98 @@
+"""Tests for connection-pool telemetry."""
+
+from collections.abc import AsyncIterator, Iterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from src.core.metrics import Histogram
+from src.core.pool_metrics import (
+    TimedAsyncAdaptedQueuePool,
+    pool_route_ctx_var,
+    pool_telemetry,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_telemetry() -> Iterator[None]:
+    pool_telemetry.reset()
+    yield
+    pool_telemetry.reset()
+
+
+@pytest_asyncio.fixture
+async def engine(tmp_path: Path) -> AsyncIterator[AsyncEngine]:
+    """A one-connection pool that times out quickly."""
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+        poolclass=TimedAsyncAdaptedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    pool_telemetry.instrument(engine.sync_engine.pool)
+    try:
+        yield engine
+    finally:
+        await engine.dispose()
+
+
+def test_histogram_is_cumulative() -> None:
+    histogram = Histogram((0.1, 1.0))
+    for value in (0.05, 0.5, 0.7, 3.0):
+        histogram.observe(value)
+    assert histogram.prometheus_lines("wait") == [
+        'wait_bucket{le="0.1"} 1',
+        'wait_bucket{le="1.0"} 3',
+        'wait_bucket{le="+Inf"} 4',
+        "wait_sum 4.25",
+        "wait_count 4",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_hold_time_is_attributed_to_the_route(engine: AsyncEngine) -> None:
+    token = pool_route_ctx_var.set("GET /api/v1/users")
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+            assert pool_telemetry.routes["GET /api/v1/users"].held == 1
+    finally:
+        pool_route_ctx_var.reset(token)
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+    users = pool_telemetry.routes["GET /api/v1/users"]
+    assert (users.count, users.held) == (1, 0)
+    assert users.total_seconds > 0
+    assert pool_telemetry.routes["background"].count == 1
+    assert pool_telemetry.checkout_wait.count == 2
+    assert pool_telemetry.connects == 1
+    lines = pool_telemetry.prometheus_lines()
+    assert 'db_pool_connection_hold_seconds_count{route="GET /api/v1/users"} 1' in lines
+    assert "db_pool_checkout_wait_seconds_count 2" in lines
+
+
+@pytest.mark.asyncio
+async def test_exhaustion_and_invalidation_are_counted(
+    engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    logged: list[str] = []
+    monkeypatch.setattr(pool_telemetry, "log_top_routes", logged.append)
+    pool_route_ctx_var.set("POST /api/v1/uploads")
+    async with engine.connect() as holder:
+        await holder.execute(text("SELECT 1"))
+        with pytest.raises(PoolTimeoutError):
+            async with engine.connect():
+                pass
+        # Background flushes from earlier tests may hold connections too.
+        assert "POST /api/v1/uploads" in dict(pool_telemetry.top_routes())
+        await holder.invalidate()
+    assert pool_telemetry.checkout_timeouts == 1
+    assert logged and "timed out" in logged[0]
+    assert pool_telemetry.invalidations == {"explicit": 1}
+    assert pool_telemetry.routes["POST /api/v1/uploads"].held == 0
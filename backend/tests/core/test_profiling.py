@@ -0,0 +1,60 @@
+"""Tests for the sampling profiler and profiling tokens."""
+
+import threading
+import time
+
+from src.core.profiling import (
+    profile_worker,
+    sign_profile_token,
+    verify_profile_token,
+)
+
+
+def _spin_until(stop: threading.Event) -> None:
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def test_worker_profile_samples_busy_threads_only() -> None:
+    stop = threading.Event()
+    busy = threading.Thread(target=_spin_until, args=(stop,), name="busy")
+    parked = threading.Thread(target=stop.wait, name="parked")
+    busy.start()
+    parked.start()
+    try:
+        profile = profile_worker(0.2, interval=0.005)
+    finally:
+        stop.set()
+        busy.join()
+        parked.join()
+
+    collapsed = profile.collapsed()
+    assert profile.samples > 0
+    assert any(
+        line.startswith("busy;") and "_spin_until" in line
+        for line in collapsed.splitlines()
+    )
+    assert not any(line.startswith("parked;") for line in collapsed.splitlines())
+
+    speedscope = profile.speedscope()
+    frames = speedscope["shared"]["frames"]
+    (busy_profile,) = [p for p in speedscope["profiles"] if p["name"] == "busy"]
+    assert len(busy_profile["samples"]) == len(busy_profile["weights"])
+    assert all(i < len(frames) for sample in busy_profile["samples"] for i in sample)
+    assert "_spin_until" in {
+        frames[sample[-1]]["name"] for sample in busy_profile["samples"]
+    }
+
+
+def test_profile_tokens_are_bound_to_method_path_and_expiry() -> None:
+    expires = int(time.time()) + 60
+    token = sign_profile_token("secret", "get", "/api/v1/uploads", expires)
+
+    assert verify_profile_token(token, "secret", "GET", "/api/v1/uploads")
+    assert not verify_profile_token(token, "secret", "POST", "/api/v1/uploads")
+    assert not verify_profile_token(token, "secret", "GET", "/api/v1/users")
+    assert not verify_profile_token(token, "other", "GET", "/api/v1/uploads")
+    assert not verify_profile_token(
+        token, "secret", "GET", "/api/v1/uploads", now=expires + 1
+    )
+    assert not verify_profile_token("garbage", "secret", "GET", "/api/v1/uploads")
@@ -0,0 +1,50 @@
+"""Tests for per-request query accounting."""
+
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core import query_metrics
+from src.core.query_metrics import normalize_sql, track_queries
+from src.models.user import User
+
+
+def test_normalize_sql_collapses_values() -> None:
+    sql = """SELECT users.id FROM users
+        WHERE users.email = 'a@b.c' AND users.id IN ($1, $2, $3) LIMIT 10"""
+    assert normalize_sql(sql) == (
+        "SELECT users.id FROM users WHERE users.email = ? AND users.id IN (?) LIMIT ?"
+    )
+    assert normalize_sql("SELECT :id_1, users_1.x::text") == "SELECT ?, users_1.x::text"
+
+
+@pytest.mark.asyncio
+async def test_nested_collectors_and_n_plus_one(
+    async_session: AsyncSession,
+    loguru_list_sink: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(query_metrics, "_n_plus_one_threshold", 3)
+    with track_queries() as outer:
+        with track_queries("req-1") as inner:
+            for user_id in range(4):
+                await async_session.execute(select(User.id).where(User.id == user_id))
+        await async_session.execute(text("SELECT 1"))
+    assert (inner.count, outer.count) == (4, 5)
+    assert inner.seconds > 0
+    assert len(inner.repeated) == 1
+    warnings = [m for m in loguru_list_sink if m.startswith("Possible N+1")]
+    assert len(warnings) == 1
+    assert "req-1" in warnings[0]
+    assert "WHERE users.id = ?" in warnings[0]
+
+
+@pytest.mark.asyncio
+async def test_slow_queries_are_logged(
+    async_session: AsyncSession,
+    loguru_list_sink: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(query_metrics, "_slow_query_seconds", 0.0)
+    await async_session.execute(text("SELECT 42"))
+    assert any(m.startswith("Slow query") and "SELECT ?" in m for m in loguru_list_sink)
@@ -0,0 +1,105 @@
+"""Tests for read-replica routing against two SQLite databases."""
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import (
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.core.replicas import (
+    ReplicaSet,
+    RoutingSession,
+    allow_replica_reads,
+    replica_set,
+)
+from src.models.base import Base
+from src.models.user import User
+from src.repositories.user import list_users
+
+
+@pytest_asyncio.fixture
+async def make_session(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    """Sessions on a primary whose only user is on the primary, and likewise a replica."""
+    engines = [
+        create_async_engine(f"sqlite+aiosqlite:///{tmp_path / name}.db")
+        for name in ("primary", "replica")
+    ]
+    for engine, email in zip(
+        engines, ("primary@example.com", "replica@example.com"), strict=True
+    ):
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with AsyncSession(engine) as session:
+            session.add(User(email=email, hashed_password="h"))
+            await session.commit()
+    primary, replica = engines
+    replicas = ReplicaSet()
+    replicas.configure([replica])
+    await replicas.check()
+    for attr in ("replicas", "max_lag_seconds", "primary_fallbacks"):
+        monkeypatch.setattr(replica_set, attr, getattr(replicas, attr))
+    try:
+        yield async_sessionmaker(
+            bind=primary, sync_session_class=RoutingSession, expire_on_commit=False
+        )
+    finally:
+        for engine in engines:
+            await engine.dispose()
+
+
+async def _listed(session: AsyncSession) -> list[str]:
+    users, _ = await list_users(session)
+    return [u.email for u in users]
+
+
+@pytest.mark.asyncio
+async def test_reads_route_to_replica_until_the_session_writes(
+    make_session: async_sessionmaker[AsyncSession],
+) -> None:
+    async with make_session() as session:
+        assert await _listed(session) == ["primary@example.com"]
+
+    async with make_session() as session:
+        allow_replica_reads(session)
+        assert await _listed(session) == ["replica@example.com"]
+        # Unmarked reads stay on the primary.
+        emails = (await session.scalars(select(User.email))).all()
+        assert emails == ["primary@example.com"]
+
+        session.add(User(email="new@example.com", hashed_password="h"))
+        await session.flush()
+        assert sorted(await _listed(session)) == [
+            "new@example.com",
+            "primary@example.com",
+        ]
+    assert replica_set.stats()[0]["reads"] == 2
+
+
+@pytest.mark.asyncio
+async def test_lagging_or_failed_replica_falls_back_to_primary(
+    make_session: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    replica = replica_set.replicas[0]
+    monkeypatch.setattr(replica, "lag_seconds", replica_set.max_lag_seconds + 1)
+    async with make_session() as session:
+        allow_replica_reads(session)
+        assert await _listed(session) == ["primary@example.com"]
+    assert replica_set.primary_fallbacks == 2
+
+    # A replica that cannot be reached fails its next check.
+    await replica.engine.dispose()
+    replica.engine = create_async_engine("sqlite+aiosqlite:////nonexistent/dir/x.db")
+    await replica_set.check()
+    assert replica_set.stats()[0]["healthy"] is False
+    async with make_session() as session:
+        allow_replica_reads(session)
+        assert await _listed(session) == ["primary@example.com"]
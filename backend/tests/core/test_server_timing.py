@@ -0,0 +1,176 @@
+"""Tests for per-request dependency, handler and serialization timing."""
+
+from collections.abc import AsyncIterator, Iterator
+
+import pytest
+from fastapi import Depends, FastAPI, HTTPException
+from fastapi.testclient import TestClient
+
+from src.core.config import get_settings
+from src.core.metrics import metrics
+from src.core.server_timing import instrument_routes
+from src.middlewares.logging import RequestLoggingMiddleware
+
+torn_down: list[str] = []
+
+
+def load_flags() -> dict[str, bool]:
+    return {"beta": True}
+
+
+async def get_user(flags: dict[str, bool] = Depends(load_flags)) -> str:
+    return "alice"
+
+
+async def get_session() -> AsyncIterator[str]:
+    yield "session"
+    torn_down.append("session")
+
+
+def get_lock() -> Iterator[str]:
+    yield "lock"
+    torn_down.append("lock")
+
+
+async def require_item(item_id: int) -> int:
+    if item_id == 0:
+        raise HTTPException(404, "missing")
+    return item_id
+
+
+@pytest.fixture(autouse=True)
+def fresh_state() -> Iterator[None]:
+    metrics.reset()
+    torn_down.clear()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    def read_item(
+        item_id: int = Depends(require_item),
+        user: str = Depends(get_user),
+        session: str = Depends(get_session),
+        lock: str = Depends(get_lock),
+    ) -> dict[str, str | int]:
+        return {"id": item_id, "user": user, "session": session, "lock": lock}
+
+    @app.post("/items/{item_id}")
+    async def update_item(item_id: int = Depends(require_item)) -> None:
+        raise HTTPException(409, "conflict")
+
+    instrument_routes(app)
+    return app
+
+
+def _phases(header: str) -> list[str]:
+    return [entry.split(";")[0] for entry in header.split(", ")]
+
+
+def test_every_dependency_and_phase_is_timed(
+    app: FastAPI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "server_timing_enabled", True)
+    response = TestClient(app).get("/items/7")
+
+    assert response.json() == {
+        "id": 7,
+        "user": "alice",
+        "session": "session",
+        "lock": "lock",
+    }
+    assert _phases(response.headers["Server-Timing"]) == [
+        "require_item",
+        "load_flags",
+        "get_user",
+        "get_session",
+        "get_lock",
+        "handler",
+        "serialize",
+    ]
+    assert sorted(torn_down) == ["lock", "session"]
+    lines = metrics.prometheus_lines()
+    for phase in ("get_user", "handler", "serialize"):
+        assert (
+            "http_phase_duration_seconds_count"
+            f'{{method="GET",route="/items/{{item_id}}",phase="{phase}"}} 1'
+        ) in lines
+
+
+def test_failing_dependency_stops_timing_at_that_dependency(
+    app: FastAPI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "server_timing_enabled", True)
+    response = TestClient(app).get("/items/0")
+
+    assert response.status_code == 404
+    assert _phases(response.headers["Server-Timing"]) == ["require_item"]
+
+
+def test_raising_handler_is_still_timed(
+    app: FastAPI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "server_timing_enabled", True)
+    response = TestClient(app).post("/items/7")
+
+    assert response.status_code == 409
+    assert _phases(response.headers["Server-Timing"])[:2] == [
+        "require_item",
+        "handler",
+    ]
+    assert (
+        "http_phase_duration_seconds_count"
+        '{method="POST",route="/items/{item_id}",phase="handler"} 1'
+    ) in metrics.prometheus_lines()
+
+
+def test_header_needs_the_flag_or_a_valid_api_key(
+    app: FastAPI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "server_timing_enabled", False)
+    monkeypatch.setattr(settings, "api_key", "secret")
+    client = TestClient(app)
+
+    assert "Server-Timing" not in client.get("/items/7").headers
+    denied = client.get(
+        "/items/7", headers={"X-Server-Timing": "1", "X-API-Key": "wrong"}
+    )
+    assert "Server-Timing" not in denied.headers
+    allowed = client.get(
+        "/items/7", headers={"X-Server-Timing": "1", "X-API-Key": "secret"}
+    )
+    assert "handler" in _phases(allowed.headers["Server-Timing"])
+    # Recorded either way
+    assert (
+        "http_phase_duration_seconds_count"
+        '{method="GET",route="/items/{item_id}",phase="handler"} 3'
+    ) in metrics.prometheus_lines()
+
+
+def test_dependency_overrides_still_apply(
+    app: FastAPI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "server_timing_enabled", True)
+    app.dependency_overrides[get_user] = lambda: "bob"
+    response = TestClient(app).get("/items/7")
+
+    assert response.json()["user"] == "bob"
+    assert "load_flags" not in _phases(response.headers["Server-Timing"])
+
+
+def test_request_logging_adds_db_entry_to_the_same_header(
+    app: FastAPI, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "server_timing_enabled", True)
+    app.add_middleware(RequestLoggingMiddleware, expose_query_headers=True)
+    response = TestClient(app).get("/items/7")
+
+    assert response.headers.get_list("Server-Timing") == [
+        response.headers["Server-Timing"]
+    ]
+    assert _phases(response.headers["Server-Timing"])[:2] == ["db", "require_item"]
@@ -0,0 +1,73 @@
+"""Tests for production SQLite mode."""
+
+from collections.abc import AsyncIterator
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from src.core.sqlite import SQLiteSession, create_sqlite_engines, sqlite_pools
+from src.models.base import Base
+from src.models.user import User
+
+
+@pytest_asyncio.fixture
+async def engines(tmp_path: Path) -> AsyncIterator[tuple[AsyncEngine, AsyncEngine]]:
+    writer, reader = create_sqlite_engines(
+        f"sqlite+aiosqlite:///{tmp_path / 'app.db'}",
+        SimpleNamespace(db_sqlite_busy_timeout_ms=1234, db_sqlite_readers=2),
+        {},
+    )
+    async with writer.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sqlite_pools.reader = reader
+    try:
+        yield writer, reader
+    finally:
+        await sqlite_pools.stop()
+        await writer.dispose()
+
+
+@pytest.mark.asyncio
+async def test_connections_get_wal_and_pragmas(
+    engines: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    writer, reader = engines
+    for engine in engines:
+        async with engine.connect() as conn:
+            assert (await conn.exec_driver_sql("PRAGMA journal_mode")).scalar() == "wal"
+            assert (await conn.exec_driver_sql("PRAGMA synchronous")).scalar() == 1
+            assert (await conn.exec_driver_sql("PRAGMA busy_timeout")).scalar() == 1234
+            assert (await conn.exec_driver_sql("PRAGMA temp_store")).scalar() == 2
+    async with reader.connect() as conn:
+        with pytest.raises(OperationalError, match="readonly"):
+            await conn.execute(
+                text("INSERT INTO users (email, hashed_password) VALUES ('a', 'h')")
+            )
+
+
+@pytest.mark.asyncio
+async def test_session_reads_from_readers_until_it_writes(
+    engines: tuple[AsyncEngine, AsyncEngine],
+) -> None:
+    writer, reader = engines
+    make_session = async_sessionmaker(bind=writer, sync_session_class=SQLiteSession)
+    async with make_session() as session:
+        await session.scalars(select(User))
+        assert writer.sync_engine.pool.checkedout() == 0
+        assert reader.sync_engine.pool.checkedout() == 1
+
+        session.add(User(email="new@example.com", hashed_password="h"))
+        await session.flush()
+        assert writer.sync_engine.pool.checkedout() == 1
+        # The session reads its own uncommitted write from the writer.
+        emails = (await session.scalars(select(User.email))).all()
+        assert emails == ["new@example.com"]
+        await session.commit()
+
+    async with make_session() as session:
+        assert (await session.scalars(select(User.email))).all() == ["new@example.com"]
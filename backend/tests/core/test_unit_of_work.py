@@ -0,0 +1,146 @@
+"""Tests for the request-scoped unit of work."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from src.core import database
+from src.core.unit_of_work import UnitOfWork
+from src.models.user import User
+from src.repositories.audit import audit_on_commit, audit_queue
+from tests.test_data_generators import get_unique_email
+
+
+@contextmanager
+def count_commits(session: AsyncSession) -> Iterator[list[int]]:
+    """Yield a one-item list holding the number of COMMITs seen so far."""
+    commits: list[int] = [0]
+
+    def _count(_: Session) -> None:
+        commits[0] += 1
+
+    event.listen(session.sync_session, "after_commit", _count)
+    try:
+        yield commits
+    finally:
+        event.remove(session.sync_session, "after_commit", _count)
+
+
+@pytest.mark.asyncio
+async def test_commits_once_and_skips_read_only(async_session: AsyncSession) -> None:
+    email = get_unique_email()
+    with count_commits(async_session) as commits:
+        async with UnitOfWork(async_session):
+            async_session.add(User(email=email, hashed_password="h"))
+            await async_session.flush()
+            async_session.add(User(email=get_unique_email(), hashed_password="h"))
+        assert commits[0] == 1
+
+        async with UnitOfWork(async_session):
+            await async_session.execute(select(User.id).where(User.email == email))
+        assert commits[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_error_rolls_back_and_savepoint_keeps_outer_work(
+    async_session: AsyncSession,
+) -> None:
+    lost, kept = get_unique_email(), get_unique_email()
+    with pytest.raises(RuntimeError):
+        async with UnitOfWork(async_session):
+            async_session.add(User(email=lost, hashed_password="h"))
+            await async_session.flush()
+            raise RuntimeError("boom")
+
+    async with UnitOfWork(async_session) as uow:
+        async_session.add(User(email=kept, hashed_password="h"))
+        audit_on_commit(async_session, "user.create", "user", kept)
+        info = async_session.sync_session.info
+        info["unrelated"] = ["before"]
+        with pytest.raises(RuntimeError):
+            async with uow.savepoint():
+                audit_on_commit(async_session, "user.delete", "user", kept)
+                info["unrelated"].append("inside")
+                raise RuntimeError("step failed")
+        # Only the on-commit lists are rolled back with the savepoint.
+        assert info.pop("unrelated") == ["before", "inside"]
+    actions = [e.action for e in audit_queue.drain() if e.entity_id == kept]
+    assert actions == ["user.create"]
+
+    emails = set(
+        (
+            await async_session.scalars(
+                select(User.email).where(User.email.in_([lost, kept]))
+            )
+        ).all()
+    )
+    assert emails == {kept}
+
+
+@pytest.mark.asyncio
+async def test_commits_per_endpoint(
+    test_app: FastAPI, async_session: AsyncSession
+) -> None:
+    from src.services.user import get_password_reset_token
+
+    email, password = get_unique_email(), "OldPassword123!"
+    async with AsyncClient(
+        transport=ASGITransport(app=test_app),
+        base_url="http://test",
+        headers={"X-API-Key": "testkey"},
+    ) as ac:
+
+        async def commits_for(path: str, body: dict[str, str], status: int) -> int:
+            with count_commits(async_session) as commits:
+                resp = await ac.post(f"/api/v1/auth/{path}", json=body)
+            assert resp.status_code == status, resp.text
+            return commits[0]
+
+        credentials = {"email": email, "password": password}
+        assert await commits_for("register", credentials, 201) == 1
+        assert await commits_for("login", credentials, 200) == 0
+        reset = {"token": get_password_reset_token(email), "new_password": "New456!pw"}
+        assert await commits_for("reset-password", reset, 200) == 1
+        assert await commits_for("reset-password", reset, 400) == 0
+
+
+@pytest.mark.asyncio
+async def test_endpoints_get_a_session_without_overrides(
+    async_engine_isolated: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from src.main import create_app
+
+    # The real get_async_session, on the test database.
+    monkeypatch.setattr(
+        database,
+        "AsyncSessionLocal",
+        async_sessionmaker(async_engine_isolated, expire_on_commit=False),
+    )
+    app = create_app()
+    failures = database.get_connection_debug_info()["connection_failures"]
+    credentials = {"email": get_unique_email(), "password": "Password123!"}
+    async with AsyncClient(
+        transport=ASGITransport(app=app),
+        base_url="http://test",
+        headers={"X-API-Key": "testkey"},
+    ) as ac:
+        assert (
+            await ac.post("/api/v1/auth/register", json=credentials)
+        ).status_code == 201
+        resp = await ac.post("/api/v1/auth/login", json=credentials)
+        assert resp.status_code == 200, resp.text
+        token = resp.json()["access_token"]
+        me = await ac.get(
+            "/api/v1/auth/me", headers={"Authorization": f"Bearer {token}"}
+        )
+        assert me.json()["email"] == credentials["email"]
+        wrong = {**credentials, "password": "Wrong123!"}
+        assert (await ac.post("/api/v1/auth/login", json=wrong)).status_code == 401
+    # An error response is not a session failure.
+    assert database.get_connection_debug_info()["connection_failures"] == failures
@@ -0,0 +1,102 @@
+"""Tests for the pure ASGI front door (early 429/401 rejection)."""
+
+from __future__ import annotations
+
+from typing import Final
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.security import OAuth2PasswordBearer
+from fastapi.testclient import TestClient
+
+from src.core.config import get_settings
+from src.middlewares.front_door import FrontDoorMiddleware
+
+oauth2: Final[OAuth2PasswordBearer] = OAuth2PasswordBearer(tokenUrl="/token")
+
+
+def get_token(token: str = Depends(oauth2)) -> str:
+    return token
+
+
+@pytest.fixture
+def calls() -> list[str]:
+    return []
+
+
+@pytest.fixture
+def app(calls: list[str], monkeypatch: pytest.MonkeyPatch) -> FastAPI:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "front_door_enabled", True)
+    monkeypatch.setattr(settings, "front_door_ip_limit", 0)
+    monkeypatch.setattr(settings, "front_door_auth_limit", 2)
+
+    app = FastAPI()
+    app.add_middleware(FrontDoorMiddleware)
+
+    @app.get("/public")
+    def public() -> dict[str, bool]:
+        calls.append("public")
+        return {"ok": True}
+
+    @app.get("/private")
+    def private(token: str = Depends(get_token)) -> dict[str, str]:
+        calls.append("private")
+        return {"token": token}
+
+    @app.post("/api/v1/auth/login")
+    def login() -> dict[str, bool]:
+        calls.append("login")
+        return {"ok": True}
+
+    return app
+
+
+@pytest.fixture
+def client(app: FastAPI) -> TestClient:
+    return TestClient(app)
+
+
+def test_missing_bearer_rejected_before_route(
+    client: TestClient, calls: list[str]
+) -> None:
+    resp = client.get("/private")
+    assert resp.status_code == 401
+    assert resp.json() == {"detail": "Not authenticated"}
+    assert resp.headers["www-authenticate"] == "Bearer"
+    assert calls == []
+
+
+def test_bearer_present_reaches_route(client: TestClient, calls: list[str]) -> None:
+    resp = client.get("/private", headers={"Authorization": "Bearer abc"})
+    assert resp.status_code == 200
+    assert calls == ["private"]
+    assert client.get("/public").status_code == 200
+
+
+def test_overridden_auth_dependency_is_not_enforced(
+    app: FastAPI, client: TestClient
+) -> None:
+    app.dependency_overrides[get_token] = lambda: "override"
+    assert client.get("/private").json() == {"token": "override"}
+
+
+def test_auth_endpoint_rate_limited_per_client(
+    client: TestClient, calls: list[str]
+) -> None:
+    statuses = [client.post("/api/v1/auth/login").status_code for _ in range(3)]
+    assert statuses == [200, 200, 429]
+    assert calls == ["login", "login"]
+    resp = client.post("/api/v1/auth/login")
+    assert int(resp.headers["retry-after"]) >= 1
+    assert client.get("/public").status_code == 200
+
+
+def test_global_limit_and_disable(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "front_door_ip_limit", 1)
+    assert client.get("/public").status_code == 200
+    assert client.get("/public").status_code == 429
+    monkeypatch.setattr(get_settings(), "front_door_enabled", False)
+    assert client.get("/public").status_code == 200
@@ -17,7 +17,7 @@ from collections.abc import Awaitable, Callable
 from typing import Final
 
 import pytest
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Request, WebSocket
 from fastapi.testclient import TestClient
 from httpx import Response as HttpxResponse
 from starlette.responses import Response
@@ -356,3 +356,79 @@ def test_sensitive_query_param_filtering(
     assert "password=[FILTERED]" in logs
     assert "token=[FILTERED]" in logs
     assert "email=foo@example.com" in logs
+
+
+@pytest.mark.asyncio
+async def test_streamed_body_is_forwarded_chunk_by_chunk(
+    loguru_list_sink: list[str],
+) -> None:
+    """Each body chunk reaches the server before the app sends the next one.
+
+    The status, request ID header and byte count are taken from the ASGI
+    messages as they pass; nothing is buffered.
+    """
+    from starlette.types import Message, Receive, Scope, Send
+
+    from src.middlewares.logging import RequestLoggingMiddleware
+
+    sent: list[Message] = []
+
+    async def stream_app(scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        for chunk in (b"id,name\n", b"1,a\n"):
+            await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            assert sent[-1]["body"] == chunk
+        await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+    async def receive() -> Message:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: Message) -> None:
+        sent.append(message)
+
+    middleware = RequestLoggingMiddleware(stream_app, expose_query_headers=True)
+    scope: Scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/export.csv",
+        "query_string": b"",
+        "headers": [(b"x-request-id", b"req-1")],
+    }
+    await middleware(scope, receive, send)
+
+    assert [m["type"] for m in sent] == [
+        "http.response.start",
+        "http.response.body",
+        "http.response.body",
+        "http.response.body",
+    ]
+    headers = dict(sent[0]["headers"])
+    assert headers[b"x-request-id"] == b"req-1"
+    assert headers[b"x-db-queries"] == b"0"
+    logs: str = "\n".join(loguru_list_sink)
+    assert "Response GET /export.csv completed with status 200" in logs
+    assert "(12 bytes, 0 queries" in logs
+
+
+def test_websocket_connections_are_logged(loguru_list_sink: list[str]) -> None:
+    """WebSocket scopes get a request ID and open/close log lines."""
+    from src.middlewares.logging import RequestLoggingMiddleware, get_request_id
+
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.websocket("/ws")
+    async def echo(websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.send_text(get_request_id() or "")
+        await websocket.close()
+
+    with TestClient(app).websocket_connect(
+        "/ws", headers={"X-Request-ID": "ws-1"}
+    ) as websocket:
+        assert websocket.receive_text() == "ws-1"
+
+    logs: str = "\n".join(loguru_list_sink)
+    assert "WebSocket /ws connecting" in logs
+    assert "WebSocket /ws closed with code 1000" in logs
+    assert "(4 bytes sent)" in logs
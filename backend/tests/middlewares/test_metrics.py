@@ -0,0 +1,69 @@
+"""Tests for the request and WebSocket metrics middleware."""
+
+from collections.abc import Iterator
+
+import pytest
+from fastapi import FastAPI, HTTPException, WebSocket
+from fastapi.testclient import TestClient
+
+from src.core.metrics import metrics
+from src.middlewares.metrics import MetricsMiddleware
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics() -> Iterator[None]:
+    metrics.reset()
+    yield
+    metrics.reset()
+
+
+@pytest.fixture
+def client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.post("/items/{item_id}")
+    async def update(item_id: int) -> dict[str, int]:
+        if item_id == 0:
+            raise HTTPException(404, "missing")
+        return {"id": item_id}
+
+    @app.websocket("/ws/{room}")
+    async def chat(websocket: WebSocket, room: str) -> None:
+        await websocket.accept()
+        await websocket.send_text(await websocket.receive_text())
+        await websocket.close()
+
+    return TestClient(app)
+
+
+def test_requests_are_keyed_by_route_template_and_status(client: TestClient) -> None:
+    client.post("/items/1", content=b"12345")
+    client.post("/items/2", content=b"12345")
+    client.post("/items/0")
+    client.get("/nowhere")
+
+    lines = metrics.prometheus_lines()
+    route = 'method="POST",route="/items/{item_id}"'
+    assert f'http_requests_total{{{route},status="200"}} 2.0' in lines
+    assert f'http_requests_total{{{route},status="404"}} 1.0' in lines
+    assert (
+        'http_requests_total{method="GET",route="<unmatched>",status="404"} 1.0'
+        in lines
+    )
+    assert f'http_request_duration_seconds_count{{{route},status="200"}} 2' in lines
+    assert f"http_request_bytes_total{{{route}}} 10.0" in lines
+    assert f"http_response_bytes_total{{{route}}} " in "\n".join(lines)
+    assert "http_requests_active 0.0" in lines
+
+
+def test_websocket_connections_and_messages(client: TestClient) -> None:
+    with client.websocket_connect("/ws/lobby") as websocket:
+        websocket.send_text("hi")
+        assert websocket.receive_text() == "hi"
+
+    lines = metrics.prometheus_lines()
+    assert 'websocket_connections_total{route="/ws/{room}"} 1.0' in lines
+    assert 'websocket_connections_active{route="/ws/{room}"} 0.0' in lines
+    assert 'websocket_messages_total{route="/ws/{room}",direction="in"} 1.0' in lines
+    assert 'websocket_messages_total{route="/ws/{room}",direction="out"} 1.0' in lines
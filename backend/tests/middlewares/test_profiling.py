@@ -0,0 +1,65 @@
+"""Tests for the per-request profiling middleware."""
+
+import asyncio
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.core.config import get_settings
+from src.core.profiling import sign_profile_token
+from src.middlewares.profiling import ProfilingMiddleware
+
+
+async def crunch() -> None:
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        sum(range(1000))
+
+
+@pytest.fixture
+def client(monkeypatch: pytest.MonkeyPatch) -> TestClient:
+    monkeypatch.setattr(get_settings(), "profiling_secret", "secret")
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/slow")
+    async def slow() -> dict[str, bool]:
+        await crunch()
+        await asyncio.sleep(0.05)
+        return {"done": True}
+
+    return TestClient(app)
+
+
+def _token(path: str = "/slow") -> str:
+    return sign_profile_token("secret", "GET", path, int(time.time()) + 60)
+
+
+def test_requests_without_a_valid_token_are_not_profiled(client: TestClient) -> None:
+    assert client.get("/slow").json() == {"done": True}
+    response = client.get("/slow", headers={"X-Profile": _token("/other")})
+    assert response.json() == {"done": True}
+    assert "X-Profiled-Status" not in response.headers
+
+
+def test_signed_request_returns_its_profile(client: TestClient) -> None:
+    response = client.get(
+        "/slow", headers={"X-Profile": _token(), "X-Profile-Format": "collapsed"}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["X-Profiled-Status"] == "200"
+    assert response.headers["Content-Disposition"].startswith("attachment;")
+    lines = response.text.splitlines()
+    # Running on the event loop, and suspended in asyncio.sleep
+    assert any("crunch" in line and not line.startswith("waiting;") for line in lines)
+    assert any(line.startswith("waiting;") and "slow" in line for line in lines)
+
+
+def test_speedscope_is_the_default_format(client: TestClient) -> None:
+    response = client.get("/slow", headers={"X-Profile": _token()})
+
+    assert response.headers["Content-Type"] == "application/json"
+    assert response.json()["profiles"]
@@ -0,0 +1,104 @@
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import IO, Final
+
+import pytest
+from fastapi import Depends, FastAPI
+from httpx import ASGITransport, AsyncClient
+from loguru import logger
+
+from src.api.deps import PaginationParams, pagination_params
+from src.core.app_logging import init_logging, stop_logging
+from src.middlewares.logging import RequestLoggingMiddleware
+
+REQUESTS: Final[int] = 1000
+# Each write() blocks this long, like a pipe to a busy log collector.
+WRITE_LATENCY_SECONDS: Final[float] = 0.0002
+
+
+class _SlowStream:
+    """A file whose writes block, as stdout does when its reader lags."""
+
+    def __init__(self, stream: IO[str]) -> None:
+        self.stream = stream
+
+    def write(self, text: str) -> int:
+        time.sleep(WRITE_LATENCY_SECONDS)
+        return self.stream.write(text)
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+def _app() -> FastAPI:
+    """A DB-free app with the request logging middleware and a chatty handler."""
+    app = FastAPI()
+    app.add_middleware(RequestLoggingMiddleware)
+
+    @app.get("/items")
+    async def items(
+        params: PaginationParams = Depends(pagination_params),
+    ) -> dict[str, int]:
+        for step in ("parsed", "authorized", "loaded", "serialized"):
+            logger.debug(
+                "items {}: offset={} limit={}", step, params.offset, params.limit
+            )
+        return {"offset": params.offset, "limit": params.limit}
+
+    return app
+
+
+async def _requests_per_second(app: FastAPI) -> float:
+    async with AsyncClient(
+        transport=ASGITransport(app=app), base_url="http://test"
+    ) as client:
+        for _ in range(50):  # warm up
+            await client.get("/items")
+        start = time.perf_counter()
+        for _ in range(REQUESTS):
+            response = await client.get("/items?offset=10&limit=20")
+            assert response.status_code == 200
+        return REQUESTS / (time.perf_counter() - start)
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_logging_modes_requests_per_second(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Requests/sec with logging off, at DEBUG, sampled, and in performance mode.
+
+    Every request logs about six lines. Prints the rates, so ``pytest -s``
+    shows the benchmark.
+    """
+    modes: dict[str, Callable[[], None]] = {
+        "off": lambda: init_logging(level="WARNING", color=False),
+        "debug": lambda: init_logging(level="DEBUG", color=False),
+        "debug, sampled 1%": lambda: init_logging(
+            level="DEBUG", color=False, sample_rates={"src": 0.01, "tests": 0.01}
+        ),
+        "debug, performance mode": lambda: init_logging(
+            level="DEBUG", performance=True
+        ),
+    }
+    results: dict[str, float] = {}
+    with (
+        (tmp_path / "stdout.log").open("w", encoding="utf-8") as stream,
+        monkeypatch.context() as patched,
+    ):
+        patched.setattr(sys, "stdout", _SlowStream(stream))
+        try:
+            for name, configure in modes.items():
+                configure()
+                results[name] = await _requests_per_second(_app())
+                stop_logging()
+        finally:
+            stop_logging()
+            logger.remove()
+    for name, rate in results.items():
+        print(f"logging {name}: {rate:.0f} requests/s")
+    assert results["off"] > results["debug"]
+    assert results["debug, sampled 1%"] > results["debug"]
+    assert results["debug, performance mode"] > results["debug"]
@@ -0,0 +1,83 @@
+import time
+from collections.abc import Callable
+from typing import Any, Final
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.sql import Executable
+
+from src.models.blacklisted_token import BlacklistedToken
+from src.models.file import File
+from src.models.user import User
+from src.repositories import hot_queries
+
+CALLS: Final[int] = 5_000
+
+
+def _per_call_seconds(build: Callable[[int], Executable]) -> float:
+    """Cost of building a statement and its cache key, as ``execute`` does."""
+    best: float = float("inf")
+    for _ in range(3):
+        start: float = time.perf_counter()
+        for i in range(CALLS):
+            build(i)._generate_cache_key()
+        best = min(best, (time.perf_counter() - start) / CALLS)
+    return best
+
+
+# (name, statement as the repositories used to build it, hot-query builder)
+CASES: Final[list[tuple[str, Callable[[int], Any], Callable[[int], Any]]]] = [
+    (
+        "user_principal_row",
+        lambda i: select(
+            User.id,
+            User.email,
+            User.is_active,
+            User.is_deleted,
+            User.is_admin,
+            User.updated_at,
+        ).where(User.id == i),
+        hot_queries.user_principal_row,
+    ),
+    (
+        "file_by_filename",
+        lambda i: select(File).where(File.filename == f"f{i}"),
+        lambda i: hot_queries.file_by_filename(f"f{i}"),
+    ),
+    (
+        "blacklisted_token",
+        lambda i: select(BlacklistedToken).where(BlacklistedToken.jti == f"j{i}"),
+        lambda i: hot_queries.blacklisted_token(f"j{i}"),
+    ),
+    (
+        "file_page",
+        lambda i: select(File)
+        .where(File.user_id == i, File.filename.ilike("%a%"))
+        .order_by(File.created_at.desc())
+        .offset(0)
+        .limit(20),
+        lambda i: hot_queries.file_page(i, q="a"),
+    ),
+    (
+        "file_count",
+        lambda i: select(func.count()).select_from(
+            select(File).where(File.user_id == i, File.filename.ilike("%a%")).subquery()
+        ),
+        lambda i: hot_queries.file_count(i, q="a"),
+    ),
+]
+
+
+@pytest.mark.performance
+@pytest.mark.parametrize(("name", "before", "after"), CASES, ids=[c[0] for c in CASES])
+def test_hot_queries_cut_per_call_overhead(
+    name: str, before: Callable[[int], Any], after: Callable[[int], Any]
+) -> None:
+    """Cached lambda statements must be cheaper than rebuilding ``select()``.
+
+    Prints the per-call cost of both, so ``pytest -s`` shows the benchmark.
+    """
+    old: float = _per_call_seconds(before)
+    new: float = _per_call_seconds(after)
+    print(f"{name}: {old * 1e6:.1f}us -> {new * 1e6:.1f}us per call")
+    assert new < old, f"{name}: {old * 1e6:.1f}us -> {new * 1e6:.1f}us"
@@ -0,0 +1,37 @@
+import time
+from typing import Final
+
+import pytest
+
+from src.utils.rate_limit import RateLimiterEngine, RateLimitRule
+
+RULE: Final[RateLimitRule] = RateLimitRule(limit=5, period=60.0)
+CALLS: Final[int] = 20_000
+
+
+def _per_call_seconds(tracked_keys: int) -> float:
+    """Average cost of a hit against an engine already tracking ``tracked_keys``."""
+    engine = RateLimiterEngine()
+    for i in range(tracked_keys):
+        engine.hit(f"ip:{i}", RULE)
+    keys: list[str] = [f"ip:{i % tracked_keys}" for i in range(CALLS)]
+    best: float = float("inf")
+    for _ in range(3):
+        start: float = time.perf_counter()
+        for key in keys:
+            engine.hit(key, RULE)
+        best = min(best, (time.perf_counter() - start) / CALLS)
+    return best
+
+
+@pytest.mark.performance
+def test_rate_limit_cost_is_independent_of_tracked_keys() -> None:
+    """Per-call cost must not grow with the number of tracked keys or past calls.
+
+    The old limiter rebuilt a per-key timestamp list on every call behind one
+    global lock; a credential-stuffing attack made every check slower.
+    """
+    small: float = _per_call_seconds(100)
+    large: float = _per_call_seconds(100_000)
+    assert large < small * 3, f"{small * 1e6:.2f}us -> {large * 1e6:.2f}us per call"
+    assert large < 50e-6, f"Rate limit check too slow: {large * 1e6:.2f}us"
@@ -0,0 +1,116 @@
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Final
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from src.core.replicas import RoutingSession
+from src.core.sqlite import SQLiteSession, create_sqlite_engines, sqlite_pools
+from src.models.base import Base
+from src.models.user import User
+
+WRITERS: Final[int] = 150
+READERS: Final[int] = 150
+# Time a request keeps its transaction open after its write (other awaits).
+HOLD_SECONDS: Final[float] = 0.005
+
+
+async def _run_load(
+    make_session: async_sessionmaker[AsyncSession],
+) -> tuple[float, int]:
+    """Concurrent read-then-write and read-only requests; (seconds, failures)."""
+    failures = 0
+
+    async def write(i: int) -> None:
+        nonlocal failures
+        try:
+            async with make_session() as session:
+                await session.scalars(select(User.id).limit(1))
+                session.add(User(email=f"w{i}@example.com", hashed_password="h"))
+                await session.flush()
+                await asyncio.sleep(HOLD_SECONDS)
+                await session.commit()
+        except Exception:
+            failures += 1
+
+    async def read() -> None:
+        nonlocal failures
+        try:
+            async with make_session() as session:
+                (await session.scalars(select(User).limit(20))).all()
+        except Exception:
+            failures += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(write(i) for i in range(WRITERS)), *(read() for _ in range(READERS))
+    )
+    return time.perf_counter() - start, failures
+
+
+async def _create_schema(engine: AsyncEngine) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def _default_mode(path: Path) -> tuple[float, int]:
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", connect_args={"timeout": 1}
+    )
+    try:
+        await _create_schema(engine)
+        return await _run_load(
+            async_sessionmaker(bind=engine, sync_session_class=RoutingSession)
+        )
+    finally:
+        await engine.dispose()
+
+
+async def _production_mode(path: Path) -> tuple[float, int]:
+    writer, reader = create_sqlite_engines(
+        f"sqlite+aiosqlite:///{path}",
+        SimpleNamespace(db_sqlite_busy_timeout_ms=1000),
+        {},
+    )
+    sqlite_pools.reader = reader
+    try:
+        await _create_schema(writer)
+        return await _run_load(
+            async_sessionmaker(bind=writer, sync_session_class=SQLiteSession)
+        )
+    finally:
+        await sqlite_pools.stop()
+        await writer.dispose()
+
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_production_sqlite_mode_has_no_lock_errors(tmp_path: Path) -> None:
+    """Under concurrent writes the single writer queues instead of failing.
+
+    Both setups wait at most one second for a lock. Prints both timings and
+    failure counts, so ``pytest -s`` shows the benchmark.
+    """
+    modes: dict[str, Callable[[Path], Awaitable[tuple[float, int]]]] = {
+        "default": _default_mode,
+        "production": _production_mode,
+    }
+    results: dict[str, tuple[float, int]] = {}
+    for name, run in modes.items():
+        results[name] = await run(tmp_path / f"{name}.db")
+        seconds, failures = results[name]
+        print(
+            f"{name}: {WRITERS} writers + {READERS} readers in "
+            f"{seconds:.2f}s, {failures} failed"
+        )
+    assert results["production"][1] == 0
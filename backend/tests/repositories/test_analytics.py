@@ -0,0 +1,124 @@
+from collections.abc import Iterator
+from datetime import UTC, date, datetime
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.file import File
+from src.models.user import User
+from src.repositories.analytics import (
+    analytics_rollups,
+    apply_rollup_deltas,
+    backfill_rollups,
+    count_on_commit,
+    daily_rollups,
+    monthly_rollups,
+)
+from src.repositories.file import create_file, delete_file
+from src.utils.write_behind import PendingWrite
+from tests.test_data_generators import get_unique_email
+
+
+@pytest.fixture(autouse=True)
+def empty_buffer() -> Iterator[None]:
+    analytics_rollups.drain()
+    yield
+    analytics_rollups.drain()
+
+
+def _pending_today(metric: str) -> int:
+    today = datetime.now(UTC).date()
+    pending = analytics_rollups.drain().get(today)
+    return pending.increments.get(metric, 0) if pending else 0
+
+
+@pytest.mark.asyncio
+async def test_deltas_upsert_into_daily_and_monthly(
+    async_session: AsyncSession,
+) -> None:
+    """Deltas add to existing rows; the monthly table sums the days."""
+    updates = {
+        date(2001, 3, 1): PendingWrite(increments={"logins": 2, "uploads": 0}),
+        date(2001, 3, 9): PendingWrite(increments={"logins": 3}),
+    }
+    await apply_rollup_deltas(async_session, updates)
+    await apply_rollup_deltas(
+        async_session, {date(2001, 3, 9): PendingWrite(increments={"logins": 1})}
+    )
+    await async_session.commit()
+
+    daily = await daily_rollups(
+        async_session, "logins", date(2001, 3, 1), date(2001, 3, 10)
+    )
+    assert len(daily) == 10
+    assert (daily[date(2001, 3, 1)], daily[date(2001, 3, 9)]) == (2, 4)
+    assert daily[date(2001, 3, 2)] == 0
+    monthly = await monthly_rollups(async_session, "logins", 2001)
+    assert (monthly[3], monthly[4]) == (6, 0)
+    assert await daily_rollups(
+        async_session, "uploads", date(2001, 3, 1), date(2001, 3, 1)
+    ) == {date(2001, 3, 1): 0}
+
+
+@pytest.mark.asyncio
+async def test_counts_are_published_only_on_commit(
+    async_session: AsyncSession,
+) -> None:
+    count_on_commit(async_session, "signups", 5)
+    await async_session.rollback()
+    assert _pending_today("signups") == 0
+
+    user = User(email=get_unique_email(), hashed_password="h", is_active=True)
+    async_session.add(user)
+    await async_session.flush()
+    await create_file(async_session, "rollup.txt", "text/plain", user.id, size=300)
+    await async_session.commit()
+    today = datetime.now(UTC).date()
+    assert analytics_rollups.drain()[today].increments == {
+        "uploads": 1,
+        "bytes_stored": 300,
+    }
+
+    assert await delete_file(async_session, "rollup.txt")
+    await async_session.commit()
+    assert analytics_rollups.drain()[today].increments == {
+        "uploads": -1,
+        "bytes_stored": -300,
+    }
+
+
+@pytest.mark.asyncio
+async def test_backfill_rebuilds_from_source_rows(
+    async_session: AsyncSession,
+) -> None:
+    user = User(email=get_unique_email(), hashed_password="h", is_active=True)
+    async_session.add(user)
+    await async_session.flush()
+    user.created_at = datetime(2002, 5, 20, 10, 0)
+    async_session.add_all(
+        [
+            File(
+                filename=f"bf{i}.txt",
+                content_type="text/plain",
+                user_id=user.id,
+                size=100 * (i + 1),
+                created_at=datetime(2002, 5, 21, 8, 0),
+            )
+            for i in range(2)
+        ]
+    )
+    await async_session.commit()
+    analytics_rollups.drain()
+    analytics_rollups.increment(date(2002, 5, 22), logins=4, signups=99)
+
+    counts = await backfill_rollups(async_session)
+    assert counts["signups"] >= 1 and counts["uploads"] >= 1
+
+    signups = await daily_rollups(
+        async_session, "signups", date(2002, 5, 20), date(2002, 5, 22)
+    )
+    assert list(signups.values()) == [1, 0, 0]
+    assert (await monthly_rollups(async_session, "bytes_stored", 2002))[5] == 300
+    assert (await monthly_rollups(async_session, "uploads", 2002))[5] == 2
+    assert (await monthly_rollups(async_session, "logins", 2002))[5] == 4
+    assert len(analytics_rollups) == 0
@@ -0,0 +1,83 @@
+from collections.abc import Iterator
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.user import User
+from src.repositories.audit import (
+    AuditEvent,
+    audit_on_commit,
+    audit_queue,
+    iter_audit_events,
+    query_audit_events,
+    write_audit_events,
+)
+from src.repositories.file import create_file
+from src.repositories.user import change_user_password
+from tests.test_data_generators import get_unique_email
+
+
+@pytest.fixture(autouse=True)
+def empty_queue() -> Iterator[None]:
+    audit_queue.drain()
+    yield
+    audit_queue.drain()
+
+
+@pytest.mark.asyncio
+async def test_events_are_queued_only_on_commit(async_session: AsyncSession) -> None:
+    audit_on_commit(async_session, "user.update", "user", 1)
+    await async_session.rollback()
+    assert audit_queue.drain() == []
+
+    user = User(email=get_unique_email(), hashed_password="h", is_active=True)
+    async_session.add(user)
+    await async_session.flush()
+    await create_file(async_session, "audited.txt", "text/plain", user.id, size=7)
+    await change_user_password(async_session, user.id, "new-hash")
+    assert audit_queue.drain() == []
+    await async_session.commit()
+    queued = audit_queue.drain()
+    assert [(e.action, e.entity_id) for e in queued] == [
+        ("file.upload", "audited.txt"),
+        ("user.password_change", str(user.id)),
+    ]
+    assert queued[0].actor_id == user.id
+    assert queued[0].details == {"size": 7, "content_type": "text/plain"}
+
+
+@pytest.mark.asyncio
+async def test_write_and_query_with_keyset_pages(async_session: AsyncSession) -> None:
+    base = datetime(2004, 2, 1, tzinfo=UTC)
+    events = [
+        AuditEvent(
+            action="file.delete" if i % 2 else "file.upload",
+            entity_type="file",
+            entity_id=f"q{i}.txt",
+            actor_id=42,
+            details={"n": i},
+            occurred_at=base + timedelta(minutes=i),
+        )
+        for i in range(5)
+    ]
+    await write_audit_events(async_session, events)
+    await async_session.commit()
+
+    window = {"start": base, "end": base + timedelta(days=1)}
+    first = await query_audit_events(async_session, **window, limit=2)
+    assert [r["entity_id"] for r in first] == ["q4.txt", "q3.txt"]
+    assert first[0]["details"] == {"n": 4}
+    before = (datetime.fromisoformat(first[-1]["occurred_at"]), first[-1]["id"])
+    second = await query_audit_events(async_session, **window, before=before, limit=2)
+    assert [r["entity_id"] for r in second] == ["q2.txt", "q1.txt"]
+
+    uploads = await query_audit_events(async_session, **window, action="file.upload")
+    assert [r["entity_id"] for r in uploads] == ["q4.txt", "q2.txt", "q0.txt"]
+    streamed = [
+        r["entity_id"]
+        async for r in iter_audit_events(
+            async_session, **window, actor_id=42, chunk_size=2
+        )
+    ]
+    assert streamed == [f"q{i}.txt" for i in range(4, -1, -1)]
@@ -6,7 +6,11 @@ import pytest
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.repositories.blacklisted_token import blacklist_token, is_token_blacklisted
+from src.repositories.blacklisted_token import (
+    blacklist_token,
+    delete_expired_blacklisted_tokens,
+    is_token_blacklisted,
+)
 
 
 class TestBlacklistedTokenRepository:
@@ -93,6 +97,24 @@ class TestBlacklistedTokenRepository:
         for jti in jtis:
             assert await is_token_blacklisted(async_session, jti) is True
 
+    @pytest.mark.asyncio
+    async def test_delete_expired_blacklisted_tokens(
+        self: "TestBlacklistedTokenRepository", async_session: AsyncSession
+    ) -> None:
+        """Test that only expired entries are purged."""
+        now: Final[datetime] = datetime.now(UTC)
+        live: Final[str] = f"live-{uuid.uuid4()}"
+        await blacklist_token(async_session, live, now + timedelta(minutes=5))
+        for i in range(2):
+            await blacklist_token(
+                async_session,
+                f"expired-{i}-{uuid.uuid4()}",
+                now - timedelta(days=i + 1),
+            )
+        await async_session.flush()
+        assert await delete_expired_blacklisted_tokens(async_session, now) == 2
+        assert await is_token_blacklisted(async_session, live) is True
+
     @pytest.mark.asyncio
     @pytest.mark.requires_real_db(
         "Transaction rollback test not supported in SQLite in-memory mode"
@@ -278,7 +278,7 @@ async def test_transactional_rollback_create_file(async_session: AsyncSession) -
 
 @pytest.mark.asyncio
 async def test_duplicate_filename_different_users(async_session: AsyncSession) -> None:
-    """Test that duplicate filenames for different users are allowed."""
+    """Test that a filename is unique across users (files are looked up by name)."""
     user1: User = User(
         email="test100@example.com", hashed_password="hashed", is_active=True
     )
@@ -289,14 +289,10 @@ async def test_duplicate_filename_different_users(async_session: AsyncSession) -
     async_session.add(user2)
     await async_session.flush()
 
-    file1 = await create_file(
-        async_session, "shared.txt", "text/plain", user_id=user1.id
-    )
-    file2 = await create_file(
-        async_session, "shared.txt", "text/plain", user_id=user2.id
-    )
-    assert file1.filename == file2.filename
-    assert file1.user_id != file2.user_id
+    await create_file(async_session, "shared.txt", "text/plain", user_id=user1.id)
+    with pytest.raises(IntegrityError):
+        await create_file(async_session, "shared.txt", "text/plain", user_id=user2.id)
+    await async_session.rollback()
 
 
 @pytest.mark.skip(reason="File repository does not currently validate content_type")
@@ -0,0 +1,150 @@
+"""Query-plan regression tests for the hot repository queries.
+
+Each statement is run under ``EXPLAIN`` against a seeded database. The test
+fails if a lookup scans a whole table instead of using an index.
+
+- SQLite (always): ``EXPLAIN QUERY PLAN``; a ``SCAN`` step is a full scan.
+- PostgreSQL (when the suite runs against the test container): ``EXPLAIN``
+  with ``enable_seqscan`` off, so a ``Seq Scan`` is only planned when no
+  index can serve the query.
+"""
+
+import json
+from collections.abc import AsyncIterator, Callable, Iterator
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any, Final
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, create_async_engine
+from sqlalchemy.sql import Executable
+
+from src.models.base import Base
+from src.models.blacklisted_token import BlacklistedToken
+from src.models.file import File
+from src.models.user import User
+from src.repositories import hot_queries
+
+USERS: Final[int] = 50
+FILES_PER_USER: Final[int] = 40
+TOKENS: Final[int] = 2000
+NOW: Final[datetime] = datetime(2026, 1, 1, tzinfo=UTC)
+
+# Every hot repository statement, with representative arguments.
+QUERIES: Final[dict[str, Callable[[], Executable]]] = {
+    "user_by_id": lambda: hot_queries.user_by_id(7),
+    "user_principal_row": lambda: hot_queries.user_principal_row(7),
+    "user_id_by_email": lambda: hot_queries.user_id_by_email("user7@example.com"),
+    "file_by_filename": lambda: hot_queries.file_by_filename("u7-f3.pdf"),
+    "blacklisted_token": lambda: hot_queries.blacklisted_token("jti-7"),
+    "file_page_newest": lambda: hot_queries.file_page(7),
+    "file_page_by_name": lambda: hot_queries.file_page(7, sort="filename", order="asc"),
+    "file_page_search": lambda: hot_queries.file_page(7, q="f3"),
+    "file_count": lambda: hot_queries.file_count(7),
+    "expired_tokens": lambda: delete(BlacklistedToken).where(
+        BlacklistedToken.expires_at <= NOW
+    ),
+}
+
+
+async def _seed(conn: AsyncConnection) -> None:
+    await conn.run_sync(Base.metadata.create_all)
+    await conn.execute(
+        insert(User),
+        [
+            {"email": f"user{i}@example.com", "hashed_password": "h"}
+            for i in range(1, USERS + 1)
+        ],
+    )
+    await conn.execute(
+        insert(File),
+        [
+            {
+                "filename": f"u{u}-f{f}.pdf",
+                "content_type": "application/pdf",
+                "user_id": u,
+                "size": 1,
+                "created_at": NOW - timedelta(hours=f),
+            }
+            for u in range(1, USERS + 1)
+            for f in range(FILES_PER_USER)
+        ],
+    )
+    # Mostly live tokens, as in production: the purge deletes a few.
+    await conn.execute(
+        insert(BlacklistedToken),
+        [
+            {"jti": f"jti-{i}", "expires_at": NOW + timedelta(minutes=i - 20)}
+            for i in range(TOKENS)
+        ],
+    )
+    await conn.exec_driver_sql("ANALYZE")
+
+
+def _positional(stmt: Executable, conn: AsyncConnection) -> tuple[str, tuple[Any, ...]]:
+    compiled = stmt.compile(dialect=conn.dialect)
+    params = compiled.construct_params()
+    return str(compiled), tuple(params[name] for name in compiled.positiontup or ())
+
+
+async def _sqlite_scans(conn: AsyncConnection, stmt: Executable) -> list[str]:
+    sql, args = _positional(stmt, conn)
+    rows = (await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}", args)).all()
+    return [row[-1] for row in rows if row[-1].startswith("SCAN ")]
+
+
+def _plan_nodes(node: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+async def _postgres_scans(conn: AsyncConnection, stmt: Executable) -> list[str]:
+    sql, args = _positional(stmt, conn)
+    await conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    raw = (await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}", args)).scalar()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return [
+        f"Seq Scan on {node['Relation Name']}"
+        for node in _plan_nodes(plan[0]["Plan"])
+        if node["Node Type"] == "Seq Scan"
+    ]
+
+
+@pytest_asyncio.fixture(params=["sqlite", "postgresql"])
+async def seeded(
+    request: pytest.FixtureRequest, tmp_path: Path, test_db_url: str
+) -> AsyncIterator[AsyncConnection]:
+    """A connection to a seeded database; PostgreSQL changes are rolled back."""
+    if request.param == "sqlite":
+        url = f"sqlite+aiosqlite:///{tmp_path / 'plans.db'}"
+    elif test_db_url.startswith("postgresql"):
+        url = test_db_url
+    else:
+        pytest.skip("PostgreSQL plans need the PostgreSQL test database")
+    engine = create_async_engine(url)
+    try:
+        async with engine.connect() as conn:
+            transaction = await conn.begin()
+            if request.param == "postgresql":
+                # A private schema, so the seed never meets the shared tables.
+                await conn.exec_driver_sql("CREATE SCHEMA query_plans")
+                await conn.exec_driver_sql("SET LOCAL search_path TO query_plans")
+            await _seed(conn)
+            yield conn
+            await transaction.rollback()
+    finally:
+        await engine.dispose()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("name", list(QUERIES))
+async def test_hot_query_uses_an_index(seeded: AsyncConnection, name: str) -> None:
+    stmt = QUERIES[name]()
+    if seeded.dialect.name == "postgresql":
+        scans = await _postgres_scans(seeded, stmt)
+    else:
+        scans = await _sqlite_scans(seeded, stmt)
+    assert scans == [], f"{name} scans a whole table: {scans}"
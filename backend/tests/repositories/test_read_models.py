@@ -0,0 +1,140 @@
+from datetime import datetime
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models.file import File
+from src.models.user import User
+from src.repositories.file import list_files
+from src.repositories.read_models import (
+    get_file_item,
+    list_file_items,
+    list_user_items,
+)
+from src.repositories.user import list_users
+from tests.test_data_generators import get_unique_email
+
+
+@pytest.mark.asyncio
+async def test_user_items_match_orm_list(async_session: AsyncSession) -> None:
+    """The projected rows are the same users, in the same order, as list_users."""
+    marker = get_unique_email().split("@")[0]
+    for i in range(3):
+        async_session.add(
+            User(
+                email=f"{marker}.{i}@example.com",
+                hashed_password="h",
+                is_active=True,
+                name=f"Reader {i}",
+                created_at=datetime(2003, 1, 1 + i),
+            )
+        )
+    await async_session.commit()
+
+    items = await list_user_items(
+        async_session, email=marker, sort="email", order="asc"
+    )
+    users, _total = await list_users(
+        async_session, email=marker, sort="email", order="asc"
+    )
+    assert [item["id"] for item in items] == [u.id for u in users]
+    assert [item["email"] for item in items] == [u.email for u in users]
+    assert items[0]["created_at"] == "2003-01-01T00:00:00"
+    assert set(items[0]) == {
+        "id",
+        "email",
+        "name",
+        "bio",
+        "avatar_url",
+        "created_at",
+        "updated_at",
+    }
+
+
+@pytest.mark.asyncio
+async def test_user_items_select_only_response_columns(
+    async_session: AsyncSession,
+) -> None:
+    statements: list[str] = []
+
+    def capture(_conn, _cursor, statement, *_args) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    engine = async_session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        await list_user_items(async_session, limit=1)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    assert len(statements) == 1
+    assert "preferences" not in statements[0]
+    assert "hashed_password" not in statements[0]
+
+
+@pytest.mark.asyncio
+async def test_file_items_page_and_total(async_session: AsyncSession) -> None:
+    user = User(email=get_unique_email(), hashed_password="h", is_active=True)
+    async_session.add(user)
+    await async_session.flush()
+    async_session.add_all(
+        [
+            File(
+                filename=f"rm{i}.txt",
+                content_type="text/plain",
+                user_id=user.id,
+                size=10 * i,
+            )
+            for i in range(5)
+        ]
+    )
+    await async_session.commit()
+
+    items, total = await list_file_items(
+        async_session, user.id, limit=2, sort="filename", order="asc"
+    )
+    files, orm_total = await list_files(
+        async_session, user.id, limit=2, sort="filename", order="asc"
+    )
+    assert total == orm_total == 5
+    assert [item["filename"] for item in items] == ["rm0.txt", "rm1.txt"]
+    assert [item["filename"] for item in items] == [f.filename for f in files]
+    assert items[1]["url"] == "/uploads/rm1.txt"
+    assert items[1]["size"] == 10
+
+
+@pytest.mark.asyncio
+async def test_fieldset_limits_selected_columns(async_session: AsyncSession) -> None:
+    statements: list[str] = []
+
+    def capture(_conn, _cursor, statement, *_args) -> None:  # type: ignore[no-untyped-def]
+        statements.append(statement)
+
+    engine = async_session.get_bind()
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        await list_user_items(async_session, limit=1, fields=("id", "email"))
+        await get_file_item(async_session, "missing.txt", fields=("url", "size"))
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+    user_sql, file_sql = (s.split("FROM")[0] for s in statements)
+    assert "users.email" in user_sql and "users.bio" not in user_sql
+    assert "users.created_at" not in user_sql
+    assert file_sql.count("files.filename") == 1 and "content_type" not in file_sql
+
+
+@pytest.mark.asyncio
+async def test_url_without_filename(async_session: AsyncSession) -> None:
+    user = User(email=get_unique_email(), hashed_password="h", is_active=True)
+    async_session.add(user)
+    await async_session.flush()
+    async_session.add(
+        File(filename="only-url.txt", content_type="text/plain", user_id=user.id)
+    )
+    await async_session.commit()
+
+    assert await get_file_item(async_session, "only-url.txt", fields=("url",)) == {
+        "url": "/uploads/only-url.txt"
+    }
+    items, _total = await list_file_items(async_session, user.id, fields=("size",))
+    assert items == [{"size": 0}]
@@ -10,8 +10,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.file import File
 from src.models.user import User
+from src.repositories.analytics import backfill_rollups
 from src.repositories.user import (
+    _principal_reads,
     anonymize_user,
+    apply_user_activity,
     assign_role_to_user,
     audit_log_user_change,
     bulk_create_users,
@@ -30,16 +33,20 @@ from src.repositories.user import (
     get_active_users,
     get_inactive_users,
     get_user_by_id,
+    get_user_principal,
+    get_user_principal_by_email,
     get_user_with_files,
     get_users_by_custom_field,
     get_users_by_ids,
     get_users_created_within,
     import_users_from_dicts,
+    invalidate_user_principal,
     is_email_unique,
     list_users,
     list_users_paginated,
     partial_update_user,
     reactivate_user,
+    record_login,
     restore_user,
     revoke_role_from_user,
     safe_get_user_by_id,
@@ -48,6 +55,7 @@ from src.repositories.user import (
     soft_delete_user,
     update_last_login,
     upsert_user,
+    user_activity,
     user_exists,
     user_signups_per_month,
 )
@@ -57,6 +65,7 @@ from src.utils.errors import (
     UserNotFoundError,
     ValidationError,
 )
+from src.utils.write_behind import PendingWrite
 from tests.test_data_generators import get_unique_email
 
 
@@ -102,6 +111,23 @@ class TestUserRepository:
             await create_user_with_validation(async_session, test_email, "Password123!")
         await async_session.rollback()
 
+    @pytest.mark.asyncio
+    async def test_create_user_conflict_detected_by_insert(
+        self, async_session: AsyncSession
+    ) -> None:
+        """A sign-up racing past the pre-check is rejected by ON CONFLICT."""
+        test_email = get_unique_email()
+        first = await create_user_with_validation(
+            async_session, test_email, "Password123!"
+        )
+        assert first.id is not None and first.created_at is not None
+        with patch("src.repositories.user.is_email_unique", return_value=True):
+            with pytest.raises(UserAlreadyExistsError):
+                await create_user_with_validation(
+                    async_session, test_email, "Password123!"
+                )
+        assert await is_email_unique(async_session, test_email) is False
+
     @pytest.mark.asyncio
     async def test_create_user_with_name(self, async_session: AsyncSession) -> None:
         user = await create_user_with_validation(
@@ -134,6 +160,108 @@ class TestUserRepository:
         assert found is not None
         assert found.email == user.email
 
+    @pytest.mark.asyncio
+    async def test_get_user_principal_served_from_cache(
+        self, async_session: AsyncSession
+    ) -> None:
+        user = await create_user_with_validation(
+            async_session, get_unique_email(), "Password123!"
+        )
+        principal = await get_user_principal(async_session, user.id)
+        assert principal is not None
+        assert principal.id == user.id
+        assert principal.email == user.email
+        assert principal.is_active is True
+        assert principal.is_deleted is False
+        assert principal.role == "user"
+        with patch.object(
+            async_session, "execute", AsyncMock(side_effect=AssertionError)
+        ):
+            cached = await get_user_principal(async_session, user.id)
+        assert cached is principal
+        await invalidate_user_principal(user.id)
+
+    @pytest.mark.asyncio
+    async def test_get_user_principal_not_found(
+        self, async_session: AsyncSession
+    ) -> None:
+        assert await get_user_principal(async_session, 999999) is None
+
+    @pytest.mark.asyncio
+    async def test_get_user_principal_by_email(
+        self, async_session: AsyncSession
+    ) -> None:
+        user = await create_user_with_validation(
+            async_session, get_unique_email(), "Password123!"
+        )
+        principal = await get_user_principal_by_email(async_session, user.email)
+        assert principal is not None
+        assert principal.id == user.id
+        assert await get_user_principal_by_email(async_session, "x@none.io") is None
+        await invalidate_user_principal(user.id)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "write",
+        [deactivate_user, soft_delete_user, anonymize_user],
+    )
+    async def test_user_writes_invalidate_principal(
+        self, async_session: AsyncSession, write: Any
+    ) -> None:
+        user = await create_user_with_validation(
+            async_session, get_unique_email(), "Password123!"
+        )
+        before = await get_user_principal(async_session, user.id)
+        assert before is not None and before.is_active and not before.is_deleted
+        assert await write(async_session, user.id) is True
+        await async_session.commit()
+        after = await get_user_principal(async_session, user.id)
+        assert after is not None
+        assert after is not before
+        assert not after.is_active or after.is_deleted
+        await invalidate_user_principal(user.id)
+
+    @pytest.mark.asyncio
+    async def test_partial_update_invalidates_principal(
+        self, async_session: AsyncSession
+    ) -> None:
+        user = await create_user_with_validation(
+            async_session, get_unique_email(), "Password123!"
+        )
+        before = await get_user_principal(async_session, user.id)
+        assert before is not None and before.is_admin is False
+        await partial_update_user(async_session, user.id, {"is_admin": True})
+        # The cached principal is dropped once the change commits.
+        assert await get_user_principal(async_session, user.id) is before
+        await async_session.commit()
+        after = await get_user_principal(async_session, user.id)
+        assert after is not None and after.is_admin is True
+        await invalidate_user_principal(user.id)
+
+    @pytest.mark.asyncio
+    async def test_principal_invalidated_mid_lookup_is_not_cached(
+        self, async_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        user = await create_user_with_validation(
+            async_session, get_unique_email(), "Password123!"
+        )
+        execute = async_session.execute
+
+        async def execute_then_invalidate(*args: Any, **kwargs: Any) -> Any:
+            result = await execute(*args, **kwargs)
+            # A concurrent deactivation commits after the row was read.
+            await invalidate_user_principal(user.id)
+            return result
+
+        monkeypatch.setattr(async_session, "execute", execute_then_invalidate)
+        stale = await get_user_principal(async_session, user.id)
+        monkeypatch.undo()
+        assert stale is not None
+        assert await get_user_principal(async_session, user.id) is not stale
+        # Nothing is kept per user once its lookups finish.
+        assert user.id not in _principal_reads
+        await invalidate_user_principal(user.id)
+
     @pytest.mark.asyncio
     async def test_safe_get_user_by_id(self, async_session: AsyncSession) -> None:
         user = await create_user_with_validation(
@@ -337,7 +465,43 @@ class TestUserRepository:
         ]
         result = await bulk_create_users(async_session, users)
         assert len(result) == 2
-        assert all(u.id is not None for u in result)
+        assert all(isinstance(user_id, int) for user_id in result)
+        assert await is_email_unique(async_session, users[1].email) is False
+
+    @pytest.mark.asyncio
+    async def test_bulk_operations_are_chunked_and_keep_cache_coherent(
+        self, async_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Set-based helpers chunk their statements and drop stale principals."""
+        monkeypatch.setattr("src.repositories.user._BULK_CHUNK_SIZE", 2)
+        rows = [
+            {"email": get_unique_email(), "hashed_password": "h", "name": f"u{i}"}
+            for i in range(5)
+        ]
+        ids = await bulk_create_users(async_session, rows)
+        assert len(ids) == 5 and ids == sorted(ids)
+        principal = await get_user_principal(async_session, ids[0])
+        assert principal is not None and principal.is_active
+
+        updated = await bulk_update_users(
+            async_session, [*ids, ids[0], 999999], {"is_active": False}
+        )
+        assert sorted(updated) == ids
+        await async_session.commit()
+        principal = await get_user_principal(async_session, ids[0])
+        assert principal is not None and not principal.is_active
+
+        deleted = await bulk_delete_users(async_session, ids[:3])
+        assert sorted(deleted) == ids[:3]
+        await async_session.commit()
+        assert await get_user_principal(async_session, ids[0]) is None
+
+    @pytest.mark.asyncio
+    async def test_bulk_update_rejects_unknown_fields(
+        self, async_session: AsyncSession
+    ) -> None:
+        with pytest.raises(ValidationError):
+            await bulk_update_users(async_session, [1], {"not_a_column": 1})
 
     @pytest.mark.asyncio
     async def test_bulk_update_users(self, async_session: AsyncSession) -> None:
@@ -349,10 +513,10 @@ class TestUserRepository:
         )
         await async_session.commit()
 
-        count = await bulk_update_users(
+        updated = await bulk_update_users(
             async_session, [user1.id, user2.id], {"is_active": False}
         )
-        assert count == 2
+        assert sorted(updated) == sorted([user1.id, user2.id])
 
         # Refresh and check
         await async_session.refresh(user1)
@@ -362,11 +526,11 @@ class TestUserRepository:
 
     @pytest.mark.asyncio
     async def test_bulk_update_users_empty(self, async_session: AsyncSession) -> None:
-        count = await bulk_update_users(async_session, [], {"is_active": False})
-        assert count == 0
+        updated = await bulk_update_users(async_session, [], {"is_active": False})
+        assert updated == []
 
-        count = await bulk_update_users(async_session, [1, 2], {})
-        assert count == 0
+        updated = await bulk_update_users(async_session, [1, 2], {})
+        assert updated == []
 
     @pytest.mark.asyncio
     async def test_bulk_delete_users(self, async_session: AsyncSession) -> None:
@@ -378,8 +542,8 @@ class TestUserRepository:
         )
         await async_session.commit()
 
-        count = await bulk_delete_users(async_session, [user1.id, user2.id])
-        assert count == 2
+        deleted = await bulk_delete_users(async_session, [user1.id, user2.id])
+        assert sorted(deleted) == sorted([user1.id, user2.id])
 
         # Check users are deleted
         found1 = await get_user_by_id(async_session, user1.id)
@@ -389,8 +553,8 @@ class TestUserRepository:
 
     @pytest.mark.asyncio
     async def test_bulk_delete_users_empty(self, async_session: AsyncSession) -> None:
-        count = await bulk_delete_users(async_session, [])
-        assert count == 0
+        deleted = await bulk_delete_users(async_session, [])
+        assert deleted == []
 
     @pytest.mark.asyncio
     async def test_soft_delete_user(self, async_session: AsyncSession) -> None:
@@ -738,6 +902,54 @@ class TestUserRepository:
         result = await update_last_login(async_session, 999999)
         assert result is False
 
+    @pytest.mark.asyncio
+    async def test_apply_user_activity_bulk_update(
+        self, async_session: AsyncSession
+    ) -> None:
+        """Coalesced touches and counters land in one bulk UPDATE."""
+        first = await create_user_with_validation(
+            async_session, get_unique_email(), "Password123!"
+        )
+        second = await create_user_with_validation(
+            async_session, get_unique_email(), "Password123!"
+        )
+        await async_session.commit()
+        login_time = datetime(2026, 1, 2, 3, 4, 5)
+        updates = {
+            first.id: PendingWrite(
+                touches={"last_login_at": login_time},
+                increments={"ws_message_count": 3, "ws_error_count": 1},
+            ),
+            second.id: PendingWrite(increments={"ws_message_count": 2}),
+            999999: PendingWrite(increments={"ws_message_count": 1}),
+        }
+        assert await apply_user_activity(async_session, updates) == 2
+        await apply_user_activity(
+            async_session, {first.id: PendingWrite(increments={"ws_message_count": 1})}
+        )
+        await async_session.commit()
+        await async_session.refresh(first)
+        await async_session.refresh(second)
+        assert first.last_login_at == login_time
+        assert (first.ws_message_count, first.ws_error_count) == (4, 1)
+        assert second.last_login_at is None
+        assert second.ws_message_count == 2
+
+    @pytest.mark.asyncio
+    async def test_record_login_is_buffered(self, async_session: AsyncSession) -> None:
+        user = await create_user_with_validation(
+            async_session, get_unique_email(), "Password123!"
+        )
+        await async_session.commit()
+        record_login(user.id)
+        record_login(user.id)
+        try:
+            assert len(user_activity) == 1
+            await async_session.refresh(user)
+            assert user.last_login_at is None
+        finally:
+            await user_activity.flush()
+
     @pytest.mark.asyncio
     async def test_anonymize_user(self, async_session: AsyncSession) -> None:
         user = await create_user_with_validation(
@@ -787,6 +999,8 @@ class TestUserRepository:
         user1.created_at = datetime(2024, 1, 15)
         user2.created_at = datetime(2024, 2, 15)
         await async_session.commit()
+        # The stats come from the rollups; rebuild them from the edited rows.
+        await backfill_rollups(async_session)
 
         stats = await user_signups_per_month(async_session, 2024)
         assert isinstance(stats, dict)
@@ -844,8 +1058,8 @@ class TestUserRepository:
     async def test_create_user_with_validation_rollback_on_error(
         self, async_session: AsyncSession
     ) -> None:
-        # Mock the commit to raise an exception
-        with patch.object(async_session, "commit", side_effect=Exception("DB Error")):
+        # Mock the INSERT to raise an exception
+        with patch.object(async_session, "scalars", side_effect=Exception("DB Error")):
             with pytest.raises(
                 (Exception,)
             ):  # Explicitly testing rollback behavior on any exception
@@ -861,8 +1075,8 @@ class TestUserRepository:
             User(email=get_unique_email(), hashed_password="hash1", is_active=True),
         ]
 
-        # Mock commit to raise an exception
-        with patch.object(async_session, "commit", side_effect=Exception("DB Error")):
+        # Mock the INSERT to raise an exception
+        with patch.object(async_session, "execute", side_effect=Exception("DB Error")):
             with pytest.raises(
                 (Exception,)
             ):  # Explicitly testing rollback behavior on any exception
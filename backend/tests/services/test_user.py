@@ -580,15 +580,15 @@ class TestUserService(AuthUnitTestTemplate):
         exc_type: type[Exception]
         if error_case == "jwt_decode_error":
             patchers = [
-                patch("src.services.user.jwt.decode", side_effect=Exception("fail"))
+                patch("src.core.security.jwt.decode", side_effect=Exception("fail"))
             ]
             exc_type = user_service.RefreshTokenError
         elif error_case == "missing_user_id":
-            patchers = [patch("src.services.user.jwt.decode", return_value={})]
+            patchers = [patch("src.core.security.jwt.decode", return_value={})]
             exc_type = user_service.RefreshTokenError
         elif error_case == "rate_limited":
             patchers = [
-                patch("src.services.user.jwt.decode", return_value={"user_id": 1}),
+                patch("src.core.security.jwt.decode", return_value={"user_id": 1}),
                 patch(
                     "src.services.user.user_action_limiter",
                     new_callable=AsyncMock,
@@ -598,7 +598,7 @@ class TestUserService(AuthUnitTestTemplate):
             exc_type = user_service.RefreshTokenRateLimitError
         elif error_case == "blacklisted":
             patchers = [
-                patch("src.services.user.jwt.decode", return_value={"user_id": 1}),
+                patch("src.core.security.jwt.decode", return_value={"user_id": 1}),
                 patch(
                     "src.services.user.user_action_limiter",
                     new_callable=AsyncMock,
@@ -613,7 +613,7 @@ class TestUserService(AuthUnitTestTemplate):
             exc_type = user_service.RefreshTokenBlacklistedError
         elif error_case == "unexpected_error":
             patchers = [
-                patch("src.services.user.jwt.decode", return_value={"user_id": 1}),
+                patch("src.core.security.jwt.decode", return_value={"user_id": 1}),
                 patch(
                     "src.services.user.user_action_limiter",
                     new_callable=AsyncMock,
@@ -728,7 +728,7 @@ class TestUserService(AuthUnitTestTemplate):
             avatar_url=None,
             preferences=None,
         )
-        with patch("src.services.user.jwt.decode", return_value=payload):
+        with patch("src.core.security.jwt.decode", return_value=payload):
             with patch(
                 "src.services.user.user_action_limiter",
                 new_callable=AsyncMock,
@@ -0,0 +1,111 @@
+"""Tests for the streaming user import pipeline."""
+
+import uuid
+from collections.abc import AsyncIterator, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.config import get_settings
+from src.models.user import User
+from src.services.user_import import (
+    ImportReport,
+    _iter_csv,
+    _iter_lines,
+    import_users,
+    shutdown_hash_pool,
+)
+from src.utils.hashing import verify_password
+
+
+def _email() -> str:
+    return f"imp_{uuid.uuid4().hex[:10]}@example.com"
+
+
+async def _chunks(data: str, size: int = 7) -> AsyncIterator[bytes]:
+    raw: bytes = data.encode()
+    for i in range(0, len(raw), size):
+        yield raw[i : i + size]
+
+
+@pytest.fixture
+def executor() -> Iterator[ThreadPoolExecutor]:
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+@pytest.mark.asyncio
+async def test_csv_parsing_survives_chunk_boundaries() -> None:
+    data = '\ufeffEmail,Name\r\na@x.io,"Multi\nline, name"\r\nb@x.io\r\n\r\n'
+    rows = [r async for r in _iter_csv(_iter_lines(_chunks(data, size=3)))]
+    assert rows[0].data == {"email": "a@x.io", "name": "Multi\nline, name"}
+    assert rows[1].data is None and rows[1].row == 2
+
+
+@pytest.mark.asyncio
+async def test_import_batches_validates_and_skips_existing(
+    async_session: AsyncSession, executor: ThreadPoolExecutor
+) -> None:
+    first, second = _email(), _email()
+    body = "\n".join(
+        [
+            "email,password,name,is_active",
+            f"{first},Password123!,First,true",
+            f"{first},Password123!,Twice,true",
+            "bad-email,Password123!,,",
+            f"{second},short,,",
+            f"{second},Password123!,,no",
+        ]
+    )
+    progress: list[tuple[int, bool]] = []
+
+    async def on_progress(report: ImportReport, done: bool) -> None:
+        progress.append((report.total, done))
+
+    report = await import_users(
+        async_session,
+        _chunks(body),
+        "csv",
+        progress=on_progress,
+        executor=executor,
+        batch_size=2,
+    )
+    assert (report.total, report.created, report.failed) == (5, 2, 3)
+    assert [(e["row"], e["error"]) for e in report.errors][:2] == [
+        (2, "Duplicate email in import."),
+        (3, "Invalid email format."),
+    ]
+    assert progress == [(2, False), (4, False), (5, True)]
+
+    users: Sequence[User] = (
+        await async_session.scalars(
+            select(User).where(User.email.in_([first, second])).order_by(User.id)
+        )
+    ).all()
+    assert [(u.name, u.is_active) for u in users] == [("First", True), (None, False)]
+    assert verify_password("Password123!", users[0].hashed_password)
+
+    again = await import_users(
+        async_session,
+        _chunks(f'{{"email": "{first}", "password": "Password123!"}}\n[1]\n'),
+        "ndjson",
+        executor=executor,
+    )
+    assert (again.created, again.skipped, again.failed) == (0, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_import_hashes_in_process_pool(
+    async_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(get_settings(), "user_import_hash_workers", 1)
+    email = _email()
+    try:
+        report = await import_users(
+            async_session, _chunks(f"email,password\n{email},Password123!\n"), "csv"
+        )
+    finally:
+        shutdown_hash_pool()
+    assert report.created == 1
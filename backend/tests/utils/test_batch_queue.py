@@ -0,0 +1,75 @@
+import asyncio
+from collections.abc import Sequence
+
+import pytest
+
+from src.utils.batch_queue import BatchQueue
+from tests.test_templates import UtilityUnitTestTemplate
+
+
+class TestBatchQueue(UtilityUnitTestTemplate):
+    """Batching, drop accounting, retry and backpressure of the batch queue."""
+
+    @pytest.mark.asyncio
+    async def test_flushes_in_batches_and_drops_when_full(self) -> None:
+        batches: list[list[int]] = []
+
+        async def write(batch: Sequence[int]) -> None:
+            batches.append(list(batch))
+
+        queue: BatchQueue[int] = BatchQueue("test", write, max_size=5, batch_size=2)
+        accepted = [queue.put_nowait(i) for i in range(7)]
+        self.assert_equal(accepted, [True] * 5 + [False] * 2)
+        self.assert_equal(await queue.flush(), 5)
+        self.assert_equal(batches, [[0, 1], [2, 3], [4]])
+        self.assert_equal(
+            queue.stats(),
+            {
+                "queued": 0,
+                "max_size": 5,
+                "written": 5,
+                "dropped": 2,
+                "failed_batches": 0,
+            },
+        )
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_is_retried_in_order(self) -> None:
+        calls: list[list[int]] = []
+
+        async def write(batch: Sequence[int]) -> None:
+            calls.append(list(batch))
+            if len(calls) == 1:
+                raise ConnectionError("db down")
+
+        queue: BatchQueue[int] = BatchQueue("test", write, batch_size=10)
+        queue.put_nowait(1)
+        queue.put_nowait(2)
+        self.assert_equal(await queue.flush(), 0)
+        queue.put_nowait(3)
+        self.assert_equal(await queue.flush(), 3)
+        self.assert_equal(calls[1], [1, 2, 3])
+        self.assert_equal(queue.failed_batches, 1)
+
+    @pytest.mark.asyncio
+    async def test_full_batch_wakes_writer_and_put_waits_for_room(self) -> None:
+        written: list[int] = []
+
+        async def write(batch: Sequence[int]) -> None:
+            written.extend(batch)
+
+        queue: BatchQueue[int] = BatchQueue(
+            "test", write, max_size=2, batch_size=2, interval=60
+        )
+        queue.start()
+        try:
+            queue.put_nowait(1)
+            queue.put_nowait(2)
+            # The writer has not run yet, so the queue is still full.
+            self.assert_equal(await queue.put(3, timeout=1.0), True)
+            await asyncio.sleep(0)
+            self.assert_equal(written[:2], [1, 2])
+            self.assert_equal(queue.dropped, 0)
+        finally:
+            await queue.stop()
+        self.assert_equal(written, [1, 2, 3])
@@ -50,3 +50,16 @@ class TestAsyncInMemoryCache(UtilityUnitTestTemplate):
         await cache.clear()
         result: str | None = await cache.get(key)
         self.assert_is_none(result)
+
+    @pytest.mark.asyncio
+    async def test_delete(self) -> None:
+        """
+        Test that delete removes a single key and ignores missing keys.
+        """
+        cache: Final[AsyncInMemoryCache[str, str]] = AsyncInMemoryCache()
+        await cache.set("keep", "v1")
+        await cache.set("drop", "v2")
+        await cache.delete("drop")
+        await cache.delete("missing")
+        self.assert_is_none(await cache.get("drop"))
+        self.assert_equal(await cache.get("keep"), "v1")
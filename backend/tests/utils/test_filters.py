@@ -5,7 +5,11 @@ import pytest
 from typing_extensions import TypedDict
 
 from src.utils.datetime import parse_flexible_datetime
-from src.utils.filters import filter_fields, process_user_filters
+from src.utils.filters import (
+    filter_fields,
+    parse_sparse_fieldset,
+    process_user_filters,
+)
 from tests.test_templates import UtilityUnitTestTemplate
 
 
@@ -384,3 +388,15 @@ class TestFilters(UtilityUnitTestTemplate):
             "name": "John",
         }
         self.assert_equal(result, expected)
+
+    def test_parse_sparse_fieldset(self) -> None:
+        """Test parse_sparse_fieldset adds required fields and keeps allowed order."""
+        allowed: tuple[str, ...] = ("id", "email", "name", "bio")
+        self.assert_equal(parse_sparse_fieldset(None, allowed, ("id",)), None)
+        self.assert_equal(
+            parse_sparse_fieldset(" name , email,", allowed, ("id",)),
+            ("id", "email", "name"),
+        )
+        self.assert_equal(parse_sparse_fieldset("", allowed, ("id",)), ("id",))
+        with pytest.raises(ValueError, match="preferences"):
+            parse_sparse_fieldset("name,preferences", allowed)
@@ -1,5 +1,7 @@
 from typing import Final
 
+import pytest
+
 from tests.test_templates import UtilityUnitTestTemplate
 
 
@@ -37,3 +39,11 @@ class TestHashingUtils(UtilityUnitTestTemplate):
         self.assert_is_true(verify_password(password, hash2))
         self.assert_predicate_true(verify_password, password, hash1)
         self.assert_predicate_true(verify_password, password, hash2)
+
+    @pytest.mark.asyncio
+    async def test_hash_password_async(self) -> None:
+        """The off-loop hash produces a normal verifiable bcrypt hash."""
+        from src.utils.hashing import hash_password_async, verify_password
+
+        hashed: str = await hash_password_async("off-loop")
+        self.assert_is_true(verify_password("off-loop", hashed))
@@ -0,0 +1,62 @@
+import time
+from collections.abc import Mapping
+from typing import Any, Final
+
+import pytest
+from jose import JWTError, jwt
+
+from src.core.jwt_keys import KeyRing
+from src.utils.jwt_verify import JWKSVerifier
+from tests.test_templates import UtilityUnitTestTemplate
+
+JWKS_URL: Final[str] = "https://api.test/.well-known/jwks.json"
+
+
+def _sign(ring: KeyRing, claims: Mapping[str, Any]) -> str:
+    key = ring.signing_key()
+    return jwt.encode(
+        {"exp": int(time.time()) + 60, **claims},
+        key.private_pem,
+        algorithm=key.algorithm,
+        headers={"kid": key.kid},
+    )
+
+
+class TestJWKSVerifier(UtilityUnitTestTemplate):
+    @pytest.mark.parametrize("algorithm", ["RS256", "ES256"])
+    def test_verify_with_static_jwks(self, algorithm: str) -> None:
+        ring = KeyRing.ephemeral(algorithm)
+        verifier = JWKSVerifier(jwks=ring.jwks())
+        self.assert_equal(verifier.verify(_sign(ring, {"sub": "1"}))["sub"], "1")
+
+    def test_unknown_kid_triggers_single_refresh(self) -> None:
+        old_ring = KeyRing.ephemeral("ES256")
+        new_ring = KeyRing.ephemeral("ES256")
+        calls: list[str] = []
+
+        def fetcher(url: str) -> Mapping[str, Any]:
+            calls.append(url)
+            return new_ring.jwks() if len(calls) > 1 else old_ring.jwks()
+
+        verifier = JWKSVerifier(JWKS_URL, fetcher=fetcher, min_refresh_interval=0)
+        verifier.refresh()
+        claims = verifier.verify(_sign(new_ring, {"sub": "2"}))
+        self.assert_equal(claims["sub"], "2")
+        self.assert_equal(len(calls), 2)
+
+    def test_rejects_hmac_and_missing_kid(self) -> None:
+        ring = KeyRing.ephemeral("ES256")
+        verifier = JWKSVerifier(jwks=ring.jwks())
+        hmac_token: str = jwt.encode({"sub": "1"}, "secret", algorithm="HS256")
+        with pytest.raises(JWTError):
+            verifier.verify(hmac_token)
+        key = ring.signing_key()
+        no_kid: str = jwt.encode({"sub": "1"}, key.private_pem, algorithm="ES256")
+        with pytest.raises(JWTError):
+            verifier.verify(no_kid)
+
+    def test_rejects_expired_token(self) -> None:
+        ring = KeyRing.ephemeral("ES256")
+        verifier = JWKSVerifier(jwks=ring.jwks())
+        with pytest.raises(JWTError):
+            verifier.verify(_sign(ring, {"sub": "1", "exp": int(time.time()) - 10}))
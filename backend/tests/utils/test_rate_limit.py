@@ -3,7 +3,14 @@ from typing import Final
 
 import pytest
 
-from src.utils.rate_limit import AsyncRateLimiter
+from src.utils.rate_limit import (
+    AsyncRateLimiter,
+    LocalRateLimitStore,
+    RateLimitDecision,
+    RateLimiterEngine,
+    RateLimitRule,
+    create_rate_limit_store,
+)
 from tests.test_templates import UtilityUnitTestTemplate
 
 
@@ -18,7 +25,7 @@ class TestAsyncRateLimiter(UtilityUnitTestTemplate):
         and allows again after the period. Also tests reset for a single key and global reset.
         """
         limiter: Final[AsyncRateLimiter[str]] = AsyncRateLimiter(
-            max_calls=2, period=0.5
+            max_calls=2, period=0.5, namespace="test"
         )
         key: Final[str] = "user:1:test"
         results: list[bool] = [await limiter.is_allowed(key) for _ in range(2)]
@@ -40,3 +47,112 @@ class TestAsyncRateLimiter(UtilityUnitTestTemplate):
         all_keys: list[str] = [key, key2, key3]
         results = [await limiter.is_allowed(k) for k in all_keys]
         self.assert_all_true(results)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now: float = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FailingStore:
+    async def hit(
+        self, key: str, rule: RateLimitRule, cost: int = 1
+    ) -> RateLimitDecision:
+        raise ConnectionError("store down")
+
+    async def reset(self, key: str) -> None:
+        raise ConnectionError("store down")
+
+
+class TestRateLimiterEngine(UtilityUnitTestTemplate):
+    """GCRA decisions, eviction and shared-store behaviour of the limiter engine."""
+
+    def test_burst_then_steady_rate(self) -> None:
+        clock = FakeClock()
+        engine = RateLimiterEngine(clock=clock)
+        rule = RateLimitRule(limit=3, period=3.0)
+        decisions = [engine.hit("k", rule) for _ in range(3)]
+        self.assert_all_true([d.allowed for d in decisions])
+        self.assert_equal([d.remaining for d in decisions], [2, 1, 0])
+        denied = engine.hit("k", rule)
+        self.assert_is_false(denied.allowed)
+        self.assert_equal(round(denied.retry_after, 6), 1.0)
+        clock.now += 1.0
+        self.assert_is_true(engine.hit("k", rule).allowed)
+        self.assert_is_false(engine.hit("k", rule).allowed)
+
+    def test_denied_calls_do_not_consume(self) -> None:
+        clock = FakeClock()
+        engine = RateLimiterEngine(clock=clock)
+        rule = RateLimitRule(limit=1, period=1.0)
+        engine.hit("k", rule)
+        for _ in range(10):
+            engine.hit("k", rule)
+        clock.now += 1.0
+        self.assert_is_true(engine.hit("k", rule).allowed)
+
+    def test_keys_are_independent_and_resettable(self) -> None:
+        engine = RateLimiterEngine(clock=FakeClock())
+        rule = RateLimitRule(limit=1, period=60.0)
+        self.assert_is_true(engine.hit("a", rule).allowed)
+        self.assert_is_true(engine.hit("b", rule).allowed)
+        self.assert_is_false(engine.peek("a", rule).allowed)
+        engine.reset("a")
+        self.assert_is_true(engine.hit("a", rule).allowed)
+        engine.reset()
+        self.assert_equal(len(engine), 0)
+
+    def test_idle_keys_are_evicted(self) -> None:
+        """Keys whose bucket has drained are swept without an explicit call."""
+        clock = FakeClock()
+        engine = RateLimiterEngine(shards=4, evict_interval=4.0, clock=clock)
+        rule = RateLimitRule(limit=10, period=1.0)
+        for i in range(100):
+            engine.hit(f"ip:{i}", rule)
+        self.assert_equal(len(engine), 100)
+        self.assert_equal(engine.evict_idle(), 0)
+        # Each later call sweeps one shard once per evict_interval / shards.
+        for _ in range(4):
+            clock.now += 1.0
+            engine.hit("active", rule)
+        self.assert_equal(len(engine), 1)
+
+    def test_invalid_rule(self) -> None:
+        with pytest.raises(ValueError):
+            RateLimitRule(limit=0, period=1.0)
+
+    @pytest.mark.asyncio
+    async def test_async_limiter_uses_shared_store(self) -> None:
+        """Limiters sharing a store share their budget, per namespace."""
+        store = LocalRateLimitStore()
+        first: AsyncRateLimiter[str] = AsyncRateLimiter(
+            1, 60.0, store=store, namespace="login"
+        )
+        second: AsyncRateLimiter[str] = AsyncRateLimiter(
+            1, 60.0, store=store, namespace="login"
+        )
+        other: AsyncRateLimiter[str] = AsyncRateLimiter(
+            1, 60.0, store=store, namespace="upload"
+        )
+        self.assert_is_true((await first.check("1.2.3.4")).allowed)
+        self.assert_is_false((await second.check("1.2.3.4")).allowed)
+        self.assert_is_true((await other.check("1.2.3.4")).allowed)
+        self.assert_equal(len(store.engine), 2)
+
+    @pytest.mark.asyncio
+    async def test_async_limiter_fails_open_to_local_state(self) -> None:
+        limiter: AsyncRateLimiter[str] = AsyncRateLimiter(
+            1, 60.0, namespace="test", store=FailingStore()
+        )
+        self.assert_is_true((await limiter.check("k")).allowed)
+        self.assert_is_false((await limiter.check("k")).allowed)
+
+    def test_create_store(self) -> None:
+        self.assert_is_instance(create_rate_limit_store("memory"), LocalRateLimitStore)
+        with pytest.raises(RuntimeError):
+            create_rate_limit_store("redis")
+        with pytest.raises(ValueError):
+            create_rate_limit_store("memcached")
@@ -0,0 +1,68 @@
+import asyncio
+from collections.abc import Mapping
+
+import pytest
+
+from src.utils.write_behind import PendingWrite, WriteBehindBuffer
+from tests.test_templates import UtilityUnitTestTemplate
+
+
+class TestWriteBehindBuffer(UtilityUnitTestTemplate):
+    """Coalescing, retry and shutdown behaviour of the write-behind buffer."""
+
+    @pytest.mark.asyncio
+    async def test_coalesces_per_entity(self) -> None:
+        flushed: list[Mapping[int, PendingWrite]] = []
+
+        async def flush(batch: Mapping[int, PendingWrite]) -> None:
+            flushed.append(batch)
+
+        buffer: WriteBehindBuffer[int] = WriteBehindBuffer("test", flush)
+        buffer.touch(1, last_login_at="a")
+        buffer.touch(1, last_login_at="b")
+        buffer.increment(1, hits=2)
+        buffer.increment(1, hits=3)
+        buffer.increment(2, hits=1)
+        self.assert_equal(len(buffer), 2)
+        self.assert_equal(await buffer.flush(), 2)
+        self.assert_equal(flushed[0][1].touches, {"last_login_at": "b"})
+        self.assert_equal(flushed[0][1].increments, {"hits": 5})
+        self.assert_equal(await buffer.flush(), 0)
+        self.assert_equal(len(flushed), 1)
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_requeued(self) -> None:
+        calls: list[Mapping[int, PendingWrite]] = []
+
+        async def flush(batch: Mapping[int, PendingWrite]) -> None:
+            calls.append(batch)
+            if len(calls) == 1:
+                raise ConnectionError("db down")
+
+        buffer: WriteBehindBuffer[int] = WriteBehindBuffer("test", flush)
+        buffer.touch(1, seen="old")
+        buffer.increment(1, hits=1)
+        self.assert_equal(await buffer.flush(), 0)
+        buffer.touch(1, seen="new")
+        buffer.increment(1, hits=1)
+        self.assert_equal(await buffer.flush(), 1)
+        self.assert_equal(calls[1][1].touches, {"seen": "new"})
+        self.assert_equal(calls[1][1].increments, {"hits": 2})
+
+    @pytest.mark.asyncio
+    async def test_bounded_and_flushed_on_stop(self) -> None:
+        flushed: list[int] = []
+
+        async def flush(batch: Mapping[int, PendingWrite]) -> None:
+            flushed.extend(batch)
+
+        buffer: WriteBehindBuffer[int] = WriteBehindBuffer(
+            "test", flush, interval=3600.0, max_entities=2
+        )
+        buffer.start()
+        for key in range(3):
+            buffer.increment(key, hits=1)
+        self.assert_equal(buffer.dropped, 1)
+        await asyncio.sleep(0)  # the overflow wakes the flush task early
+        await buffer.stop()
+        self.assert_equal(sorted(flushed), [0, 1])
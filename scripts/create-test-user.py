@@ -33,6 +33,8 @@ async def create_test_user():
                     password="testpassword123",
                     name="Test User"
                 )
+                # Repositories only flush; outside a request, commit here.
+                await session.commit()
                 
                 print(f"✅ Test user created successfully!")
                 print(f"📧 Email: {user.email}")
@@ -19,7 +19,7 @@ async def test_user_creation():
         from src.repositories.user import create_user_with_validation
 
         # Get a database session
-        async for session in get_async_session():
+        async with get_async_session() as session:
             try:
                 print("Testing user creation...")
                 result = await create_user_with_validation(
@@ -28,6 +28,8 @@ async def test_user_creation():
                     "TestPassword123!",
                     "Debug Test User",
                 )
+                # Repositories only flush; outside a request, commit here.
+                await session.commit()
                 print(f"✅ User created: {result}")
 
             except Exception as e:
@@ -35,7 +37,6 @@ async def test_user_creation():
                 import traceback
 
                 traceback.print_exc()
-            break  # Only use one session
 
     except Exception as e:
         print(f"❌ Setup error: {type(e).__name__}: {e}")